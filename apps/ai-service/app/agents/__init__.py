@@ -5,10 +5,30 @@ Multi-Agent 패턴 구현
 - ManagerAgent (김 반장): 인테리어 상담, 비용 견적, 일정 계획
 - ArchitectAgent (AI 건축사): 도면 분석, 구조물 감지, 철거 검증
 - DesignerAgent (AI 디자이너): 인테리어 스타일 추천, 디자인 이미지 생성
+
+에이전트 모듈은 이름에 처음 접근할 때 임포트 (module __getattr__)
+→ `import app.agents`만으로는 에이전트/SDK를 로드하지 않음
+→ 호출부는 `from app import agents` 후 `agents.get_manager_agent()`처럼 사용 시점에 접근
+  (`from app.agents import get_*_agent`는 임포트 시점에 모든 에이전트를 로드하므로 피할 것)
 """
-from .manager_agent import ManagerAgent, get_manager_agent
-from .architect_agent import ArchitectAgent, get_architect_agent
-from .designer_agent import DesignerAgent, get_designer_agent
+import importlib
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .manager_agent import ManagerAgent, get_manager_agent
+    from .architect_agent import ArchitectAgent, get_architect_agent
+    from .designer_agent import DesignerAgent, get_designer_agent
+
+# 공개 이름 → 정의된 하위 모듈
+_LAZY_EXPORTS = {
+    "ManagerAgent": ".manager_agent",
+    "get_manager_agent": ".manager_agent",
+    "ArchitectAgent": ".architect_agent",
+    "get_architect_agent": ".architect_agent",
+    "DesignerAgent": ".designer_agent",
+    "get_designer_agent": ".designer_agent",
+}
 
 __all__ = [
     "ManagerAgent",
@@ -18,3 +38,22 @@ __all__ = [
     "DesignerAgent",
     "get_designer_agent",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # 이후 접근은 일반 속성 조회
+    return value
+
+
+def is_loaded(name: str) -> bool:
+    """공개 이름의 하위 모듈이 이미 임포트되었는지 (임포트를 일으키지 않음)"""
+    module_name = _LAZY_EXPORTS.get(name)
+    return module_name is not None and f"{__name__}{module_name}" in sys.modules
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,15 +2,12 @@
 Architect Agent - AI 건축사
 도면 분석, 구조물 감지, 철거 계획 검증을 담당하는 AI 에이전트
 Gemini Vision API를 사용하여 이미지 분석
+
+google.generativeai / httpx는 첫 사용 시 로드 (서버 콜드 스타트 단축)
 """
 import json
 import base64
-import httpx
-from typing import Optional, List
-from PIL import Image
-from io import BytesIO
-
-import google.generativeai as genai
+from typing import TYPE_CHECKING, BinaryIO, Optional, List
 
 from app.llm import GeminiProvider, LLMConfig
 from app.models.schemas import (
@@ -21,6 +18,13 @@ from app.models.schemas import (
     DesignFeasibility,
 )
 from app.config import settings
+from app.core.image_utils import decode_image
+from app.core.executor import get_executor
+from app.core.lazy import import_module_async
+from app.services.analysis_store import get_analysis_store
+
+if TYPE_CHECKING:
+    from PIL import Image
 
 
 FLOOR_PLAN_ANALYSIS_PROMPT = """You are an expert AI Architect specializing in Korean residential interior analysis.
@@ -237,6 +241,7 @@ class ArchitectAgent:
     async def initialize(self):
         """Gemini Vision 클라이언트 초기화"""
         if not self._initialized:
+            genai = await import_module_async("google.generativeai")
             genai.configure(api_key=self.api_key)
             self._model = genai.GenerativeModel(
                 model_name=self.model_name,
@@ -247,13 +252,30 @@ class ArchitectAgent:
             )
             self._initialized = True
 
+    async def warm_connections(self) -> None:
+        """Gemini 커넥션 웜업: count_tokens로 TLS 핸드셰이크만 수행 (API 키가 없으면 건너뜀)"""
+        if not self.api_key:
+            return
+        await self.initialize()
+        await self._model.count_tokens_async("ping")
+
     async def _load_image(
         self,
         image_url: Optional[str] = None,
         image_base64: Optional[str] = None,
-    ) -> Image.Image:
-        """이미지 로드 (URL 또는 Base64)"""
-        if image_base64:
+        image_file: Optional[BinaryIO] = None,
+    ) -> "Image.Image":
+        """이미지 로드 (업로드 파일, URL 또는 Base64)"""
+        if image_file is not None:
+            # 업로드 스풀 파일에서 바로 디코딩 (base64 문자열/bytes 복사 없음, 큰 스캔은 축소 디코딩)
+            try:
+                img = await get_executor().run_io(decode_image, image_file, settings.upload_image_max_side)
+                print(f"[DEBUG] Image opened from upload: {img.format} {img.size} {img.mode}")
+                return img
+            except Exception as e:
+                raise ValueError(f"이미지 파일 열기 실패: {str(e)}")
+
+        elif image_base64:
             # 디버그: base64 길이 출력
             print(f"[DEBUG] Received base64 length: {len(image_base64)}")
 
@@ -266,16 +288,15 @@ class ArchitectAgent:
                 except IndexError:
                     raise ValueError("Invalid data URI format")
 
-            # Base64 디코딩
+            # Base64 디코딩 + 이미지 열기 (스레드 풀 - 큰 도면에서 이벤트 루프를 막지 않도록)
             try:
-                image_data = base64.b64decode(image_base64)
+                image_data = await get_executor().run_io(base64.b64decode, image_base64)
                 print(f"[DEBUG] Decoded image data size: {len(image_data)} bytes")
             except Exception as e:
                 raise ValueError(f"Base64 디코딩 실패: {str(e)}")
 
-            # 이미지 열기
             try:
-                img = Image.open(BytesIO(image_data))
+                img = await get_executor().run_io(decode_image, image_data)
                 print(f"[DEBUG] Image opened: {img.format} {img.size} {img.mode}")
                 return img
             except Exception as e:
@@ -286,12 +307,13 @@ class ArchitectAgent:
         elif image_url:
             # URL에서 다운로드
             print(f"[DEBUG] Downloading image from URL: {image_url[:100]}...")
+            httpx = await import_module_async("httpx")
             async with httpx.AsyncClient() as client:
                 response = await client.get(image_url)
                 response.raise_for_status()
-                return Image.open(BytesIO(response.content))
+                return await get_executor().run_io(decode_image, response.content)
         else:
-            raise ValueError("image_url 또는 image_base64 중 하나를 제공해야 합니다.")
+            raise ValueError("image_url, image_base64 또는 업로드 파일 중 하나를 제공해야 합니다.")
 
     async def analyze_dwg_json(
         self,
@@ -310,9 +332,9 @@ class ArchitectAgent:
         """
         await self.initialize()
 
-        # 프롬프트 구성
+        # 프롬프트 구성 (들여쓰기 없는 JSON → 입력 토큰 절감)
         prompt = DWG_JSON_ANALYSIS_PROMPT.format(
-            dwg_json=json.dumps(dwg_json, ensure_ascii=False, indent=2)
+            dwg_json=json.dumps(dwg_json, ensure_ascii=False, separators=(",", ":"))
         )
 
         # Gemini API 호출
@@ -362,7 +384,8 @@ class ArchitectAgent:
             warnings.extend(infer_warnings)
             print(f"[Architect] 외벽 {len(inferred_walls)}개 자동 추론 추가됨")
 
-        return FloorPlanAnalysis(
+        # 서버에 보관 → 후속 요청은 analysis_id만 전달
+        return await get_analysis_store().put_async(FloorPlanAnalysis(
             floor_plan_id=floor_plan_id,
             image_dimensions={"width": 1000, "height": 800},  # DWG 기본 크기
             estimated_area=result.get("estimated_area"),
@@ -371,7 +394,7 @@ class ArchitectAgent:
             elements=elements,
             analysis_summary=result.get("analysis_summary", ""),
             warnings=warnings,
-        )
+        ))
 
     def _find_max_y(self, dwg_json: dict) -> float:
         """DWG JSON에서 최대 Y좌표 찾기 (좌표 반전용)"""
@@ -488,6 +511,7 @@ class ArchitectAgent:
         image_url: Optional[str] = None,
         image_base64: Optional[str] = None,
         property_type: Optional[str] = None,
+        image_file: Optional[BinaryIO] = None,
     ) -> FloorPlanAnalysis:
         """
         도면 이미지 분석
@@ -497,6 +521,7 @@ class ArchitectAgent:
             image_url: 도면 이미지 URL
             image_base64: 도면 이미지 Base64
             property_type: 건물 유형
+            image_file: 업로드된 도면 이미지 파일 객체 (multipart/raw body)
 
         Returns:
             FloorPlanAnalysis: 도면 분석 결과
@@ -504,7 +529,7 @@ class ArchitectAgent:
         await self.initialize()
 
         # 이미지 로드
-        image = await self._load_image(image_url, image_base64)
+        image = await self._load_image(image_url, image_base64, image_file)
 
         # 프롬프트 구성
         prompt = FLOOR_PLAN_ANALYSIS_PROMPT
@@ -535,7 +560,8 @@ class ArchitectAgent:
                 confidence=elem.get("confidence", 0.5),
             ))
 
-        return FloorPlanAnalysis(
+        # 서버에 보관 → 후속 요청은 analysis_id만 전달
+        return await get_analysis_store().put_async(FloorPlanAnalysis(
             floor_plan_id=floor_plan_id,
             image_dimensions={"width": image.width, "height": image.height},
             estimated_area=result.get("estimated_area"),
@@ -544,7 +570,7 @@ class ArchitectAgent:
             elements=elements,
             analysis_summary=result.get("analysis_summary", ""),
             warnings=result.get("warnings", []),
-        )
+        ))
 
     async def validate_demolition_plan(
         self,
@@ -563,9 +589,9 @@ class ArchitectAgent:
         """
         await self.initialize()
 
-        # 프롬프트 구성
+        # 프롬프트 구성 (들여쓰기 없는 JSON → 입력 토큰 절감)
         prompt = DEMOLITION_VALIDATION_PROMPT.format(
-            floor_plan_analysis=floor_plan_analysis.model_dump_json(indent=2),
+            floor_plan_analysis=floor_plan_analysis.model_dump_json(exclude={"analysis_id"}),
             selected_elements=json.dumps(selected_element_labels, ensure_ascii=False),
         )
 
@@ -615,6 +641,7 @@ class ArchitectAgent:
         design_image_url: Optional[str] = None,
         design_image_base64: Optional[str] = None,
         design_description: Optional[str] = None,
+        design_image_file: Optional[BinaryIO] = None,
     ) -> DesignFeasibility:
         """
         디자인 시공 가능성 검증
@@ -625,22 +652,23 @@ class ArchitectAgent:
             design_image_url: 디자인 이미지 URL
             design_image_base64: 디자인 이미지 Base64
             design_description: 디자인 설명
+            design_image_file: 업로드된 디자인 이미지 파일 객체
 
         Returns:
             DesignFeasibility: 시공 가능성 검증 결과
         """
         await self.initialize()
 
-        # 프롬프트 구성
+        # 프롬프트 구성 (들여쓰기 없는 JSON → 입력 토큰 절감)
         prompt = DESIGN_FEASIBILITY_PROMPT.format(
-            floor_plan_analysis=floor_plan_analysis.model_dump_json(indent=2),
-            demolition_plan=demolition_plan.model_dump_json(indent=2),
+            floor_plan_analysis=floor_plan_analysis.model_dump_json(exclude={"analysis_id"}),
+            demolition_plan=demolition_plan.model_dump_json(),
             design_description=design_description or "N/A",
         )
 
         # 이미지가 있으면 Vision API 사용
-        if design_image_url or design_image_base64:
-            image = await self._load_image(design_image_url, design_image_base64)
+        if design_image_url or design_image_base64 or design_image_file is not None:
+            image = await self._load_image(design_image_url, design_image_base64, design_image_file)
             response = await self._model.generate_content_async([prompt, image])
         else:
             response = await self._model.generate_content_async(prompt)
@@ -2,22 +2,36 @@
 Designer Agent - AI 인테리어 디자이너
 사용자의 스타일 요구와 도면을 결합하여 인테리어 디자인 이미지를 생성하는 AI 에이전트
 Stable Diffusion + ControlNet 기반 이미지 생성
+
+google.generativeai / httpx는 첫 사용 시 로드 (서버 콜드 스타트 단축)
 """
 import asyncio
 import json
 import base64
-import httpx
 import math
-from io import BytesIO
-from typing import Optional, List, Dict, Any, Tuple
+import os
+import re
+import unicodedata
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Set, Tuple
 from enum import Enum
 
-import google.generativeai as genai
-from PIL import Image, ImageDraw, ImageFilter
-
 from app.config import settings
+from app.core import ResultCache, PerceptualHashCache, stable_hash, stable_seed
+from app.core.control_images import render_dwg_lineart, render_perspective_depth_map
+from app.core.executor import get_executor
+from app.core.image_utils import IMAGE_VARIANTS, encode_webp_variants, make_thumbnail, perceptual_hash
+from app.core.lazy import import_module, import_module_async
+from app.core.object_store import get_object_store
+from app.core.remote_fetch import fetch_image_bytes
+from app.core.state import get_state_backend
+from app.services.palette_analyzer import analyze_palette
+from app.services.style_catalog import STYLE_DATA, STYLE_PROMPTS, ROOM_PROMPTS
 from app.models.schemas import FloorPlanAnalysis
 
+if TYPE_CHECKING:
+    import httpx
+    from PIL import Image
+
 
 class InteriorStyle(str, Enum):
     """인테리어 스타일 종류"""
@@ -31,119 +45,6 @@ class InteriorStyle(str, Enum):
     KOREAN_MODERN = "korean_modern"
 
 
-# 스타일별 상세 데이터 (프롬프트 + 자재 정보 for 견적 연동)
-STYLE_DATA: Dict[str, Dict[str, Any]] = {
-    "modern": {
-        "prompt": "modern interior design, clean lines, neutral colors, contemporary furniture, minimalist decor, high-end finishes, white walls, sleek surfaces",
-        "materials": {
-            "flooring": {"type": "강화마루", "unit": "sqm", "price_range": (80000, 150000)},
-            "wall": {"type": "친환경 페인트", "unit": "sqm", "price_range": (15000, 30000)},
-            "ceiling": {"type": "평천장 도장", "unit": "sqm", "price_range": (20000, 40000)},
-            "furniture_style": "contemporary",
-            "lighting": {"type": "LED 매입등 + 레일조명", "unit": "set", "price_range": (500000, 1500000)},
-        },
-        "cost_multiplier": 1.0,  # 기준 가격
-    },
-    "minimalist": {
-        "prompt": "minimalist interior, ultra clean, white space, simple furniture, no clutter, zen atmosphere, natural light, monochromatic palette",
-        "materials": {
-            "flooring": {"type": "폴리싱 콘크리트 or 마이크로 시멘트", "unit": "sqm", "price_range": (100000, 200000)},
-            "wall": {"type": "백색 무광 페인트", "unit": "sqm", "price_range": (15000, 25000)},
-            "ceiling": {"type": "평천장 무광 도장", "unit": "sqm", "price_range": (20000, 35000)},
-            "furniture_style": "minimal",
-            "lighting": {"type": "간접조명 + 다운라이트", "unit": "set", "price_range": (600000, 1200000)},
-        },
-        "cost_multiplier": 1.1,
-    },
-    "scandinavian": {
-        "prompt": "scandinavian interior, light wood floors, white walls, cozy textiles, hygge atmosphere, functional furniture, natural materials, soft lighting",
-        "materials": {
-            "flooring": {"type": "화이트오크 원목마루", "unit": "sqm", "price_range": (150000, 300000)},
-            "wall": {"type": "화이트/라이트그레이 페인트", "unit": "sqm", "price_range": (15000, 28000)},
-            "ceiling": {"type": "화이트 도장", "unit": "sqm", "price_range": (18000, 32000)},
-            "furniture_style": "scandinavian_wood",
-            "lighting": {"type": "펜던트 조명 + 테이블 램프", "unit": "set", "price_range": (400000, 1000000)},
-            "textiles": {"type": "린넨/울 텍스타일", "unit": "set", "price_range": (300000, 800000)},
-        },
-        "cost_multiplier": 1.2,
-    },
-    "industrial": {
-        "prompt": "industrial interior design, exposed brick, metal accents, concrete floors, vintage furniture, Edison bulbs, loft style, raw materials",
-        "materials": {
-            "flooring": {"type": "에폭시 코팅 콘크리트", "unit": "sqm", "price_range": (80000, 150000)},
-            "wall": {"type": "노출콘크리트 or 브릭타일", "unit": "sqm", "price_range": (50000, 120000)},
-            "ceiling": {"type": "노출천장 (덕트 노출)", "unit": "sqm", "price_range": (30000, 60000)},
-            "furniture_style": "industrial_vintage",
-            "lighting": {"type": "에디슨벌브 + 파이프조명", "unit": "set", "price_range": (300000, 800000)},
-            "metal_fixtures": {"type": "철재 인테리어 요소", "unit": "set", "price_range": (200000, 600000)},
-        },
-        "cost_multiplier": 0.95,
-    },
-    "natural": {
-        "prompt": "natural interior design, warm wood tones, plants, earthy colors, organic materials, rattan furniture, botanical elements, biophilic design",
-        "materials": {
-            "flooring": {"type": "월넛/티크 원목마루", "unit": "sqm", "price_range": (180000, 350000)},
-            "wall": {"type": "자연 톤 페인트 or 목재 패널", "unit": "sqm", "price_range": (25000, 80000)},
-            "ceiling": {"type": "목재 빔 노출 or 우드 패널", "unit": "sqm", "price_range": (50000, 120000)},
-            "furniture_style": "natural_organic",
-            "lighting": {"type": "라탄/우드 펜던트", "unit": "set", "price_range": (400000, 900000)},
-            "plants": {"type": "플랜테리어 (대형 화분 포함)", "unit": "set", "price_range": (500000, 1500000)},
-        },
-        "cost_multiplier": 1.3,
-    },
-    "classic": {
-        "prompt": "classic elegant interior, crown molding, traditional furniture, rich fabrics, chandelier, symmetrical layout, timeless design, warm lighting",
-        "materials": {
-            "flooring": {"type": "헤링본 원목마루 or 대리석", "unit": "sqm", "price_range": (200000, 500000)},
-            "wall": {"type": "몰딩 + 고급 벽지 or 페인트", "unit": "sqm", "price_range": (40000, 100000)},
-            "ceiling": {"type": "크라운 몰딩 + 우물천장", "unit": "sqm", "price_range": (80000, 180000)},
-            "furniture_style": "traditional_elegant",
-            "lighting": {"type": "샹들리에 + 브라켓 조명", "unit": "set", "price_range": (800000, 3000000)},
-            "molding": {"type": "석고 몰딩", "unit": "m", "price_range": (15000, 40000)},
-        },
-        "cost_multiplier": 1.5,
-    },
-    "luxurious": {
-        "prompt": "luxury interior design, marble floors, gold accents, designer furniture, crystal chandelier, premium materials, sophisticated palette, high ceiling",
-        "materials": {
-            "flooring": {"type": "이탈리아 대리석 or 포세린 타일", "unit": "sqm", "price_range": (300000, 800000)},
-            "wall": {"type": "베네치안 플라스터 or 고급 벽지", "unit": "sqm", "price_range": (80000, 200000)},
-            "ceiling": {"type": "우물천장 + 간접조명", "unit": "sqm", "price_range": (120000, 250000)},
-            "furniture_style": "designer_luxury",
-            "lighting": {"type": "크리스탈 샹들리에 + 디자이너 조명", "unit": "set", "price_range": (2000000, 10000000)},
-            "gold_accents": {"type": "골드 하드웨어/악센트", "unit": "set", "price_range": (500000, 2000000)},
-        },
-        "cost_multiplier": 2.0,
-    },
-    "korean_modern": {
-        "prompt": "modern Korean interior, ondol floor, minimalist hanok elements, natural wood, paper screen inspired, warm neutral tones, clean aesthetic",
-        "materials": {
-            "flooring": {"type": "온돌 원목마루 (오크/물푸레)", "unit": "sqm", "price_range": (150000, 280000)},
-            "wall": {"type": "한지벽지 or 황토 도장", "unit": "sqm", "price_range": (30000, 70000)},
-            "ceiling": {"type": "한지 천장 or 평천장", "unit": "sqm", "price_range": (40000, 90000)},
-            "furniture_style": "korean_contemporary",
-            "lighting": {"type": "한지 조명 + 간접조명", "unit": "set", "price_range": (400000, 1000000)},
-            "traditional_elements": {"type": "한옥 요소 (창호, 문살)", "unit": "set", "price_range": (300000, 1200000)},
-        },
-        "cost_multiplier": 1.25,
-    },
-}
-
-# 기존 호환성을 위한 STYLE_PROMPTS 매핑
-STYLE_PROMPTS: Dict[str, str] = {
-    style_id: data["prompt"] for style_id, data in STYLE_DATA.items()
-}
-
-# 공간별 추가 프롬프트
-ROOM_PROMPTS: Dict[str, str] = {
-    "living_room": "spacious living room, comfortable sofa, coffee table, entertainment center, area rug, accent lighting",
-    "bedroom": "cozy bedroom, comfortable bed, nightstands, soft bedding, ambient lighting, wardrobe",
-    "kitchen": "modern kitchen, kitchen island, built-in appliances, pendant lights, countertop, cabinets",
-    "bathroom": "modern bathroom, vanity, mirror, tiles, shower, clean lines",
-    "office": "home office, desk, ergonomic chair, bookshelf, task lighting, organized workspace",
-}
-
-
 PROMPT_ENHANCEMENT_TEMPLATE = """You are an expert interior design AI assistant.
 Your task is to transform a user's simple style request into a detailed, high-quality prompt for AI image generation.
 
@@ -163,6 +64,47 @@ The prompt should be optimized for Stable Diffusion image generation.
 Keep it under 200 words.
 """
 
+# 프롬프트 강화 결과에 붙이는 품질 태그
+QUALITY_TAGS = "interior photography, professional lighting, 8k uhd, high detail, architectural visualization"
+
+# 캐시 키 정규화 시 제거할 끝맺음 표현
+_REQUEST_SUFFIXES = ("해주세요", "해 주세요", "부탁드려요", "부탁해요", "해줘", "해 줘")
+
+
+def normalize_prompt_input(user_input: str) -> str:
+    """
+    프롬프트 강화 캐시 키용 사용자 입력 정규화
+
+    "밝고  따뜻한 느낌!" / "밝고 따뜻한 느낌 해주세요" → "밝고 따뜻한 느낌"
+    """
+    text = unicodedata.normalize("NFC", user_input).lower()
+    text = re.sub(r"\s+", " ", text).strip()
+    text = text.rstrip(" .!?~…")
+    for suffix in _REQUEST_SUFFIXES:
+        if text.endswith(suffix):
+            text = text[: -len(suffix)].rstrip(" .!?~…")
+            break
+    return text
+
+
+def load_prompt_phrases(path: str) -> List[str]:
+    """
+    웜업용 상위 요청 문구 파일 로드 (한 줄에 하나, # 주석 허용)
+
+    Args:
+        path: 문구 파일 경로
+
+    Returns:
+        List[str]: 문구 목록 (파일이 없으면 빈 목록)
+    """
+    if not path or not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [
+            line.strip() for line in f
+            if line.strip() and not line.strip().startswith("#")
+        ]
+
 
 class DesignerAgent:
     """
@@ -175,11 +117,48 @@ class DesignerAgent:
         self.replicate_api_key = replicate_api_key or settings.replicate_api_key
         self._initialized = False
         self._model = None
+        # 생성 결과 캐시: 같은 (모델, 프롬프트, 네거티브, 컨트롤 이미지, seed, steps) → 같은 이미지
+        self._result_cache = ResultCache(
+            name="generated_images",
+            max_entries=settings.image_cache_max_entries,
+            ttl_seconds=settings.image_cache_ttl_seconds,
+            backend=get_state_backend(),
+        )
+        # 레퍼런스 이미지 스타일 설명 캐시 (지각 해시 기반 → 재압축된 같은 이미지도 히트)
+        self._reference_cache = PerceptualHashCache(
+            name="reference_styles",
+            max_distance=settings.reference_phash_max_distance,
+            max_entries=settings.reference_cache_max_entries,
+            backend=get_state_backend(),
+        )
+        self._pending_descriptions: Dict[int, asyncio.Future] = {}
+        # 프롬프트 강화 캐시: 정규화된 (user_input, style, room_type) → 강화 프롬프트
+        self._prompt_cache = ResultCache(
+            name="prompt_enhancements",
+            max_entries=settings.prompt_cache_max_entries,
+            backend=get_state_backend(),
+        )
+        # 재호스팅 캐시: 원본 URL → 오브젝트 스토어 변형 URL (같은 목업/출력 재다운로드 방지)
+        self._rehost_cache = ResultCache(
+            name="rehosted_images",
+            max_entries=settings.image_cache_max_entries,
+            ttl_seconds=settings.rehosted_image_cache_ttl_seconds,
+            backend=get_state_backend(),
+        )
+        # 컨트롤 이미지 캐시: 같은 DWG 요소/시점 → 같은 lineart/depth map PNG (렌더링 생략)
+        self._control_cache = ResultCache(
+            name="control_images",
+            max_entries=settings.control_image_cache_max_entries,
+            backend=get_state_backend(),
+        )
+        self._http_client: Optional["httpx.AsyncClient"] = None
+        self._background_tasks: Set[asyncio.Task] = set()
         print(f"[Designer] Initialized with Replicate API: {'Yes' if self.replicate_api_key else 'No (Mockup mode)'}")
 
     async def initialize(self):
         """Gemini 클라이언트 초기화 (프롬프트 강화용)"""
         if not self._initialized:
+            genai = await import_module_async("google.generativeai")
             genai.configure(api_key=self.gemini_api_key)
             self._model = genai.GenerativeModel(
                 model_name="gemini-2.0-flash",
@@ -190,6 +169,59 @@ class DesignerAgent:
             )
             self._initialized = True
 
+    def _get_http_client(self) -> "httpx.AsyncClient":
+        """이미지 다운로드/Replicate 호출용 커넥션 풀 클라이언트 (요청마다 TLS 핸드셰이크 반복 방지)"""
+        if self._http_client is None or self._http_client.is_closed:
+            httpx = import_module("httpx")
+            self._http_client = httpx.AsyncClient(
+                timeout=20.0,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return self._http_client
+
+    async def close(self):
+        """리소스 정리 (진행 중인 예측 취소 요청은 전송 완료까지 대기)"""
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def warm_connections(self) -> None:
+        """
+        커넥션 웜업: 첫 요청 전에 TLS 핸드셰이크를 끝내 두기
+
+        - Gemini: count_tokens (생성 비용 없음)
+        - Replicate: 풀 클라이언트로 계정 조회 → 이후 예측 생성/폴링이 같은 연결 재사용
+        """
+        tasks = []
+        if self.gemini_api_key:
+            await self.initialize()
+            tasks.append(self._model.count_tokens_async("ping"))
+        if self.replicate_api_key:
+            await import_module_async("httpx")
+            tasks.append(self._get_http_client().get(
+                "https://api.replicate.com/v1/account",
+                headers={"Authorization": f"Token {self.replicate_api_key}"},
+            ))
+        await asyncio.gather(*tasks)
+
+    async def warm_caches(self) -> Dict[str, int]:
+        """
+        디자이너 캐시를 공유 상태 백엔드에서 메모리로 적재 (디스크 I/O는 스레드 풀)
+
+        Returns:
+            dict: 캐시 이름 → 적재된 항목 수
+        """
+        loaded = {}
+        for cache in (self._result_cache, self._rehost_cache, self._control_cache, self._reference_cache):
+            loaded[cache.name] = await cache.load_shared_async()
+        print(f"[Designer] Cache warm-up: {loaded}")
+        prompt = await self.warm_prompt_cache()
+        loaded[self._prompt_cache.name] = prompt["loaded"]
+        return loaded
+
     async def enhance_prompt(
         self,
         user_input: str,
@@ -199,6 +231,9 @@ class DesignerAgent:
         """
         사용자의 간단한 요청을 고품질 이미지 생성용 프롬프트로 변환
 
+        정규화된 (user_input, style, room_type) 기준으로 캐시
+        → "밝고 따뜻한 느낌" 같은 흔한 요청은 Gemini 호출 없이 즉시 반환
+
         Args:
             user_input: 사용자의 스타일 요청 (예: "밝고 따뜻한 느낌으로")
             style: 기본 스타일 (modern, minimalist, etc.)
@@ -207,6 +242,23 @@ class DesignerAgent:
         Returns:
             str: 강화된 프롬프트
         """
+        cache_key = self._prompt_cache_key(user_input, style, room_type)
+        cached = await self._prompt_cache.get_async(cache_key)
+        if cached:
+            return cached
+
+        enhanced = await self._enhance_with_llm(user_input, style, room_type)
+        if enhanced:
+            await self._prompt_cache.set_async(cache_key, enhanced)
+            return enhanced
+
+        # 폴백: 기본 스타일 프롬프트 사용 (캐시하지 않음 - 다음 요청에서 재시도)
+        base_style = STYLE_PROMPTS.get(style, STYLE_PROMPTS["modern"])
+        room_prompt = ROOM_PROMPTS.get(room_type, "")
+        return f"{base_style}, {room_prompt}, interior photography, professional lighting, high quality"
+
+    async def _enhance_with_llm(self, user_input: str, style: str, room_type: str) -> Optional[str]:
+        """Gemini로 프롬프트 강화 (실패 시 None)"""
         await self.initialize()
 
         base_style = STYLE_PROMPTS.get(style, STYLE_PROMPTS["modern"])
@@ -220,15 +272,107 @@ class DesignerAgent:
         try:
             response = await self._model.generate_content_async(prompt)
             enhanced = response.text.strip()
+            if not enhanced:
+                return None
 
             # 기본 품질 향상 태그 추가
-            quality_tags = "interior photography, professional lighting, 8k uhd, high detail, architectural visualization"
-            return f"{enhanced}, {quality_tags}"
+            return f"{enhanced}, {QUALITY_TAGS}"
         except Exception as e:
             print(f"[Designer] Prompt enhancement failed: {e}")
-            # 폴백: 기본 스타일 프롬프트 사용
-            room_prompt = ROOM_PROMPTS.get(room_type, "")
-            return f"{base_style}, {room_prompt}, interior photography, professional lighting, high quality"
+            return None
+
+    def _prompt_cache_key(self, user_input: str, style: str, room_type: str) -> str:
+        """프롬프트 강화 캐시 키 (템플릿이 바뀌면 자동으로 무효화)"""
+        style = style if style in STYLE_PROMPTS else "modern"
+        return stable_hash(
+            PROMPT_ENHANCEMENT_TEMPLATE,
+            normalize_prompt_input(user_input),
+            style,
+            room_type.strip().lower(),
+        )
+
+    async def refresh_prompt_cache(
+        self,
+        phrases: List[str],
+        styles: Optional[List[str]] = None,
+        room_types: Optional[List[str]] = None,
+        force: bool = False,
+        concurrency: int = 4,
+    ) -> Dict[str, int]:
+        """
+        자주 쓰이는 문구 x 스타일 x 공간 조합의 프롬프트 강화 결과를 일괄 생성
+
+        Args:
+            phrases: 사용자 요청 문구 목록
+            styles: 스타일 목록 (기본: STYLE_DATA 전체)
+            room_types: 공간 목록 (기본: ROOM_PROMPTS 전체)
+            force: 이미 캐시된 항목도 다시 생성
+            concurrency: 동시 Gemini 호출 수
+
+        Returns:
+            dict: {"total", "cached", "generated", "failed"}
+        """
+        styles = styles or list(STYLE_DATA.keys())
+        room_types = room_types or list(ROOM_PROMPTS.keys())
+        semaphore = asyncio.Semaphore(concurrency)
+        counts = {"total": 0, "cached": 0, "generated": 0, "failed": 0}
+
+        async def refresh_one(phrase: str, style: str, room_type: str):
+            cache_key = self._prompt_cache_key(phrase, style, room_type)
+            if not force and await self._prompt_cache.get_async(cache_key):
+                counts["cached"] += 1
+                return
+            async with semaphore:
+                enhanced = await self._enhance_with_llm(phrase, style, room_type)
+            if enhanced:
+                await self._prompt_cache.set_async(cache_key, enhanced)
+                counts["generated"] += 1
+            else:
+                counts["failed"] += 1
+
+        combos = [(p, s, r) for p in phrases for s in styles for r in room_types]
+        counts["total"] = len(combos)
+        await asyncio.gather(*(refresh_one(*combo) for combo in combos))
+        return counts
+
+    def cache_stats(self) -> List[dict]:
+        """디자이너 캐시별 통계"""
+        return [
+            self._result_cache.stats(),
+            self._prompt_cache.stats(),
+            self._rehost_cache.stats(),
+            self._control_cache.stats(),
+            self._reference_cache.stats(),
+        ]
+
+    async def warm_prompt_cache(self, generate: Optional[bool] = None) -> Dict[str, int]:
+        """
+        서버 시작 시 프롬프트 강화 캐시 웜업
+
+        1. 공유 상태 백엔드에 저장된 강화 결과를 메모리로 적재
+        2. generate가 켜져 있으면 설정된 상위 문구 중 누락된 조합을 생성
+
+        Args:
+            generate: 누락 조합 생성 여부 (기본: settings.prompt_cache_warmup_generate)
+
+        Returns:
+            dict: {"loaded", ...refresh 통계}
+        """
+        loaded = await self._prompt_cache.load_shared_async()
+        result = {"loaded": loaded}
+        print(f"[Designer] Prompt cache warm-up: {loaded} entries loaded from shared store")
+
+        if generate is None:
+            generate = settings.prompt_cache_warmup_generate
+        if generate:
+            phrases = load_prompt_phrases(settings.prompt_cache_phrases_file)
+            if phrases:
+                counts = await self.refresh_prompt_cache(
+                    phrases, concurrency=settings.prompt_cache_warmup_concurrency
+                )
+                result.update(counts)
+                print(f"[Designer] Prompt cache warm-up generated {counts['generated']} entries")
+        return result
 
     async def generate_interior_image(
         self,
@@ -242,6 +386,9 @@ class DesignerAgent:
         floor_plan_analysis: Optional[FloorPlanAnalysis] = None,
         viewpoint_request: Optional[str] = None,
         dwg_elements: Optional[dict] = None,  # DWG 원본 요소 데이터 (lineart 생성용)
+        deep_style_analysis: bool = False,
+        base_image_bytes: Optional[bytes] = None,
+        base_image_mime_type: str = "image/png",
     ) -> Dict[str, Any]:
         """
         인테리어 디자인 이미지 생성
@@ -256,6 +403,10 @@ class DesignerAgent:
             reference_image_urls: 레퍼런스 이미지 URL 목록
             floor_plan_analysis: 건축사 에이전트의 도면 분석 결과
             viewpoint_request: 시점 요청 (예: "view from kitchen looking towards living room")
+            deep_style_analysis: 레퍼런스 이미지를 Gemini로 심층 스타일 분석할지 여부
+                (False면 로컬 팔레트/자재 톤 분석만 사용)
+            base_image_bytes: 업로드된 베이스 이미지 원본 바이트 (base64 대신)
+            base_image_mime_type: base_image_bytes의 MIME 타입
 
         Returns:
             dict: 생성된 이미지 정보
@@ -266,7 +417,7 @@ class DesignerAgent:
         lineart_base64 = None
         if dwg_elements:
             try:
-                lineart_base64 = self._generate_lineart_from_dwg(dwg_elements)
+                lineart_base64 = await self._generate_lineart_from_dwg(dwg_elements)
                 if lineart_base64:
                     print(f"[Designer] Generated lineart from DWG elements for ControlNet")
             except Exception as e:
@@ -278,41 +429,56 @@ class DesignerAgent:
             room_prompt = ROOM_PROMPTS.get(room_type, "")
             style_prompt = f"{style_prompt}, {room_prompt}"
 
-        # 1. 건축사 분석 결과가 있으면 이를 기반으로 공간 설명 생성 (우선)
-        layout_description = ""
-        if floor_plan_analysis:
-            # 시점 정보가 있으면 공간 관계를 반영한 프롬프트 생성
-            if viewpoint_request:
-                layout_description = self._generate_spatial_prompt(floor_plan_analysis, viewpoint_request)
-                print(f"[Designer] Using spatial-aware prompt: {layout_description[:150]}...")
-            else:
-                layout_description = self._convert_floor_plan_to_prompt(floor_plan_analysis)
-                print(f"[Designer] Using architect's analysis: {layout_description[:150]}...")
-        # 1-1. 건축사 분석이 없고 도면 이미지가 있으면 Gemini로 분석 (폴백)
-        elif base_image_url or base_image_base64:
-            try:
-                layout_description = await self._analyze_floor_plan_layout(
-                    image_url=base_image_url,
-                    image_base64=base_image_base64,
-                )
-                if layout_description:
-                    print(f"[Designer] Gemini floor plan analysis: {layout_description[:100]}...")
-            except Exception as e:
-                print(f"[Designer] Floor plan analysis failed: {e}")
+        # 레퍼런스 이미지 분석은 도면 분석과 독립적이므로 먼저 시작해 동시에 진행
+        reference_task = None
+        if reference_image_urls:
+            reference_task = asyncio.create_task(
+                self._analyze_reference_images(reference_image_urls, deep_analysis=deep_style_analysis)
+            )
 
-        # 레이아웃 설명을 프롬프트에 추가
-        if layout_description:
-            style_prompt = f"Interior design of {layout_description}. Style: {style_prompt}"
+        try:
+            # 1. 건축사 분석 결과가 있으면 이를 기반으로 공간 설명 생성 (우선)
+            layout_description = ""
+            if floor_plan_analysis:
+                # 시점 정보가 있으면 공간 관계를 반영한 프롬프트 생성
+                if viewpoint_request:
+                    layout_description = self._generate_spatial_prompt(floor_plan_analysis, viewpoint_request)
+                    print(f"[Designer] Using spatial-aware prompt: {layout_description[:150]}...")
+                else:
+                    layout_description = self._convert_floor_plan_to_prompt(floor_plan_analysis)
+                    print(f"[Designer] Using architect's analysis: {layout_description[:150]}...")
+            # 1-1. 건축사 분석이 없고 도면 이미지가 있으면 Gemini로 분석 (폴백)
+            elif base_image_url or base_image_base64 or base_image_bytes:
+                try:
+                    layout_description = await self._analyze_floor_plan_layout(
+                        image_url=base_image_url,
+                        image_base64=base_image_base64,
+                        image_bytes=base_image_bytes,
+                        mime_type=base_image_mime_type,
+                    )
+                    if layout_description:
+                        print(f"[Designer] Gemini floor plan analysis: {layout_description[:100]}...")
+                except Exception as e:
+                    print(f"[Designer] Floor plan analysis failed: {e}")
 
-        # 2. 레퍼런스 이미지가 있으면 Gemini로 스타일 분석 후 프롬프트 보강
-        if reference_image_urls and len(reference_image_urls) > 0:
-            try:
-                reference_style = await self._analyze_reference_images(reference_image_urls)
-                if reference_style:
-                    style_prompt = f"{style_prompt}, inspired by: {reference_style}"
-                    print(f"[Designer] Enhanced with reference analysis: {reference_style[:100]}...")
-            except Exception as e:
-                print(f"[Designer] Reference analysis failed: {e}")
+            # 레이아웃 설명을 프롬프트에 추가
+            if layout_description:
+                style_prompt = f"Interior design of {layout_description}. Style: {style_prompt}"
+
+            # 2. 레퍼런스 이미지가 있으면 Gemini로 스타일 분석 후 프롬프트 보강
+            if reference_task:
+                try:
+                    reference_style = await reference_task
+                    if reference_style:
+                        style_prompt = f"{style_prompt}, inspired by: {reference_style}"
+                        print(f"[Designer] Enhanced with reference analysis: {reference_style[:100]}...")
+                except Exception as e:
+                    print(f"[Designer] Reference analysis failed: {e}")
+        except asyncio.CancelledError:
+            # 요청이 취소되면(클라이언트 연결 종료) 동시에 시작한 레퍼런스 분석도 중단
+            if reference_task:
+                reference_task.cancel()
+            raise
 
         # 기본 네거티브 프롬프트 (강화된 창문 관련 항목 포함)
         if not negative_prompt:
@@ -345,7 +511,7 @@ class DesignerAgent:
             # 시점 정보가 있으면 depth map 생성
             if viewpoint_request:
                 try:
-                    depth_map_base64 = self._generate_perspective_depth_map(
+                    depth_map_base64 = await self._generate_perspective_depth_map(
                         analysis=floor_plan_analysis,
                         viewpoint=viewpoint_request,
                         width=1024,
@@ -382,21 +548,21 @@ class DesignerAgent:
             )
         else:
             # MVP: 목업 응답 반환
-            return await self._generate_mockup_response(
+            mockup = await self._generate_mockup_response(
                 style=style,
                 room_type=room_type,
                 prompt=style_prompt,
             )
+            return await self._rehost_output(mockup)
 
-    def _generate_lineart_from_dwg(
+    async def _generate_lineart_from_dwg(
         self,
         dwg_elements: dict,
         width: int = 1024,
         height: int = 768,
     ) -> str:
         """
-        DWG 요소 데이터로부터 ControlNet Lineart 이미지 생성
-        원본 DWG의 선(Line) 정보를 최대한 보존하여 구조 일관성 확보
+        DWG 요소 데이터로부터 ControlNet Lineart 이미지 생성 (프로세스 풀에서 렌더링)
 
         Args:
             dwg_elements: DWG 파싱된 요소 데이터 (walls, doors, windows 등)
@@ -404,105 +570,17 @@ class DesignerAgent:
             height: 출력 이미지 높이
 
         Returns:
-            str: base64 인코딩된 lineart 이미지
+            str: base64 인코딩된 lineart 이미지 (좌표가 없으면 빈 문자열)
         """
-        # 흰 배경에 검은 선
-        img = Image.new('RGB', (width, height), color=(255, 255, 255))
-        draw = ImageDraw.Draw(img)
-
-        # DWG 좌표 범위 계산 (정규화용)
-        all_coords = []
-        for key in ["walls", "doors", "windows", "elements"]:
-            items = dwg_elements.get(key, [])
-            if isinstance(items, list):
-                for item in items:
-                    coords = item.get("coordinates", {})
-                    if coords:
-                        all_coords.append((
-                            coords.get("x", 0),
-                            coords.get("y", 0),
-                            coords.get("x", 0) + coords.get("width", 0),
-                            coords.get("y", 0) + coords.get("height", 0)
-                        ))
-
-        if not all_coords:
-            return ""
-
-        # 경계 계산
-        min_x = min(c[0] for c in all_coords)
-        min_y = min(c[1] for c in all_coords)
-        max_x = max(c[2] for c in all_coords)
-        max_y = max(c[3] for c in all_coords)
-
-        dwg_width = max_x - min_x
-        dwg_height = max_y - min_y
-
-        if dwg_width == 0 or dwg_height == 0:
-            return ""
-
-        # 마진 추가
-        margin = 50
-        scale_x = (width - 2 * margin) / dwg_width
-        scale_y = (height - 2 * margin) / dwg_height
-        scale = min(scale_x, scale_y)
-
-        def transform_coord(x, y):
-            """DWG 좌표를 이미지 좌표로 변환 (Y축 반전 포함)"""
-            new_x = margin + (x - min_x) * scale
-            new_y = margin + (max_y - y) * scale  # Y축 반전
-            return (new_x, new_y)
-
-        # 벽 그리기 (두꺼운 선)
-        walls = dwg_elements.get("walls", [])
-        for wall in walls:
-            coords = wall.get("coordinates", {})
-            if not coords:
-                continue
-
-            x1, y1 = transform_coord(coords.get("x", 0), coords.get("y", 0))
-            x2 = x1 + coords.get("width", 0) * scale
-            y2 = y1 - coords.get("height", 0) * scale  # Y반전된 좌표계
-
-            # 레이어에 따라 선 두께 조정
-            layer = wall.get("layer", "").upper()
-            line_width = 4 if "LOAD" in layer else 2
-
-            draw.rectangle([x1, y2, x2, y1], outline=(0, 0, 0), width=line_width)
-
-        # 문 그리기 (얇은 선 + 호)
-        doors = dwg_elements.get("doors", [])
-        for door in doors:
-            coords = door.get("coordinates", {})
-            if not coords:
-                continue
-
-            x1, y1 = transform_coord(coords.get("x", 0), coords.get("y", 0))
-            w = coords.get("width", 0) * scale
-            h = coords.get("height", 0) * scale
-
-            # 문 프레임
-            draw.rectangle([x1, y1 - h, x1 + w, y1], outline=(100, 100, 100), width=1)
-
-        # 창문 그리기
-        windows = dwg_elements.get("windows", [])
-        for window in windows:
-            coords = window.get("coordinates", {})
-            if not coords:
-                continue
-
-            x1, y1 = transform_coord(coords.get("x", 0), coords.get("y", 0))
-            w = coords.get("width", 0) * scale
-            h = coords.get("height", 0) * scale
-
-            # 창문 (이중선)
-            draw.rectangle([x1, y1 - h, x1 + w, y1], outline=(50, 50, 50), width=2)
-            draw.rectangle([x1 + 2, y1 - h + 2, x1 + w - 2, y1 - 2], outline=(150, 150, 150), width=1)
-
-        # base64 인코딩
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-        return base64.b64encode(buffer.getvalue()).decode('utf-8')
+        cache_key = stable_hash("lineart", dwg_elements, width, height)
+        cached = await self._control_cache.get_async(cache_key)
+        if cached is not None:
+            return cached
+
+        png = await get_executor().run_cpu(render_dwg_lineart, dwg_elements, width, height)
+        img_base64 = base64.b64encode(png).decode('utf-8') if png else ""
+        await self._control_cache.set_async(cache_key, img_base64)
+        return img_base64
 
     def _convert_floor_plan_to_prompt(self, analysis: FloorPlanAnalysis) -> str:
         """
@@ -723,6 +801,9 @@ class DesignerAgent:
     def _calculate_camera_hash(self, analysis: FloorPlanAnalysis, viewpoint: str) -> int:
         """
         도면과 시점을 기반으로 고유한 seed 값 생성 (재현성 보장)
+
+        내장 hash()는 프로세스마다 랜덤화되므로 SHA-256 기반 stable_seed 사용
+        → 워커/재시작과 무관하게 같은 도면 + 시점이면 같은 seed
         """
         # 도면의 고유 특성들을 해시
         elements_str = ""
@@ -731,7 +812,7 @@ class DesignerAgent:
             elements_str += f"{e.label}:{pos.get('x', 0)}:{pos.get('y', 0)}:"
 
         hash_input = f"{elements_str}{viewpoint}{analysis.estimated_area}"
-        return hash(hash_input) % (2**32)  # 양수 32비트 정수
+        return stable_seed(hash_input)  # 양수 32비트 정수
 
     def _generate_spatial_prompt(self, analysis: FloorPlanAnalysis, viewpoint: str) -> str:
         """
@@ -846,7 +927,7 @@ class DesignerAgent:
         print(f"[Designer] Generated spatial prompt for viewpoint '{viewpoint[:50]}': {result[:200]}...")
         return result
 
-    def _generate_perspective_depth_map(
+    async def _generate_perspective_depth_map(
         self,
         analysis: FloorPlanAnalysis,
         viewpoint: str,
@@ -855,7 +936,7 @@ class DesignerAgent:
     ) -> str:
         """
         도면 분석 결과와 시점을 기반으로 3D 관점 depth map 생성
-        실제 좌표를 사용하여 일관된 depth map 생성
+        좌표 추출은 여기서, 드로잉/블러/PNG 인코딩은 프로세스 풀에서 실행
 
         Args:
             analysis: FloorPlanAnalysis 객체
@@ -866,206 +947,101 @@ class DesignerAgent:
         Returns:
             str: base64 인코딩된 depth map 이미지
         """
-        # depth map 생성 (검정=가까움, 흰색=멀음)
-        img = Image.new('RGB', (width, height), color=(50, 50, 50))  # 중간 회색 배경
-        draw = ImageDraw.Draw(img)
-
-        viewpoint_lower = viewpoint.lower()
-
         # 도면에서 실제 좌표 추출
         room_positions = self._extract_room_positions(analysis)
         windows = room_positions["windows"]
-
-        # 카메라 위치와 방향 계산
         kitchen_center = room_positions["kitchen"]["center"]
         living_center = room_positions["living_room"]["center"]
-        entrance_center = room_positions["entrance"]["center"]
-
-        # 창문 위치 (도면 좌표 기반)
-        main_window = windows[0] if windows else {"x": 10, "y": 50, "width": 30, "is_continuous": True}
-        window_x = main_window.get("x", 10)
-        window_width = main_window.get("width", 30)
+        window_x = windows[0].get("x", 10) if windows else 10
 
         print(f"[Designer] Depth map using coordinates: kitchen={kitchen_center}, living={living_center}, window_x={window_x}")
 
-        has_open_kitchen = False
-
-        # 주방에서 거실을 바라볼 때
-        if ("kitchen" in viewpoint_lower and "living" in viewpoint_lower) or "주방에서" in viewpoint_lower:
-            # 바닥 (가까운 곳은 밝게, 먼 곳은 어둡게) - depth gradient
-            for y in range(height // 3, height):
-                depth_value = int(200 - (y - height // 3) / (height * 2 / 3) * 150)
-                draw.line([(0, y), (width, y)], fill=(depth_value, depth_value, depth_value))
-
-            # 천장 (멀리)
-            draw.rectangle([0, 0, width, height // 4], fill=(30, 30, 30))
-
-            # 왼쪽 벽 (옆면, 사다리꼴)
-            left_wall = [
-                (0, height // 4),  # 상단 왼쪽
-                (width // 6, height // 3),  # 상단 오른쪽 (원근)
-                (width // 6, height - 50),  # 하단 오른쪽
-                (0, height),  # 하단 왼쪽
-            ]
-            draw.polygon(left_wall, fill=(80, 80, 80))
-
-            # 오른쪽 벽 (옆면, 사다리꼴)
-            right_wall = [
-                (width, height // 4),  # 상단 오른쪽
-                (width - width // 6, height // 3),  # 상단 왼쪽 (원근)
-                (width - width // 6, height - 50),  # 하단 왼쪽
-                (width, height),  # 하단 오른쪽
-            ]
-            draw.polygon(right_wall, fill=(80, 80, 80))
-
-            # 정면 벽 (멀리 - 어두움)
-            far_wall = [
-                (width // 6, height // 3),
-                (width - width // 6, height // 3),
-                (width - width // 6, height - 50),
-                (width // 6, height - 50),
-            ]
-            draw.polygon(far_wall, fill=(40, 40, 40))
-
-            # 창문 (정면 벽에, 가장 밝게 - 빛이 들어옴)
-            if windows:
-                main_window = windows[0]
-                # 창문 크기 계산 (도면 좌표 기반)
-                w_width = main_window.get("width", 30)
-                is_continuous = main_window.get("is_continuous", False)
-
-                if w_width > 25 or is_continuous:
-                    # 넓은 창문 - 거의 전체 벽
-                    window_rect = [
-                        width // 5,  # left
-                        height // 3 + 20,  # top
-                        width - width // 5,  # right
-                        height - 100,  # bottom
-                    ]
-                else:
-                    # 작은 창문
-                    window_rect = [
-                        width // 3,
-                        height // 3 + 30,
-                        width - width // 3,
-                        height - 120,
-                    ]
-                draw.rectangle(window_rect, fill=(250, 250, 250))  # 매우 밝음 (빛)
-
-            # 주방 카운터 (전경, 아래쪽)
-            counter_polygon = [
-                (0, height - 150),
-                (width // 4, height - 100),
-                (width // 4, height),
-                (0, height),
-            ]
-            draw.polygon(counter_polygon, fill=(180, 180, 180))  # 가까움 = 밝음
-
-        # 거실에서 주방을 바라볼 때
-        elif ("living" in viewpoint_lower and "kitchen" in viewpoint_lower) or "거실에서" in viewpoint_lower:
-            # 바닥
-            for y in range(height // 3, height):
-                depth_value = int(200 - (y - height // 3) / (height * 2 / 3) * 150)
-                draw.line([(0, y), (width, y)], fill=(depth_value, depth_value, depth_value))
-
-            # 천장
-            draw.rectangle([0, 0, width, height // 4], fill=(30, 30, 30))
-
-            # 왼쪽/오른쪽 벽
-            draw.polygon([
-                (0, height // 4), (width // 6, height // 3),
-                (width // 6, height - 50), (0, height)
-            ], fill=(80, 80, 80))
-            draw.polygon([
-                (width, height // 4), (width - width // 6, height // 3),
-                (width - width // 6, height - 50), (width, height)
-            ], fill=(80, 80, 80))
-
-            # 정면 (주방) - 캐비닛과 가전
-            draw.polygon([
-                (width // 6, height // 3), (width - width // 6, height // 3),
-                (width - width // 6, height - 50), (width // 6, height - 50)
-            ], fill=(60, 60, 60))
-
-            # 주방 카운터/아일랜드 (중앙)
-            island = [
-                (width // 3, height - 200),
-                (width * 2 // 3, height - 200),
-                (width * 2 // 3, height - 80),
-                (width // 3, height - 80),
-            ]
-            draw.rectangle(island, fill=(100, 100, 100))
-
-            # 소파 암레스트 (전경)
-            draw.rectangle([0, height - 100, width // 5, height], fill=(200, 200, 200))
-
-        # 창가 방향
-        elif "window" in viewpoint_lower or "창가" in viewpoint_lower:
-            # 바닥
-            for y in range(height // 3, height):
-                depth_value = int(200 - (y - height // 3) / (height * 2 / 3) * 150)
-                draw.line([(0, y), (width, y)], fill=(depth_value, depth_value, depth_value))
-
-            # 천장
-            draw.rectangle([0, 0, width, height // 4], fill=(30, 30, 30))
-
-            # 측면 벽
-            draw.polygon([
-                (0, height // 4), (width // 8, height // 3),
-                (width // 8, height - 50), (0, height)
-            ], fill=(80, 80, 80))
-            draw.polygon([
-                (width, height // 4), (width - width // 8, height // 3),
-                (width - width // 8, height - 50), (width, height)
-            ], fill=(80, 80, 80))
-
-            # 큰 창문 (정면 거의 전체)
-            window_rect = [
-                width // 10,
-                height // 4,
-                width - width // 10,
-                height - 80,
-            ]
-            draw.rectangle(window_rect, fill=(255, 255, 255))  # 매우 밝음
-
-        else:
-            # 기본값: 일반적인 거실 관점
-            for y in range(height // 3, height):
-                depth_value = int(180 - (y - height // 3) / (height * 2 / 3) * 130)
-                draw.line([(0, y), (width, y)], fill=(depth_value, depth_value, depth_value))
-            draw.rectangle([0, 0, width, height // 3], fill=(40, 40, 40))
-
-        # Gaussian Blur 적용 (edge를 부드럽게 하여 ControlNet 결과 개선)
-        img = img.filter(ImageFilter.GaussianBlur(radius=5))
+        cache_key = stable_hash("depth", viewpoint, windows, width, height)
+        cached = await self._control_cache.get_async(cache_key)
+        if cached is not None:
+            return cached
 
-        # 이미지를 base64로 인코딩
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-        img_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
+        png = await get_executor().run_cpu(render_perspective_depth_map, viewpoint, windows, width, height)
+        img_base64 = base64.b64encode(png).decode('utf-8')
+        await self._control_cache.set_async(cache_key, img_base64)
 
         print(f"[Designer] Generated depth map with blur for viewpoint: {viewpoint[:30]}...")
         return img_base64
 
-    async def _analyze_reference_images(self, image_urls: List[str]) -> str:
+    async def _analyze_reference_images(self, image_urls: List[str], deep_analysis: bool = False) -> str:
         """
-        Gemini를 사용해 레퍼런스 이미지들의 스타일을 분석
+        레퍼런스 이미지들의 스타일 분석
+
+        1. 풀링된 HTTP 클라이언트로 이미지를 동시에 다운로드 후 로컬에서 썸네일 생성
+        2. 로컬 NumPy 분석으로 색상 팔레트 / 주요 자재 톤 추출 (수십 ms, 항상 수행)
+        3. deep_analysis 요청 시에만 Gemini Vision 스타일 설명 추가
+           - 이미지별 지각 해시로 캐시 조회 → 같은(또는 재압축된) 이미지는 한 번만 분석
+           - 캐시 미스인 이미지만 동시에 분석
 
         Args:
             image_urls: 레퍼런스 이미지 URL 목록
+            deep_analysis: Gemini 심층 스타일 분석 여부
 
         Returns:
             str: 분석된 스타일 설명
         """
         try:
-            # 이미지 URL을 Gemini에 전달
-            parts = []
-            for url in image_urls[:3]:  # 최대 3장만 분석
-                parts.append({"mime_type": "image/jpeg", "file_uri": url})
+            images = await asyncio.gather(
+                *(self._fetch_reference_image(url) for url in image_urls[:3])  # 최대 3장만 분석
+            )
+            images = [img for img in images if img is not None]
+            if not images:
+                return ""
+
+            palette = await get_executor().run_cpu(analyze_palette, images)  # k-means (프로세스 풀)
+            print(f"[Designer] Reference palette: {palette.material_tone}, {[c.hex for c in palette.palette]}")
+            parts = [palette.to_prompt()]
+
+            if deep_analysis:
+                descriptions = await asyncio.gather(
+                    *(self._describe_reference_image(img) for img in images)
+                )
+                parts.extend(d for d in descriptions if d)
 
-            prompt = """You are an expert interior designer. Analyze these reference interior images and extract the key design elements.
+            return ", ".join(parts)
 
-Describe in English, in a single paragraph (max 100 words):
+        except Exception as e:
+            print(f"[Designer] Reference image analysis error: {e}")
+            return ""
+
+    async def _fetch_reference_image(self, url: str) -> Optional["Image.Image"]:
+        """레퍼런스 이미지 다운로드 + 썸네일 생성 (실패 시 None, 공인 주소의 image/* 응답만 크기 한도 안에서 허용)"""
+        try:
+            content = await fetch_image_bytes(self._get_http_client(), url, settings.upload_max_bytes)
+            return await get_executor().run_io(
+                make_thumbnail, content, settings.reference_thumbnail_size
+            )
+        except Exception as e:
+            print(f"[Designer] Failed to fetch reference image {url[:80]}: {e}")
+            return None
+
+    async def _describe_reference_image(self, image: "Image.Image") -> str:
+        """
+        단일 레퍼런스 이미지 스타일 설명 (지각 해시 캐시 사용)
+
+        같은 이미지에 대한 동시 요청은 하나의 Gemini 호출을 공유
+        """
+        phash = perceptual_hash(image)
+        cached = await self._reference_cache.get_async(phash)
+        if cached:
+            print(f"[Designer] Reference style cache hit: {phash:016x}")
+            return cached
+
+        pending = self._pending_descriptions.get(phash)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending_descriptions[phash] = future
+        try:
+            prompt = """You are an expert interior designer. Analyze this reference interior image and extract the key design elements.
+
+Describe in English, in a single paragraph (max 60 words):
 1. Color palette (dominant and accent colors)
 2. Materials used (wood, metal, fabric, etc.)
 3. Furniture style
@@ -1074,18 +1050,28 @@ Describe in English, in a single paragraph (max 100 words):
 
 Output ONLY the design description, no explanations or bullet points."""
 
-            # Gemini Vision 호출
-            response = await self._model.generate_content_async([prompt] + [url for url in image_urls[:3]])
-            return response.text.strip()
-
+            # Gemini Vision 호출 (로컬 썸네일 전달)
+            response = await self._model.generate_content_async([prompt, image])
+            description = response.text.strip()
+            if description:
+                await self._reference_cache.set_async(phash, description)
+            future.set_result(description)
+            return description
         except Exception as e:
-            print(f"[Designer] Reference image analysis error: {e}")
+            print(f"[Designer] Reference image description failed: {e}")
+            future.set_result("")
             return ""
+        finally:
+            if not future.done():  # 취소된 경우 대기 중인 요청이 멈추지 않도록
+                future.set_result("")
+            self._pending_descriptions.pop(phash, None)
 
     async def _analyze_floor_plan_layout(
         self,
         image_url: Optional[str] = None,
         image_base64: Optional[str] = None,
+        image_bytes: Optional[bytes] = None,
+        mime_type: str = "image/png",
     ) -> str:
         """
         Gemini Vision을 사용해 도면의 방 배치를 분석하여 텍스트로 변환
@@ -1093,6 +1079,8 @@ Output ONLY the design description, no explanations or bullet points."""
         Args:
             image_url: 도면 이미지 URL
             image_base64: 도면 이미지 Base64
+            image_bytes: 도면 이미지 원본 바이트 (업로드)
+            mime_type: image_bytes의 MIME 타입
 
         Returns:
             str: 방 배치 설명 (영문)
@@ -1111,7 +1099,14 @@ Output a single paragraph (max 80 words) describing the spatial layout.
 Use phrases like: "spacious L-shaped living area", "open-plan kitchen connected to dining", "large windows on the right wall"
 Do NOT mention any measurements or technical terms. Focus on spatial description for interior visualization."""
 
-            if image_base64:
+            if image_bytes:
+                # 업로드 원본 바이트 그대로 전달
+                image_part = {
+                    "mime_type": mime_type,
+                    "data": image_bytes
+                }
+                response = await self._model.generate_content_async([prompt, image_part])
+            elif image_base64:
                 # Base64 이미지 사용
                 image_part = {
                     "mime_type": "image/png",
@@ -1151,88 +1146,106 @@ Do NOT mention any measurements or technical terms. Focus on spatial description
         - None: 순수 text-to-image (구조 제약 없음)
 
         seed를 고정하면 같은 입력에 대해 같은 출력 보장
+        → seed가 있는 요청은 결과를 캐시하여 동일 요청 시 GPU 재실행 없이 반환
         """
         try:
-            async with httpx.AsyncClient(timeout=180.0) as client:
-                full_prompt = f"realistic interior design photograph, {prompt}, professional interior photography, 8k uhd, highly detailed, architectural visualization"
-
-                # ControlNet 이미지가 있으면 사용
-                if depth_map_base64:
-                    # control_type에 따라 다른 모델 선택
-                    if control_type == "lineart":
-                        # SDXL ControlNet Lineart 모델 - DWG 원본 구조 보존에 최적
-                        # https://replicate.com/lucataco/sdxl-controlnet-lineart
-                        model_version = "af55c8f1d4d3b2e5d8f8e3e5f0c8e5a8b9f3c5d1e6a2b4c8d9e0f1a2b3c4d5e6"
-                        model_name = "sdxl-controlnet-lineart"
-                        condition_scale = 0.9  # lineart는 더 높은 강도로 구조 유지
-                        print(f"[Designer] Using ControlNet Lineart for DWG structure preservation")
-                    else:
-                        # SDXL ControlNet Depth 모델 - 3D 깊이감/시점 표현에 최적
-                        # https://replicate.com/lucataco/sdxl-controlnet
-                        model_version = "db2ffdbdc7f6cb4d6dab512434679ee3366ae7ab84f89750f8947d5594b79a47"
-                        model_name = "sdxl-controlnet-depth"
-                        condition_scale = 0.8  # depth는 적당한 강도
-                        print(f"[Designer] Using ControlNet Depth for perspective rendering")
-
-                    input_data = {
-                        "prompt": full_prompt,
-                        "negative_prompt": negative_prompt,
-                        "image": f"data:image/png;base64,{depth_map_base64}",
-                        "condition_scale": condition_scale,
-                        "num_inference_steps": 30,
-                        "guidance_scale": 7.5,
-                    }
+            await import_module_async("httpx")
+            client = self._get_http_client()
+            full_prompt = f"realistic interior design photograph, {prompt}, professional interior photography, 8k uhd, highly detailed, architectural visualization"
+
+            # ControlNet 이미지가 있으면 사용
+            if depth_map_base64:
+                # control_type에 따라 다른 모델 선택
+                if control_type == "lineart":
+                    # SDXL ControlNet Lineart 모델 - DWG 원본 구조 보존에 최적
+                    # https://replicate.com/lucataco/sdxl-controlnet-lineart
+                    model_version = "af55c8f1d4d3b2e5d8f8e3e5f0c8e5a8b9f3c5d1e6a2b4c8d9e0f1a2b3c4d5e6"
+                    model_name = "sdxl-controlnet-lineart"
+                    condition_scale = 0.9  # lineart는 더 높은 강도로 구조 유지
+                    print(f"[Designer] Using ControlNet Lineart for DWG structure preservation")
+                else:
+                    # SDXL ControlNet Depth 모델 - 3D 깊이감/시점 표현에 최적
+                    # https://replicate.com/lucataco/sdxl-controlnet
+                    model_version = "db2ffdbdc7f6cb4d6dab512434679ee3366ae7ab84f89750f8947d5594b79a47"
+                    model_name = "sdxl-controlnet-depth"
+                    condition_scale = 0.8  # depth는 적당한 강도
+                    print(f"[Designer] Using ControlNet Depth for perspective rendering")
+
+                input_data = {
+                    "prompt": full_prompt,
+                    "negative_prompt": negative_prompt,
+                    "image": f"data:image/png;base64,{depth_map_base64}",
+                    "condition_scale": condition_scale,
+                    "num_inference_steps": 30,
+                    "guidance_scale": 7.5,
+                }
 
-                    # seed 추가 (재현성 보장)
-                    if seed is not None:
-                        input_data["seed"] = seed
-                        print(f"[Designer] Using seed: {seed}")
+                # seed 추가 (재현성 보장)
+                if seed is not None:
+                    input_data["seed"] = seed
+                    print(f"[Designer] Using seed: {seed}")
 
-                    print(f"[Designer] Prompt: {full_prompt[:200]}...")
+                print(f"[Designer] Prompt: {full_prompt[:200]}...")
 
-                else:
-                    # 순수 SDXL text-to-image
-                    model_version = "7762fd07cf82c948538e41f63f77d685e02b063e37e496e96eefd46c929f9bdc"
-                    model_name = "sdxl"
-
-                    input_data = {
-                        "prompt": full_prompt,
-                        "negative_prompt": negative_prompt,
-                        "width": 1024,
-                        "height": 768,
-                        "num_inference_steps": 35,
-                        "guidance_scale": 7.5,
-                        "scheduler": "K_EULER",
+            else:
+                # 순수 SDXL text-to-image
+                model_version = "7762fd07cf82c948538e41f63f77d685e02b063e37e496e96eefd46c929f9bdc"
+                model_name = "sdxl"
+
+                input_data = {
+                    "prompt": full_prompt,
+                    "negative_prompt": negative_prompt,
+                    "width": 1024,
+                    "height": 768,
+                    "num_inference_steps": 35,
+                    "guidance_scale": 7.5,
+                    "scheduler": "K_EULER",
+                }
+
+                # seed 추가 (재현성 보장)
+                if seed is not None:
+                    input_data["seed"] = seed
+                    print(f"[Designer] Using seed: {seed}")
+
+                print(f"[Designer] Using SDXL text-to-image")
+                print(f"[Designer] Prompt: {full_prompt[:200]}...")
+
+            # 결과 캐시 조회 (seed 고정 요청만 - seed가 없으면 매번 새 샘플을 원하는 것)
+            cache_key = None
+            if seed is not None:
+                cache_key = self._result_cache_key(model_version, input_data, depth_map_base64)
+                cached = await self._result_cache.get_async(cache_key)
+                if cached:
+                    print(f"[Designer] Result cache hit: {cache_key[:12]}")
+                    return {
+                        **cached,
+                        "prompt_used": prompt,
+                        "cached": True,
                     }
 
-                    # seed 추가 (재현성 보장)
-                    if seed is not None:
-                        input_data["seed"] = seed
-                        print(f"[Designer] Using seed: {seed}")
-
-                    print(f"[Designer] Using SDXL text-to-image")
-                    print(f"[Designer] Prompt: {full_prompt[:200]}...")
-
-                response = await client.post(
-                    "https://api.replicate.com/v1/predictions",
-                    headers={
-                        "Authorization": f"Token {self.replicate_api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "version": model_version,
-                        "input": input_data,
-                    },
-                )
+            response = await client.post(
+                "https://api.replicate.com/v1/predictions",
+                headers={
+                    "Authorization": f"Token {self.replicate_api_key}",
+                    "Content-Type": "application/json",
+                },
+                json={
+                    "version": model_version,
+                    "input": input_data,
+                },
+                timeout=180.0,
+            )
 
-                if response.status_code != 201:
-                    raise Exception(f"Replicate API error: {response.text}")
+            if response.status_code != 201:
+                raise Exception(f"Replicate API error: {response.text}")
 
-                prediction = response.json()
-                prediction_id = prediction["id"]
-                print(f"[Designer] Prediction started: {prediction_id}")
+            prediction = response.json()
+            prediction_id = prediction["id"]
+            print(f"[Designer] Prediction started: {prediction_id}")
 
-                # 결과 폴링 (최대 3분)
+            # 결과 폴링 (최대 3분)
+            settled = False
+            try:
                 for i in range(36):
                     await asyncio.sleep(5)
 
@@ -1248,6 +1261,7 @@ Do NOT mention any measurements or technical terms. Focus on spatial description
                         print(f"[Designer] Status: {status}")
 
                     if status == "succeeded":
+                        settled = True
                         output = result.get("output")
                         # SDXL은 [generated_image] 반환
                         if isinstance(output, list) and output:
@@ -1255,16 +1269,29 @@ Do NOT mention any measurements or technical terms. Focus on spatial description
                         else:
                             image_url = output
                         print(f"[Designer] Generated image: {image_url[:100] if image_url else 'None'}...")
-                        return {
+                        # Replicate URL은 약 1시간 후 만료 → 한 번 내려받아 재호스팅
+                        output = await self._rehost_output({
                             "success": True,
                             "image_url": image_url,
-                            "prompt_used": prompt,
                             "model": model_name,
-                        }
+                        })
+                        if cache_key and image_url:
+                            # 재호스팅에 성공했으면 URL이 만료되지 않으므로 장기 보관
+                            await self._result_cache.set_async(
+                                cache_key,
+                                output,
+                                ttl_seconds=settings.rehosted_image_cache_ttl_seconds if output.get("image_variants") else None,
+                            )
+                        return {**output, "prompt_used": prompt}
                     elif status == "failed":
+                        settled = True
                         raise Exception(f"Generation failed: {result.get('error')}")
 
                 raise Exception("Generation timeout (3 minutes)")
+            finally:
+                if not settled:
+                    # 클라이언트 연결 종료(취소)/폴링 실패/시간 초과 → 아무도 쓰지 않을 GPU 작업 중단
+                    self._cancel_prediction_later(prediction_id)
 
         except Exception as e:
             print(f"[Designer] Replicate generation failed: {e}")
@@ -1274,6 +1301,106 @@ Do NOT mention any measurements or technical terms. Focus on spatial description
                 "prompt_used": prompt,
             }
 
+    def _cancel_prediction_later(self, prediction_id: str) -> None:
+        """Replicate 예측 취소를 백그라운드로 요청 (취소 중인 요청 task 안에서도 전송되도록)"""
+        task = asyncio.create_task(self._cancel_prediction(prediction_id))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _cancel_prediction(self, prediction_id: str) -> None:
+        """Replicate 예측 취소 (이미 끝난 예측이면 무시됨)"""
+        try:
+            response = await self._get_http_client().post(
+                f"https://api.replicate.com/v1/predictions/{prediction_id}/cancel",
+                headers={"Authorization": f"Token {self.replicate_api_key}"},
+            )
+            print(f"[Designer] Prediction canceled: {prediction_id} ({response.status_code})")
+        except Exception as e:
+            print(f"[Designer] Prediction cancel failed: {prediction_id}: {e}")
+
+    def _result_cache_key(
+        self,
+        model_version: str,
+        input_data: Dict[str, Any],
+        control_image_base64: Optional[str],
+    ) -> str:
+        """
+        생성 결과 캐시 키
+
+        (모델 버전, 프롬프트, 네거티브 프롬프트, seed, steps 등 입력 파라미터, 컨트롤 이미지 해시)
+        컨트롤 이미지는 수백 KB base64이므로 본문 대신 해시만 키에 포함
+        """
+        params = {k: v for k, v in input_data.items() if k != "image"}
+        control_hash = stable_hash(control_image_base64) if control_image_base64 else None
+        return stable_hash(model_version, params, control_hash)
+
+    async def _rehost_output(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        생성 결과 이미지를 오브젝트 스토어로 재호스팅
+
+        성공 시 image_url을 안정적인 full 변형 URL로 교체하고
+        image_variants(thumbnail/medium/full), source_image_url(원본) 추가
+        실패하면 원본 결과를 그대로 반환
+        """
+        source_url = result.get("image_url")
+        if not result.get("success") or not source_url:
+            return result
+
+        variants = await self._rehost_image(source_url)
+        if not variants:
+            return result
+
+        return {
+            **result,
+            "image_url": variants["full"],
+            "image_variants": variants,
+            "source_image_url": source_url,
+        }
+
+    async def _rehost_image(self, source_url: str) -> Optional[Dict[str, str]]:
+        """
+        원본 이미지를 한 번 내려받아 WebP 변형으로 콘텐츠 주소 저장
+
+        키: {sha256[:2]}/{sha256}/{variant}.webp (원본 바이트 해시)
+
+        Returns:
+            dict: {변형 이름: URL} (실패 시 None)
+        """
+        url_key = stable_hash(source_url)
+        cached = await self._rehost_cache.get_async(url_key)
+        if cached:
+            return cached
+
+        try:
+            response = await self._get_http_client().get(source_url)
+            response.raise_for_status()
+            data = response.content
+
+            content_hash = stable_hash(data)
+            keys = {
+                name: f"{content_hash[:2]}/{content_hash}/{name}.webp"
+                for name in IMAGE_VARIANTS
+            }
+            store = get_object_store()
+            executor = get_executor()
+
+            def store_variants(encoded: Dict[str, bytes]) -> None:
+                for name, blob in encoded.items():
+                    store.put(keys[name], blob, "image/webp")
+
+            # 디코딩/리사이즈/WebP 인코딩은 프로세스 풀, 존재 확인/파일 쓰기는 스레드 풀
+            if not await executor.run_io(lambda: all(store.exists(key) for key in keys.values())):
+                encoded = await executor.run_cpu(encode_webp_variants, data)
+                await executor.run_io(store_variants, encoded)
+
+            variants = {name: store.url_for(key) for name, key in keys.items()}
+            await self._rehost_cache.set_async(url_key, variants)
+            print(f"[Designer] Rehosted image {content_hash[:12]} ({len(data)} bytes)")
+            return variants
+        except Exception as e:
+            print(f"[Designer] Image rehosting failed: {e}")
+            return None
+
     async def _generate_mockup_response(
         self,
         style: str,
@@ -2,6 +2,7 @@
 Manager Agent - 김 반장 (Chief Kim)
 인테리어 현장 관리 20년 경력의 베테랑 현장 소장
 """
+import asyncio
 import json
 import re
 from typing import Optional
@@ -17,9 +18,31 @@ from app.models.schemas import (
     QuoteData,
 )
 from app.config import settings
+from app.core.executor import get_executor
+from app.core.hashing import stable_hash
+from app.core.semantic_cache import get_answer_cache, hash_embed, query_numbers
+from app.core.session import build_session_prompt, get_session_store
+from app.services.cost_engine import (
+    GRADE_LABELS,
+    EstimateInput,
+    build_estimate_input,
+    estimate_cost,
+    is_price_check,
+    parse_area,
+    parse_bathrooms,
+    parse_price,
+    query_slots,
+    resolve_work_scope,
+    stated_work_scope,
+)
+from app.services.estimate_store import ANY, Benchmark, get_estimate_store
+from app.services.intent_router import canonicalize_query, get_intent_router
+from app.services.knowledge_index import get_knowledge_index
+from app.services.quote_builder import build_quote, has_quotable_estimate
+from app.services.scheduler import ConstraintScheduler, build_phases, next_monday, parse_start_date
 
 
-SYSTEM_PROMPT = """You are Chief Kim (김 반장), a veteran Interior Site Manager with 20+ years of experience in Korean residential interior construction.
+PERSONA_PROMPT = """You are Chief Kim (김 반장), a veteran Interior Site Manager with 20+ years of experience in Korean residential interior construction.
 
 Your goal is to deliver the project **On Time, On Budget, and Without Complaints**.
 
@@ -35,10 +58,15 @@ Your goal is to deliver the project **On Time, On Budget, and Without Complaints
 3. **Cost Transparency** - 비용은 반드시 DM(재료비)/DL(노무비)/OH(경비)로 분리해서 설명
 4. **Realistic Timeline** - 공정은 여유 있게, 예비일 반드시 포함
 
-## Response Format
+"""
+
+RESPONSE_FORMAT_HEADER = """## Response Format
 You must respond with a valid JSON object only. No markdown code blocks, no explanations outside JSON.
 
-For **COST** questions, use this format:
+"""
+
+# 의도별 응답 포맷 (전체 프롬프트와 의도별 슬림 프롬프트가 공유)
+COST_FORMAT = """For **COST** questions, use this format:
 {
   "intent": "cost",
   "answer": "친근한 한국어 설명...",
@@ -55,7 +83,9 @@ For **COST** questions, use this format:
   "follow_up_questions": ["어떤 자재 등급을 원하세요?", "철거 범위가 어디까지인가요?"]
 }
 
-For **SCHEDULE** questions, use this format:
+"""
+
+SCHEDULE_FORMAT = """For **SCHEDULE** questions, use this format:
 {
   "intent": "schedule",
   "answer": "친근한 한국어 설명...",
@@ -72,7 +102,9 @@ For **SCHEDULE** questions, use this format:
   "follow_up_questions": ["언제 시작하실 예정인가요?"]
 }
 
-For **TECHNICAL** questions (자재, 시공법 등), use:
+"""
+
+TECHNICAL_FORMAT = """For **TECHNICAL** questions (자재, 시공법 등), use:
 {
   "intent": "technical",
   "answer": "상세한 기술적 설명...",
@@ -80,7 +112,9 @@ For **TECHNICAL** questions (자재, 시공법 등), use:
   "follow_up_questions": ["추가 질문..."]
 }
 
-For **CHAT** (일반 대화), use:
+"""
+
+CHAT_FORMAT = """For **CHAT** (일반 대화), use:
 {
   "intent": "chat",
   "answer": "친근한 대답...",
@@ -88,7 +122,9 @@ For **CHAT** (일반 대화), use:
   "follow_up_questions": []
 }
 
-For **QUOTE_SEND** (견적서를 업체에 보내달라는 요청 - "이 견적서 업체에 보내줘", "시공업체에 견적 의뢰해줘", "업체 찾아줘" 등), use:
+"""
+
+QUOTE_SEND_FORMAT = """For **QUOTE_SEND** (견적서를 업체에 보내달라는 요청 - "이 견적서 업체에 보내줘", "시공업체에 견적 의뢰해줘", "업체 찾아줘" 등), use:
 {
   "intent": "quote_send",
   "answer": "알겠습니다! 이 견적서를 관련 시공업체들에게 보내드릴게요. 잠시만 기다려 주세요.",
@@ -111,11 +147,73 @@ For **QUOTE_SEND** (견적서를 업체에 보내달라는 요청 - "이 견적
   "follow_up_questions": ["특별히 원하시는 업체 조건이 있나요?"]
 }
 
-Important: When the user asks to send the quote to contractors or asks to find contractors for this work, you MUST use "quote_send" intent and extract all the cost and project information from the conversation context. Make sure to include the complete breakdown data in the response.
+"""
+
+QUOTE_SEND_RULES = """Important: When the user asks to send the quote to contractors or asks to find contractors for this work, you MUST use "quote_send" intent and extract all the cost and project information from the conversation context. Make sure to include the complete breakdown data in the response.
 
 CRITICAL: When a previous cost estimate is provided in the context (previous_cost_estimate), you MUST use that data for the quote_send response. Copy the breakdown array exactly as provided, use the same area_size, and calculate total_cost from the breakdown. Never return an empty breakdown when previous_cost_estimate is available.
 """
 
+# 의도를 모를 때 사용하는 전체 프롬프트 (모든 포맷 포함)
+SYSTEM_PROMPT = (
+    PERSONA_PROMPT
+    + RESPONSE_FORMAT_HEADER
+    + COST_FORMAT
+    + SCHEDULE_FORMAT
+    + TECHNICAL_FORMAT
+    + CHAT_FORMAT
+    + QUOTE_SEND_FORMAT
+    + QUOTE_SEND_RULES
+)
+
+# 의도별 슬림 프롬프트 (분류기가 확신할 때 사용)
+INTENT_PROMPTS = {
+    AgentIntent.COST: PERSONA_PROMPT + RESPONSE_FORMAT_HEADER + COST_FORMAT,
+    AgentIntent.SCHEDULE: PERSONA_PROMPT + RESPONSE_FORMAT_HEADER + SCHEDULE_FORMAT,
+    AgentIntent.TECHNICAL: PERSONA_PROMPT + RESPONSE_FORMAT_HEADER + TECHNICAL_FORMAT,
+    AgentIntent.CHAT: PERSONA_PROMPT + RESPONSE_FORMAT_HEADER + CHAT_FORMAT,
+    AgentIntent.QUOTE_SEND: PERSONA_PROMPT + RESPONSE_FORMAT_HEADER + QUOTE_SEND_FORMAT + QUOTE_SEND_RULES,
+}
+
+# 의도별 최대 출력 토큰
+INTENT_MAX_OUTPUT_TOKENS = {
+    AgentIntent.COST: 2048,
+    AgentIntent.SCHEDULE: 2048,
+    AgentIntent.TECHNICAL: 1024,
+    AgentIntent.CHAT: 256,
+    AgentIntent.QUOTE_SEND: 2048,
+}
+
+# 시맨틱 캐시 대상 의도 / 정확히 일치해야 하는 컨텍스트 키
+SEMANTIC_CACHE_INTENTS = (AgentIntent.TECHNICAL, AgentIntent.COST)
+SEMANTIC_CACHE_CONTEXT_KEYS = ("area_size", "location", "budget", "work_type", "grade", "style", "bathrooms")
+SEMANTIC_CACHE_MIN_CHARS = 4
+
+
+COST_ANSWER_PROMPT = """You are Chief Kim (김 반장), a veteran Korean interior site manager.
+The cost estimate below was already calculated by our estimation engine. Do NOT change any numbers.
+Explain it to the customer in friendly Korean: mention the final total (예비비 포함), the biggest cost items,
+and what could change the price. Keep it under 6 sentences. Costs are in 만원.
+If "market" is given (percentiles p10~p90 of recorded estimates/contractor offers for similar jobs, n = sample count),
+say where our estimate sits in that range. If "customer_price" is given, tell the customer whether that price is
+reasonable using market.price_pct and market.verdict.
+
+Respond with JSON only: {"answer": "...", "follow_up_questions": ["...", "..."]}"""
+
+SCHEDULE_ANSWER_PROMPT = """You are Chief Kim (김 반장), a veteran Korean interior site manager.
+The construction schedule below was already planned by our scheduler (Friday Rule and holidays applied). Do NOT change any dates.
+Explain it to the customer in friendly Korean: total duration, the order of the main phases, the critical path,
+and any days that were shifted because of the Friday Rule or holidays. Keep it under 6 sentences.
+
+Respond with JSON only: {"answer": "...", "follow_up_questions": ["...", "..."]}"""
+
+TECHNICAL_RAG_PROMPT = """You are Chief Kim (김 반장), a veteran Korean interior site manager.
+Answer the customer's technical question in friendly Korean using the reference passages below.
+Prefer the passages over general knowledge; if they do not cover the question, say what you would check on site.
+Keep it under 6 sentences.
+
+""" + RESPONSE_FORMAT_HEADER + TECHNICAL_FORMAT
+
 
 class ManagerAgent:
     """
@@ -130,6 +228,7 @@ class ManagerAgent:
             max_tokens=4096,
         )
         self.provider = GeminiProvider(self.config)
+        self._chat_provider: Optional[GeminiProvider] = None
         self._initialized = False
 
     async def initialize(self):
@@ -138,20 +237,261 @@ class ManagerAgent:
             await self.provider.initialize()
             self._initialized = True
 
-    async def process_request(self, query: str, context: dict = None) -> AgentResponse:
+    async def warm_connections(self) -> None:
+        """기본/CHAT 모델 커넥션 웜업 (API 키가 없으면 건너뜀)"""
+        if not self.config.api_key:
+            return
+        await self.initialize()
+        chat_provider = await self._get_chat_provider()
+        await asyncio.gather(self.provider.warm_connection(), chat_provider.warm_connection())
+
+    async def probe(self) -> None:
+        """최소 토큰 생성 1회 (모델 서빙 경로까지 웜업, API 비용 발생)"""
+        await self.initialize()
+        await self.provider.generate("ping", generation_config={"max_output_tokens": 8})
+
+    async def process_request(
+        self,
+        query: str,
+        context: dict = None,
+        session_id: Optional[str] = None,
+    ) -> AgentResponse:
         """
         사용자 요청 처리
 
+        세션 슬롯(평수, 위치, 최근 견적 등)과 클라이언트 컨텍스트를 합쳐 처리하고,
+        응답 후 세션에 턴과 최근 견적/일정을 저장
+
         Args:
             query: 사용자 질문
             context: 추가 컨텍스트 (평수, 위치, 공종 등)
+            session_id: 세션 ID (없으면 새 세션 생성)
 
         Returns:
-            AgentResponse: 파싱된 응답
+            AgentResponse: 파싱된 응답 (session_id 포함)
         """
         await self.initialize()
 
-        # 컨텍스트 정보 구성
+        store = get_session_store()
+        session = await store.get_or_create_async(session_id)
+        stated = query_slots(query)  # 이번 질문에 명시된 평수/범위/욕실 수 → 저장된 슬롯보다 우선
+        session.update_slots(context)
+        session.update_slots(stated)
+        merged_context = {**session.to_context(), **(context or {}), **stated}
+        history = build_session_prompt(session, settings.session_prompt_token_budget)
+
+        response = await self._respond(query, merged_context, history, client_context=context or {})
+
+        def apply(target):
+            # 처리 중 같은 세션의 다른 요청이 먼저 저장했으면 최신 세션에 다시 적용됨
+            target.update_slots(context)
+            target.update_slots(stated)
+            if isinstance(response.data, CostEstimate):
+                target.latest_estimate = response.data.model_dump()
+                if response.data.area_size:
+                    target.slots.setdefault("area_size", response.data.area_size)
+            elif isinstance(response.data, ProjectSchedule):
+                target.latest_schedule = response.data.model_dump()
+            target.add_turn("user", query, settings.session_recent_turns, settings.session_summary_max_lines)
+            target.add_turn("assistant", response.answer, settings.session_recent_turns, settings.session_summary_max_lines)
+
+        session = await store.update_async(session, apply)
+
+        response.session_id = session.session_id
+        return response
+
+    @staticmethod
+    async def _record_history(response: AgentResponse, context: dict) -> None:
+        """새로 생성한 견적/견적서를 견적 이력 저장소에 기록 (캐시 히트는 제외, 실패해도 응답에는 영향 없음)"""
+        try:
+            if isinstance(response.data, CostEstimate):
+                await get_executor().run_io(
+                    get_estimate_store().record_estimate, response.data, location=context.get("location")
+                )
+            elif isinstance(response.data, QuoteData):
+                await get_executor().run_io(get_estimate_store().record_quote, response.data)
+        except Exception as e:
+            print(f"[Manager] Failed to record estimate history: {e}")
+
+    async def _respond(
+        self,
+        query: str,
+        context: dict,
+        history: str = "",
+        client_context: Optional[dict] = None,
+    ) -> AgentResponse:
+        """
+        의도 분류 후 로컬 엔진 또는 LLM으로 응답 생성
+
+        Args:
+            query: 사용자 질문
+            context: 세션 슬롯이 합쳐진 컨텍스트
+            history: 세션 대화 이력 블록 (토큰 예산 내)
+            client_context: 이번 요청에 클라이언트가 보낸 컨텍스트 (없으면 context)
+
+        Returns:
+            AgentResponse: 파싱된 응답
+        """
+        # 로컬 의도 분류 → 의도별 슬림 프롬프트 / 로컬 엔진 선택
+        prediction = get_intent_router().classify(query)
+        intent = prediction.intent if prediction.confident else None
+        print(f"[Manager] Intent: {prediction.intent.value} ({prediction.confidence:.2f}, confident={prediction.confident})")
+
+        # 시맨틱 캐시: 표현만 다른 같은 질문이면 이전 답변 재사용 (일부는 새로 계산해 오탐 검증)
+        # scope는 질문 + 클라이언트가 보낸 컨텍스트로만 구성 (세션 슬롯은 세션마다 다르므로 제외)
+        client_context = context if client_context is None else client_context
+        cache_key = self._semantic_cache_key(query, client_context, intent)
+        hit = None
+        if cache_key is not None:
+            hit = await get_answer_cache().get_async(*cache_key)
+            if hit is not None and not hit.audit:
+                print(f"[Manager] Semantic cache hit ({hit.similarity:.2f}): {hit.question}")
+                return hit.value.model_copy(deep=True)
+            # 캐시한 답변은 다른 세션에도 제공되므로 세션 슬롯/대화 이력 없이 scope에 든 값만으로 생성
+            context = {key: client_context[key] for key in SEMANTIC_CACHE_CONTEXT_KEYS if client_context.get(key)}
+            history = ""
+
+        response = await self._dispatch(query, context, history, intent, prediction.intent)
+        await self._record_history(response, context)
+
+        if cache_key is not None and response.intent == intent and response.answer:
+            cache = get_answer_cache()
+            if hit is not None:
+                await cache.record_audit_async(hit, query, self._same_answer(hit.value, response))
+            await cache.set_async(*cache_key, response.model_copy(deep=True))
+        return response
+
+    async def _dispatch(
+        self,
+        query: str,
+        context: dict,
+        history: str,
+        intent: Optional[AgentIntent],
+        predicted: Optional[AgentIntent] = None,
+    ) -> AgentResponse:
+        """
+        의도별 로컬 엔진 / LLM 호출 (intent가 None이면 전체 프롬프트)
+
+        Args:
+            intent: 확신 있는 의도 (없으면 None)
+            predicted: 분류기 1순위 의도 (확신 여부와 무관)
+        """
+        # 일정: 로컬 스케줄러로 배치하고 LLM은 답변 문장만 작성
+        if intent == AgentIntent.SCHEDULE:
+            return await self._answer_schedule(query, context)
+
+        # 가격 적정성: 질문 속 금액은 새 견적과 함께, 없으면 최근 견적 금액을 기록 통계와 비교
+        if intent in (AgentIntent.COST, None) and is_price_check(query):
+            estimate_input = build_estimate_input(query, context)
+            if parse_price(query) and estimate_input is not None:
+                return await self._answer_cost(query, estimate_input)
+            response = await self._answer_price_check(query, context)
+            if response is not None:
+                return response
+
+        # 비용: 평수를 알면 로컬 견적 엔진으로 계산하고 LLM은 답변 문장만 작성
+        if intent == AgentIntent.COST:
+            estimate_input = build_estimate_input(query, context)
+            if estimate_input is not None:
+                return await self._answer_cost(query, estimate_input)
+
+        # 견적서 전송: 이전 견적이 있으면 LLM 없이 그대로 견적서 구성
+        if intent == AgentIntent.QUOTE_SEND and has_quotable_estimate(context.get("previous_cost_estimate")):
+            return self._answer_quote_send(context)
+
+        # 프롬프트 구성
+        user_prompt = f"[고객 질문]\n{query}{self._build_context_str(context)}{history}"
+
+        # 기술 상담: 지식 베이스 검색 → 거의 같은 질문이면 바로 답변, 아니면 관련 문단만 넣은 짧은 프롬프트
+        # (의도 확신이 없을 때도 검색: "강화마루 vs 원목마루"처럼 짧은 FAQ는 분류 점수가 낮게 나옴)
+        if intent in (AgentIntent.TECHNICAL, None):
+            hits = get_knowledge_index().search(query, k=settings.knowledge_top_k, min_score=settings.knowledge_min_score)
+            if hits and hits[0].similarity >= settings.knowledge_direct_answer_threshold:
+                print(f"[Manager] Knowledge direct answer: {hits[0].entry.id} ({hits[0].similarity:.2f})")
+                return AgentResponse(
+                    answer=hits[0].entry.content,
+                    intent=AgentIntent.TECHNICAL,
+                    follow_up_questions=list(hits[0].entry.follow_up_questions),
+                )
+            # 관련 문단 프롬프트는 기술 상담이 확실하거나 1순위일 때만 (그 외는 전체 프롬프트)
+            if hits and AgentIntent.TECHNICAL in (intent, predicted):
+                passages = "\n\n".join(f"[{hit.entry.title}]\n{hit.entry.content}" for hit in hits)
+                response = await self.provider.generate(
+                    prompt=f"{user_prompt}\n\n[참고 자료]\n{passages}",
+                    system_prompt=TECHNICAL_RAG_PROMPT,
+                    generation_config={"max_output_tokens": INTENT_MAX_OUTPUT_TOKENS[AgentIntent.TECHNICAL]},
+                )
+                return self._parse_response(response.content)
+
+        # LLM 호출 (확신 없으면 전체 프롬프트)
+        if intent is None:
+            response = await self.provider.generate(
+                prompt=user_prompt,
+                system_prompt=SYSTEM_PROMPT,
+            )
+        else:
+            provider = await self._get_chat_provider() if intent == AgentIntent.CHAT else self.provider
+            response = await provider.generate(
+                prompt=user_prompt,
+                system_prompt=INTENT_PROMPTS[intent],
+                generation_config={"max_output_tokens": INTENT_MAX_OUTPUT_TOKENS[intent]},
+            )
+
+        # 응답 파싱
+        return self._parse_response(response.content)
+
+    @staticmethod
+    def _semantic_cache_key(query: str, context: dict, intent: Optional[AgentIntent]) -> Optional[tuple]:
+        """
+        시맨틱 캐시 (정규화 질문, scope) - 캐시 대상이 아니면 None
+
+        scope에는 정확히 일치해야 하는 값(의도, 평수/위치/예산 등 컨텍스트, 질문 속 숫자,
+        COST는 공사 범위)을 넣어 다른 조건의 답이 섞이지 않도록 함
+        """
+        if not settings.semantic_cache_enabled or intent not in SEMANTIC_CACHE_INTENTS:
+            return None
+        question = canonicalize_query(query)
+        if len(question) < SEMANTIC_CACHE_MIN_CHARS:
+            return None  # "그건요?" 같은 짧은 후속 질문은 대화 맥락에 의존
+        topic = ""
+        if intent == AgentIntent.COST:
+            if build_estimate_input(query, context) is None:
+                return None  # 평수를 모르면 LLM이 이전 견적/대화에 기대어 답하므로 캐시하지 않음
+            if is_price_check(query) and not parse_price(query):
+                return None  # "이 가격"은 세션의 최근 견적 금액을 가리킴
+            topic = resolve_work_scope(query, context)
+        scope = stable_hash(
+            intent.value,
+            topic,
+            query_numbers(query),
+            {key: str(context.get(key) or "") for key in SEMANTIC_CACHE_CONTEXT_KEYS},
+        )
+        return question, scope
+
+    @staticmethod
+    def _same_answer(cached: AgentResponse, fresh: AgentResponse) -> bool:
+        """오탐 검증 - 구조화 데이터가 같거나, 답변 문장이 충분히 비슷하면 같은 답으로 봄"""
+        if cached.data is not None or fresh.data is not None:
+            return cached.data == fresh.data
+        similarity = float(hash_embed(cached.answer) @ hash_embed(fresh.answer))
+        return similarity >= settings.semantic_cache_audit_min_similarity
+
+    async def _get_chat_provider(self) -> GeminiProvider:
+        """CHAT 의도용 저비용 모델 프로바이더 (지연 생성)"""
+        if self._chat_provider is None:
+            provider = GeminiProvider(LLMConfig(
+                api_key=self.config.api_key,
+                model=settings.chat_llm_model,
+                temperature=self.config.temperature,
+                max_tokens=INTENT_MAX_OUTPUT_TOKENS[AgentIntent.CHAT],
+            ))
+            await provider.initialize()
+            self._chat_provider = provider
+        return self._chat_provider
+
+    @staticmethod
+    def _build_context_str(context: dict) -> str:
+        """컨텍스트를 프롬프트용 [고객 정보] 블록으로 변환"""
         context_str = ""
         if context:
             context_parts = []
@@ -188,17 +528,245 @@ class ManagerAgent:
             if context_parts:
                 context_str = f"\n\n[고객 정보]\n" + "\n".join(context_parts)
 
-        # 프롬프트 구성
-        user_prompt = f"[고객 질문]\n{query}{context_str}"
+        return context_str
+
+    @staticmethod
+    def _answer_quote_send(context: dict) -> AgentResponse:
+        """
+        이전 견적으로 QUOTE_SEND 응답 생성 (LLM 호출 없음)
 
-        # LLM 호출
-        response = await self.provider.generate(
-            prompt=user_prompt,
-            system_prompt=SYSTEM_PROMPT,
+        Args:
+            context: previous_cost_estimate가 포함된 컨텍스트
+
+        Returns:
+            AgentResponse: QUOTE_SEND 응답
+        """
+        quote = build_quote(context["previous_cost_estimate"], context)
+        follow_ups = ["특별히 원하시는 업체 조건이 있나요?"]
+        if not quote.location_city:
+            follow_ups.insert(0, "공사하실 지역이 어디인가요?")
+        return AgentResponse(
+            answer="알겠습니다! 이 견적서를 관련 시공업체들에게 보내드릴게요. 잠시만 기다려 주세요.",
+            data=quote,
+            intent=AgentIntent.QUOTE_SEND,
+            follow_up_questions=follow_ups,
         )
 
-        # 응답 파싱
-        return self._parse_response(response.content)
+    async def _narrate(self, system_prompt: str, user_prompt: str) -> tuple:
+        """
+        로컬 계산 결과에 대한 답변 문장 생성
+
+        Returns:
+            tuple: (answer 또는 None, 후속 질문 목록) - LLM 실패 시 (None, [])
+        """
+        try:
+            data = await self.provider.generate_json(prompt=user_prompt, system_prompt=system_prompt)
+        except Exception as e:
+            print(f"[Manager] Answer generation failed, using template: {e}")
+            return None, []
+        follow_ups = [q for q in data.get("follow_up_questions", []) if isinstance(q, str)]
+        return data.get("answer"), follow_ups
+
+    async def _answer_schedule(self, query: str, context: dict) -> AgentResponse:
+        """
+        스케줄러 결과로 SCHEDULE 응답 생성
+
+        Args:
+            query: 사용자 질문
+            context: 채팅 컨텍스트 (area_size, work_type, start_date 등)
+
+        Returns:
+            AgentResponse: SCHEDULE 응답
+        """
+        notes = []
+        area = parse_area(query)  # 질문에 명시된 평수가 저장된 슬롯보다 우선
+        if not area:
+            try:
+                area = int(float(context.get("area_size") or 0))
+            except (TypeError, ValueError, OverflowError):
+                area = None
+        if not area:
+            area = 32
+            notes.append("평수 미정 - 32평 기준으로 산정")
+
+        work_scope = resolve_work_scope(query, context)
+
+        start_date = parse_start_date(str(context.get("start_date") or "")) or parse_start_date(query)
+        if start_date is None:
+            start_date = next_monday()
+            notes.append(f"착공일 미정 - {start_date.isoformat()}(월) 기준")
+
+        scheduler = ConstraintScheduler()
+        bathrooms = parse_bathrooms(query)
+        if bathrooms is None:
+            bathrooms = context.get("bathrooms")
+        plan = scheduler.plan(build_phases(area, work_scope, bathrooms), start_date)
+        schedule = scheduler.to_project_schedule(plan, extra_warnings=notes)
+
+        summary = {
+            "area_size": area,
+            "work_scope": work_scope,
+            "start_date": schedule.start_date,
+            "total_days": schedule.total_days,
+            "phases": [[p.phase.name, p.start.isoformat(), p.end.isoformat()] for p in plan.phases.values()],
+            "critical_path": plan.critical_path,
+            "warnings": schedule.warnings[:5],
+        }
+        user_prompt = (
+            f"[고객 질문]\n{query}\n\n"
+            f"[공정 계획]\n{json.dumps(summary, ensure_ascii=False, separators=(',', ':'))}"
+        )
+        answer, follow_ups = await self._narrate(SCHEDULE_ANSWER_PROMPT, user_prompt)
+
+        if not answer:
+            end = max(p.end for p in plan.phases.values())
+            answer = (
+                f"{area}평 {work_scope} 공사는 {schedule.start_date}에 착공하면 "
+                f"총 {schedule.total_days}일, {end.isoformat()}에 마무리될 예정입니다. "
+                f"주요 공정 순서는 {' → '.join(plan.critical_path)} 입니다."
+            )
+            if plan.warnings:
+                answer += " 금요일/공휴일 소음 작업 제한으로 일부 일정이 조정되었어요."
+        if not follow_ups:
+            follow_ups = ["입주 예정일이 정해져 있나요?", "공사 중 거주하시나요?"]
+
+        return AgentResponse(
+            answer=answer,
+            data=schedule,
+            intent=AgentIntent.SCHEDULE,
+            follow_up_questions=follow_ups,
+        )
+
+    async def _answer_cost(self, query: str, estimate_input: EstimateInput) -> AgentResponse:
+        """
+        견적 엔진 결과로 COST 응답 생성
+
+        견적 수치는 엔진이 결정하고, LLM은 짧은 프롬프트로 answer/후속 질문만 작성
+        LLM 호출 실패 시 템플릿 문장으로 응답
+
+        Args:
+            query: 사용자 질문
+            estimate_input: 견적 입력
+
+        Returns:
+            AgentResponse: COST 응답
+        """
+        estimate = estimate_cost(estimate_input)
+        summary = {
+            "area_size": estimate.area_size,
+            "work_scope": estimate.work_scope,
+            "breakdown": [[item.category, item.total] for item in estimate.breakdown],
+            "grand_total": estimate.grand_total,
+            "contingency": estimate.contingency,
+            "final_total": estimate.final_total,
+            "assumptions": estimate.assumptions,
+        }
+        price = parse_price(query)
+        market = await get_executor().run_io(self._market_benchmark, estimate_input, price)
+        if market is not None:
+            summary["market"] = market.to_prompt_dict()
+        if price:
+            summary["customer_price"] = price
+        user_prompt = (
+            f"[고객 질문]\n{query}\n\n"
+            f"[견적 결과]\n{json.dumps(summary, ensure_ascii=False, separators=(',', ':'))}"
+        )
+
+        answer, follow_ups = await self._narrate(COST_ANSWER_PROMPT, user_prompt)
+
+        if not answer:
+            largest = max(estimate.breakdown, key=lambda item: item.total, default=None)
+            answer = (
+                f"{estimate.area_size}평 {estimate.work_scope} 공사 기준으로 "
+                f"예비비 포함 약 {estimate.final_total:,}만원 정도 예상됩니다."
+            )
+            if largest is not None:
+                answer += f" 가장 큰 비중은 {largest.category}({largest.total:,}만원)입니다."
+            answer += f" {GRADE_LABELS[estimate_input.grade]} 자재 기준이라 자재 등급에 따라 달라질 수 있어요."
+            if market is not None and market.verdict:
+                answer += (
+                    f" 말씀하신 {price:,}만원은 비슷한 공사 {market.count}건 중 "
+                    f"하위 {round(market.price_percentile * 100)}% 수준으로 {market.verdict}입니다."
+                )
+        if not follow_ups:
+            follow_ups = ["어떤 자재 등급을 원하세요?", "공사 시작 예정일이 언제인가요?"]
+
+        return AgentResponse(
+            answer=answer,
+            data=estimate,
+            intent=AgentIntent.COST,
+            follow_up_questions=follow_ups,
+        )
+
+    async def _answer_price_check(self, query: str, context: dict) -> Optional[AgentResponse]:
+        """
+        가격 적정성 질문에 기록 통계로 답변 (LLM 호출 없음)
+
+        질문에 금액이 없으면 최근 견적(previous_cost_estimate)의 예비비 포함 금액을 비교
+
+        Args:
+            query: 사용자 질문
+            context: 세션 슬롯이 합쳐진 컨텍스트
+
+        Returns:
+            Optional[AgentResponse]: 비교할 금액/평수나 기록이 없으면 None (일반 경로로 처리)
+        """
+        previous = context.get("previous_cost_estimate") or {}
+        price, label = parse_price(query), "말씀하신"
+        if not price:
+            price, label = (
+                previous.get("final_total") or previous.get("finalTotal")
+                or previous.get("grand_total") or previous.get("grandTotal")
+            ), "이전 견적"
+        area = parse_area(query) or context.get("area_size") or previous.get("area_size") or previous.get("areaSize")
+        try:
+            price, area = int(float(price or 0)), int(float(area or 0))
+        except (TypeError, ValueError):
+            return None
+        if price <= 0 or area <= 0:
+            return None
+
+        estimate_input = build_estimate_input(query, {**context, "area_size": area})
+        scope = previous.get("work_scope") or previous.get("workScope")
+        if scope and not context.get("work_type") and stated_work_scope(query) is None:
+            estimate_input.work_scope = scope
+        market = await get_executor().run_io(self._market_benchmark, estimate_input, price)
+        if market is None or market.price_percentile is None:
+            return None
+
+        answer = (
+            f"{label} {price:,}만원은 비슷한 {area}평 {estimate_input.work_scope} 공사 {market.count}건 중 "
+            f"하위 {round(market.price_percentile * 100)}% 수준으로 {market.verdict}입니다."
+        )
+        low, high = market.total_percentiles.get("p25"), market.total_percentiles.get("p75")
+        if low and high:
+            answer += f" 비슷한 공사는 보통 {low:,}~{high:,}만원 선이에요."
+        if not market.sufficient:
+            answer += f" 아직 기록이 {market.count}건뿐이라 참고용으로 봐주세요."
+        return AgentResponse(
+            answer=answer,
+            intent=AgentIntent.COST,
+            follow_up_questions=["업체 견적을 받아 비교해 드릴까요?", "자재 등급을 바꾸면 얼마나 달라지는지 볼까요?"],
+        )
+
+    @staticmethod
+    def _market_benchmark(estimate_input: EstimateInput, price: Optional[int] = None) -> Optional[Benchmark]:
+        """비슷한 공사의 기록 통계 (업체 제안가 우선, 표본이 부족하면 전체 기록)"""
+        store = get_estimate_store()
+        location = " ".join(part for part in (estimate_input.city, estimate_input.district) if part)
+        fallback = None
+        for source in ("offer", ANY):
+            result = store.benchmark(
+                estimate_input.work_scope,
+                area_size=estimate_input.area_size,
+                location=location,
+                source=source,
+                price=price,
+            )
+            if result is not None and result.sufficient:
+                return result
+            fallback = fallback or result
+        return fallback
 
     def _parse_response(self, content: str) -> AgentResponse:
         """LLM 응답을 AgentResponse로 파싱"""
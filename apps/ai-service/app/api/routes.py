@@ -1,8 +1,13 @@
 """
 API 라우터
 """
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+import os
+
+from dataclasses import asdict
+from typing import List, Optional
+
+from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile
+from pydantic import BaseModel, ValidationError
 
 from app.models.schemas import (
     ChatRequest,
@@ -19,8 +24,34 @@ from app.models.schemas import (
     EnhancePromptResponse,
     GenerateDesignRequest,
     GenerateDesignResponse,
+    # Cost engine schemas
+    CostGridRequest,
+    CostGridResponse,
+    ContractorOfferRequest,
+    EstimateBenchmarkResponse,
+    # Scheduler schemas
+    MultiProjectScheduleRequest,
+    MultiProjectScheduleResponse,
+    ProjectScheduleResult,
 )
-from app.agents import get_manager_agent, get_architect_agent, get_designer_agent
+from app import agents  # 에이전트 모듈은 핸들러에서 처음 접근할 때 임포트
+from app.config import settings
+from app.core.admission import get_admission
+from app.core.executor import get_executor
+from app.api.uploads import check_upload, read_upload_bytes, spool_request_body
+from app.core.loop_monitor import get_loop_monitor
+from app.core.responses import FastJSONResponse
+from app.core.semantic_cache import get_answer_cache
+from app.core.session import get_session_store
+from app.core.state import get_state_backend
+from app.core.warmup import get_warmup
+from app.services.analysis_store import get_analysis_store
+from app.services.cost_engine import GRADES, estimate_grid
+from app.services.estimate_store import SOURCES, ANY, get_estimate_store
+from app.services.crew_scheduler import CrewScheduler, ProjectSpec
+from app.services.scheduler import Phase, build_phases
+from app.services.regions import parse_location
+from app.services.style_catalog import STYLE_DATA
 
 router = APIRouter()
 
@@ -34,15 +65,17 @@ async def chat(request: ChatRequest) -> AgentResponse:
 
     - **query**: 사용자 질문
     - **context**: 추가 컨텍스트 (평수, 위치, 공종 등)
+    - **session_id**: 세션 ID (응답의 session_id를 다음 요청에 전달하면 context 재전송 불필요)
 
     Returns:
         AgentResponse with answer, structured data, intent, and follow-up questions
     """
     try:
-        agent = await get_manager_agent()
+        agent = await agents.get_manager_agent()
         response = await agent.process_request(
             query=request.query,
             context=request.context or {},
+            session_id=request.session_id,
         )
         return response
     except Exception as e:
@@ -52,10 +85,21 @@ async def chat(request: ChatRequest) -> AgentResponse:
         )
 
 
+@router.get("/chat/cache/stats")
+async def chat_cache_stats():
+    """
+    시맨틱 캐시 통계
+
+    Returns:
+        히트율, 제거/만료 수, 표본 검증 오탐률 및 최근 오탐 사례
+    """
+    return get_answer_cache().stats()
+
+
 # ============== AI 건축사 (Architect Agent) ==============
 
 @router.post("/architect/analyze-floor-plan", response_model=FloorPlanAnalysis)
-async def analyze_floor_plan(request: FloorPlanAnalysisRequest) -> FloorPlanAnalysis:
+async def analyze_floor_plan(request: FloorPlanAnalysisRequest) -> FastJSONResponse:
     """
     도면 이미지 분석
 
@@ -67,7 +111,7 @@ async def analyze_floor_plan(request: FloorPlanAnalysisRequest) -> FloorPlanAnal
     - **property_type**: 건물 유형 (아파트/빌라/주택, 선택)
 
     Returns:
-        FloorPlanAnalysis: 도면 분석 결과 (구조물 목록, 방 개수, 면적 등)
+        FloorPlanAnalysis: 도면 분석 결과 (구조물 목록, 방 개수, 면적 등, 후속 요청용 analysis_id)
     """
     import traceback
     try:
@@ -85,7 +129,7 @@ async def analyze_floor_plan(request: FloorPlanAnalysisRequest) -> FloorPlanAnal
                 detail="image_url 또는 image_base64 중 하나를 제공해야 합니다."
             )
 
-        agent = await get_architect_agent()
+        agent = await agents.get_architect_agent()
         result = await agent.analyze_floor_plan(
             floor_plan_id=request.floor_plan_id,
             image_url=request.image_url,
@@ -93,7 +137,7 @@ async def analyze_floor_plan(request: FloorPlanAnalysisRequest) -> FloorPlanAnal
             property_type=request.property_type,
         )
         print(f"[DEBUG] analyze-floor-plan success")
-        return result
+        return FastJSONResponse(result)
     except HTTPException:
         raise
     except Exception as e:
@@ -105,13 +149,106 @@ async def analyze_floor_plan(request: FloorPlanAnalysisRequest) -> FloorPlanAnal
         )
 
 
+async def _analyze_uploaded_floor_plan(image_file, floor_plan_id: Optional[str], property_type: Optional[str]) -> FastJSONResponse:
+    """업로드된 도면 파일 분석 (multipart / raw body 공통)"""
+    try:
+        agent = await agents.get_architect_agent()
+        result = await agent.analyze_floor_plan(
+            floor_plan_id=floor_plan_id,
+            property_type=property_type,
+            image_file=image_file,
+        )
+        return FastJSONResponse(result)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"[ERROR] analyze-floor-plan upload failed: {type(e).__name__}: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"도면 분석 중 오류가 발생했습니다: {str(e)}"
+        )
+
+
+@router.post("/architect/analyze-floor-plan/upload", response_model=FloorPlanAnalysis)
+async def analyze_floor_plan_upload(
+    image: UploadFile = File(..., description="도면 이미지 파일"),
+    floor_plan_id: Optional[str] = Form(None),
+    property_type: Optional[str] = Form(None),
+) -> FastJSONResponse:
+    """
+    도면 이미지 분석 (multipart 업로드)
+
+    base64 JSON 대신 이미지 파일을 그대로 받아 스풀 버퍼에서 바로 디코딩합니다.
+
+    - **image**: 도면 이미지 파일 (png/jpeg/webp 등)
+    - **floor_plan_id**: 도면 ID (선택)
+    - **property_type**: 건물 유형 (선택)
+    """
+    return await _analyze_uploaded_floor_plan(check_upload(image), floor_plan_id, property_type)
+
+
+@router.post("/architect/analyze-floor-plan/raw", response_model=FloorPlanAnalysis)
+async def analyze_floor_plan_raw(
+    request: Request,
+    floor_plan_id: Optional[str] = None,
+    property_type: Optional[str] = None,
+) -> FastJSONResponse:
+    """
+    도면 이미지 분석 (raw body 스트리밍 업로드)
+
+    요청 본문 전체가 이미지 바이트입니다 (Content-Type: image/png 등).
+    대용량 스캔을 청크 단위로 스풀 파일에 받으며, 한도를 넘으면 즉시 413을 반환합니다.
+
+    - **floor_plan_id**: 도면 ID (쿼리, 선택)
+    - **property_type**: 건물 유형 (쿼리, 선택)
+    """
+    spool = await spool_request_body(request)
+    try:
+        return await _analyze_uploaded_floor_plan(spool, floor_plan_id, property_type)
+    finally:
+        spool.close()
+
+
+async def _resolve_analysis(
+    analysis: Optional[FloorPlanAnalysis],
+    analysis_id: Optional[str],
+    required: bool = True,
+) -> Optional[FloorPlanAnalysis]:
+    """
+    요청의 도면 분석 결과 확정 (서버 저장 analysis_id 우선)
+
+    Args:
+        analysis: 요청 본문에 포함된 분석 결과 (하위 호환)
+        analysis_id: 분석 응답의 analysis_id
+        required: 둘 다 없을 때 400 여부
+
+    Returns:
+        FloorPlanAnalysis: 파싱된 분석 결과 (저장소 객체는 공유되므로 읽기 전용)
+    """
+    if analysis_id:
+        stored = await get_analysis_store().get_async(analysis_id)
+        if stored is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"도면 분석 결과를 찾을 수 없습니다 (만료되었거나 잘못된 analysis_id): {analysis_id}"
+            )
+        return stored
+    if analysis is None and required:
+        raise HTTPException(
+            status_code=400,
+            detail="analysis_id 또는 floor_plan_analysis 중 하나를 제공해야 합니다."
+        )
+    return analysis
+
+
 @router.post("/architect/validate-demolition", response_model=DemolitionValidation)
-async def validate_demolition(request: DemolitionValidationRequest) -> DemolitionValidation:
+async def validate_demolition(request: DemolitionValidationRequest) -> FastJSONResponse:
     """
     철거 계획 검증
 
     선택된 구조물들의 철거가 안전한지 검증합니다.
 
+    - **analysis_id**: 도면 분석 응답의 analysis_id (floor_plan_analysis 대신 전달)
     - **floor_plan_analysis**: 도면 분석 결과
     - **selected_element_ids**: 철거할 구조물 라벨 목록
 
@@ -119,18 +256,19 @@ async def validate_demolition(request: DemolitionValidationRequest) -> Demolitio
         DemolitionValidation: 철거 검증 결과 (안전 여부, 위험도, 권장사항)
     """
     import traceback
+    analysis = await _resolve_analysis(request.floor_plan_analysis, request.analysis_id)
     try:
         print(f"[DEBUG] validate-demolition request received")
         print(f"[DEBUG] selected_element_ids: {request.selected_element_ids}")
-        print(f"[DEBUG] floor_plan_analysis elements count: {len(request.floor_plan_analysis.elements)}")
+        print(f"[DEBUG] floor_plan_analysis elements count: {len(analysis.elements)}")
 
-        agent = await get_architect_agent()
+        agent = await agents.get_architect_agent()
         result = await agent.validate_demolition_plan(
-            floor_plan_analysis=request.floor_plan_analysis,
+            floor_plan_analysis=analysis,
             selected_element_labels=request.selected_element_ids,
         )
         print(f"[DEBUG] validate-demolition success")
-        return result
+        return FastJSONResponse(result)
     except Exception as e:
         print(f"[ERROR] validate-demolition failed: {type(e).__name__}: {str(e)}")
         traceback.print_exc()
@@ -141,12 +279,13 @@ async def validate_demolition(request: DemolitionValidationRequest) -> Demolitio
 
 
 @router.post("/architect/check-design-feasibility", response_model=DesignFeasibility)
-async def check_design_feasibility(request: DesignFeasibilityRequest) -> DesignFeasibility:
+async def check_design_feasibility(request: DesignFeasibilityRequest) -> FastJSONResponse:
     """
     디자인 시공 가능성 검증
 
     제안된 디자인이 구조적으로 시공 가능한지 검증합니다.
 
+    - **analysis_id**: 도면 분석 응답의 analysis_id (floor_plan_analysis 대신 전달)
     - **floor_plan_analysis**: 도면 분석 결과
     - **demolition_plan**: 철거 계획
     - **design_image_url**: 디자인 이미지 URL (선택)
@@ -156,16 +295,69 @@ async def check_design_feasibility(request: DesignFeasibilityRequest) -> DesignF
     Returns:
         DesignFeasibility: 시공 가능성 검증 결과
     """
+    analysis = await _resolve_analysis(request.floor_plan_analysis, request.analysis_id)
     try:
-        agent = await get_architect_agent()
+        agent = await agents.get_architect_agent()
         result = await agent.check_design_feasibility(
-            floor_plan_analysis=request.floor_plan_analysis,
+            floor_plan_analysis=analysis,
             demolition_plan=request.demolition_plan,
             design_image_url=request.design_image_url,
             design_image_base64=request.design_image_base64,
             design_description=request.design_description,
         )
-        return result
+        return FastJSONResponse(result)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"디자인 검증 중 오류가 발생했습니다: {str(e)}"
+        )
+
+
+def _parse_json_form(model, value: str, field: str):
+    """multipart 폼의 JSON 문자열 필드를 Pydantic 모델로 변환"""
+    try:
+        return model.model_validate_json(value)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"{field} JSON 형식이 올바르지 않습니다: {e.errors()[:3]}")
+
+
+@router.post("/architect/check-design-feasibility/upload", response_model=DesignFeasibility)
+async def check_design_feasibility_upload(
+    demolition_plan: str = Form(..., description="철거 계획 (JSON)"),
+    analysis_id: Optional[str] = Form(None, description="서버 저장 분석 ID"),
+    floor_plan_analysis: Optional[str] = Form(None, description="도면 분석 결과 (JSON)"),
+    design_image: Optional[UploadFile] = File(None, description="디자인 이미지 파일"),
+    design_description: Optional[str] = Form(None),
+) -> FastJSONResponse:
+    """
+    디자인 시공 가능성 검증 (multipart 업로드)
+
+    - **demolition_plan**: 철거 계획 JSON 문자열
+    - **analysis_id**: 도면 분석 응답의 analysis_id (floor_plan_analysis 대신 전달)
+    - **floor_plan_analysis**: 도면 분석 결과 JSON 문자열
+    - **design_image**: 디자인 이미지 파일 (선택)
+    - **design_description**: 디자인 설명 (선택)
+    """
+    analysis = await _resolve_analysis(
+        (
+            _parse_json_form(FloorPlanAnalysis, floor_plan_analysis, "floor_plan_analysis")
+            if floor_plan_analysis and not analysis_id else None
+        ),
+        analysis_id,
+    )
+    demolition = _parse_json_form(DemolitionValidation, demolition_plan, "demolition_plan")
+    image_file = check_upload(design_image) if design_image is not None else None
+    try:
+        agent = await agents.get_architect_agent()
+        result = await agent.check_design_feasibility(
+            floor_plan_analysis=analysis,
+            demolition_plan=demolition,
+            design_description=design_description,
+            design_image_file=image_file,
+        )
+        return FastJSONResponse(result)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -175,30 +367,33 @@ async def check_design_feasibility(request: DesignFeasibilityRequest) -> DesignF
 
 class CleanSlateRequest(BaseModel):
     """Clean Slate 시각화 요청"""
-    floor_plan_analysis: FloorPlanAnalysis
+    analysis_id: Optional[str] = None
+    floor_plan_analysis: Optional[FloorPlanAnalysis] = None
     demolition_plan: DemolitionValidation
 
 
 @router.post("/architect/clean-slate")
-async def generate_clean_slate(request: CleanSlateRequest) -> dict:
+async def generate_clean_slate(request: CleanSlateRequest) -> FastJSONResponse:
     """
     Clean Slate 시각화 데이터 생성
 
     철거 후 상태를 시각화하기 위한 데이터를 생성합니다.
 
+    - **analysis_id**: 도면 분석 응답의 analysis_id (floor_plan_analysis 대신 전달)
     - **floor_plan_analysis**: 도면 분석 결과
     - **demolition_plan**: 철거 계획
 
     Returns:
         dict: Clean Slate 시각화 데이터
     """
+    analysis = await _resolve_analysis(request.floor_plan_analysis, request.analysis_id)
     try:
-        agent = await get_architect_agent()
+        agent = await agents.get_architect_agent()
         result = await agent.generate_clean_slate_visualization(
-            floor_plan_analysis=request.floor_plan_analysis,
+            floor_plan_analysis=analysis,
             demolition_plan=request.demolition_plan,
         )
-        return result
+        return FastJSONResponse(result)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -219,7 +414,7 @@ async def get_style_suggestions():
         List[StyleSuggestion]: 스타일 추천 목록
     """
     try:
-        agent = await get_designer_agent()
+        agent = await agents.get_designer_agent()
         styles = await agent.get_style_suggestions()
         return styles
     except Exception as e:
@@ -244,7 +439,7 @@ async def enhance_prompt(request: EnhancePromptRequest) -> EnhancePromptResponse
         EnhancePromptResponse: 강화된 프롬프트
     """
     try:
-        agent = await get_designer_agent()
+        agent = await agents.get_designer_agent()
         enhanced = await agent.enhance_prompt(
             user_input=request.user_input,
             style=request.style or "modern",
@@ -276,12 +471,68 @@ async def generate_design(request: GenerateDesignRequest) -> GenerateDesignRespo
     - **style**: 스타일 종류 (modern, minimalist, etc.)
     - **room_type**: 공간 유형
     - **user_request**: 사용자 자연어 요청 (선택)
+    - **reference_image_urls**: 레퍼런스 이미지 URL 목록 (선택, 팔레트/자재 톤 분석)
+    - **deep_style_analysis**: 레퍼런스 이미지 AI 심층 스타일 분석 여부 (선택)
+    - **analysis_id**: 도면 분석 응답의 analysis_id (floor_plan_analysis 대신 전달, 선택)
 
     Returns:
         GenerateDesignResponse: 생성된 이미지 정보
     """
+    return await _generate_design(request)
+
+
+@router.post("/designer/generate/upload", response_model=GenerateDesignResponse)
+async def generate_design_upload(
+    base_image: UploadFile = File(..., description="베이스 이미지 파일 (도면/Clean Slate)"),
+    style_prompt: Optional[str] = Form(None),
+    style: Optional[str] = Form("modern"),
+    room_type: Optional[str] = Form("living_room"),
+    user_request: Optional[str] = Form(None),
+    reference_image_urls: Optional[List[str]] = Form(None),
+    deep_style_analysis: bool = Form(False),
+    analysis_id: Optional[str] = Form(None, description="서버 저장 분석 ID"),
+    floor_plan_analysis: Optional[str] = Form(None, description="건축사 도면 분석 결과 (JSON)"),
+) -> GenerateDesignResponse:
+    """
+    인테리어 디자인 이미지 생성 (multipart 업로드)
+
+    /designer/generate와 같은 필드를 폼으로 받고, 베이스 이미지는 파일로 받습니다.
+
+    - **base_image**: 베이스 이미지 파일
+    - **analysis_id**: 도면 분석 응답의 analysis_id (선택)
+    - **floor_plan_analysis**: 도면 분석 결과 JSON 문자열 (선택)
+    - **reference_image_urls**: 레퍼런스 이미지 URL (같은 필드 반복)
+    """
+    image_file = check_upload(base_image)
+    request = GenerateDesignRequest(
+        style_prompt=style_prompt,
+        style=style,
+        room_type=room_type,
+        user_request=user_request,
+        reference_image_urls=reference_image_urls,
+        deep_style_analysis=deep_style_analysis,
+        analysis_id=analysis_id,
+        floor_plan_analysis=(
+            _parse_json_form(FloorPlanAnalysis, floor_plan_analysis, "floor_plan_analysis")
+            if floor_plan_analysis and not analysis_id else None
+        ),
+    )
+    return await _generate_design(
+        request,
+        base_image_bytes=await read_upload_bytes(image_file),
+        base_image_mime_type=base_image.content_type or "image/png",
+    )
+
+
+async def _generate_design(
+    request: GenerateDesignRequest,
+    base_image_bytes: Optional[bytes] = None,
+    base_image_mime_type: str = "image/png",
+) -> GenerateDesignResponse:
+    """디자인 생성 공통 처리 (JSON / multipart)"""
+    analysis = await _resolve_analysis(request.floor_plan_analysis, request.analysis_id, required=False)
     try:
-        agent = await get_designer_agent()
+        agent = await agents.get_designer_agent()
 
         # 사용자 요청이 있으면 프롬프트 강화
         style_prompt = request.style_prompt
@@ -299,19 +550,25 @@ async def generate_design(request: GenerateDesignRequest) -> GenerateDesignRespo
             style=request.style or "modern",
             room_type=request.room_type or "living_room",
             reference_image_urls=request.reference_image_urls,
-            floor_plan_analysis=request.floor_plan_analysis,  # 건축사 분석 결과
+            deep_style_analysis=request.deep_style_analysis,
+            floor_plan_analysis=analysis,  # 건축사 분석 결과
             viewpoint_request=request.user_request,  # 시점 정보 전달
+            base_image_bytes=base_image_bytes,
+            base_image_mime_type=base_image_mime_type,
         )
 
         return GenerateDesignResponse(
             success=result.get("success", False),
             image_url=result.get("image_url"),
+            image_variants=result.get("image_variants"),
+            source_image_url=result.get("source_image_url"),
             prompt_used=result.get("prompt_used", ""),
             style=result.get("style"),
             room_type=result.get("room_type"),
             model=result.get("model"),
             error=result.get("error"),
             note=result.get("note"),
+            cached=result.get("cached", False),
         )
     except Exception as e:
         raise HTTPException(
@@ -320,6 +577,260 @@ async def generate_design(request: GenerateDesignRequest) -> GenerateDesignRespo
         )
 
 
+# ============== 견적 엔진 (Cost Engine) ==============
+
+# 매트릭스 최대 칸 수 (평수 × 스타일 × 등급)
+MAX_GRID_CELLS = 20000
+
+
+@router.post("/estimate/grid", response_model=CostGridResponse)
+async def estimate_cost_grid(request: CostGridRequest) -> FastJSONResponse:
+    """
+    평수 × 스타일 × 등급 견적 매트릭스
+
+    견적 화면 슬라이더용. LLM 호출 없이 NumPy 한 번의 계산으로 전체 매트릭스를 반환합니다.
+    각 칸은 같은 조건의 김 반장 견적(cost 응답)과 동일한 값입니다.
+
+    - **areas** 또는 **area_min/area_max/area_step**: 평수 축
+    - **styles**: 스타일 목록 (미지정 시 전체)
+    - **grades**: 자재 등급 목록 (미지정 시 basic/standard/premium)
+    - **work_scope**: 시공 범위
+    - **location**: 위치 (권역별 노임단가 보정)
+    - **include_breakdown**: 공종별 소계 포함 여부
+
+    Returns:
+        CostGridResponse: [평수][스타일][등급] 매트릭스 (만원)
+    """
+    areas = request.areas or list(range(request.area_min, request.area_max + 1, request.area_step))
+    styles = request.styles or list(STYLE_DATA.keys())
+    grades = request.grades or list(GRADES)
+
+    if not areas or any(area <= 0 for area in areas):
+        raise HTTPException(status_code=400, detail="평수는 1 이상이어야 합니다")
+    if len(areas) * len(styles) * len(grades) > MAX_GRID_CELLS:
+        raise HTTPException(status_code=400, detail=f"매트릭스가 너무 큽니다 (최대 {MAX_GRID_CELLS}칸)")
+
+    city, _ = parse_location(request.location)
+    try:
+        grid = estimate_grid(
+            areas=areas,
+            styles=styles,
+            grades=grades,
+            work_scope=request.work_scope,
+            city=city,
+            bathrooms=request.bathrooms,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"견적 매트릭스 계산 중 오류가 발생했습니다: {str(e)}"
+        )
+
+    if not request.include_breakdown:
+        grid["category_totals"] = None
+
+    return FastJSONResponse(CostGridResponse(
+        areas=areas,
+        styles=styles,
+        grades=grades,
+        work_scope=request.work_scope,
+        **grid,
+    ))
+
+
+@router.get("/estimate/benchmark", response_model=EstimateBenchmarkResponse)
+async def estimate_benchmark(
+    category: str = "전체",
+    area_size: Optional[int] = None,
+    location: Optional[str] = None,
+    source: str = ANY,
+    price: Optional[int] = None,
+) -> EstimateBenchmarkResponse:
+    """
+    평당 단가 분포 / 가격 적정성 조회
+
+    기록된 견적·업체 제안가의 분위수 스케치에서 바로 계산합니다 (LLM 호출 없음, 다른 워커 기록은 주기적으로 반영).
+
+    - **category**: 공사 범위 (전체/욕실/주방/도배/바닥) 또는 "범위/공종" (예: 욕실/타일)
+    - **area_size**: 평수 (지정 시 총액 분위수, 평형대 통계 사용)
+    - **location**: 위치 (권역 통계 사용)
+    - **source**: estimate(김 반장 견적) / quote(전송 견적서) / offer(업체 제안가) / *(전체)
+    - **price**: 비교할 총액 (만원) - 백분위와 판정 반환
+
+    Returns:
+        EstimateBenchmarkResponse: 분위수 및 가격 백분위
+    """
+    if source != ANY and source not in SOURCES:
+        raise HTTPException(status_code=400, detail=f"source는 {', '.join(SOURCES)} 또는 * 이어야 합니다")
+    if price is not None and not area_size:
+        raise HTTPException(status_code=400, detail="price를 비교하려면 area_size가 필요합니다")
+
+    result = await get_executor().run_io(
+        get_estimate_store().benchmark, category, area_size=area_size, location=location, source=source, price=price
+    )
+    if result is None:
+        raise HTTPException(status_code=404, detail="해당 조건의 견적 기록이 없습니다")
+    return EstimateBenchmarkResponse(**asdict(result))
+
+
+@router.post("/estimate/offers")
+async def record_contractor_offer(request: ContractorOfferRequest):
+    """
+    업체 제안가 기록
+
+    업체가 보낸 실제 견적을 기록해 가격 적정성 통계(source=offer)에 반영합니다.
+    """
+    try:
+        await get_executor().run_io(
+            get_estimate_store().record,
+            source="offer",
+            category=request.work_scope,
+            area_size=request.area_size,
+            total=request.total_cost,
+            location=request.location,
+            breakdown=[(item.category, item.total) for item in request.breakdown],
+            extra={"contractor_id": request.contractor_id, "quote_id": request.quote_id},
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"업체 제안가 기록 중 오류가 발생했습니다: {str(e)}"
+        )
+    return {"recorded": True}
+
+
+# ============== 공정 스케줄러 (Scheduler) ==============
+
+# 한 번에 배치할 수 있는 최대 현장 / 공정 수
+MAX_SCHEDULE_PROJECTS = 50
+MAX_SCHEDULE_TASKS = 1000
+
+
+@router.post("/schedule/multi-project", response_model=MultiProjectScheduleResponse)
+async def schedule_multi_project(request: MultiProjectScheduleRequest) -> FastJSONResponse:
+    """
+    공유 크루 제약 다중 현장 일정
+
+    업체가 동시에 진행하는 여러 현장을 타일/목공/전기 등 공유 크루 수 안에서 충돌 없이 배치합니다.
+    LLM 호출 없이 우선순위 규칙 리스트 스케줄링 + 지역 탐색으로 계산하며, 현장별로 Friday Rule과 공휴일을 지킵니다.
+
+    - **projects**: 현장 목록 (phases 미지정 시 area_size/work_scope로 공정 생성)
+    - **crews**: 공종별 크루 수
+    - **max_workers_per_day**: 현장별 하루 투입 인원 상한
+    - **time_limit_ms**: 지역 탐색 시간 상한
+
+    Returns:
+        MultiProjectScheduleResponse: 현장별 ProjectSchedule (note에 배정 크루 표시), 크루 가동률
+    """
+    if not request.projects or len(request.projects) > MAX_SCHEDULE_PROJECTS:
+        raise HTTPException(status_code=400, detail=f"현장은 1~{MAX_SCHEDULE_PROJECTS}개까지 배치할 수 있습니다")
+    if any(count < 1 for count in request.crews.values()):
+        raise HTTPException(status_code=400, detail="크루 수는 1 이상이어야 합니다")
+
+    specs = []
+    for project in request.projects:
+        if project.phases:
+            phases = [
+                Phase(p.name, p.task or p.name, p.duration, p.workers, p.is_noise_work, tuple(p.predecessors))
+                for p in project.phases
+            ]
+        else:
+            phases = build_phases(project.area_size, project.work_scope, project.bathrooms)
+        specs.append(ProjectSpec(
+            project_id=project.project_id,
+            phases=phases,
+            start_date=project.start_date,
+            due_date=project.due_date,
+            priority=project.priority,
+        ))
+    if sum(len(spec.phases) for spec in specs) > MAX_SCHEDULE_TASKS:
+        raise HTTPException(status_code=400, detail=f"공정이 너무 많습니다 (최대 {MAX_SCHEDULE_TASKS}개)")
+
+    scheduler = CrewScheduler(
+        crew_capacity=request.crews,
+        max_workers_per_day=request.max_workers_per_day,
+        time_limit=request.time_limit_ms / 1000,
+    )
+    try:
+        result = await get_executor().run_cpu(scheduler.plan, specs)  # 애니타임 탐색 (프로세스 풀)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"다중 현장 일정 계산 중 오류가 발생했습니다: {str(e)}"
+        )
+
+    return FastJSONResponse(MultiProjectScheduleResponse(
+        projects=[
+            ProjectScheduleResult(
+                project_id=spec.project_id,
+                schedule=result.schedules[spec.project_id],
+                completion_date=result.completion_dates[spec.project_id].isoformat(),
+                tardiness_days=result.tardiness_days[spec.project_id],
+            )
+            for spec in specs
+        ],
+        crew_utilization=result.crew_utilization,
+        objective=result.objective,
+        iterations=result.iterations,
+        elapsed_ms=result.elapsed_ms,
+    ))
+
+
+# ============== 운영 (Admin) ==============
+
+@router.get("/admin/loop-monitor")
+async def loop_monitor_stats(top: int = 20, reset: bool = False):
+    """
+    이벤트 루프 지연 통계
+
+    - **lag**: 하트비트 지연 분위수/히스토그램 (ms)
+    - **top_blockers**: (라우트, 블로킹 위치)별 누적 정지 시간 상위 목록 + 캡처된 스택
+    - **recent_stalls**: 최근 정지 이력
+    - **reset**: true면 조회 후 통계 초기화
+    """
+    monitor = get_loop_monitor()
+    stats = monitor.stats(top=max(1, min(top, 100)))
+    if reset:
+        monitor.reset()
+    return stats
+
+
+@router.get("/admin/admission")
+async def admission_stats():
+    """
+    승인 제어 통계 (라우트 그룹별)
+
+    - **limit**: 목표 지연 기반으로 조정되는 현재 동시 실행 한도
+    - **admitted / shed**: 승인 수 / 거절 수 (queue_full, user_queue_full → 503/429, queue_timeout → 503)
+    - **cancelled**: 승인 후 클라이언트 연결 종료로 취소된 요청 수
+    - **latency_ms / queue_wait_ms**: 승인된 요청의 처리 시간 / 대기 시간 분위수
+    """
+    return {"enabled": settings.admission_enabled, "groups": get_admission().stats()}
+
+
+@router.get("/admin/state")
+async def state_backend_stats():
+    """
+    공유 상태 백엔드 및 캐시 통계
+
+    워커마다 다른 값이 나오는 메모리 LRU 히트율과 백엔드(공유) 정보를 함께 반환합니다.
+    """
+    designer = await agents.get_designer_agent()
+    return {
+        "worker_pid": os.getpid(),
+        "backend": get_state_backend().stats(),
+        "caches": designer.cache_stats() + [
+            get_analysis_store().stats(),
+            get_session_store().stats(),
+            get_answer_cache().stats(),
+        ],
+    }
+
+
 # ============== 헬스 체크 ==============
 
 @router.get("/health")
@@ -329,3 +840,18 @@ async def health():
         "status": "healthy",
         "agents": ["김 반장 (Manager)", "AI 건축사 (Architect)", "AI 디자이너 (Designer)"],
     }
+
+
+@router.get("/ready")
+async def ready():
+    """
+    Readiness 체크
+
+    시작 웜업(에이전트 초기화, 커넥션, 캐시 적재)이 끝나기 전에는 503을 반환합니다.
+    로드밸런서/쿠버네티스 readiness 프로브용이며, liveness는 /health를 사용하세요.
+    """
+    warmup = get_warmup()
+    return FastJSONResponse(
+        {"status": "ready" if warmup.ready else "warming_up", **warmup.status()},
+        status_code=200 if warmup.ready else 503,
+    )
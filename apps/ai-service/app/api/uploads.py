@@ -0,0 +1,102 @@
+"""
+바이너리 업로드 처리
+base64 JSON 대신 multipart / raw body로 이미지를 받아 스풀 버퍼에서 바로 디코딩
+
+- 작은 업로드는 메모리, upload_spool_max_bytes 초과분은 임시 파일로 스풀 (multipart는 Starlette가 동일하게 스풀)
+- raw body: Content-Length 선검사 + 스트리밍 중 누적 크기 검사 → 한도 초과 시 즉시 413
+- 디코딩은 파일 객체에서 바로 (base64 문자열 → bytes → BytesIO 복사 없음)
+"""
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Optional
+
+from fastapi import HTTPException, Request, UploadFile
+
+from app.config import settings
+from app.core.executor import get_executor
+
+# 허용 이미지 MIME 타입
+IMAGE_CONTENT_TYPES = {
+    "image/png",
+    "image/jpeg",
+    "image/webp",
+    "image/gif",
+    "image/bmp",
+    "image/tiff",
+}
+
+
+def _check_content_type(content_type: Optional[str]) -> str:
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    if media_type not in IMAGE_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=415,
+            detail=f"지원하지 않는 이미지 형식입니다: {media_type or '없음'} (허용: {', '.join(sorted(IMAGE_CONTENT_TYPES))})"
+        )
+    return media_type
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"업로드 크기 한도({settings.upload_max_bytes // (1024 * 1024)}MB)를 초과했습니다."
+    )
+
+
+def check_upload(upload: UploadFile) -> BinaryIO:
+    """
+    multipart 업로드 파일 검증
+
+    Args:
+        upload: FastAPI UploadFile (이미 스풀 파일에 저장된 상태)
+
+    Returns:
+        BinaryIO: 처음 위치로 되감은 스풀 파일 객체
+    """
+    _check_content_type(upload.content_type)
+    if upload.size is not None and upload.size > settings.upload_max_bytes:
+        raise _too_large()
+    upload.file.seek(0)
+    return upload.file
+
+
+async def spool_request_body(request: Request) -> SpooledTemporaryFile:
+    """
+    raw body 이미지를 스풀 파일로 스트리밍 수신
+
+    Args:
+        request: Content-Type이 image/*인 요청
+
+    Returns:
+        SpooledTemporaryFile: 처음 위치로 되감은 스풀 파일 (호출자가 close)
+    """
+    _check_content_type(request.headers.get("content-type"))
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.upload_max_bytes:
+        raise _too_large()
+
+    spool = SpooledTemporaryFile(max_size=settings.upload_spool_max_bytes)
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > settings.upload_max_bytes:
+                raise _too_large()
+            if received > settings.upload_spool_max_bytes:
+                # 디스크로 넘어간 뒤의 쓰기는 스레드 풀에서
+                await get_executor().run_io(spool.write, chunk)
+            else:
+                spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    if received == 0:
+        spool.close()
+        raise HTTPException(status_code=400, detail="요청 본문에 이미지가 없습니다.")
+    spool.seek(0)
+    return spool
+
+
+async def read_upload_bytes(file: BinaryIO) -> bytes:
+    """스풀 파일 전체를 bytes로 읽기 (외부 API에 원본을 그대로 넘겨야 할 때만 사용)"""
+    file.seek(0)
+    return await get_executor().run_io(file.read)
@@ -0,0 +1,4 @@
+"""
+CLI 모듈
+오프라인 배치 작업 / 운영 도구 (python -m app.cli.<tool>)
+"""
@@ -0,0 +1,130 @@
+"""
+임포트 시간 프로파일 CLI
+
+새 인터프리터에서 `python -X importtime -c "import main"`을 실행해
+모듈별 누적 임포트 시간과 패키지별 자체 시간을 집계
+
+- 콜드 스타트 중 임포트가 차지하는 시간을 숫자로 확인
+- 지연 로드 대상 SDK(google.generativeai, grpc, httpx 등)가 시작 시점에 로드되면 경고
+- --budget-ms 초과 시 종료 코드 1 (CI 회귀 검사용)
+
+Usage:
+    python -m app.cli.import_profile
+    python -m app.cli.import_profile --top 40 --repeat 5 --budget-ms 900
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List
+
+# 서버 시작 시 로드되면 안 되는 무거운 모듈 (첫 사용 시 app.core.lazy로 로드)
+LAZY_MODULES = ("google.generativeai", "grpc", "google.protobuf", "httpx", "redis", "openai", "anthropic")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+@dataclass
+class ImportRecord:
+    """-X importtime 한 줄"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def profile_imports(module: str = "main") -> List[ImportRecord]:
+    """
+    새 인터프리터에서 모듈 임포트 시간 측정
+
+    Args:
+        module: 임포트할 모듈 (현재 디렉토리 기준)
+
+    Returns:
+        List[ImportRecord]: 임포트 순서대로의 기록
+    """
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1", "PYTHONWARNINGS": "ignore"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{module} 임포트 실패:\n{result.stderr[-2000:]}")
+
+    records = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append(ImportRecord(name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return records
+
+
+def total_ms(records: List[ImportRecord], module: str) -> float:
+    """대상 모듈의 누적 임포트 시간 (ms)"""
+    for record in reversed(records):
+        if record.module == module:
+            return record.cumulative_us / 1000
+    return sum(r.self_us for r in records) / 1000
+
+
+def by_package(records: List[ImportRecord]) -> Dict[str, float]:
+    """최상위 패키지별 자체 시간 합계 (ms)"""
+    totals: Dict[str, float] = defaultdict(float)
+    for record in records:
+        totals[record.module.split(".")[0]] += record.self_us / 1000
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def run(module: str, top: int, repeat: int) -> float:
+    totals = []
+    records: List[ImportRecord] = []
+    for _ in range(repeat):
+        records = profile_imports(module)
+        totals.append(total_ms(records, module))
+    median = statistics.median(totals)
+
+    print(f"import {module}: 중앙값 {median:.0f}ms (최소 {min(totals):.0f} / 최대 {max(totals):.0f}, {repeat}회)")
+    print(f"로드된 모듈 수: {len(records)}\n")
+
+    print(f"{'패키지':<28} | {'자체 ms':>8}")
+    print("-" * 40)
+    for package, ms in list(by_package(records).items())[:top]:
+        print(f"{package:<28} | {ms:>8.1f}")
+
+    print(f"\n{'모듈 (누적 상위)':<48} | {'누적 ms':>8} | {'자체 ms':>8}")
+    print("-" * 72)
+    for record in sorted(records, key=lambda r: r.cumulative_us, reverse=True)[:top]:
+        name = "  " * min(record.depth - 1, 6) + record.module
+        print(f"{name:<48} | {record.cumulative_us / 1000:>8.1f} | {record.self_us / 1000:>8.1f}")
+
+    loaded = {record.module for record in records}
+    eager = [name for name in LAZY_MODULES if name in loaded]
+    if eager:
+        print(f"\n⚠️ 시작 시점에 로드된 지연 로드 대상: {', '.join(eager)}")
+    return median
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="임포트 시간 프로파일")
+    parser.add_argument("--module", default="main", help="임포트할 모듈")
+    parser.add_argument("--top", type=int, default=25, help="출력할 상위 항목 수")
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--budget-ms", type=float, default=None, help="중앙값이 이 값을 넘으면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    median = run(args.module, args.top, max(1, args.repeat))
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"\n❌ 임포트 시간 {median:.0f}ms > 예산 {args.budget_ms:.0f}ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+프롬프트 강화 캐시 배치 갱신 CLI
+
+자주 쓰이는 요청 문구 x 스타일 x 공간 조합을 미리 Gemini로 강화하여 공유 캐시(상태 백엔드)에 저장
+서버는 시작 시 이 캐시를 메모리로 적재하므로 흔한 요청은 Gemini 호출 없이 응답
+
+Usage:
+    python -m app.cli.prompt_cache refresh
+    python -m app.cli.prompt_cache refresh --phrases data/prompt_phrases.txt --styles modern natural --force
+    python -m app.cli.prompt_cache stats
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from app.config import settings
+from app.agents.designer_agent import DesignerAgent, load_prompt_phrases
+
+
+async def _refresh(args: argparse.Namespace) -> int:
+    phrases = load_prompt_phrases(args.phrases)
+    if not phrases:
+        print(f"문구 파일이 비어 있거나 없습니다: {args.phrases}")
+        return 1
+
+    agent = DesignerAgent()
+    started = time.perf_counter()
+    counts = await agent.refresh_prompt_cache(
+        phrases,
+        styles=args.styles,
+        room_types=args.rooms,
+        force=args.force,
+        concurrency=args.concurrency,
+    )
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"총 {counts['total']}개 조합: 기존 캐시 {counts['cached']}, "
+        f"신규 생성 {counts['generated']}, 실패 {counts['failed']} ({elapsed:.1f}s)"
+    )
+    await agent.close()
+    return 1 if counts["failed"] else 0
+
+
+async def _stats() -> int:
+    agent = DesignerAgent()
+    result = await agent.warm_prompt_cache(generate=False)
+    print(f"상태 백엔드: {settings.state_backend}")
+    print(f"저장된 프롬프트 강화 결과: {result['loaded']}개")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="프롬프트 강화 캐시 관리")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    refresh = subparsers.add_parser("refresh", help="상위 문구 조합 일괄 강화")
+    refresh.add_argument("--phrases", default=settings.prompt_cache_phrases_file, help="문구 파일 경로")
+    refresh.add_argument("--styles", nargs="*", help="스타일 목록 (기본: 전체)")
+    refresh.add_argument("--rooms", nargs="*", help="공간 목록 (기본: 전체)")
+    refresh.add_argument("--force", action="store_true", help="캐시된 항목도 다시 생성")
+    refresh.add_argument("--concurrency", type=int, default=4, help="동시 Gemini 호출 수")
+
+    subparsers.add_parser("stats", help="캐시 현황")
+
+    args = parser.parse_args(argv)
+    if args.command == "refresh":
+        return asyncio.run(_refresh(args))
+    return asyncio.run(_stats())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
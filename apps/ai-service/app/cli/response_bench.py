@@ -0,0 +1,130 @@
+"""
+응답 직렬화/압축 벤치마크 CLI
+
+FloorPlanAnalysis 응답을 요소 수별로 만들어
+FastAPI 기본 경로와 FastJSONResponse 경로의 바이트 수 / CPU 시간을 비교
+
+- 기본 경로: model_dump → response_model 재검증 → jsonable_encoder → json.dumps
+- 최적화 경로: pydantic-core to_json (재검증/중간 dict 없음)
+- 압축: gzip(레벨 설정값), brotli(설치 시)
+
+Usage:
+    python -m app.cli.response_bench
+    python -m app.cli.response_bench --elements 50 200 1000 --repeat 200
+"""
+import argparse
+import gzip
+import json
+import random
+import sys
+import time
+from typing import Callable, List
+
+from fastapi.encoders import jsonable_encoder
+
+from app.config import settings
+from app.core.compression import brotli
+from app.core.responses import FastJSONResponse
+from app.models.schemas import FloorPlanAnalysis, StructuralElement, StructuralElementType
+
+NOTES = [
+    "내력벽으로 판단되어 철거 시 구조 검토가 필요합니다. 관리사무소 및 구조기술사 확인 후 진행하세요.",
+    "비내력벽(경량 칸막이)으로 철거 가능하나 전기 배선이 지나갈 수 있으니 사전 확인이 필요합니다.",
+    "발코니 확장 구간으로 단열/결로 대책이 필요하며, 확장 시 관할 구청 신고 대상입니다.",
+    "욕실 방수층 손상 주의 - 철거 후 방수 재시공 필수 (최소 2회 도포 + 담수 테스트 24시간).",
+]
+
+
+def build_analysis(element_count: int, seed: int = 0) -> FloorPlanAnalysis:
+    """벤치마크용 도면 분석 결과 (한글 메모 포함)"""
+    rng = random.Random(seed)
+    types = list(StructuralElementType)
+    elements = [
+        StructuralElement(
+            element_type=rng.choice(types),
+            label=f"{rng.choice(['거실', '주방', '침실', '욕실', '현관'])} 요소 {i}",
+            position={
+                "x": round(rng.uniform(0, 100), 2),
+                "y": round(rng.uniform(0, 100), 2),
+                "width": round(rng.uniform(1, 40), 2),
+                "height": round(rng.uniform(1, 40), 2),
+            },
+            is_demolishable=rng.random() < 0.6,
+            demolition_risk=rng.choice(["none", "low", "medium", "high"]),
+            demolition_note=rng.choice(NOTES),
+            confidence=round(rng.random(), 3),
+        )
+        for i in range(element_count)
+    ]
+    return FloorPlanAnalysis(
+        floor_plan_id=f"bench-{element_count}",
+        image_dimensions={"width": 4096, "height": 2731},
+        estimated_area=32.0,
+        room_count=3,
+        bathroom_count=2,
+        elements=elements,
+        analysis_summary="32평 판상형 아파트. 거실-주방 일체형 구조이며 안방 욕실 포함.",
+        warnings=["발코니 확장 여부 확인 필요", "배관 위치 실측 필요"],
+    )
+
+
+def default_path(model: FloorPlanAnalysis) -> bytes:
+    """FastAPI 기본 응답 경로 재현 (response_model 재검증 + jsonable_encoder + json.dumps)"""
+    validated = FloorPlanAnalysis.model_validate(model.model_dump(by_alias=True))
+    content = jsonable_encoder(validated)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(model: FloorPlanAnalysis) -> bytes:
+    """FastJSONResponse 경로"""
+    return FastJSONResponse(model).body
+
+
+def _cpu_us(fn: Callable[[], bytes], repeat: int) -> float:
+    fn()  # 워밍업
+    started = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return (time.process_time() - started) / repeat * 1e6
+
+
+def run(element_counts: List[int], repeat: int) -> None:
+    header = f"{'elements':>8} | {'path':<8} | {'bytes':>9} | {'serialize µs':>12} | {'gzip bytes':>10} | {'gzip µs':>8}"
+    if brotli is not None:
+        header += f" | {'br bytes':>9} | {'br µs':>8}"
+    print(header)
+    print("-" * len(header))
+
+    for count in element_counts:
+        model = build_analysis(count)
+        for name, serialize in (("default", default_path), ("fast", fast_path)):
+            body = serialize(model)
+            serialize_us = _cpu_us(lambda: serialize(model), repeat)
+            gz = gzip.compress(body, compresslevel=settings.compression_gzip_level)
+            gzip_us = _cpu_us(lambda: gzip.compress(body, compresslevel=settings.compression_gzip_level), repeat)
+            line = f"{count:>8} | {name:<8} | {len(body):>9,} | {serialize_us:>12,.0f} | {len(gz):>10,} | {gzip_us:>8,.0f}"
+            if brotli is not None:
+                br = brotli.compress(body, quality=settings.compression_brotli_quality)
+                br_us = _cpu_us(lambda: brotli.compress(body, quality=settings.compression_brotli_quality), repeat)
+                line += f" | {len(br):>9,} | {br_us:>8,.0f}"
+            print(line)
+
+        # 두 경로의 결과가 같은 JSON인지 확인
+        if json.loads(default_path(model)) != json.loads(fast_path(model)):
+            print(f"  ⚠️ {count}개 요소: 기본 경로와 최적화 경로의 JSON이 다릅니다")
+
+    if brotli is None:
+        print("\nbrotli 미설치 - gzip만 측정 (pip install brotli)")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="응답 직렬화/압축 벤치마크")
+    parser.add_argument("--elements", type=int, nargs="*", default=[20, 100, 500], help="구조물 요소 수 목록")
+    parser.add_argument("--repeat", type=int, default=100, help="측정 반복 횟수")
+    args = parser.parse_args(argv)
+    run(args.elements, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+콜드 스타트 벤치마크 CLI
+
+uvicorn 프로세스를 새로 띄워 첫 healthy 응답까지 걸린 시간(time-to-first-healthy-response)을 측정
+
+- 프로세스 생성 → 임포트 → lifespan 시작 → 포트 바인딩 → GET 헬스 체크 200 까지
+- 같은 측정을 여러 번 반복해 최소/중앙값/최대 출력, 임포트 시간(import_profile)과 나란히 표시
+- --budget-s 초과 시 종료 코드 1 (CI 회귀 검사용)
+
+Usage:
+    python -m app.cli.startup_bench
+    python -m app.cli.startup_bench --runs 5 --budget-s 3 --env EXECUTOR_PROCESS_WORKERS=0
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional
+
+from app.cli.import_profile import profile_imports, total_ms
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _healthy(url: str) -> bool:
+    try:
+        with urllib.request.urlopen(url, timeout=1.0) as response:
+            return response.status == 200
+    except (urllib.error.URLError, ConnectionError, OSError):
+        return False
+
+
+def measure_startup(path: str, timeout: float, env: Dict[str, str]) -> float:
+    """
+    uvicorn 한 번 기동 후 첫 healthy 응답까지 시간 측정
+
+    Args:
+        path: 헬스 체크 경로
+        timeout: 최대 대기 시간 (초)
+        env: 추가 환경 변수
+
+    Returns:
+        float: 첫 200 응답까지 걸린 시간 (초)
+    """
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}{path}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, "PYTHONWARNINGS": "ignore", **env},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"서버가 시작 중 종료되었습니다:\n{process.stderr.read().decode(errors='replace')[-2000:]}")
+            if _healthy(url):
+                return time.perf_counter() - started
+            time.sleep(0.01)
+        raise TimeoutError(f"{timeout:.0f}초 안에 {path}가 200을 반환하지 않았습니다")
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def run(runs: int, path: str, timeout: float, env: Dict[str, str]) -> float:
+    import_times = [total_ms(profile_imports("main"), "main") for _ in range(min(runs, 3))]
+    startups: List[float] = []
+    for i in range(runs):
+        elapsed = measure_startup(path, timeout, env)
+        startups.append(elapsed)
+        print(f"  run {i + 1}: {elapsed * 1000:,.0f}ms")
+
+    median = statistics.median(startups)
+    import_ms = statistics.median(import_times)
+    print()
+    print(f"첫 healthy 응답 ({path}): 중앙값 {median * 1000:,.0f}ms (최소 {min(startups) * 1000:,.0f} / 최대 {max(startups) * 1000:,.0f}, {runs}회)")
+    print(f"  import main:            {import_ms:,.0f}ms")
+    print(f"  인터프리터/lifespan/바인딩: {max(0.0, median * 1000 - import_ms):,.0f}ms")
+    return median
+
+
+def _parse_env(values: Optional[List[str]]) -> Dict[str, str]:
+    env = {}
+    for item in values or []:
+        key, _, value = item.partition("=")
+        env[key] = value
+    return env
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="콜드 스타트 벤치마크")
+    parser.add_argument("--runs", type=int, default=3, help="기동 반복 횟수")
+    parser.add_argument("--path", default="/api/health", help="헬스 체크 경로")
+    parser.add_argument("--timeout", type=float, default=60.0, help="기동 최대 대기 시간 (초)")
+    parser.add_argument("--env", action="append", metavar="KEY=VALUE", help="서버 프로세스에 넘길 환경 변수 (반복 가능)")
+    parser.add_argument("--budget-s", type=float, default=None, help="중앙값이 이 값을 넘으면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    median = run(max(1, args.runs), args.path, args.timeout, _parse_env(args.env))
+    if args.budget_s is not None and median > args.budget_s:
+        print(f"\n❌ 콜드 스타트 {median:.2f}s > 예산 {args.budget_s:.2f}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -26,6 +26,115 @@ class Settings(BaseSettings):
     default_llm_model: str = "gemini-1.5-flash"
     llm_temperature: float = 0.7
     llm_max_tokens: int = 4096
+    chat_llm_model: str = "gemini-1.5-flash-8b"  # 일반 대화(CHAT)용 저비용 모델
+    intent_router_threshold: float = 0.3  # 이 점수 미만이면 전체 프롬프트로 폴백
+
+    # Knowledge Base (TECHNICAL 답변용 로컬 검색)
+    knowledge_base_file: str = "data/knowledge_base.json"
+    knowledge_direct_answer_threshold: float = 0.6  # 대표 질문 유사도가 이 이상이면 LLM 없이 바로 답변
+    knowledge_min_score: float = 15.0  # 이 BM25 점수 미만 문단은 프롬프트에 넣지 않음
+    knowledge_top_k: int = 3
+
+    # Cache
+    cache_dir: str = ".cache"
+    image_cache_max_entries: int = 512
+    image_cache_ttl_seconds: int = 3600  # Replicate 출력 URL은 약 1시간 후 만료
+    reference_cache_max_entries: int = 2048
+    reference_phash_max_distance: int = 6  # 64비트 dHash 기준 근사 일치 허용 거리
+    reference_thumbnail_size: int = 512
+    prompt_cache_max_entries: int = 4096
+    prompt_cache_phrases_file: str = "data/prompt_phrases.txt"
+    prompt_cache_warmup_generate: bool = False  # 시작 시 누락된 조합을 Gemini로 생성할지 여부
+    prompt_cache_warmup_concurrency: int = 4
+    control_image_cache_max_entries: int = 256  # lineart/depth map PNG (도면/시점별로 결정적)
+
+    # State Backend (캐시/세션 공유 저장소 - uvicorn --workers N / 다중 노드 배포 시 히트율 유지)
+    state_backend: str = "file"  # memory(워커별) | file(cache_dir, 같은 호스트) | sqlite(같은 호스트) | redis(노드 간)
+    state_sqlite_file: str = ".cache/state.sqlite3"
+    state_redis_url: str = "redis://localhost:6379/0"  # Redis 호환 서버 (redis 패키지 필요)
+    state_key_prefix: str = "ai-service"  # Redis 키 접두사 (한 서버를 여러 환경이 공유할 때 구분)
+    state_file_max_entries: int = 10000  # file 백엔드 namespace별 최대 파일 수 (초과 시 오래된 파일부터 삭제, 0이면 무제한)
+    state_file_sweep_every: int = 500  # file 백엔드 namespace별 정리 주기 (쓰기 횟수)
+
+    # Semantic Cache (표현만 다른 같은 질문의 답변 재사용 - TECHNICAL/COST)
+    semantic_cache_enabled: bool = True
+    semantic_cache_threshold: float = 0.8  # 정규화된 질문 간 코사인 유사도
+    semantic_cache_max_entries: int = 4096
+    semantic_cache_ttl_seconds: int = 6 * 3600
+    semantic_cache_audit_rate: float = 0.05  # 히트 중 새로 계산해 오탐 여부를 검증할 비율
+    semantic_cache_audit_min_similarity: float = 0.4  # 검증 시 두 답변이 이 유사도 미만이면 오탐
+
+    # Estimate Store (견적/업체 제안가 이력 + 평당 단가 분위수)
+    estimate_store_file: str = ".cache/estimates.sqlite3"
+    estimate_sketch_relative_accuracy: float = 0.01  # 분위수 상대 오차
+    estimate_benchmark_min_samples: int = 5  # 이 표본 수 미만이면 더 넓은 권역/평형대로 조회
+    estimate_store_sync_seconds: float = 1.0  # 조회 시 다른 워커 기록을 따라 읽는 최소 간격
+
+    # Analysis Store (도면 분석 결과 서버 보관 - 후속 요청은 analysis_id만 전달)
+    analysis_store_max_entries: int = 1024  # 메모리에 파싱된 채로 유지할 분석 수
+    analysis_store_ttl_seconds: int = 7 * 24 * 3600  # 0이면 만료 없음
+
+    # Executor (이미지 렌더링/디코딩을 이벤트 루프 밖에서 실행)
+    executor_process_workers: int = 2  # lineart/depth map 렌더링 프로세스 수 (0이면 스레드 풀 사용)
+    executor_thread_workers: int = 8  # base64 디코딩/이미지 열기 스레드 수
+    executor_shm_min_bytes: int = 64 * 1024  # 이 크기 이상 bytes는 pickle 대신 공유 메모리로 전달
+    executor_start_method: str = "spawn"  # spawn | forkserver (fork는 이벤트 루프 상태를 복제하므로 비권장)
+
+    # Upload (multipart / raw body 이미지 업로드)
+    upload_max_bytes: int = 25 * 1024 * 1024  # 업로드 최대 크기 (초과 시 413)
+    upload_spool_max_bytes: int = 1024 * 1024  # 이 크기까지는 메모리, 초과분은 임시 파일로 스풀
+    upload_image_max_side: int = 4096  # 업로드 이미지 디코딩 시 긴 변 최대 픽셀 (큰 스캔은 축소 디코딩)
+
+    # Response Compression (gzip, brotli 설치 시 br 우선)
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024  # 이 크기(bytes) 미만 응답은 압축하지 않음
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4  # 0~11 (높을수록 작지만 CPU 사용 증가)
+
+    # Admission Control (비싼 엔드포인트 동시 실행/대기열 제한 - 과부하 시 429/503 + Retry-After)
+    admission_enabled: bool = True
+    admission_user_header: str = "x-user-id"  # 사용자별 공정성 기준 (없으면 X-Forwarded-For/클라이언트 IP)
+    admission_trusted_proxies: str = ""  # 사용자 헤더/X-Forwarded-For를 믿을 프록시 IP/CIDR (쉼표 구분, 비우면 접속 IP만 사용)
+    admission_min_concurrency: int = 2  # 지연이 목표를 넘어도 유지할 최소 동시 실행 수
+    admission_max_queue: int = 32  # 라우트 그룹별 대기열 최대 길이 (초과 시 503)
+    admission_max_queue_per_user: int = 4  # 사용자별 최대 대기 수 (초과 시 429)
+    admission_queue_timeout_seconds: float = 30  # 대기 최대 시간 (초과 시 503)
+    admission_floor_plan_target_latency_ms: float = 20000  # 도면 분석/시공 검증/Clean Slate (Gemini Vision)
+    admission_floor_plan_max_concurrency: int = 16
+    admission_generate_target_latency_ms: float = 90000  # 디자인 생성 (Replicate)
+    admission_generate_max_concurrency: int = 8
+
+    # Request Cancellation (클라이언트 연결 종료 시 처리 중인 요청 취소 - Replicate 예측도 취소)
+    cancel_on_disconnect: bool = True
+
+    # Loop Monitor (이벤트 루프 블로킹 탐지)
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval_ms: float = 50  # 하트비트 주기
+    loop_monitor_stall_threshold_ms: float = 100  # 이 이상 루프가 멈추면 스택/라우트 캡처
+    loop_monitor_max_blockers: int = 100  # 추적할 (라우트, 블로킹 위치) 조합 수
+    loop_monitor_stack_depth: int = 20
+
+    # Chat Session
+    session_max_entries: int = 10000
+    session_ttl_seconds: int = 24 * 3600
+    session_recent_turns: int = 6  # 원문으로 유지할 최근 턴 수 (사용자+어시스턴트 각각 1턴)
+    session_summary_max_lines: int = 20
+    session_prompt_token_budget: int = 1200  # 대화 이력 블록 최대 토큰 (근사치)
+
+    # Warm-up (시작 시 에이전트/커넥션/캐시 준비 - 완료 전까지 /api/ready 503)
+    warmup_enabled: bool = True
+    warmup_agents: bool = True  # 세 에이전트 생성 + initialize (SDK 로드, 모델 객체 생성)
+    warmup_connections: bool = True  # Gemini/Replicate 커넥션 풀 TLS 핸드셰이크 (생성 비용 없음)
+    warmup_caches: bool = True  # 스타일/프롬프트/생성 결과/컨트롤 이미지 캐시를 공유 저장소에서 적재
+    warmup_probe_generation: bool = False  # 최소 토큰 Gemini 생성 1회 (API 비용 발생)
+    warmup_timeout_seconds: float = 60  # 초과 시 남은 단계를 건너뛰고 ready (0이면 제한 없음)
+    warmup_blocking: bool = False  # True면 웜업이 끝난 뒤 포트 바인딩 (readiness 프로브가 없는 환경용)
+
+    # Media (생성 이미지 재호스팅)
+    media_dir: str = "media"
+    media_url_path: str = "/media"
+    media_public_base_url: Optional[str] = None  # 예: https://ai.example.com (없으면 상대 경로)
+    rehosted_image_cache_ttl_seconds: int = 30 * 24 * 3600  # 재호스팅된 URL은 만료되지 않음
 
     # Server
     host: str = "0.0.0.0"
@@ -2,3 +2,12 @@
 Core 모듈
 공통 유틸리티 및 핵심 기능
 """
+from .cache import ResultCache, PerceptualHashCache
+from .hashing import stable_hash, stable_seed
+from .semantic_cache import SemanticCache
+from .state import StateBackend, get_state_backend
+
+__all__ = [
+    "ResultCache", "PerceptualHashCache", "SemanticCache", "StateBackend",
+    "get_state_backend", "stable_hash", "stable_seed",
+]
@@ -0,0 +1,493 @@
+"""
+승인 제어 (Admission Control)
+Gemini/Replicate가 느려질 때 비싼 엔드포인트 요청이 무한히 쌓이지 않도록 라우트 그룹별로 동시 실행 수와 대기열 제한
+
+- 동시 실행 한도: 목표 지연(target latency) 기반 AIMD
+  완료 지연 > 목표 → 한도 x0.9 (같은 한도에서 시작한 요청당 한 번만), 여유 있게 완료 → 한도 +1/한도
+- 대기열: 그룹별 최대 길이 + 사용자별 최대 대기 수, 사용자 간 라운드 로빈으로 슬롯 배분
+  (한 사용자의 연속 요청이 다른 사용자를 굶기지 않음)
+- 과부하 시 즉시 거절: 대기열 가득 → 503, 사용자 대기 한도 초과 → 429, 대기 시간 초과 → 503 (모두 Retry-After)
+- 순수 ASGI 미들웨어: 승인 전에는 요청 본문을 읽지 않음 → 대기 중인 요청이 이미지를 메모리에 들고 있지 않음
+- 대기 중 연결 종료 감지: 대기하는 동안 receive()를 감시해 http.disconnect가 오면 대기열에서 제거
+  (한 메시지에 담긴 작은 본문만 미리 읽어 하위 앱에 그대로 전달, 여러 청크로 나뉜 큰 업로드는 감시하지 않음)
+- 사용자 헤더/X-Forwarded-For는 신뢰하는 프록시(게이트웨이)에서 온 요청일 때만 사용
+  (그 외에는 클라이언트가 헤더를 바꿔 가며 사용자별 대기 한도를 우회할 수 있으므로 접속 주소 기준)
+- 승인/거절/대기/지연 통계 → 관리자 엔드포인트
+"""
+import asyncio
+import ipaddress
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from app.config import settings
+from app.core.responses import FastJSONResponse
+from app.core.sketch import QuantileSketch
+
+# 라우트 그룹 (같은 다운스트림을 쓰는 비싼 엔드포인트끼리 한도 공유, 경로 접두사 기준)
+ROUTE_GROUPS = {
+    "floor_plan": (
+        "/api/architect/analyze-floor-plan",
+        "/api/architect/check-design-feasibility",
+        "/api/architect/clean-slate",
+    ),
+    "generate": (
+        "/api/designer/generate",
+    ),
+}
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+# 한도 감소 배수 / Retry-After 상한 (초)
+DECREASE_FACTOR = 0.9
+MAX_RETRY_AFTER_SECONDS = 120
+
+
+class AdmissionRejected(Exception):
+    """과부하로 요청 거절 (status_code: 429 | 503)"""
+
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Waiter:
+    """대기 중인 요청"""
+    user: str
+    future: asyncio.Future
+    enqueued_at: float
+
+
+class AdmissionController:
+    """
+    라우트 그룹 하나의 승인 제어기
+
+    Usage:
+        controller = AdmissionController("generate", target_latency_ms=90000, max_concurrency=8)
+        started = await controller.acquire(user)   # AdmissionRejected 가능
+        try:
+            ...
+        finally:
+            controller.release(started)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        target_latency_ms: float,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        max_queue: int = 32,
+        max_queue_per_user: int = 4,
+        queue_timeout_seconds: float = 30.0,
+    ):
+        self.name = name
+        self.target_latency_ms = target_latency_ms
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.max_queue = max_queue
+        self.max_queue_per_user = max_queue_per_user
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self._limit = float(self.max_concurrency)
+        self._inflight = 0
+        self._queues: Dict[str, Deque[_Waiter]] = {}
+        self._rotation: Deque[str] = deque()  # 대기 요청이 있는 사용자 (라운드 로빈 순서)
+        self._queued = 0
+        self._last_decrease_at = 0.0
+        self._latency = QuantileSketch()
+        self._queue_wait = QuantileSketch()
+        self.admitted = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.shed: Dict[str, int] = {"queue_full": 0, "user_queue_full": 0, "queue_timeout": 0}
+
+    @property
+    def limit(self) -> int:
+        """현재 동시 실행 한도"""
+        return int(self._limit)
+
+    def can_admit(self) -> bool:
+        """대기 없이 바로 승인 가능한지"""
+        return self._inflight < self.limit and not self._queued
+
+    async def acquire(self, user: str) -> float:
+        """
+        실행 슬롯 획득 (필요하면 대기)
+
+        Args:
+            user: 공정성 기준 사용자 키
+
+        Returns:
+            float: 승인 시각 (release에 전달)
+
+        Raises:
+            AdmissionRejected: 대기열 초과/대기 시간 초과
+        """
+        if self.can_admit():
+            return self._admit(0.0)
+
+        if self._queued >= self.max_queue:
+            self._reject("queue_full")
+            raise AdmissionRejected(503, "queue_full", self.retry_after())
+        queue = self._queues.get(user)
+        if queue is not None and len(queue) >= self.max_queue_per_user:
+            self._reject("user_queue_full")
+            raise AdmissionRejected(429, "user_queue_full", self.retry_after(len(queue)))
+
+        waiter = _Waiter(user, asyncio.get_running_loop().create_future(), time.perf_counter())
+        if queue is None:
+            queue = self._queues[user] = deque()
+            self._rotation.append(user)
+        queue.append(waiter)
+        self._queued += 1
+
+        try:
+            await asyncio.wait_for(waiter.future, timeout=self.queue_timeout_seconds or None)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 슬롯을 넘겨받은 직후 취소됨 → 다음 대기자에게 반납
+                self._inflight -= 1
+                self._dispatch()
+            else:
+                self._remove(waiter)
+            if isinstance(e, asyncio.CancelledError):
+                self.cancelled += 1  # 대기 중 클라이언트 연결 종료 등
+                raise
+            self._reject("queue_timeout")
+            raise AdmissionRejected(503, "queue_timeout", self.retry_after())
+        return waiter.future.result()
+
+    def release(self, started_at: float, cancelled: bool = False) -> None:
+        """
+        슬롯 반납 + 완료 지연으로 한도 조정
+
+        Args:
+            started_at: acquire가 반환한 승인 시각
+            cancelled: 클라이언트 연결 종료 등으로 취소됨 (지연 표본/한도 조정에서 제외)
+        """
+        if cancelled:
+            self.cancelled += 1
+            self._inflight -= 1
+            self._dispatch()
+            return
+
+        latency_ms = (time.perf_counter() - started_at) * 1000
+        self._latency.add(latency_ms)
+        self.completed += 1
+
+        if latency_ms > self.target_latency_ms:
+            # 마지막 감소 이후 승인된 요청만 감소 유발 (느린 요청 여러 개가 한꺼번에 한도를 무너뜨리지 않도록)
+            if started_at >= self._last_decrease_at:
+                self._limit = max(float(self.min_concurrency), self._limit * DECREASE_FACTOR)
+                self._last_decrease_at = time.perf_counter()
+        elif self._inflight >= self.limit:
+            # 한도까지 쓰이는 중에 목표 안에 끝남 → 한도 증가 여지
+            self._limit = min(float(self.max_concurrency), self._limit + 1.0 / self._limit)
+
+        self._inflight -= 1
+        self._dispatch()
+
+    def retry_after(self, ahead: Optional[int] = None) -> int:
+        """
+        Retry-After 추정 (초): 앞선 대기 수 x 평균 지연 / 동시 실행 한도
+
+        Args:
+            ahead: 앞선 대기 요청 수 (기본: 그룹 전체 대기 수)
+        """
+        mean_ms = self._latency.mean or self.target_latency_ms
+        ahead = self._queued if ahead is None else ahead
+        seconds = (ahead + 1) * mean_ms / 1000 / max(1, self.limit)
+        return max(1, min(MAX_RETRY_AFTER_SECONDS, math.ceil(seconds)))
+
+    def _admit(self, waited_seconds: float) -> float:
+        self._inflight += 1
+        self.admitted += 1
+        self._queue_wait.add(waited_seconds * 1000)
+        return time.perf_counter()
+
+    def _reject(self, reason: str) -> None:
+        self.shed[reason] += 1
+
+    def _dispatch(self) -> None:
+        """빈 슬롯을 사용자 라운드 로빈 순서로 대기자에게 배분"""
+        while self._inflight < self.limit and self._rotation:
+            user = self._rotation.popleft()
+            queue = self._queues[user]
+            waiter = queue.popleft()
+            self._queued -= 1
+            if queue:
+                self._rotation.append(user)
+            else:
+                del self._queues[user]
+            if waiter.future.done():
+                continue  # 취소/시간 초과된 대기자
+            waiter.future.set_result(self._admit(time.perf_counter() - waiter.enqueued_at))
+
+    def _remove(self, waiter: _Waiter) -> None:
+        queue = self._queues.get(waiter.user)
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        self._queued -= 1
+        if not queue:
+            del self._queues[waiter.user]
+            self._rotation.remove(waiter.user)
+
+    def stats(self) -> dict:
+        """그룹 통계"""
+
+        def q(sketch: QuantileSketch, value: float) -> Optional[float]:
+            result = sketch.quantile(value)
+            return round(result, 1) if result is not None else None
+
+        return {
+            "name": self.name,
+            "limit": self.limit,
+            "max_concurrency": self.max_concurrency,
+            "target_latency_ms": self.target_latency_ms,
+            "inflight": self._inflight,
+            "queued": self._queued,
+            "queued_users": len(self._queues),
+            "admitted": self.admitted,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "shed": dict(self.shed),
+            "shed_total": sum(self.shed.values()),
+            "latency_ms": {"p50": q(self._latency, 0.5), "p95": q(self._latency, 0.95)},
+            "queue_wait_ms": {"p50": q(self._queue_wait, 0.5), "p95": q(self._queue_wait, 0.95)},
+        }
+
+
+class AdmissionRegistry:
+    """경로 접두사 → 라우트 그룹 승인 제어기"""
+
+    def __init__(self, controllers: Dict[str, AdmissionController], groups: Dict[str, Tuple[str, ...]]):
+        self.controllers = controllers
+        self._prefixes: List[Tuple[str, AdmissionController]] = sorted(
+            ((prefix, controllers[name]) for name, prefixes in groups.items() if name in controllers for prefix in prefixes),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+
+    def match(self, path: str) -> Optional[AdmissionController]:
+        """요청 경로의 승인 제어기 (대상이 아니면 None)"""
+        for prefix, controller in self._prefixes:
+            if path == prefix or path.startswith(prefix + "/"):
+                return controller
+        return None
+
+    def stats(self) -> List[dict]:
+        """그룹별 통계"""
+        return [controller.stats() for controller in self.controllers.values()]
+
+
+def parse_trusted_proxies(value: Union[str, Iterable[str], None]) -> Tuple[IPNetwork, ...]:
+    """
+    신뢰하는 프록시 목록 파싱
+
+    Args:
+        value: IP/CIDR 목록 (쉼표 구분 문자열 또는 시퀀스, 예: "10.0.0.0/8,127.0.0.1")
+
+    Returns:
+        Tuple: 네트워크 목록 (잘못된 항목은 경고 후 제외)
+    """
+    if not value:
+        return ()
+    items = value.split(",") if isinstance(value, str) else value
+    networks = []
+    for item in items:
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            networks.append(ipaddress.ip_network(item, strict=False))
+        except ValueError:
+            print(f"[Admission] Ignoring invalid trusted proxy: {item!r}")
+    return tuple(networks)
+
+
+def _is_trusted(address: Optional[str], trusted_proxies: Sequence[IPNetwork]) -> bool:
+    if not address or not trusted_proxies:
+        return False
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted_proxies)
+
+
+def _user_key(scope: dict, user_header: str, trusted_proxies: Sequence[IPNetwork] = ()) -> str:
+    """
+    공정성 기준 사용자 키
+
+    접속 주소가 신뢰하는 프록시일 때만 사용자 헤더 → X-Forwarded-For 순으로 사용,
+    그 외에는 접속 주소 (헤더는 클라이언트가 임의로 바꿀 수 있음)
+
+    Args:
+        scope: ASGI scope
+        user_header: 게이트웨이가 설정하는 사용자 헤더 이름
+        trusted_proxies: 신뢰하는 프록시 네트워크 목록
+    """
+    client = scope.get("client")
+    peer = client[0] if client else None
+    if not _is_trusted(peer, trusted_proxies):
+        return "ip:" + (peer or "unknown")
+
+    headers = dict(scope.get("headers") or [])
+    user = headers.get(user_header.lower().encode("latin-1"))
+    if user:
+        return "user:" + user.decode("latin-1")
+    forwarded = headers.get(b"x-forwarded-for")
+    if forwarded:
+        # 오른쪽(가까운 홉)부터 신뢰하는 프록시를 건너뛰고 처음 나오는 주소 (왼쪽 항목은 클라이언트가 위조 가능)
+        hops = [hop.strip() for hop in forwarded.decode("latin-1").split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if not _is_trusted(hop, trusted_proxies):
+                return "ip:" + hop
+        if hops:
+            return "ip:" + hops[0]
+    return "ip:" + peer
+
+
+class AdmissionMiddleware:
+    """
+    비싼 엔드포인트 승인 제어 순수 ASGI 미들웨어
+
+    승인될 때까지 하위 앱을 호출하지 않음 → 대기 중에는 연결 종료 감시용 첫 메시지(작은 본문)만 읽고
+    여러 청크로 나뉜 업로드 본문은 읽지 않음
+    """
+
+    def __init__(self, app, user_header: str = "x-user-id", trusted_proxies: Union[str, Iterable[str], None] = None):
+        self.app = app
+        self.user_header = user_header
+        self.trusted_proxies = parse_trusted_proxies(trusted_proxies)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") != "POST":
+            await self.app(scope, receive, send)
+            return
+        controller = get_admission().match(scope.get("path", ""))
+        if controller is None:
+            await self.app(scope, receive, send)
+            return
+
+        replay: List[dict] = []
+        try:
+            started_at = await self._acquire(controller, _user_key(scope, self.user_header, self.trusted_proxies), receive, replay)
+        except AdmissionRejected as e:
+            response = FastJSONResponse(
+                {
+                    "detail": "요청이 많아 잠시 후 다시 시도해주세요.",
+                    "reason": e.reason,
+                    "route_group": controller.name,
+                    "retry_after": e.retry_after,
+                },
+                status_code=e.status_code,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        if started_at is None:
+            print(f"[Admission] Client left while queued for {controller.name}: {scope.get('path')}")
+            return
+
+        async def replay_receive():
+            if replay:
+                return replay.pop(0)  # 대기 중 미리 읽은 본문
+            return await receive()
+
+        cancelled = False
+        try:
+            await self.app(scope, replay_receive, send)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            controller.release(started_at, cancelled=cancelled)
+
+    @staticmethod
+    async def _acquire(controller: AdmissionController, user: str, receive, replay: List[dict]) -> Optional[float]:
+        """
+        대기 중 연결 종료를 감시하며 슬롯 획득
+
+        Args:
+            controller: 라우트 그룹 승인 제어기
+            user: 공정성 기준 사용자 키
+            receive: ASGI receive
+            replay: 감시 중 읽은 메시지를 담을 목록 (하위 앱에 순서대로 전달)
+
+        Returns:
+            Optional[float]: 승인 시각 (대기 중 연결이 끊기면 None)
+
+        Raises:
+            AdmissionRejected: 대기열 초과/대기 시간 초과
+        """
+        if controller.can_admit():
+            return await controller.acquire(user)  # 대기 없음 → 감시/선읽기 생략
+
+        acquire = asyncio.ensure_future(controller.acquire(user))
+        watch: Optional[asyncio.Future] = None
+        try:
+            while True:
+                if watch is None:
+                    watch = asyncio.ensure_future(receive())
+                await asyncio.wait({acquire, watch}, return_when=asyncio.FIRST_COMPLETED)
+                if watch.done():
+                    message = watch.result()
+                    watch = None
+                    if message["type"] == "http.disconnect":
+                        acquire.cancel()
+                        await asyncio.wait({acquire})
+                        if not acquire.cancelled() and acquire.exception() is None:
+                            controller.release(acquire.result(), cancelled=True)  # 끊긴 직후 승인됨
+                        return None
+                    replay.append(message)
+                    if message.get("more_body", False):
+                        # 여러 청크로 나뉜 본문은 대기 중에 더 읽지 않음 (메모리에 쌓지 않도록 감시 중단)
+                        return await acquire
+                    # 본문을 다 읽은 뒤의 receive()는 연결 종료 때만 반환 → 계속 감시
+                if acquire.done():
+                    return acquire.result()
+        except BaseException:
+            # 승인된 슬롯을 넘기지 못하고 나감 (요청 task 취소 등) → 반납
+            if acquire.done() and not acquire.cancelled() and acquire.exception() is None:
+                controller.release(acquire.result(), cancelled=True)
+            raise
+        finally:
+            if not acquire.done():
+                acquire.cancel()
+            if watch is not None:
+                watch.cancel()
+
+
+# 싱글톤 인스턴스
+_admission: Optional[AdmissionRegistry] = None
+
+
+def get_admission() -> AdmissionRegistry:
+    """AdmissionRegistry 싱글톤 반환"""
+    global _admission
+    if _admission is None:
+        policies = {
+            "floor_plan": (settings.admission_floor_plan_target_latency_ms, settings.admission_floor_plan_max_concurrency),
+            "generate": (settings.admission_generate_target_latency_ms, settings.admission_generate_max_concurrency),
+        }
+        controllers = {
+            name: AdmissionController(
+                name,
+                target_latency_ms=target_latency_ms,
+                max_concurrency=max_concurrency,
+                min_concurrency=settings.admission_min_concurrency,
+                max_queue=settings.admission_max_queue,
+                max_queue_per_user=settings.admission_max_queue_per_user,
+                queue_timeout_seconds=settings.admission_queue_timeout_seconds,
+            )
+            for name, (target_latency_ms, max_concurrency) in policies.items()
+        }
+        _admission = AdmissionRegistry(controllers, ROUTE_GROUPS)
+    return _admission
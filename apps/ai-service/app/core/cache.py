@@ -0,0 +1,326 @@
+"""
+결과 캐시
+TTL + LRU 인메모리 캐시, 선택적으로 공유 상태 백엔드(app.core.state)에 저장하여 워커/노드/재시작 간 공유
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+from app.core.executor import get_executor
+from app.core.hashing import hamming_distance
+from app.core.state import StateBackend
+
+# 메모리 조회 미스 표시 (None도 저장 가능한 값이므로 별도 객체)
+_MISS = object()
+
+
+class ResultCache:
+    """
+    TTL + LRU 결과 캐시
+
+    - 메모리: OrderedDict 기반 LRU (max_entries 초과 시 가장 오래 안 쓴 항목 제거)
+    - 공유(선택): backend 지정 시 namespace=name으로 함께 저장 (file/sqlite/redis)
+      같은 호스트/다른 노드의 uvicorn 워커나 재시작 후에도 조회 가능
+    - near_cache=False: 메모리 사본 없이 항상 백엔드에서 읽음 (세션처럼 다른 워커가 갱신하는 값)
+
+    키는 stable_hash() 결과 같은 hex 문자열을 사용 (워커와 무관하게 같은 키 → 히트율 유지)
+    값은 JSON 직렬화 가능해야 함
+    (encode/decode 지정 시 메모리에는 원래 객체, 백엔드에는 encode 결과를 저장)
+    이벤트 루프에서는 get_async/set_async 사용 (메모리 히트는 그대로, 백엔드 I/O만 루프 밖에서)
+
+    Usage:
+        cache = ResultCache("generated_images", max_entries=512, ttl_seconds=3600, backend=get_state_backend())
+        await cache.set_async(key, {"image_url": "..."})
+        cached = await cache.get_async(key)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        backend: Optional[StateBackend] = None,
+        encode: Optional[Callable[[Any], Any]] = None,
+        decode: Optional[Callable[[Any], Any]] = None,
+        near_cache: bool = True,
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # 공유되지 않는 백엔드(프로세스 내 메모리)는 메모리 LRU와 중복이므로 사용하지 않음
+        self._backend = backend if backend is not None and backend.shared else None
+        self._encode = encode
+        self._decode = decode
+        self._near_cache = near_cache or self._backend is None
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._shared_loaded = False  # load_shared 실행(또는 시작) 여부
+        self.hits = 0
+        self.misses = 0
+        self.backend_errors = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시 조회 (만료/미존재 시 None)"""
+        value = self._get_local(key)
+        if value is not _MISS:
+            return value
+        # 메모리에 없으면 공유 백엔드 확인 (다른 워커가 저장했을 수 있음)
+        return self._resolve(key, self._read_backend(key))
+
+    async def get_async(self, key: str) -> Optional[Any]:
+        """get의 비동기 버전 (백엔드 조회가 이벤트 루프를 막지 않음)"""
+        value = self._get_local(key)
+        if value is not _MISS:
+            return value
+        entry = None
+        if self._backend is not None:
+            try:
+                entry = self._decode_entry(await self._backend.get_entry_async(self.name, key))
+            except Exception as e:
+                self._backend_failed("read", e)
+        return self._resolve(key, entry)
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """캐시 저장 (ttl_seconds 미지정 시 기본 TTL 사용)"""
+        ttl = self._store_local(key, value, ttl_seconds)
+        if self._backend is None:
+            return
+        try:
+            self._backend.set(self.name, key, self._encode_value(value), ttl)
+        except Exception as e:
+            self._backend_failed("write", e)
+
+    async def set_async(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """set의 비동기 버전"""
+        ttl = self._store_local(key, value, ttl_seconds)
+        if self._backend is None:
+            return
+        try:
+            await self._backend.set_async(self.name, key, self._encode_value(value), ttl)
+        except Exception as e:
+            self._backend_failed("write", e)
+
+    def delete(self, key: str) -> None:
+        """캐시 항목 삭제"""
+        with self._lock:
+            self._entries.pop(key, None)
+        if self._backend is not None:
+            try:
+                self._backend.delete(self.name, key)
+            except Exception as e:
+                self._backend_failed("delete", e)
+
+    async def delete_async(self, key: str) -> None:
+        """delete의 비동기 버전"""
+        with self._lock:
+            self._entries.pop(key, None)
+        if self._backend is not None:
+            try:
+                await self._backend.delete_async(self.name, key)
+            except Exception as e:
+                self._backend_failed("delete", e)
+
+    def keys(self) -> list:
+        """메모리에 적재된 키 목록 (LRU 순서)"""
+        with self._lock:
+            return list(self._entries.keys())
+
+    def load_shared(self) -> int:
+        """
+        공유 백엔드의 유효 항목을 메모리로 적재 (웜업용, 최근에 저장된 max_entries개까지)
+
+        오래된 것부터 적재 → 가장 최근 항목이 LRU의 마지막(가장 늦게 밀려남)
+
+        Returns:
+            int: 적재된 항목 수
+        """
+        self._shared_loaded = True
+        if self._backend is None or not self._near_cache:
+            return 0
+        try:
+            keys = self._backend.recent_keys(self.name, self.max_entries)
+        except Exception as e:
+            self._backend_failed("keys", e)
+            return 0
+
+        loaded = 0
+        for key in keys:
+            entry = self._read_backend(key)
+            if entry is None:
+                continue
+            self._store(key, *entry)
+            loaded += 1
+        return loaded
+
+    async def load_shared_async(self) -> int:
+        """load_shared의 비동기 버전 (백엔드 스캔은 스레드 풀)"""
+        return await get_executor().run_io(self.load_shared)
+
+    async def ensure_shared_loaded_async(self) -> None:
+        """아직 적재하지 않았으면 한 번만 load_shared_async (웜업이 꺼져 있거나 끝나기 전의 첫 요청용)"""
+        if not self._shared_loaded:
+            self._shared_loaded = True  # 동시에 들어온 다른 요청은 적재를 기다리지 않고 진행
+            await self.load_shared_async()
+
+    def stats(self) -> dict:
+        """캐시 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "backend": self._backend.kind if self._backend is not None else "memory",
+                "backend_errors": self.backend_errors,
+            }
+
+    def _store(self, key: str, expires_at: Optional[float], value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get_local(self, key: str) -> Any:
+        """메모리 조회 (없거나 만료 시 _MISS)"""
+        if not self._near_cache:
+            return _MISS
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISS
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return _MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _resolve(self, key: str, entry: Optional[Tuple[Optional[float], Any]]) -> Optional[Any]:
+        """백엔드 조회 결과 반영 (히트면 메모리에 적재)"""
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        expires_at, value = entry
+        if self._near_cache:
+            self._store(key, expires_at, value)
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def _store_local(self, key: str, value: Any, ttl_seconds: Optional[float]) -> Optional[float]:
+        """메모리 저장 후 적용할 TTL 반환"""
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        if self._near_cache:
+            self._store(key, time.time() + ttl if ttl else None, value)
+        return ttl
+
+    def _encode_value(self, value: Any) -> Any:
+        return self._encode(value) if self._encode is not None else value
+
+    def _decode_entry(self, entry: Optional[Tuple[Optional[float], Any]]) -> Optional[Tuple[Optional[float], Any]]:
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if self._decode is not None:
+            value = self._decode(value)
+        return expires_at, value
+
+    def _read_backend(self, key: str) -> Optional[Tuple[Optional[float], Any]]:
+        if self._backend is None:
+            return None
+        try:
+            return self._decode_entry(self._backend.get_entry(self.name, key))
+        except Exception as e:
+            # 백엔드 장애/손상된 항목은 미스로 처리 (캐시 때문에 요청이 실패하지 않도록)
+            self._backend_failed("read", e)
+            return None
+
+    def _backend_failed(self, operation: str, error: Exception) -> None:
+        with self._lock:
+            self.backend_errors += 1
+        print(f"[Cache:{self.name}] Backend {operation} failed: {type(error).__name__}: {error}")
+
+
+class PerceptualHashCache:
+    """
+    지각 해시 기반 근사 캐시
+
+    정확히 같은 해시가 없으면 해밍 거리 max_distance 이내의 항목을 반환
+    → 같은 이미지가 재압축/리사이즈되어 들어와도 캐시 히트
+
+    저장은 ResultCache에 위임 (키: 16자리 hex 해시)
+
+    Usage:
+        cache = PerceptualHashCache("reference_styles", max_distance=6, backend=get_state_backend())
+        description = cache.get(phash)
+        cache.set(phash, "warm oak floors, ...")
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_distance: int = 6,
+        max_entries: int = 2048,
+        ttl_seconds: Optional[float] = None,
+        backend: Optional[StateBackend] = None,
+    ):
+        self.name = name
+        self.max_distance = max_distance
+        # 공유 백엔드 적재는 생성자에서 하지 않음 (웜업의 load_shared_async 또는 첫 get_async에서)
+        self._cache = ResultCache(
+            name=name,
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+            backend=backend,
+        )
+
+    def load_shared(self) -> int:
+        """공유 백엔드 항목을 메모리로 적재 (근접 해시 검색은 메모리 항목 대상)"""
+        return self._cache.load_shared()
+
+    async def load_shared_async(self) -> int:
+        """load_shared의 비동기 버전"""
+        return await self._cache.load_shared_async()
+
+    @staticmethod
+    def _key(phash: int) -> str:
+        return f"{phash:016x}"
+
+    def _nearest_key(self, phash: int) -> str:
+        """메모리에서 가장 가까운 해시 키 (없으면 정확 일치 키)"""
+        best_key, best_distance = self._key(phash), self.max_distance + 1
+        for key in self._cache.keys():
+            distance = hamming_distance(int(key, 16), phash)
+            if distance < best_distance:
+                best_key, best_distance = key, distance
+                if distance == 0:
+                    break
+        return best_key
+
+    def get(self, phash: int) -> Optional[Any]:
+        """가장 가까운 해시 조회 (메모리에 없으면 다른 워커가 저장한 정확 일치 항목 확인)"""
+        return self._cache.get(self._nearest_key(phash))
+
+    async def get_async(self, phash: int) -> Optional[Any]:
+        """get의 비동기 버전 (처음 호출 시 공유 백엔드 항목을 스레드 풀에서 적재)"""
+        await self._cache.ensure_shared_loaded_async()
+        return await self._cache.get_async(self._nearest_key(phash))
+
+    def set(self, phash: int, value: Any) -> None:
+        """저장"""
+        self._cache.set(self._key(phash), value)
+
+    async def set_async(self, phash: int, value: Any) -> None:
+        """set의 비동기 버전"""
+        await self._cache.set_async(self._key(phash), value)
+
+    def stats(self) -> dict:
+        """캐시 통계"""
+        return self._cache.stats()
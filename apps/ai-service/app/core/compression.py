@@ -0,0 +1,189 @@
+"""
+응답 압축 미들웨어
+Accept-Encoding 협상으로 brotli(설치 시) 또는 gzip 압축 - 셀룰러 환경 모바일 응답 크기 절감
+
+- 순수 ASGI 미들웨어 (BaseHTTPMiddleware의 별도 task/버퍼링 없음)
+- minimum_size 미만 응답, 이미 압축된 응답(WebP/PNG 등), 지정 외 Content-Type은 그대로 통과
+- 스트리밍 응답은 청크마다 flush하여 지연 없이 전송
+- brotli는 선택 의존성: 설치되어 있지 않으면 gzip만 사용
+"""
+import zlib
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+# 압축 대상 Content-Type (이미지/폰트 등 이미 압축된 형식 제외)
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def negotiate_encoding(accept_encoding: str, brotli_available: bool = brotli is not None) -> Optional[str]:
+    """
+    Accept-Encoding 헤더에서 사용할 인코딩 선택
+
+    Args:
+        accept_encoding: 요청 헤더 값 (예: "gzip, deflate, br;q=0.9")
+        brotli_available: brotli 모듈 사용 가능 여부
+
+    Returns:
+        "br" / "gzip" / None (압축 안 함)
+    """
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token.strip()] = q
+
+    wildcard = weights.get("*", 0.0)
+    candidates = (["br"] if brotli_available else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for encoding in candidates:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Compressor:
+    """인코딩별 스트리밍 압축기"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # wbits 31 = gzip 헤더
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            out = self._brotli.process(data)
+            return out + (self._brotli.finish() if final else self._brotli.flush())
+        out = self._zlib.compress(data)
+        return out + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """
+    gzip/brotli 응답 압축
+
+    Usage:
+        app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        content_types: Iterable[str] = COMPRESSIBLE_TYPES,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.content_types = tuple(content_types)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = negotiate_encoding(accept) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(self, send, encoding)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    """응답 시작 메시지를 첫 본문까지 보류했다가 압축 여부 결정"""
+
+    def __init__(self, middleware: CompressionMiddleware, send, encoding: str):
+        self.middleware = middleware
+        self._send = send
+        self.encoding = encoding
+        self._start: Optional[dict] = None
+        self._compressor: Optional[_Compressor] = None
+        self._passthrough = False
+
+    def _should_compress(self, headers: List[Tuple[bytes, bytes]]) -> bool:
+        if self._start["status"] in (204, 304) or self._start["status"] < 200:
+            return False
+        content_type = b""
+        for name, value in headers:
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                content_type = value
+        media_type = content_type.decode("latin-1").split(";", 1)[0].strip().lower()
+        return media_type.startswith(self.middleware.content_types)
+
+    def _compressed_headers(self, content_length: Optional[int]) -> List[Tuple[bytes, bytes]]:
+        headers = [
+            (name, value) for name, value in self._start.get("headers", [])
+            if name not in (b"content-length", b"content-encoding")
+        ]
+        headers.append((b"content-encoding", self.encoding.encode()))
+        if not any(name == b"vary" and b"accept-encoding" in value.lower() for name, value in headers):
+            headers.append((b"vary", b"Accept-Encoding"))
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode()))
+        return headers
+
+    async def send(self, message: dict) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self._start = message
+            return
+        if message_type != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._compressor is None:
+            headers = list(self._start.get("headers", []))
+            if not self._should_compress(headers) or (not more_body and len(body) < self.middleware.minimum_size):
+                self._passthrough = True
+                await self._send(self._start)
+                await self._send(message)
+                return
+
+            self._compressor = _Compressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            if not more_body:
+                # 단일 본문: 전체 압축 후 Content-Length 재설정
+                compressed = self._compressor.compress(body, final=True)
+                await self._send({**self._start, "headers": self._compressed_headers(len(compressed))})
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+            # 스트리밍: Content-Length 제거 후 청크 단위 압축
+            await self._send({**self._start, "headers": self._compressed_headers(None)})
+
+        await self._send({
+            "type": "http.response.body",
+            "body": self._compressor.compress(body, final=not more_body),
+            "more_body": more_body,
+        })
@@ -0,0 +1,297 @@
+"""
+ControlNet 컨트롤 이미지 렌더링
+DWG lineart / 시점 depth map을 PIL로 그려 PNG 바이트로 반환
+
+- 에이전트 인스턴스나 이벤트 루프에 의존하지 않는 순수 함수 → 프로세스 풀 워커에서 실행
+- 입력은 dict/list 같은 기본 타입만 사용 (pickle 비용 최소화)
+"""
+from io import BytesIO
+from typing import List, Optional
+
+from PIL import Image, ImageDraw, ImageFilter
+
+
+def _to_png(img: Image.Image) -> bytes:
+    buffer = BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def render_dwg_lineart(dwg_elements: dict, width: int = 1024, height: int = 768) -> bytes:
+    """
+    DWG 요소 데이터로부터 ControlNet Lineart 이미지 생성
+    원본 DWG의 선(Line) 정보를 최대한 보존하여 구조 일관성 확보
+
+    Args:
+        dwg_elements: DWG 파싱된 요소 데이터 (walls, doors, windows 등)
+        width: 출력 이미지 너비
+        height: 출력 이미지 높이
+
+    Returns:
+        bytes: PNG 바이트 (좌표가 없으면 빈 바이트)
+    """
+    # 흰 배경에 검은 선
+    img = Image.new('RGB', (width, height), color=(255, 255, 255))
+    draw = ImageDraw.Draw(img)
+
+    # DWG 좌표 범위 계산 (정규화용)
+    all_coords = []
+    for key in ["walls", "doors", "windows", "elements"]:
+        items = dwg_elements.get(key, [])
+        if isinstance(items, list):
+            for item in items:
+                coords = item.get("coordinates", {})
+                if coords:
+                    all_coords.append((
+                        coords.get("x", 0),
+                        coords.get("y", 0),
+                        coords.get("x", 0) + coords.get("width", 0),
+                        coords.get("y", 0) + coords.get("height", 0)
+                    ))
+
+    if not all_coords:
+        return b""
+
+    # 경계 계산
+    min_x = min(c[0] for c in all_coords)
+    min_y = min(c[1] for c in all_coords)
+    max_x = max(c[2] for c in all_coords)
+    max_y = max(c[3] for c in all_coords)
+
+    dwg_width = max_x - min_x
+    dwg_height = max_y - min_y
+
+    if dwg_width == 0 or dwg_height == 0:
+        return b""
+
+    # 마진 추가
+    margin = 50
+    scale_x = (width - 2 * margin) / dwg_width
+    scale_y = (height - 2 * margin) / dwg_height
+    scale = min(scale_x, scale_y)
+
+    def transform_coord(x, y):
+        """DWG 좌표를 이미지 좌표로 변환 (Y축 반전 포함)"""
+        new_x = margin + (x - min_x) * scale
+        new_y = margin + (max_y - y) * scale  # Y축 반전
+        return (new_x, new_y)
+
+    # 벽 그리기 (두꺼운 선)
+    walls = dwg_elements.get("walls", [])
+    for wall in walls:
+        coords = wall.get("coordinates", {})
+        if not coords:
+            continue
+
+        x1, y1 = transform_coord(coords.get("x", 0), coords.get("y", 0))
+        x2 = x1 + coords.get("width", 0) * scale
+        y2 = y1 - coords.get("height", 0) * scale  # Y반전된 좌표계
+
+        # 레이어에 따라 선 두께 조정
+        layer = wall.get("layer", "").upper()
+        line_width = 4 if "LOAD" in layer else 2
+
+        draw.rectangle([x1, y2, x2, y1], outline=(0, 0, 0), width=line_width)
+
+    # 문 그리기 (얇은 선 + 호)
+    doors = dwg_elements.get("doors", [])
+    for door in doors:
+        coords = door.get("coordinates", {})
+        if not coords:
+            continue
+
+        x1, y1 = transform_coord(coords.get("x", 0), coords.get("y", 0))
+        w = coords.get("width", 0) * scale
+        h = coords.get("height", 0) * scale
+
+        # 문 프레임
+        draw.rectangle([x1, y1 - h, x1 + w, y1], outline=(100, 100, 100), width=1)
+
+    # 창문 그리기
+    windows = dwg_elements.get("windows", [])
+    for window in windows:
+        coords = window.get("coordinates", {})
+        if not coords:
+            continue
+
+        x1, y1 = transform_coord(coords.get("x", 0), coords.get("y", 0))
+        w = coords.get("width", 0) * scale
+        h = coords.get("height", 0) * scale
+
+        # 창문 (이중선)
+        draw.rectangle([x1, y1 - h, x1 + w, y1], outline=(50, 50, 50), width=2)
+        draw.rectangle([x1 + 2, y1 - h + 2, x1 + w - 2, y1 - 2], outline=(150, 150, 150), width=1)
+
+    return _to_png(img)
+
+
+def _draw_floor_gradient(draw: ImageDraw.ImageDraw, width: int, height: int, near: int = 200, span: int = 150) -> None:
+    """바닥 depth gradient (가까운 곳은 밝게, 먼 곳은 어둡게)"""
+    for y in range(height // 3, height):
+        depth_value = int(near - (y - height // 3) / (height * 2 / 3) * span)
+        draw.line([(0, y), (width, y)], fill=(depth_value, depth_value, depth_value))
+
+
+def render_perspective_depth_map(
+    viewpoint: str,
+    windows: Optional[List[dict]] = None,
+    width: int = 1024,
+    height: int = 768,
+) -> bytes:
+    """
+    시점과 창문 정보를 기반으로 3D 관점 depth map 생성
+
+    Args:
+        viewpoint: 시점 정보 (예: "view from kitchen looking towards living room")
+        windows: 도면에서 추출한 창문 목록 ({width, is_continuous, ...})
+        width: 이미지 너비
+        height: 이미지 높이
+
+    Returns:
+        bytes: Gaussian blur가 적용된 PNG 바이트
+    """
+    # depth map 생성 (검정=가까움, 흰색=멀음)
+    img = Image.new('RGB', (width, height), color=(50, 50, 50))  # 중간 회색 배경
+    draw = ImageDraw.Draw(img)
+
+    viewpoint_lower = viewpoint.lower()
+    windows = windows or []
+
+    # 주방에서 거실을 바라볼 때
+    if ("kitchen" in viewpoint_lower and "living" in viewpoint_lower) or "주방에서" in viewpoint_lower:
+        _draw_floor_gradient(draw, width, height)
+
+        # 천장 (멀리)
+        draw.rectangle([0, 0, width, height // 4], fill=(30, 30, 30))
+
+        # 왼쪽 벽 (옆면, 사다리꼴)
+        left_wall = [
+            (0, height // 4),  # 상단 왼쪽
+            (width // 6, height // 3),  # 상단 오른쪽 (원근)
+            (width // 6, height - 50),  # 하단 오른쪽
+            (0, height),  # 하단 왼쪽
+        ]
+        draw.polygon(left_wall, fill=(80, 80, 80))
+
+        # 오른쪽 벽 (옆면, 사다리꼴)
+        right_wall = [
+            (width, height // 4),  # 상단 오른쪽
+            (width - width // 6, height // 3),  # 상단 왼쪽 (원근)
+            (width - width // 6, height - 50),  # 하단 왼쪽
+            (width, height),  # 하단 오른쪽
+        ]
+        draw.polygon(right_wall, fill=(80, 80, 80))
+
+        # 정면 벽 (멀리 - 어두움)
+        far_wall = [
+            (width // 6, height // 3),
+            (width - width // 6, height // 3),
+            (width - width // 6, height - 50),
+            (width // 6, height - 50),
+        ]
+        draw.polygon(far_wall, fill=(40, 40, 40))
+
+        # 창문 (정면 벽에, 가장 밝게 - 빛이 들어옴)
+        if windows:
+            main_window = windows[0]
+            # 창문 크기 계산 (도면 좌표 기반)
+            w_width = main_window.get("width", 30)
+            is_continuous = main_window.get("is_continuous", False)
+
+            if w_width > 25 or is_continuous:
+                # 넓은 창문 - 거의 전체 벽
+                window_rect = [
+                    width // 5,  # left
+                    height // 3 + 20,  # top
+                    width - width // 5,  # right
+                    height - 100,  # bottom
+                ]
+            else:
+                # 작은 창문
+                window_rect = [
+                    width // 3,
+                    height // 3 + 30,
+                    width - width // 3,
+                    height - 120,
+                ]
+            draw.rectangle(window_rect, fill=(250, 250, 250))  # 매우 밝음 (빛)
+
+        # 주방 카운터 (전경, 아래쪽)
+        counter_polygon = [
+            (0, height - 150),
+            (width // 4, height - 100),
+            (width // 4, height),
+            (0, height),
+        ]
+        draw.polygon(counter_polygon, fill=(180, 180, 180))  # 가까움 = 밝음
+
+    # 거실에서 주방을 바라볼 때
+    elif ("living" in viewpoint_lower and "kitchen" in viewpoint_lower) or "거실에서" in viewpoint_lower:
+        _draw_floor_gradient(draw, width, height)
+
+        # 천장
+        draw.rectangle([0, 0, width, height // 4], fill=(30, 30, 30))
+
+        # 왼쪽/오른쪽 벽
+        draw.polygon([
+            (0, height // 4), (width // 6, height // 3),
+            (width // 6, height - 50), (0, height)
+        ], fill=(80, 80, 80))
+        draw.polygon([
+            (width, height // 4), (width - width // 6, height // 3),
+            (width - width // 6, height - 50), (width, height)
+        ], fill=(80, 80, 80))
+
+        # 정면 (주방) - 캐비닛과 가전
+        draw.polygon([
+            (width // 6, height // 3), (width - width // 6, height // 3),
+            (width - width // 6, height - 50), (width // 6, height - 50)
+        ], fill=(60, 60, 60))
+
+        # 주방 카운터/아일랜드 (중앙)
+        island = [
+            width // 3,
+            height - 200,
+            width * 2 // 3,
+            height - 80,
+        ]
+        draw.rectangle(island, fill=(100, 100, 100))
+
+        # 소파 암레스트 (전경)
+        draw.rectangle([0, height - 100, width // 5, height], fill=(200, 200, 200))
+
+    # 창가 방향
+    elif "window" in viewpoint_lower or "창가" in viewpoint_lower:
+        _draw_floor_gradient(draw, width, height)
+
+        # 천장
+        draw.rectangle([0, 0, width, height // 4], fill=(30, 30, 30))
+
+        # 측면 벽
+        draw.polygon([
+            (0, height // 4), (width // 8, height // 3),
+            (width // 8, height - 50), (0, height)
+        ], fill=(80, 80, 80))
+        draw.polygon([
+            (width, height // 4), (width - width // 8, height // 3),
+            (width - width // 8, height - 50), (width, height)
+        ], fill=(80, 80, 80))
+
+        # 큰 창문 (정면 거의 전체)
+        window_rect = [
+            width // 10,
+            height // 4,
+            width - width // 10,
+            height - 80,
+        ]
+        draw.rectangle(window_rect, fill=(255, 255, 255))  # 매우 밝음
+
+    else:
+        # 기본값: 일반적인 거실 관점
+        _draw_floor_gradient(draw, width, height, near=180, span=130)
+        draw.rectangle([0, 0, width, height // 3], fill=(40, 40, 40))
+
+    # Gaussian Blur 적용 (edge를 부드럽게 하여 ControlNet 결과 개선)
+    img = img.filter(ImageFilter.GaussianBlur(radius=5))
+    return _to_png(img)
+
@@ -0,0 +1,75 @@
+"""
+클라이언트 연결 종료 시 요청 취소
+모바일 사용자가 화면을 떠나도 서버가 도면 분석/Gemini 호출/Replicate 폴링을 끝까지 수행하던 낭비 제거
+
+- 순수 ASGI 미들웨어: 요청 본문을 다 읽은 뒤부터 receive()로 http.disconnect를 감시
+  (본문 읽기 전에는 감시하지 않음 → 업로드 청크를 미리 당겨 메모리에 쌓지 않음)
+- 연결이 끊기면 요청을 처리 중인 task 자체를 취소 → CancelledError가 에이전트의 모든 await로 전파
+  (asyncio.gather 하위 작업, Gemini gRPC 호출, httpx 요청, 승인 제어 슬롯 반납까지 함께 정리)
+- 별도 task에서 핸들러를 실행하지 않으므로 루프 모니터의 task → 라우트 매핑 유지
+- 응답 전송이 끝난 뒤의 연결 종료는 무시, 연결 종료로 인한 취소는 서버 밖으로 전파하지 않음
+"""
+import asyncio
+import time
+from typing import Optional
+
+
+class DisconnectMiddleware:
+    """
+    클라이언트 연결 종료를 요청 task 취소로 전파하는 순수 ASGI 미들웨어
+
+    uvicorn은 연결이 끊기면 다음 receive()에 http.disconnect를 반환하지만,
+    본문을 다 읽은 핸들러는 receive()를 다시 호출하지 않으므로 대신 감시
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        task = asyncio.current_task()
+        started = time.perf_counter()
+        watcher: Optional[asyncio.Task] = None
+        disconnected = False
+        response_done = False
+
+        async def watch():
+            nonlocal disconnected
+            message = await receive()
+            if message["type"] == "http.disconnect" and not response_done:
+                disconnected = True
+                task.cancel()
+            return message
+
+        async def watched_receive():
+            nonlocal watcher
+            if watcher is not None:
+                # 본문 이후 메시지(= disconnect)는 감시 task와 공유
+                return await asyncio.shield(watcher)
+            message = await receive()
+            if message["type"] == "http.request" and not message.get("more_body", False):
+                watcher = asyncio.create_task(watch())
+            return message
+
+        async def watched_send(message):
+            nonlocal response_done
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_done = True
+            await send(message)
+
+        try:
+            await self.app(scope, watched_receive, watched_send)
+        except asyncio.CancelledError:
+            if not disconnected:
+                raise  # 서버 종료 등 다른 이유의 취소
+            uncancel = getattr(task, "uncancel", None)  # Python 3.11+: 취소 요청 카운트 정리
+            if uncancel is not None:
+                uncancel()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(f"[Disconnect] Client left, cancelled {scope.get('method')} {scope.get('path')} after {elapsed_ms:,.0f}ms")
+        finally:
+            if watcher is not None and not watcher.done():
+                watcher.cancel()
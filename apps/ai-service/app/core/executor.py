@@ -0,0 +1,211 @@
+"""
+CPU 작업 실행기 (Executor)
+이벤트 루프를 막는 이미지 작업을 풀로 넘기고 결과를 await
+
+- 프로세스 풀: PIL 드로잉/블러/PNG 인코딩 같은 무거운 작업 (GIL 회피)
+- 스레드 풀: base64 디코딩/이미지 열기 같은 가벼운 작업 (C 코드가 GIL을 풀어줌)
+- 큰 bytes 인자/결과는 pickle 대신 공유 메모리(multiprocessing.shared_memory)로 전달
+- 앱 lifespan에서 시작/종료, 프로세스 워커 수가 0이면 스레드 풀로 대체
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from multiprocessing import shared_memory
+from typing import Any, Callable, Optional, Tuple
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class SharedPayload:
+    """공유 메모리에 올린 bytes 핸들 (이름 + 길이만 pickle됨)"""
+    name: str
+    size: int
+
+
+def share_bytes(data: bytes) -> SharedPayload:
+    """bytes를 새 공유 메모리 블록에 복사 (해제 책임은 take_bytes 호출자에게 넘어감)"""
+    block = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    try:
+        block.buf[:len(data)] = data
+    except Exception:
+        block.close()
+        block.unlink()
+        raise
+    block.close()
+    return SharedPayload(name=block.name, size=len(data))
+
+
+def take_bytes(payload: SharedPayload) -> bytes:
+    """공유 메모리 블록을 읽고 해제"""
+    block = shared_memory.SharedMemory(name=payload.name)
+    try:
+        return bytes(block.buf[:payload.size])
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _release(payload: Any) -> None:
+    if isinstance(payload, SharedPayload):
+        try:
+            take_bytes(payload)
+        except FileNotFoundError:
+            pass
+
+
+def _invoke(fn: Callable, args: Tuple, shm_min_bytes: int) -> Any:
+    """
+    워커 프로세스 진입점
+
+    공유 메모리 인자를 bytes로 복원해 fn을 호출하고,
+    결과가 큰 bytes면 공유 메모리에 올려 핸들만 돌려줌
+    """
+    args = tuple(take_bytes(a) if isinstance(a, SharedPayload) else a for a in args)
+    result = fn(*args)
+    if isinstance(result, bytes) and len(result) >= shm_min_bytes:
+        return share_bytes(result)
+    return result
+
+
+def _ping() -> bool:
+    return True
+
+
+class ImagingExecutor:
+    """
+    프로세스 풀 + 스레드 풀 묶음
+
+    Usage:
+        executor = get_executor()
+        png = await executor.run_cpu(render_dwg_lineart, dwg_elements)  # 프로세스 풀
+        img = await executor.run_io(decode_image, data)                  # 스레드 풀
+    """
+
+    def __init__(
+        self,
+        process_workers: int = 2,
+        thread_workers: int = 8,
+        shm_min_bytes: int = 64 * 1024,
+        start_method: str = "spawn",
+    ):
+        self.process_workers = process_workers
+        self.shm_min_bytes = shm_min_bytes
+        self._threads = ThreadPoolExecutor(max_workers=thread_workers, thread_name_prefix="imaging-io")
+        self._processes: Optional[ProcessPoolExecutor] = None
+        if process_workers > 0:
+            # fork는 이벤트 루프/스레드 상태를 복제하므로 spawn(기본) 또는 forkserver 사용
+            self._processes = ProcessPoolExecutor(
+                max_workers=process_workers,
+                mp_context=multiprocessing.get_context(start_method),
+            )
+        self.cpu_jobs = 0
+        self.io_jobs = 0
+        self.shared_bytes = 0
+
+    async def start(self) -> None:
+        """워커 프로세스를 미리 띄움 (첫 요청에서 spawn 비용을 치르지 않도록)"""
+        if self._processes is None:
+            return
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(self._processes, _ping) for _ in range(self.process_workers)
+        ])
+        print(f"[Executor] Started {self.process_workers} imaging worker processes")
+
+    async def run_cpu(self, fn: Callable, *args: Any) -> Any:
+        """
+        무거운 작업을 프로세스 풀에서 실행
+
+        Args:
+            fn: 모듈 최상위 함수 (pickle 가능해야 함)
+            *args: 인자 (shm_min_bytes 이상 bytes는 공유 메모리로 전달)
+
+        Returns:
+            fn의 반환값
+        """
+        self.cpu_jobs += 1
+        if self._processes is None:
+            return await self._await(self._threads.submit(fn, *args))
+
+        shared_args = []
+        for arg in args:
+            if isinstance(arg, bytes) and len(arg) >= self.shm_min_bytes:
+                arg = share_bytes(arg)
+                self.shared_bytes += arg.size
+            shared_args.append(arg)
+        try:
+            future = self._processes.submit(_invoke, fn, tuple(shared_args), self.shm_min_bytes)
+        except Exception:
+            for arg in shared_args:
+                _release(arg)
+            raise
+
+        def cleanup(done: Future) -> None:
+            if done.cancelled():
+                for arg in shared_args:
+                    _release(arg)
+            elif done.exception() is None:
+                _release(done.result())
+
+        result = await self._await(future, on_cancel=cleanup)
+        if isinstance(result, SharedPayload):
+            self.shared_bytes += result.size
+            return take_bytes(result)
+        return result
+
+    async def run_io(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """가벼운 블로킹 작업을 스레드 풀에서 실행"""
+        self.io_jobs += 1
+        return await self._await(self._threads.submit(partial(fn, *args, **kwargs)))
+
+    @staticmethod
+    async def _await(future: Future, on_cancel: Optional[Callable[[Future], None]] = None) -> Any:
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # 이미 실행 중인 작업은 취소되지 않으므로 끝난 뒤 공유 메모리를 정리
+            if on_cancel is not None:
+                future.add_done_callback(on_cancel)
+            raise
+
+    def shutdown(self) -> None:
+        """풀 종료 (대기 중인 작업은 취소)"""
+        for pool in (self._processes, self._threads):
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "process_workers": self.process_workers,
+            "cpu_jobs": self.cpu_jobs,
+            "io_jobs": self.io_jobs,
+            "shared_bytes": self.shared_bytes,
+        }
+
+
+# 싱글톤 인스턴스
+_executor: Optional[ImagingExecutor] = None
+
+
+def get_executor() -> ImagingExecutor:
+    """ImagingExecutor 싱글톤 반환 (lifespan 밖에서 호출되면 지연 생성)"""
+    global _executor
+    if _executor is None:
+        _executor = ImagingExecutor(
+            process_workers=settings.executor_process_workers,
+            thread_workers=settings.executor_thread_workers,
+            shm_min_bytes=settings.executor_shm_min_bytes,
+            start_method=settings.executor_start_method,
+        )
+    return _executor
+
+
+def close_executor() -> None:
+    """풀 종료 후 싱글톤 초기화 (다음 lifespan에서 다시 생성)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
@@ -0,0 +1,57 @@
+"""
+안정적인 콘텐츠 해시
+프로세스/워커/재시작과 무관하게 같은 입력이면 같은 값을 반환
+
+Python 내장 hash()는 문자열에 대해 프로세스마다 랜덤화(PYTHONHASHSEED)되므로
+seed나 캐시 키로 사용하면 워커마다 다른 값이 나옴 → SHA-256 기반으로 대체
+"""
+import hashlib
+import json
+from typing import Any
+
+
+def _to_bytes(value: Any) -> bytes:
+    """해시 입력을 정규화된 바이트로 변환"""
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    if hasattr(value, "model_dump"):  # Pydantic 모델
+        value = value.model_dump(mode="json")
+    return json.dumps(
+        value,
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    ).encode("utf-8")
+
+
+def stable_hash(*parts: Any) -> str:
+    """
+    여러 값을 결합한 SHA-256 hex 다이제스트
+
+    각 값 앞에 길이를 붙여 ("ab", "c")와 ("a", "bc")가 충돌하지 않도록 함
+
+    Args:
+        *parts: str, bytes, dict/list 등 JSON 직렬화 가능한 값 또는 Pydantic 모델
+
+    Returns:
+        str: 64자리 hex 문자열
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        data = _to_bytes(part)
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def stable_seed(*parts: Any) -> int:
+    """입력 기반 양수 32비트 seed (이미지 생성 재현성용)"""
+    return int(stable_hash(*parts)[:8], 16)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """두 지각 해시의 해밍 거리"""
+    return bin(a ^ b).count("1")
@@ -0,0 +1,111 @@
+"""
+이미지 유틸리티
+썸네일 생성, 지각 해시(perceptual hash) 계산
+"""
+from io import BytesIO
+from typing import BinaryIO, Optional, Union
+
+from PIL import Image
+
+
+def make_thumbnail(data: bytes, max_size: int = 512) -> Image.Image:
+    """
+    이미지 바이트를 RGB 썸네일로 디코딩
+
+    JPEG는 draft 모드로 축소 디코딩하여 원본 해상도 전체를 풀지 않음
+
+    Args:
+        data: 원본 이미지 바이트
+        max_size: 긴 변 최대 픽셀
+
+    Returns:
+        Image.Image: RGB 썸네일
+    """
+    img = Image.open(BytesIO(data))
+    img.draft("RGB", (max_size, max_size))
+    img = img.convert("RGB")
+    img.thumbnail((max_size, max_size))
+    return img
+
+
+def decode_image(source: Union[bytes, BinaryIO], max_side: Optional[int] = None) -> Image.Image:
+    """
+    이미지 디코딩 (픽셀까지 즉시 로드)
+
+    Image.open()은 지연 로드이므로 load()까지 호출해 실제 디코딩을 호출한 스레드에서 끝냄
+    파일 객체(업로드 스풀 파일 등)는 bytes로 복사하지 않고 바로 디코딩
+
+    Args:
+        source: 이미지 바이트 또는 읽기 가능한 파일 객체
+        max_side: 긴 변 최대 픽셀 (초과 시 JPEG는 draft 축소 디코딩 후 리사이즈, None이면 원본)
+
+    Returns:
+        Image.Image: 로드된 PIL 이미지
+    """
+    img = Image.open(BytesIO(source) if isinstance(source, bytes) else source)
+    if max_side and max(img.size) > max_side:
+        img.draft(None, (max_side, max_side))
+        img.thumbnail((max_side, max_side), Image.LANCZOS)
+    else:
+        img.load()
+    return img
+
+
+def perceptual_hash(img: Image.Image, hash_size: int = 8) -> int:
+    """
+    차분 해시(dHash) 계산
+
+    (hash_size+1) x hash_size 흑백으로 축소한 뒤 인접 픽셀 밝기 비교 → 64비트 정수
+    재압축/리사이즈/약한 색보정에도 해밍 거리가 거의 변하지 않음
+
+    Args:
+        img: PIL 이미지
+        hash_size: 해시 한 변 크기 (8 → 64비트)
+
+    Returns:
+        int: 지각 해시
+    """
+    small = img.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS)
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (1 if pixels[offset + col] > pixels[offset + col + 1] else 0)
+    return value
+
+
+# 멀티 해상도 변형 (이름 → 긴 변 최대 픽셀, None이면 원본 크기)
+IMAGE_VARIANTS = {
+    "thumbnail": 320,
+    "medium": 1024,
+    "full": None,
+}
+
+
+def encode_webp_variants(data: bytes, variants: dict = None, quality: int = 82) -> dict:
+    """
+    이미지 바이트를 여러 해상도의 WebP로 인코딩
+
+    Args:
+        data: 원본 이미지 바이트 (PNG/JPEG/WebP 등)
+        variants: {이름: 긴 변 최대 픽셀 또는 None} (기본: IMAGE_VARIANTS)
+        quality: WebP 품질
+
+    Returns:
+        dict: {이름: WebP 바이트}
+    """
+    variants = variants or IMAGE_VARIANTS
+    source = Image.open(BytesIO(data))
+    source = source.convert("RGBA" if source.mode in ("RGBA", "LA", "P") else "RGB")
+
+    encoded = {}
+    for name, max_size in variants.items():
+        img = source
+        if max_size and max(img.size) > max_size:
+            img = source.copy()
+            img.thumbnail((max_size, max_size), Image.LANCZOS)
+        buffer = BytesIO()
+        img.save(buffer, format="WEBP", quality=quality, method=4)
+        encoded[name] = buffer.getvalue()
+    return encoded
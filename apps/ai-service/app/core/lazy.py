@@ -0,0 +1,46 @@
+"""
+지연 임포트
+무거운 SDK(google.generativeai의 gRPC/protobuf, httpx 등)를 서버 시작 시점이 아닌 첫 사용 시점에 로드
+
+- 콜드 스타트(컨테이너 기동 → 첫 healthy 응답) 단축: 임포트 비용을 실제로 쓰는 요청/웜업으로 이동
+- async 경로는 import_module_async로 스레드에서 로드 → 첫 요청이 이벤트 루프를 수백 ms 멈추지 않음
+- 로드가 끝난 모듈만 캐시에서 반환 (다른 스레드가 임포트 중인 반쯤 초기화된 모듈을 쓰지 않도록)
+"""
+import importlib
+import threading
+from types import ModuleType
+from typing import Dict
+
+_loaded: Dict[str, ModuleType] = {}
+_lock = threading.Lock()
+
+
+def import_module(name: str) -> ModuleType:
+    """모듈 임포트 (한 번 로드되면 캐시에서 반환)"""
+    module = _loaded.get(name)
+    if module is not None:
+        return module
+    with _lock:
+        module = _loaded.get(name)
+        if module is None:
+            module = importlib.import_module(name)
+            _loaded[name] = module
+    return module
+
+
+async def import_module_async(name: str) -> ModuleType:
+    """
+    이벤트 루프를 막지 않는 모듈 임포트
+
+    Args:
+        name: 모듈 경로 (예: "google.generativeai")
+
+    Returns:
+        ModuleType: 로드된 모듈
+    """
+    module = _loaded.get(name)
+    if module is not None:
+        return module
+    # 순환 임포트 방지를 위해 호출 시점에 참조
+    from app.core.executor import get_executor
+    return await get_executor().run_io(import_module, name)
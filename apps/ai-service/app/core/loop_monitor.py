@@ -0,0 +1,361 @@
+"""
+이벤트 루프 지연 모니터 (Loop Monitor)
+async 경로 안의 블로킹 호출(SDK 초기화, 큰 print/JSON 직렬화, PIL 작업 등)을 찾아냄
+
+- 하트비트: 루프에서 주기적으로 sleep → 예정보다 늦게 깨어난 시간 = 루프 지연(lag)
+- 워치독 스레드: 하트비트가 임계값 이상 멈추면 루프 스레드의 스택과 실행 중인 라우트를 캡처
+- 미들웨어: 요청 처리 task → 라우트 매핑 (워치독이 블로킹 당시 라우트를 알 수 있도록)
+- 지연 히스토그램/분위수 + 블로킹 위치별 누적 시간 상위 목록 → 관리자 엔드포인트
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.core.sketch import QuantileSketch
+
+# 지연 히스토그램 버킷 상한 (ms)
+LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# 블로킹 위치 판별 시 "우리 코드"로 보는 경로 (app/ 패키지)
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SERVICE_ROOT = os.path.dirname(_APP_ROOT)
+_SELF = os.path.abspath(__file__)
+
+BACKGROUND_ROUTE = "(background)"
+
+
+def _short_path(filename: str) -> str:
+    filename = os.path.abspath(filename)
+    if filename.startswith(_SERVICE_ROOT + os.sep):
+        return os.path.relpath(filename, _SERVICE_ROOT)
+    # site-packages 등 외부 코드는 패키지 경로만
+    for marker in ("site-packages" + os.sep, "lib" + os.sep + "python"):
+        index = filename.rfind(marker)
+        if index >= 0:
+            return filename[index + len(marker):]
+    return filename
+
+
+def _blocking_location(frames: List[traceback.FrameSummary]) -> str:
+    """
+    스택에서 블로킹 위치 라벨 생성
+
+    가장 안쪽의 app/ 프레임 + (다르면) 실제로 멈춰 있던 가장 안쪽 프레임
+    예: "app/agents/designer_agent.py:250 _load_image → PIL/Image.py:3280 open"
+    """
+    innermost = frames[-1] if frames else None
+    own = next(
+        (f for f in reversed(frames) if f.filename.startswith(_APP_ROOT) and f.filename != _SELF),
+        None,
+    )
+    parts = []
+    for frame in (own, innermost):
+        if frame is None:
+            continue
+        label = f"{_short_path(frame.filename)}:{frame.lineno} {frame.name}"
+        if label not in parts:
+            parts.append(label)
+    return " → ".join(parts) or "(unknown)"
+
+
+def _route_template(scope: dict) -> str:
+    """
+    요청 경로의 라우트 템플릿 (/api/schedule/{id} 등 - 라벨 카디널리티 제한)
+
+    include_router(prefix=...)로 등록된 라우트는 scope["route"].path에 prefix가 빠져 있으므로
+    실제 경로에서 라우트 정규식과 일치하는 접미부 앞부분을 prefix로 복원
+    """
+    path = scope.get("path", "")
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    regex = getattr(route, "path_regex", None)
+    if not template or regex is None:
+        return path
+    for index, char in enumerate(path):
+        if char == "/" and regex.match(path[index:]):
+            return path[:index] + template
+    return template
+
+
+@dataclass
+class StallCapture:
+    """워치독이 캡처한 블로킹 순간"""
+    route: str
+    location: str
+    stack: List[str]
+
+
+@dataclass
+class BlockerStats:
+    """라우트 + 블로킹 위치별 누적"""
+    route: str
+    location: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_seen: float = 0.0
+    stack: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "route": self.route,
+            "location": self.location,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 1),
+            "max_ms": round(self.max_ms, 1),
+            "avg_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "last_seen": self.last_seen,
+            "stack": self.stack,
+        }
+
+
+class LoopMonitor:
+    """
+    이벤트 루프 지연 측정 + 블로킹 스택 캡처
+
+    Usage:
+        monitor = get_loop_monitor()
+        await monitor.start()      # lifespan 시작
+        monitor.stats()            # 관리자 엔드포인트
+        await monitor.stop()       # lifespan 종료
+    """
+
+    def __init__(
+        self,
+        interval_ms: float = 50,
+        threshold_ms: float = 100,
+        max_blockers: int = 100,
+        stack_depth: int = 20,
+    ):
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.max_blockers = max_blockers
+        self.stack_depth = stack_depth
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._last_beat = time.monotonic()
+        self._pending: Optional[StallCapture] = None
+        self._task_scopes: Dict[asyncio.Task, dict] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """누적 통계 초기화"""
+        with self._lock:
+            self._lag = QuantileSketch(relative_accuracy=0.01)
+            self._histogram = [0] * (len(LAG_BUCKETS_MS) + 1)
+            self._blockers: Dict[Tuple[str, str], BlockerStats] = {}
+            self._recent: deque = deque(maxlen=20)
+            self.stalls = 0
+            self.stalled_ms = 0.0
+            self.started_at = time.time()
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat is not None and not self._heartbeat.done()
+
+    async def start(self) -> None:
+        """하트비트 task + 워치독 스레드 시작"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._heartbeat = asyncio.create_task(self._beat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        print(f"[LoopMonitor] Watching event loop (interval {self.interval * 1000:.0f}ms, stall >= {self.threshold * 1000:.0f}ms)")
+
+    async def stop(self) -> None:
+        """모니터 종료"""
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    # ---------- 요청 task ↔ 라우트 ----------
+
+    def enter(self, task: Optional[asyncio.Task], scope: dict) -> None:
+        if task is not None:
+            self._task_scopes[task] = scope
+
+    def exit(self, task: Optional[asyncio.Task]) -> None:
+        if task is not None:
+            self._task_scopes.pop(task, None)
+
+    def _current_route(self) -> str:
+        """루프에서 실행 중인 task의 라우트 (워치독 스레드에서 호출)"""
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            return BACKGROUND_ROUTE
+        scope = self._task_scopes.get(task) if task is not None else None
+        if scope is None:
+            return BACKGROUND_ROUTE
+        return f"{scope.get('method', '')} {_route_template(scope)}".strip()
+
+    # ---------- 하트비트 (루프) ----------
+
+    async def _beat(self) -> None:
+        while True:
+            scheduled = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_beat = now
+            self._record_lag(max(now - scheduled - self.interval, 0.0))
+
+    def _record_lag(self, lag: float) -> None:
+        lag_ms = lag * 1000
+        with self._lock:
+            self._lag.add(lag_ms)
+            bucket = next((i for i, bound in enumerate(LAG_BUCKETS_MS) if lag_ms <= bound), len(LAG_BUCKETS_MS))
+            self._histogram[bucket] += 1
+            if lag < self.threshold:
+                self._pending = None
+                return
+
+            capture, self._pending = self._pending, None
+            if capture is None:
+                # 워치독 폴링 간격보다 짧게 끝난 정지 - 스택 없이 집계
+                capture = StallCapture(route=BACKGROUND_ROUTE, location="(uncaptured)", stack=[])
+            self.stalls += 1
+            self.stalled_ms += lag_ms
+
+            key = (capture.route, capture.location)
+            blocker = self._blockers.get(key)
+            if blocker is None:
+                if len(self._blockers) >= self.max_blockers:
+                    # 누적 시간이 가장 적은 항목 제거
+                    del self._blockers[min(self._blockers, key=lambda k: self._blockers[k].total_ms)]
+                blocker = self._blockers[key] = BlockerStats(route=capture.route, location=capture.location)
+            blocker.count += 1
+            blocker.total_ms += lag_ms
+            blocker.max_ms = max(blocker.max_ms, lag_ms)
+            blocker.last_seen = time.time()
+            if capture.stack:
+                blocker.stack = capture.stack
+            self._recent.append({
+                "route": capture.route,
+                "location": capture.location,
+                "duration_ms": round(lag_ms, 1),
+                "at": blocker.last_seen,
+            })
+        print(f"[LoopMonitor] Event loop blocked {lag_ms:.0f}ms in {capture.route}: {capture.location}")
+
+    # ---------- 워치독 (별도 스레드) ----------
+
+    def _watch(self) -> None:
+        poll = max(self.threshold / 4, 0.005)
+        captured_beat = None
+        while not self._stop.wait(poll):
+            beat = self._last_beat
+            behind = time.monotonic() - beat - self.interval
+            if behind < self.threshold or beat == captured_beat:
+                continue
+            # 이번 정지에서 한 번만 캡처 (루프 스레드가 멈춰 있는 동안의 스택)
+            captured_beat = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            frames = traceback.extract_stack(frame)[-self.stack_depth:]
+            capture = StallCapture(
+                route=self._current_route(),
+                location=_blocking_location(frames),
+                stack=[
+                    f"{_short_path(f.filename)}:{f.lineno} {f.name}" + (f": {f.line}" if f.line else "")
+                    for f in frames
+                ],
+            )
+            with self._lock:
+                self._pending = capture
+
+    # ---------- 조회 ----------
+
+    def stats(self, top: int = 20) -> dict:
+        """지연 분포 + 블로킹 상위 목록"""
+        with self._lock:
+            labels = [f"<={bound}ms" for bound in LAG_BUCKETS_MS] + [f">{LAG_BUCKETS_MS[-1]}ms"]
+            blockers = sorted(self._blockers.values(), key=lambda b: b.total_ms, reverse=True)[:top]
+
+            def q(value: float) -> Optional[float]:
+                result = self._lag.quantile(value)
+                return round(result, 2) if result is not None else None
+
+            return {
+                "running": self.running,
+                "interval_ms": round(self.interval * 1000, 1),
+                "threshold_ms": round(self.threshold * 1000, 1),
+                "since": self.started_at,
+                "lag": {
+                    "samples": self._lag.count,
+                    "mean_ms": round(self._lag.mean, 2) if self._lag.mean is not None else None,
+                    "p50_ms": q(0.5),
+                    "p90_ms": q(0.9),
+                    "p99_ms": q(0.99),
+                    "max_ms": round(self._lag.max, 2) if self._lag.count else None,
+                    "histogram": dict(zip(labels, self._histogram)),
+                },
+                "stalls": self.stalls,
+                "stalled_ms": round(self.stalled_ms, 1),
+                "top_blockers": [b.to_dict() for b in blockers],
+                "recent_stalls": list(self._recent),
+            }
+
+
+class LoopMonitorMiddleware:
+    """
+    요청을 처리하는 task를 라우트와 연결하는 순수 ASGI 미들웨어
+
+    BaseHTTPMiddleware는 핸들러를 별도 task에서 실행하므로 사용하지 않음
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        monitor = get_loop_monitor()
+        task = asyncio.current_task()
+        monitor.enter(task, scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            monitor.exit(task)
+
+
+# 싱글톤 인스턴스
+_loop_monitor: Optional[LoopMonitor] = None
+
+
+def get_loop_monitor() -> LoopMonitor:
+    """LoopMonitor 싱글톤 반환"""
+    global _loop_monitor
+    if _loop_monitor is None:
+        _loop_monitor = LoopMonitor(
+            interval_ms=settings.loop_monitor_interval_ms,
+            threshold_ms=settings.loop_monitor_stall_threshold_ms,
+            max_blockers=settings.loop_monitor_max_blockers,
+            stack_depth=settings.loop_monitor_stack_depth,
+        )
+    return _loop_monitor
@@ -0,0 +1,114 @@
+"""
+오브젝트 스토어
+생성 이미지 등 바이너리를 콘텐츠 주소(SHA-256) 기반으로 저장하고 안정적인 URL을 제공
+
+- ObjectStore: 추상 인터페이스 (MinIO/S3 등은 이 인터페이스를 구현해 교체)
+- FilesystemObjectStore: 로컬 디스크 구현 (/media 경로로 정적 서빙)
+"""
+import os
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from starlette.staticfiles import StaticFiles
+
+from app.config import settings
+
+
+class ObjectStore(ABC):
+    """
+    오브젝트 스토어 추상 베이스 클래스
+
+    키는 콘텐츠 해시 기반이므로 같은 키 = 같은 내용 (덮어쓰기 불필요, 영구 캐시 가능)
+    """
+
+    @abstractmethod
+    def put(self, key: str, data: bytes, content_type: str) -> None:
+        """오브젝트 저장"""
+        pass
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """오브젝트 조회 (없으면 None)"""
+        pass
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """오브젝트 존재 여부"""
+        pass
+
+    @abstractmethod
+    def url_for(self, key: str) -> str:
+        """클라이언트가 접근할 안정적인 URL"""
+        pass
+
+
+class FilesystemObjectStore(ObjectStore):
+    """
+    로컬 파일시스템 오브젝트 스토어 (MinIO 대용)
+
+    Usage:
+        store = FilesystemObjectStore(root_dir="media", url_prefix="/media")
+        store.put("ab/abcd.../full.webp", data, "image/webp")
+        store.url_for("ab/abcd.../full.webp")  # → /media/ab/abcd.../full.webp
+    """
+
+    def __init__(self, root_dir: str, url_prefix: str = "/media", public_base_url: Optional[str] = None):
+        self.root_dir = root_dir
+        self.url_prefix = url_prefix.rstrip("/")
+        self.public_base_url = (public_base_url or "").rstrip("/")
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        path = os.path.normpath(os.path.join(self.root_dir, key))
+        if not path.startswith(os.path.normpath(self.root_dir) + os.sep):
+            raise ValueError(f"Invalid object key: {key}")
+        return path
+
+    def put(self, key: str, data: bytes, content_type: str) -> None:
+        path = self._path(key)
+        if os.path.exists(path):
+            return  # 콘텐츠 주소 → 이미 있으면 같은 내용
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def url_for(self, key: str) -> str:
+        return f"{self.public_base_url}{self.url_prefix}/{key}"
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """콘텐츠 주소 파일 서빙 - 내용이 바뀌지 않으므로 장기 캐시 헤더 추가"""
+
+    async def get_response(self, path, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code == 200:
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+# 싱글톤 인스턴스
+_object_store: Optional[ObjectStore] = None
+
+
+def get_object_store() -> ObjectStore:
+    """ObjectStore 싱글톤 반환"""
+    global _object_store
+    if _object_store is None:
+        _object_store = FilesystemObjectStore(
+            root_dir=settings.media_dir,
+            url_prefix=settings.media_url_path,
+            public_base_url=settings.media_public_base_url,
+        )
+    return _object_store
@@ -0,0 +1,112 @@
+"""
+원격 이미지 다운로드
+레퍼런스 이미지처럼 사용자가 지정한 URL을 서버가 직접 받을 때의 SSRF/메모리 방어
+
+- http/https만 허용, 호스트를 해석해 공인 주소가 아니면 거절 (루프백/사설망/링크 로컬 = 클라우드 메타데이터 등)
+- 리다이렉트는 자동으로 따라가지 않고 직접 처리 → 홉마다 같은 검사 (최대 횟수 제한)
+- Content-Type이 image/*가 아니면 거절, 본문은 스트리밍으로 받다가 바이트 한도를 넘으면 중단
+
+검사 후 httpx가 다시 이름을 해석하므로 DNS 리바인딩까지 막지는 못함 (외부 이그레스 정책과 함께 사용)
+"""
+import asyncio
+import ipaddress
+import socket
+from typing import TYPE_CHECKING
+from urllib.parse import urljoin, urlsplit
+
+if TYPE_CHECKING:
+    import httpx
+
+# 리다이렉트 최대 횟수
+MAX_REDIRECTS = 3
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class RemoteFetchError(ValueError):
+    """허용되지 않는 URL 또는 응답"""
+
+
+async def check_public_url(url: str) -> None:
+    """
+    URL이 공인 주소의 http/https인지 검사
+
+    Args:
+        url: 검사할 URL
+
+    Raises:
+        RemoteFetchError: 스킴/호스트가 허용되지 않거나 해석된 주소 중 공인 주소가 아닌 것이 있음
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in _DEFAULT_PORTS:
+        raise RemoteFetchError(f"Unsupported URL scheme: {parts.scheme or '(none)'}")
+    host = parts.hostname
+    if not host:
+        raise RemoteFetchError("URL has no host")
+    try:
+        port = parts.port or _DEFAULT_PORTS[parts.scheme]
+    except ValueError as e:
+        raise RemoteFetchError(f"Invalid port in URL: {url[:80]}") from e
+
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror as e:
+        raise RemoteFetchError(f"Cannot resolve host: {host}") from e
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%", 1)[0])  # IPv6 scope ID 제거
+        mapped = getattr(address, "ipv4_mapped", None)
+        if mapped is not None:
+            address = mapped  # ::ffff:127.0.0.1 등
+        if not address.is_global or address.is_multicast:
+            raise RemoteFetchError(f"Host {host} resolves to a non-public address: {address}")
+
+
+async def fetch_image_bytes(
+    client: "httpx.AsyncClient",
+    url: str,
+    max_bytes: int,
+    max_redirects: int = MAX_REDIRECTS,
+) -> bytes:
+    """
+    사용자가 지정한 URL에서 이미지 바이트 다운로드
+
+    Args:
+        client: 풀링된 httpx 클라이언트 (클라이언트의 리다이렉트 설정과 무관하게 직접 처리)
+        url: 이미지 URL
+        max_bytes: 최대 본문 크기
+        max_redirects: 최대 리다이렉트 횟수
+
+    Returns:
+        bytes: 이미지 본문
+
+    Raises:
+        RemoteFetchError: 허용되지 않는 URL/리다이렉트, 이미지가 아닌 응답, 크기 초과
+        httpx.HTTPError: 네트워크 오류, 4xx/5xx 응답
+    """
+    for _ in range(max_redirects + 1):
+        await check_public_url(url)
+        async with client.stream("GET", url, follow_redirects=False) as response:
+            if response.is_redirect:
+                location = response.headers.get("location")
+                if not location:
+                    raise RemoteFetchError("Redirect without Location header")
+                url = urljoin(str(response.url), location)
+                continue
+            response.raise_for_status()
+
+            media_type = response.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+            if not media_type.startswith("image/"):
+                raise RemoteFetchError(f"Not an image response: {media_type or '(none)'}")
+            content_length = response.headers.get("content-length", "")
+            if content_length.isdigit() and int(content_length) > max_bytes:
+                raise RemoteFetchError(f"Image too large: {content_length} bytes")
+
+            chunks = []
+            received = 0
+            async for chunk in response.aiter_bytes():
+                received += len(chunk)
+                if received > max_bytes:
+                    raise RemoteFetchError(f"Image exceeds {max_bytes} bytes")
+                chunks.append(chunk)
+            return b"".join(chunks)
+    raise RemoteFetchError(f"Too many redirects (> {max_redirects})")
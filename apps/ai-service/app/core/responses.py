@@ -0,0 +1,31 @@
+"""
+빠른 JSON 응답
+FastAPI 기본 경로(response_model 재검증 → jsonable_encoder → json.dumps) 대신
+pydantic-core 직렬화기로 바로 bytes 생성
+
+- 라우트가 우리가 만든 모델 객체를 FastJSONResponse로 감싸 반환하면 재검증/중간 dict 변환을 건너뜀
+- 기본 응답 클래스로 쓰면 dict/list 결과도 json.dumps 대신 pydantic-core로 직렬화
+- 한글은 이스케이프 없이 UTF-8 그대로 (바이트 수 절감)
+"""
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    pydantic-core to_json 기반 JSON 응답
+
+    Usage:
+        @router.post("/...", response_model=FloorPlanAnalysis)
+        async def handler(...):
+            result = await agent.analyze(...)
+            return FastJSONResponse(result)   # response_model은 문서용으로만 사용됨
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        # BaseModel/dataclass/datetime/Enum 모두 직접 직렬화 (NaN/Inf는 null)
+        return to_json(content, by_alias=True, inf_nan_mode="null")
@@ -0,0 +1,480 @@
+"""
+시맨틱 캐시
+표현만 다른 같은 질문("32평 올수리 얼마?" / "32평 전체 리모델링 비용")을 근사 일치로 재사용
+
+- 임베딩: 문자 n-gram 해싱 트릭 (로컬 CPU, 모델 파일 없음) → L2 정규화 벡터
+- ANN: 랜덤 초평면 LSH (여러 테이블) 후보 → 코사인 유사도 임계값 이상만 히트
+- scope(의도 + 평수/위치/예산 등 컨텍스트 + 질문 속 숫자)가 정확히 같아야 후보가 됨
+- TTL + LRU 제거, 히트율 및 오탐(false hit) 표본 검증 지표
+- 공유 상태 백엔드 지정 시 (scope, 정규화 질문) 해시 키로 함께 저장
+  → 다른 워커가 답한 같은 질문은 정확 일치로 히트, 시작 시 LSH 인덱스 웜업
+"""
+import random
+import re
+import threading
+import time
+import unicodedata
+import zlib
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.core.executor import get_executor
+from app.core.hashing import stable_hash
+from app.core.state import StateBackend, get_state_backend
+from app.models.schemas import AgentResponse
+
+_NON_WORD = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def _normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).lower()
+    return _SPACES.sub(" ", _NON_WORD.sub(" ", text)).strip()
+
+
+def query_numbers(text: str) -> Tuple[str, ...]:
+    """질문 속 숫자 (평수/금액/날짜 등) - 다르면 같은 질문으로 보지 않음"""
+    return tuple(sorted(_NUMBER.findall(text)))
+
+
+def hash_embed(text: str, dim: int = 512, sizes: Tuple[int, ...] = (2, 3)) -> np.ndarray:
+    """
+    문자 n-gram 해싱 임베딩
+
+    n-gram별 CRC32로 차원과 부호를 정해 누적 (부호 해싱으로 충돌 편향 상쇄)
+
+    Args:
+        text: 입력 문장
+        dim: 벡터 차원
+        sizes: n-gram 크기
+
+    Returns:
+        np.ndarray: L2 정규화된 float32 벡터 (빈 문장이면 0 벡터)
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    padded = f" {_normalize(text)} "
+    for n in sizes:
+        for i in range(len(padded) - n + 1):
+            gram = padded[i:i + n]
+            if not gram.strip():
+                continue
+            h = zlib.crc32(gram.encode("utf-8"))
+            vector[h % dim] += 1.0 if (h >> 31) & 1 else -1.0
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+@dataclass
+class SemanticEntry:
+    """캐시 항목"""
+    key: int
+    scope: str
+    question: str
+    vector: np.ndarray
+    codes: Tuple[int, ...]  # 테이블별 LSH 버킷 코드
+    value: Any
+    expires_at: Optional[float]
+
+
+@dataclass
+class SemanticHit:
+    """조회 결과"""
+    key: int
+    question: str  # 캐시에 저장된 원래 질문
+    similarity: float
+    value: Any
+    audit: bool  # True면 표본 검증 대상 → 호출자가 새로 계산해 record_audit()으로 비교
+
+
+class SemanticCache:
+    """
+    LSH 기반 근사 일치 캐시
+
+    Usage:
+        cache = SemanticCache("chat_answers", threshold=0.85)
+        hit = await cache.get_async(question, scope)
+        if hit and not hit.audit:
+            return hit.value
+        value = compute()
+        if hit:
+            await cache.record_audit_async(hit, question, agreed=...)
+        await cache.set_async(question, scope, value)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        threshold: float = 0.85,
+        max_entries: int = 2048,
+        ttl_seconds: Optional[float] = None,
+        dim: int = 512,
+        num_tables: int = 12,
+        num_bits: int = 8,
+        audit_rate: float = 0.05,
+        seed: int = 0,
+        backend: Optional[StateBackend] = None,
+        encode: Optional[Callable[[Any], Any]] = None,
+        decode: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.name = name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.dim = dim
+        self.audit_rate = audit_rate
+        # 테이블별 랜덤 초평면 (num_tables, num_bits, dim)
+        self._planes = np.random.default_rng(seed).standard_normal((num_tables, num_bits, dim)).astype(np.float32)
+        self._bit_weights = 1 << np.arange(num_bits, dtype=np.int64)
+        self._buckets: List[Dict[Tuple[str, int], Set[int]]] = [{} for _ in range(num_tables)]
+        self._entries: "OrderedDict[int, SemanticEntry]" = OrderedDict()
+        self._next_key = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        # 공유되지 않는 백엔드(프로세스 내 메모리)는 사용하지 않음
+        self._backend = backend if backend is not None and backend.shared else None
+        self._encode = encode
+        self._decode = decode
+        self._shared_loaded = False  # load_shared 실행(또는 시작) 여부
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.audits = 0
+        self.false_hits = 0
+        self.recent_false_hits: deque = deque(maxlen=20)
+
+    def _codes(self, vector: np.ndarray) -> Tuple[int, ...]:
+        bits = (self._planes @ vector) > 0  # (num_tables, num_bits)
+        return tuple(int(code) for code in bits.astype(np.int64) @ self._bit_weights)
+
+    def get(self, question: str, scope: str) -> Optional[SemanticHit]:
+        """
+        근사 일치 조회
+
+        Args:
+            question: 사용자 질문
+            scope: 정확히 일치해야 하는 컨텍스트 키
+
+        Returns:
+            Optional[SemanticHit]: 임계값 이상인 가장 가까운 항목 (없으면 None)
+        """
+        vector = hash_embed(question, self.dim)
+        codes = self._codes(vector)
+        hit = self._lookup(scope, vector, codes)
+        if hit is not None:
+            return hit
+        # 로컬 인덱스에 없으면 다른 워커가 저장한 정확 일치 항목 확인 (lock 밖에서 백엔드 조회)
+        return self._adopt_shared(question, scope, vector, codes, self._read_shared(question, scope))
+
+    async def get_async(self, question: str, scope: str) -> Optional[SemanticHit]:
+        """get의 비동기 버전 (공유 백엔드 조회가 이벤트 루프를 막지 않음, 처음 호출 시 인덱스 적재)"""
+        if not self._shared_loaded:
+            self._shared_loaded = True  # 동시에 들어온 다른 요청은 적재를 기다리지 않고 진행
+            await self.load_shared_async()
+        vector = hash_embed(question, self.dim)
+        codes = self._codes(vector)
+        hit = self._lookup(scope, vector, codes)
+        if hit is not None:
+            return hit
+        shared = None
+        if self._backend is not None:
+            try:
+                shared = self._shared_value(
+                    await self._backend.get_entry_async(self.name, self._shared_key(question, scope))
+                )
+            except Exception as e:
+                print(f"[SemanticCache:{self.name}] Shared read failed: {type(e).__name__}: {e}")
+        return self._adopt_shared(question, scope, vector, codes, shared)
+
+    def set(self, question: str, scope: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """저장 (같은 scope에 거의 같은 질문이 있으면 교체)"""
+        ttl = self._insert_local(question, scope, value, ttl_seconds)
+        if self._backend is None:
+            return
+        try:
+            self._backend.set(self.name, self._shared_key(question, scope), self._shared_data(question, scope, value), ttl)
+        except Exception as e:
+            print(f"[SemanticCache:{self.name}] Shared write failed: {type(e).__name__}: {e}")
+
+    async def set_async(self, question: str, scope: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """set의 비동기 버전"""
+        ttl = self._insert_local(question, scope, value, ttl_seconds)
+        if self._backend is None:
+            return
+        try:
+            await self._backend.set_async(
+                self.name, self._shared_key(question, scope), self._shared_data(question, scope, value), ttl
+            )
+        except Exception as e:
+            print(f"[SemanticCache:{self.name}] Shared write failed: {type(e).__name__}: {e}")
+
+    def load_shared(self) -> int:
+        """
+        공유 백엔드에 저장된 항목으로 LSH 인덱스 웜업 (최근에 저장된 max_entries개까지)
+
+        Returns:
+            int: 적재된 항목 수
+        """
+        self._shared_loaded = True
+        if self._backend is None:
+            return 0
+        loaded = 0
+        try:
+            for shared_key in self._backend.recent_keys(self.name, self.max_entries):
+                entry = self._backend.get_entry(self.name, shared_key)
+                if entry is None:
+                    continue
+                expires_at, data = entry
+                value = self._decode(data["value"]) if self._decode is not None else data["value"]
+                vector = hash_embed(data["question"], self.dim)
+                with self._lock:
+                    self._insert(data["question"], data["scope"], vector, self._codes(vector), value, expires_at)
+                loaded += 1
+        except Exception as e:
+            print(f"[SemanticCache:{self.name}] Shared warm-up failed: {type(e).__name__}: {e}")
+        return loaded
+
+    async def load_shared_async(self) -> int:
+        """load_shared의 비동기 버전 (백엔드 스캔은 스레드 풀)"""
+        return await get_executor().run_io(self.load_shared)
+
+    def invalidate(self, key: int) -> None:
+        """항목 삭제 (공유 백엔드 포함)"""
+        entry = self._remove_local(key)
+        if entry is not None and self._backend is not None:
+            try:
+                self._backend.delete(self.name, self._shared_key(entry.question, entry.scope))
+            except Exception as e:
+                print(f"[SemanticCache:{self.name}] Shared delete failed: {type(e).__name__}: {e}")
+
+    async def invalidate_async(self, key: int) -> None:
+        """invalidate의 비동기 버전"""
+        entry = self._remove_local(key)
+        if entry is not None and self._backend is not None:
+            try:
+                await self._backend.delete_async(self.name, self._shared_key(entry.question, entry.scope))
+            except Exception as e:
+                print(f"[SemanticCache:{self.name}] Shared delete failed: {type(e).__name__}: {e}")
+
+    def record_audit(self, hit: SemanticHit, question: str, agreed: bool) -> None:
+        """
+        표본 검증 결과 기록 - 새로 계산한 답과 다르면 오탐으로 집계하고 항목 삭제
+
+        Args:
+            hit: 검증한 조회 결과
+            question: 이번 질문
+            agreed: 새로 계산한 결과가 캐시 값과 같은 답인지
+        """
+        if self._count_audit(hit, question, agreed):
+            self.invalidate(hit.key)
+
+    async def record_audit_async(self, hit: SemanticHit, question: str, agreed: bool) -> None:
+        """record_audit의 비동기 버전"""
+        if self._count_audit(hit, question, agreed):
+            await self.invalidate_async(hit.key)
+
+    def _count_audit(self, hit: SemanticHit, question: str, agreed: bool) -> bool:
+        """검증 결과 집계 - 오탐이면 True (항목 삭제 필요)"""
+        with self._lock:
+            self.audits += 1
+            if agreed:
+                return False
+            self.false_hits += 1
+            self.recent_false_hits.append({
+                "question": question,
+                "cached_question": hit.question,
+                "similarity": hit.similarity,
+            })
+            return True
+
+    def stats(self) -> dict:
+        """캐시 통계 (오탐률은 표본 검증 기준)"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "audits": self.audits,
+                "false_hits": self.false_hits,
+                "false_hit_rate": round(self.false_hits / self.audits, 4) if self.audits else 0.0,
+                "recent_false_hits": list(self.recent_false_hits),
+                "backend": self._backend.kind if self._backend is not None else "memory",
+            }
+
+    def _insert(
+        self,
+        question: str,
+        scope: str,
+        vector: np.ndarray,
+        codes: Tuple[int, ...],
+        value: Any,
+        expires_at: Optional[float],
+    ) -> int:
+        """항목 추가 - 같은 scope에 거의 같은 질문이 있으면 교체 (lock 보유 상태에서 호출)"""
+        for key in list(self._buckets[0].get((scope, codes[0]), ())):
+            if float(vector @ self._entries[key].vector) >= 0.999:
+                self._remove(key)
+        key = self._next_key
+        self._next_key += 1
+        self._entries[key] = SemanticEntry(
+            key=key,
+            scope=scope,
+            question=question,
+            vector=vector,
+            codes=codes,
+            value=value,
+            expires_at=expires_at,
+        )
+        for table, code in zip(self._buckets, codes):
+            table.setdefault((scope, code), set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        return key
+
+    @staticmethod
+    def _shared_key(question: str, scope: str) -> str:
+        """워커와 무관한 공유 키 (scope + 정규화된 질문)"""
+        return stable_hash(scope, _normalize(question))[:32]
+
+    def _lookup(self, scope: str, vector: np.ndarray, codes: Tuple[int, ...]) -> Optional[SemanticHit]:
+        """로컬 LSH 인덱스 조회 (만료 항목은 정리)"""
+        now = time.time()
+        with self._lock:
+            candidates: Set[int] = set()
+            for table, code in zip(self._buckets, codes):
+                candidates |= table.get((scope, code), set())
+
+            best: Optional[SemanticEntry] = None
+            best_similarity = self.threshold
+            for key in candidates:
+                entry = self._entries[key]
+                if entry.expires_at is not None and entry.expires_at <= now:
+                    self._remove(key)
+                    self.expirations += 1
+                    continue
+                similarity = float(vector @ entry.vector)
+                if similarity >= best_similarity:
+                    best, best_similarity = entry, similarity
+
+            if best is None:
+                return None
+            self._entries.move_to_end(best.key)
+            self.hits += 1
+            return SemanticHit(
+                key=best.key,
+                question=best.question,
+                similarity=round(best_similarity, 4),
+                value=best.value,
+                audit=self._random.random() < self.audit_rate,
+            )
+
+    def _adopt_shared(
+        self,
+        question: str,
+        scope: str,
+        vector: np.ndarray,
+        codes: Tuple[int, ...],
+        shared: Optional[Tuple[Any, Optional[float]]],
+    ) -> Optional[SemanticHit]:
+        """공유 백엔드 조회 결과를 로컬 인덱스에 반영"""
+        with self._lock:
+            if shared is None:
+                self.misses += 1
+                return None
+            value, expires_at = shared
+            key = self._insert(question, scope, vector, codes, value, expires_at)
+            self.hits += 1
+            return SemanticHit(
+                key=key,
+                question=question,
+                similarity=1.0,
+                value=value,
+                audit=self._random.random() < self.audit_rate,
+            )
+
+    def _insert_local(self, question: str, scope: str, value: Any, ttl_seconds: Optional[float]) -> Optional[float]:
+        """로컬 인덱스에 저장 후 적용할 TTL 반환"""
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        vector = hash_embed(question, self.dim)
+        codes = self._codes(vector)
+        with self._lock:
+            self._insert(question, scope, vector, codes, value, time.time() + ttl if ttl else None)
+        return ttl
+
+    def _remove_local(self, key: int) -> Optional[SemanticEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._remove(key)
+        return entry
+
+    def _shared_value(self, entry) -> Optional[Tuple[Any, Optional[float]]]:
+        """백엔드 항목 → (값, 만료 시각)"""
+        if entry is None:
+            return None
+        expires_at, data = entry
+        value = self._decode(data["value"]) if self._decode is not None else data["value"]
+        return value, expires_at
+
+    def _shared_data(self, question: str, scope: str, value: Any) -> dict:
+        """백엔드 저장 형식"""
+        return {
+            "scope": scope,
+            "question": question,
+            "value": self._encode(value) if self._encode is not None else value,
+        }
+
+    def _read_shared(self, question: str, scope: str) -> Optional[Tuple[Any, Optional[float]]]:
+        if self._backend is None:
+            return None
+        try:
+            return self._shared_value(self._backend.get_entry(self.name, self._shared_key(question, scope)))
+        except Exception as e:
+            print(f"[SemanticCache:{self.name}] Shared read failed: {type(e).__name__}: {e}")
+            return None
+
+    def _remove(self, key: int) -> None:
+        """항목과 버킷 참조 제거 (lock 보유 상태에서 호출)"""
+        entry = self._entries.pop(key)
+        for table, code in zip(self._buckets, entry.codes):
+            bucket = table.get((entry.scope, code))
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del table[(entry.scope, code)]
+
+
+# 싱글톤 인스턴스
+_answer_cache: Optional[SemanticCache] = None
+
+
+def get_answer_cache() -> SemanticCache:
+    """채팅 답변용 SemanticCache 싱글톤 반환"""
+    global _answer_cache
+    if _answer_cache is None:
+        _answer_cache = SemanticCache(
+            name="chat_answers",
+            threshold=settings.semantic_cache_threshold,
+            max_entries=settings.semantic_cache_max_entries,
+            ttl_seconds=settings.semantic_cache_ttl_seconds,
+            audit_rate=settings.semantic_cache_audit_rate,
+            backend=get_state_backend(),
+            encode=lambda response: response.model_dump(mode="json"),
+            decode=AgentResponse.model_validate,
+        )
+        # 공유 백엔드 적재는 웜업(load_shared_async) 또는 첫 get_async에서 (생성 시 I/O 없음)
+    return _answer_cache
@@ -0,0 +1,328 @@
+"""
+채팅 세션
+세션 ID별로 구조화된 슬롯(평수, 위치, 최근 견적/일정)과 대화 요약을 서버에 보관
+
+- 최근 N턴은 원문 유지, 그보다 오래된 턴은 로컬 추출 요약으로 접어 넣음 (LLM 호출 없음)
+- 프롬프트 조립 시 토큰 예산 안에서 최근 일정 → 최근 턴 → 요약 순으로 채움
+  → 대화가 길어져도 요청 페이로드와 프롬프트 크기가 일정하게 유지됨
+- 같은 세션의 동시 요청: 저장 시 최신 세션을 다시 읽어 요청별 변경(턴/슬롯/최근 견적)을 재적용
+  → 나중에 끝난 요청이 먼저 끝난 요청의 턴을 덮어쓰지 않음
+"""
+import asyncio
+import re
+import time
+import uuid
+import weakref
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config import settings
+from app.core.cache import ResultCache
+from app.core.state import StateBackend, get_state_backend
+
+
+# 컨텍스트에서 슬롯으로 보관하는 키
+SLOT_KEYS = ("area_size", "location", "work_type", "budget", "start_date", "bathrooms", "grade", "style")
+
+# 요약 시 우선 보존할 도메인 키워드
+SUMMARY_KEYWORDS = (
+    "평", "만원", "예산", "견적", "일정", "착공", "입주", "철거", "목공", "타일", "도배",
+    "전기", "설비", "바닥", "욕실", "주방", "자재", "스타일", "업체",
+)
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?。])\s+|\n+")
+_HAS_NUMBER = re.compile(r"\d")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 근사치
+
+    영문/숫자는 약 4자당 1토큰, 한글 등 비ASCII는 약 1.5자당 1토큰으로 계산
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return int(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5) + 1
+
+
+def _sentence_score(sentence: str) -> float:
+    """추출 요약용 문장 점수 (숫자/도메인 키워드 포함, 짧을수록 우대)"""
+    score = 0.0
+    if _HAS_NUMBER.search(sentence):
+        score += 2.0
+    score += sum(1.0 for keyword in SUMMARY_KEYWORDS if keyword in sentence)
+    return score / (1 + len(sentence) / 120)
+
+
+def extract_key_sentences(text: str, max_sentences: int = 2, max_chars: int = 160) -> str:
+    """
+    텍스트에서 핵심 문장 추출 (원래 순서 유지)
+
+    Args:
+        text: 원문
+        max_sentences: 최대 문장 수
+        max_chars: 최대 길이
+
+    Returns:
+        str: 추출 요약
+    """
+    sentences = [s.strip() for s in _SENTENCE_SPLIT.split(text) if s.strip()]
+    if not sentences:
+        return ""
+    ranked = sorted(range(len(sentences)), key=lambda i: _sentence_score(sentences[i]), reverse=True)
+    chosen = sorted(ranked[:max_sentences])
+    summary = " ".join(sentences[i] for i in chosen)
+    if len(summary) > max_chars:
+        summary = summary[:max_chars - 1] + "…"
+    return summary
+
+
+@dataclass
+class ChatTurn:
+    """대화 한 턴"""
+    role: str  # user / assistant
+    text: str
+
+
+@dataclass
+class ChatSession:
+    """채팅 세션 상태"""
+    session_id: str
+    slots: Dict[str, Any] = field(default_factory=dict)
+    latest_estimate: Optional[Dict[str, Any]] = None
+    latest_schedule: Optional[Dict[str, Any]] = None
+    summary: List[str] = field(default_factory=list)  # 오래된 턴의 추출 요약 (한 줄씩)
+    turns: List[ChatTurn] = field(default_factory=list)
+    turn_count: int = 0
+    updated_at: float = field(default_factory=time.time)
+    version: int = 0  # 저장할 때마다 증가 (읽은 뒤 다른 요청이 저장했는지 판단)
+
+    def update_slots(self, context: Optional[dict]) -> None:
+        """클라이언트 컨텍스트 값으로 슬롯 갱신 (비어 있는 값은 무시)"""
+        if not context:
+            return
+        for key in SLOT_KEYS:
+            value = context.get(key)
+            if value not in (None, ""):
+                self.slots[key] = value
+        if context.get("previous_cost_estimate"):
+            self.latest_estimate = context["previous_cost_estimate"]
+
+    def to_context(self) -> dict:
+        """에이전트가 사용하는 컨텍스트 dict로 변환"""
+        context = dict(self.slots)
+        if self.latest_estimate:
+            context["previous_cost_estimate"] = self.latest_estimate
+        return context
+
+    def add_turn(self, role: str, text: str, max_recent_turns: int, max_summary_lines: int) -> None:
+        """턴 추가 - 최근 턴 수를 넘으면 가장 오래된 턴을 요약으로 접어 넣음"""
+        self.turns.append(ChatTurn(role=role, text=text))
+        if role == "user":
+            self.turn_count += 1
+        while len(self.turns) > max_recent_turns:
+            old = self.turns.pop(0)
+            line = extract_key_sentences(old.text)
+            if line:
+                speaker = "고객" if old.role == "user" else "김 반장"
+                self.summary.append(f"{speaker}: {line}")
+        if len(self.summary) > max_summary_lines:
+            del self.summary[:len(self.summary) - max_summary_lines]
+        self.updated_at = time.time()
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ChatSession":
+        turns = [ChatTurn(**turn) for turn in data.get("turns", [])]
+        return cls(**{**data, "turns": turns})
+
+
+def _compact_schedule(schedule: Dict[str, Any]) -> str:
+    """일정을 프롬프트용 한 줄로 압축"""
+    parts = []
+    if schedule.get("start_date"):
+        parts.append(f"착공 {schedule['start_date']}")
+    if schedule.get("total_days"):
+        parts.append(f"총 {schedule['total_days']}일")
+    phases = list(dict.fromkeys(item.get("phase") for item in schedule.get("items", []) if isinstance(item, dict)))
+    if phases:
+        parts.append("공정: " + " → ".join(phases))
+    return " / ".join(parts)
+
+
+def build_session_prompt(session: ChatSession, token_budget: int) -> str:
+    """
+    토큰 예산 안에서 세션 블록 조립
+
+    우선순위: 최근 일정 → 최근 턴(최신부터) → 이전 대화 요약(최신부터)
+    (슬롯 값과 최근 견적은 기존 [고객 정보] 블록으로 전달되므로 여기서는 제외)
+
+    Args:
+        session: 채팅 세션
+        token_budget: 최대 토큰 수
+
+    Returns:
+        str: 프롬프트에 덧붙일 텍스트 (없으면 빈 문자열)
+    """
+    remaining = token_budget
+    state_lines = []
+    if session.latest_schedule:
+        state_lines.append(f"최근 일정: {_compact_schedule(session.latest_schedule)}")
+    for line in state_lines:
+        remaining -= estimate_tokens(line)
+
+    recent: List[str] = []
+    for turn in reversed(session.turns):
+        speaker = "고객" if turn.role == "user" else "김 반장"
+        line = f"{speaker}: {turn.text}"
+        cost = estimate_tokens(line)
+        if cost > remaining:
+            break
+        recent.insert(0, line)
+        remaining -= cost
+
+    summary: List[str] = []
+    for line in reversed(session.summary):
+        cost = estimate_tokens(line)
+        if cost > remaining:
+            break
+        summary.insert(0, line)
+        remaining -= cost
+
+    blocks = []
+    if state_lines:
+        blocks.append("[진행 상황]\n" + "\n".join(state_lines))
+    if summary:
+        blocks.append("[이전 대화 요약]\n" + "\n".join(summary))
+    if recent:
+        blocks.append("[최근 대화]\n" + "\n".join(recent))
+    return "\n\n" + "\n\n".join(blocks) if blocks else ""
+
+
+class SessionStore:
+    """
+    세션 저장소
+
+    ResultCache(TTL + LRU)에 세션 dict를 저장, 공유 상태 백엔드가 있으면 항상 백엔드에서 읽음
+    → 다른 워커가 갱신한 세션도 바로 보임 (워커별 메모리 사본을 두지 않음)
+
+    Usage:
+        store = get_session_store()
+        session = await store.get_or_create_async(session_id)
+        ...
+        await store.update_async(session, lambda s: s.add_turn(...))
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: Optional[float] = None,
+        backend: Optional[StateBackend] = None,
+    ):
+        self._cache = ResultCache(
+            name="chat_sessions",
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+            backend=backend,
+            near_cache=False,
+        )
+        # 세션별 저장 락 (사용 중인 락만 유지)
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    @staticmethod
+    def _valid_id(session_id: Optional[str]) -> bool:
+        return bool(session_id) and re.fullmatch(r"[A-Za-z0-9_-]{8,64}", session_id) is not None
+
+    @staticmethod
+    def _parse(data: Optional[dict]) -> Optional[ChatSession]:
+        if data is None:
+            return None
+        try:
+            return ChatSession.from_dict(data)
+        except TypeError:
+            return None
+
+    def _new(self, session_id: Optional[str]) -> ChatSession:
+        """새 세션 (잘못된 ID면 새 ID 발급)"""
+        return ChatSession(session_id=session_id if self._valid_id(session_id) else uuid.uuid4().hex)
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        """세션 조회 (없거나 만료 시 None)"""
+        if not self._valid_id(session_id):
+            return None
+        return self._parse(self._cache.get(session_id))
+
+    async def get_async(self, session_id: str) -> Optional[ChatSession]:
+        """get의 비동기 버전"""
+        if not self._valid_id(session_id):
+            return None
+        return self._parse(await self._cache.get_async(session_id))
+
+    def get_or_create(self, session_id: Optional[str] = None) -> ChatSession:
+        """세션 조회, 없으면 새로 생성 (잘못된 ID면 새 ID 발급)"""
+        session = self.get(session_id) if session_id else None
+        return session if session is not None else self._new(session_id)
+
+    async def get_or_create_async(self, session_id: Optional[str] = None) -> ChatSession:
+        """get_or_create의 비동기 버전"""
+        session = await self.get_async(session_id) if session_id else None
+        return session if session is not None else self._new(session_id)
+
+    def save(self, session: ChatSession) -> None:
+        """세션 저장"""
+        self._cache.set(session.session_id, session.to_dict())
+
+    async def save_async(self, session: ChatSession) -> None:
+        """save의 비동기 버전"""
+        await self._cache.set_async(session.session_id, session.to_dict())
+
+    async def update_async(self, session: ChatSession, apply: Callable[[ChatSession], None]) -> ChatSession:
+        """
+        요청 처리 결과를 세션에 반영해 저장
+
+        읽은 뒤 같은 세션의 다른 요청이 먼저 저장했으면 (version 변경) 최신 세션에 변경을 다시 적용
+        같은 워커 안에서는 세션별 락으로 읽기-적용-쓰기를 직렬화 (워커 간에는 이 구간만큼의 경합이 남음)
+
+        Args:
+            session: 요청 시작 시 읽은 세션
+            apply: 이 요청의 변경을 세션에 적용하는 함수 (여러 번 호출될 수 있음)
+
+        Returns:
+            ChatSession: 저장된 세션
+        """
+        lock = self._locks.get(session.session_id)
+        if lock is None:
+            lock = self._locks[session.session_id] = asyncio.Lock()
+        async with lock:
+            latest = await self.get_async(session.session_id)
+            target = latest if latest is not None and latest.version != session.version else session
+            apply(target)
+            target.version += 1
+            await self.save_async(target)
+        return target
+
+    def delete(self, session_id: str) -> None:
+        """세션 삭제"""
+        if self._valid_id(session_id):
+            self._cache.delete(session_id)
+
+    def stats(self) -> dict:
+        """저장소 통계"""
+        return self._cache.stats()
+
+
+# 싱글톤 인스턴스
+_session_store: Optional[SessionStore] = None
+
+
+def get_session_store() -> SessionStore:
+    """SessionStore 싱글톤 반환"""
+    global _session_store
+    if _session_store is None:
+        _session_store = SessionStore(
+            max_entries=settings.session_max_entries,
+            ttl_seconds=settings.session_ttl_seconds,
+            backend=get_state_backend(),
+        )
+    return _session_store
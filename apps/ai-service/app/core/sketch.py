@@ -0,0 +1,139 @@
+"""
+스트리밍 분위수 스케치
+DDSketch 방식: 값을 로그 간격 버킷에 세어 상대 오차 alpha 이내로 분위수를 추정
+
+- 메모리: 값 범위의 로그에 비례 (만원 단위 견적은 수백 개 버킷 이하)
+- 병합 가능 (버킷 카운트 합) → 지역/평형대 롤업, 워커 간 합치기
+- 조회: 누적 카운트 배열 + 이분 탐색 → 마이크로초 단위
+"""
+import math
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+
+class QuantileSketch:
+    """
+    상대 오차 보장 분위수 스케치 (음수 미지원, 0 이하는 0 버킷)
+
+    Usage:
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+        sketch.quantile(0.5)   # 중앙값 (±1%)
+        sketch.rank(3500)      # 3500 이하 비율
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy는 0과 1 사이여야 합니다")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._cumulative: Optional[Tuple[List[int], List[int]]] = None
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def add(self, value: float, weight: int = 1) -> None:
+        """값 추가"""
+        if value <= 0:
+            self.zero_count += weight
+            value = 0.0
+        else:
+            key = self._key(value)
+            self.bins[key] = self.bins.get(key, 0) + weight
+        self.count += weight
+        self.sum += value * weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self._cumulative = None
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """다른 스케치 합치기 (같은 정확도여야 함)"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("정확도가 다른 스케치는 합칠 수 없습니다")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._cumulative = None
+
+    def _cumulative_counts(self) -> Tuple[List[int], List[int]]:
+        if self._cumulative is None:
+            keys = sorted(self.bins)
+            cumulative, total = [], self.zero_count
+            for key in keys:
+                total += self.bins[key]
+                cumulative.append(total)
+            self._cumulative = (keys, cumulative)
+        return self._cumulative
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        분위수 추정
+
+        Args:
+            q: 0~1
+
+        Returns:
+            float 또는 None (비어 있을 때)
+        """
+        if self.count == 0:
+            return None
+        q = min(max(q, 0.0), 1.0)
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        keys, cumulative = self._cumulative_counts()
+        index = bisect_right(cumulative, rank)
+        value = self._value(keys[min(index, len(keys) - 1)])
+        return min(max(value, self.min), self.max)
+
+    def rank(self, value: float) -> float:
+        """value 이하인 값의 비율 (0~1)"""
+        if self.count == 0:
+            return 0.0
+        if value <= 0:
+            return self.zero_count / self.count
+        keys, cumulative = self._cumulative_counts()
+        index = bisect_right(keys, self._key(value))
+        below = cumulative[index - 1] if index > 0 else self.zero_count
+        return below / self.count
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def to_dict(self) -> dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "bins": {str(key): count for key, count in self.bins.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        sketch = cls(data.get("relative_accuracy", 0.01))
+        sketch.bins = {int(key): count for key, count in data.get("bins", {}).items()}
+        sketch.zero_count = data.get("zero_count", 0)
+        sketch.count = data.get("count", 0)
+        sketch.sum = data.get("sum", 0.0)
+        sketch.min = data["min"] if data.get("min") is not None else math.inf
+        sketch.max = data["max"] if data.get("max") is not None else -math.inf
+        return sketch
@@ -0,0 +1,610 @@
+"""
+공유 상태 백엔드
+캐시/세션 등 서버 상태를 uvicorn 워커와 노드 간에 공유하기 위한 저장소 추상화
+
+- StateBackend: 추상 인터페이스 (namespace + key → JSON 값, 항목별 TTL)
+- MemoryBackend: 프로세스 내 dict (단일 워커 / 테스트용 가짜 백엔드)
+- FileBackend: 항목별 JSON 파일 (기존 .cache 디렉토리 형식, 같은 호스트의 워커 간 공유)
+- SQLiteBackend: 단일 SQLite 파일 (WAL, 같은 호스트의 워커 간 공유 - 항목 수가 많을 때 파일보다 유리)
+- RedisBackend: Redis 호환 서버 (노드 간 공유, redis 패키지는 선택 의존성 - 사용할 때만 임포트)
+
+키는 stable_hash() 결과처럼 워커/노드와 무관하게 같은 문자열을 사용 → 워커 수를 늘려도 히트율 유지
+이벤트 루프에서는 *_async 메서드 사용 (파일/SQLite는 I/O 스레드 풀, Redis는 redis.asyncio 클라이언트)
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.core.executor import get_executor
+from app.core.lazy import import_module
+
+# 지원하는 백엔드 종류 (settings.state_backend)
+STATE_BACKENDS = ("memory", "file", "sqlite", "redis")
+
+# (만료 시각 epoch 초 또는 None, 값)
+Entry = Tuple[Optional[float], Any]
+
+
+def _expires_at(ttl_seconds: Optional[float]) -> Optional[float]:
+    return time.time() + ttl_seconds if ttl_seconds else None
+
+
+class StateBackend(ABC):
+    """
+    공유 상태 백엔드 추상 베이스 클래스
+
+    값은 JSON 직렬화 가능해야 함 (백엔드가 직렬화 - 조회 결과는 항상 새 객체)
+    shared가 True면 다른 워커가 쓴 값이 보이는 저장소
+    """
+
+    kind = "base"
+    shared = True
+
+    @abstractmethod
+    def get_entry(self, namespace: str, key: str) -> Optional[Entry]:
+        """항목 조회 (만료/미존재 시 None)"""
+        pass
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """항목 저장 (ttl_seconds 미지정 시 만료 없음)"""
+        pass
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> None:
+        """항목 삭제"""
+        pass
+
+    @abstractmethod
+    def keys(self, namespace: str) -> List[str]:
+        """namespace의 유효 키 목록"""
+        pass
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """값 조회 (만료/미존재 시 None)"""
+        entry = self.get_entry(namespace, key)
+        return entry[1] if entry is not None else None
+
+    def recent_keys(self, namespace: str, limit: int) -> List[str]:
+        """최근에 저장된 키 최대 limit개 (오래된 것 → 최근 순, 웜업용)"""
+        return self.keys(namespace)[-limit:] if limit > 0 else []
+
+    # 비동기 버전 - 기본 구현은 동기 메서드를 I/O 스레드 풀에서 실행 (루프를 막지 않도록)
+
+    async def get_entry_async(self, namespace: str, key: str) -> Optional[Entry]:
+        """get_entry의 비동기 버전"""
+        return await get_executor().run_io(self.get_entry, namespace, key)
+
+    async def set_async(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """set의 비동기 버전"""
+        await get_executor().run_io(self.set, namespace, key, value, ttl_seconds)
+
+    async def delete_async(self, namespace: str, key: str) -> None:
+        """delete의 비동기 버전"""
+        await get_executor().run_io(self.delete, namespace, key)
+
+    def close(self) -> None:
+        """연결 종료"""
+        pass
+
+    async def close_async(self) -> None:
+        """연결 종료 (비동기 클라이언트 포함)"""
+        self.close()
+
+    def stats(self) -> dict:
+        """백엔드 정보"""
+        return {"backend": self.kind, "shared": self.shared}
+
+
+class MemoryBackend(StateBackend):
+    """
+    프로세스 내 메모리 백엔드
+
+    워커 간 공유되지 않음 → ResultCache는 자체 메모리 LRU만 사용하고 이 백엔드에 중복 저장하지 않음
+    shared=True로 만들면 원격 백엔드처럼 동작 (한 인스턴스를 여러 캐시에 넘겨 워커 공유 동작을 테스트)
+
+    Usage:
+        backend = MemoryBackend(shared=True)
+        worker_a = ResultCache("images", backend=backend)
+        worker_b = ResultCache("images", backend=backend)
+    """
+
+    kind = "memory"
+
+    def __init__(self, max_entries: Optional[int] = None, shared: bool = False):
+        self.max_entries = max_entries
+        self.shared = shared
+        # (namespace, key) → (expires_at, JSON 문자열) - 원격 저장소처럼 조회마다 새 객체 반환
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Optional[float], str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_entry(self, namespace: str, key: str) -> Optional[Entry]:
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return None
+            expires_at, data = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[(namespace, key)]
+                return None
+            self._entries.move_to_end((namespace, key))
+        return expires_at, json.loads(data)
+
+    def set(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        data = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._entries[(namespace, key)] = (_expires_at(ttl_seconds), data)
+            self._entries.move_to_end((namespace, key))
+            while self.max_entries and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._entries.pop((namespace, key), None)
+
+    def keys(self, namespace: str) -> List[str]:
+        now = time.time()
+        with self._lock:
+            return [
+                key for (ns, key), (expires_at, _) in self._entries.items()
+                if ns == namespace and (expires_at is None or expires_at > now)
+            ]
+
+    # 메모리 접근뿐이므로 스레드 풀을 거치지 않음
+
+    async def get_entry_async(self, namespace: str, key: str) -> Optional[Entry]:
+        return self.get_entry(namespace, key)
+
+    async def set_async(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        self.set(namespace, key, value, ttl_seconds)
+
+    async def delete_async(self, namespace: str, key: str) -> None:
+        self.delete(namespace, key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**super().stats(), "entries": len(self._entries)}
+
+
+class FileBackend(StateBackend):
+    """
+    항목별 JSON 파일 백엔드 ({root_dir}/{namespace}/{key}.json)
+
+    기존 ResultCache 디스크 형식({"expires_at", "value"})과 같아 이전 캐시 파일을 그대로 읽음
+    namespace별로 sweep_every번 쓰기마다(프로세스의 첫 쓰기 포함) 정리:
+    만료 파일, 중단된 임시 파일, max_entries를 넘는 오래된 파일(수정 시각 기준) 삭제
+    """
+
+    kind = "file"
+
+    # 파일 앞부분의 만료 시각 (json.dump가 expires_at을 먼저 씀 → 값 전체를 읽지 않고 확인)
+    _EXPIRES_PATTERN = re.compile(rb'^\{"expires_at": (null|[0-9.eE+-]+)')
+    # 이보다 오래된 임시 파일은 쓰다 중단된 것으로 보고 삭제 (초)
+    STALE_TMP_SECONDS = 3600
+
+    def __init__(self, root_dir: str, max_entries: Optional[int] = None, sweep_every: int = 500):
+        self.root_dir = root_dir
+        self.max_entries = max_entries
+        self.sweep_every = sweep_every
+        self._writes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, namespace: str, key: str) -> str:
+        return os.path.join(self.root_dir, namespace, f"{key}.json")
+
+    def get_entry(self, namespace: str, key: str) -> Optional[Entry]:
+        try:
+            with open(self._path(namespace, key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        expires_at = data.get("expires_at")
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(namespace, key)
+            return None
+        return expires_at, data.get("value")
+
+    def set(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        path = self._path(namespace, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 임시 파일에 쓴 뒤 교체 → 다른 워커가 반쯤 쓰인 파일을 읽지 않도록
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"expires_at": _expires_at(ttl_seconds), "value": value}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            writes = self._writes[namespace] = self._writes.get(namespace, 0) + 1
+        if self.sweep_every and writes % self.sweep_every == 1:
+            self.sweep(namespace)
+
+    def delete(self, namespace: str, key: str) -> None:
+        try:
+            os.remove(self._path(namespace, key))
+        except OSError:
+            pass
+
+    def _scan(self, namespace: str) -> List[Tuple[float, str]]:
+        """namespace의 (수정 시각, 키) 목록"""
+        directory = os.path.join(self.root_dir, namespace)
+        entries = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(".json"):
+                        continue
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.name[:-5]))
+                    except OSError:
+                        continue  # 다른 워커가 방금 삭제
+        except OSError:
+            return []
+        return entries
+
+    def keys(self, namespace: str) -> List[str]:
+        return sorted(key for _, key in self._scan(namespace))
+
+    def recent_keys(self, namespace: str, limit: int) -> List[str]:
+        if limit <= 0:
+            return []
+        return [key for _, key in sorted(self._scan(namespace))[-limit:]]
+
+    def _peek_expires_at(self, path: str) -> Optional[float]:
+        """파일 앞부분만 읽어 만료 시각 확인 (형식이 다르면 None)"""
+        try:
+            with open(path, "rb") as f:
+                match = self._EXPIRES_PATTERN.match(f.read(64))
+        except OSError:
+            return None
+        if match is None or match.group(1) == b"null":
+            return None
+        try:
+            return float(match.group(1))
+        except ValueError:
+            return None
+
+    def sweep(self, namespace: str) -> int:
+        """
+        만료/초과 파일 정리
+
+        Args:
+            namespace: 정리할 namespace
+
+        Returns:
+            int: 삭제한 파일 수
+        """
+        directory = os.path.join(self.root_dir, namespace)
+        now = time.time()
+        removed = 0
+        live: List[Tuple[float, str]] = []
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            return 0
+        for entry in entries:
+            try:
+                mtime = entry.stat().st_mtime
+            except OSError:
+                continue
+            if entry.name.endswith(".tmp"):
+                stale = mtime < now - self.STALE_TMP_SECONDS
+            elif entry.name.endswith(".json"):
+                expires_at = self._peek_expires_at(entry.path)
+                stale = expires_at is not None and expires_at <= now
+                if not stale:
+                    live.append((mtime, entry.path))
+            else:
+                continue
+            if stale:
+                removed += self._remove(entry.path)
+
+        if self.max_entries and len(live) > self.max_entries:
+            live.sort()
+            for _, path in live[:len(live) - self.max_entries]:
+                removed += self._remove(path)
+        if removed:
+            print(f"[State] Swept {removed} files from {namespace}")
+        return removed
+
+    @staticmethod
+    def _remove(path: str) -> int:
+        try:
+            os.remove(path)
+            return 1
+        except OSError:
+            return 0  # 다른 워커가 먼저 삭제
+
+    def stats(self) -> dict:
+        return {**super().stats(), "root_dir": self.root_dir, "max_entries": self.max_entries}
+
+
+class SQLiteBackend(StateBackend):
+    """
+    SQLite 단일 파일 백엔드
+
+    - WAL 모드: 여러 워커 프로세스가 동시에 읽고, 쓰기는 짧게 직렬화
+    - 만료 항목은 조회 시 제거 + purge_every번 쓰기마다 일괄 정리
+    - updated_at: 최근 저장 순서 (웜업 시 최근 항목부터 적재)
+    """
+
+    kind = "sqlite"
+
+    def __init__(self, path: str, purge_every: int = 500):
+        self.path = path
+        self.purge_every = purge_every
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS state (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL,
+                updated_at REAL,
+                PRIMARY KEY (namespace, key)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS state_expires ON state (expires_at) WHERE expires_at IS NOT NULL;
+        """)
+        # 이전 버전 파일: updated_at 컬럼 추가 (기존 항목은 NULL → 가장 오래된 것으로 취급)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(state)")}
+        if "updated_at" not in columns:
+            self._conn.execute("ALTER TABLE state ADD COLUMN updated_at REAL")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS state_updated ON state (namespace, updated_at)")
+        self._conn.commit()
+
+    def get_entry(self, namespace: str, key: str) -> Optional[Entry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM state WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+            if row is None:
+                return None
+            data, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                self._conn.execute("DELETE FROM state WHERE namespace = ? AND key = ?", (namespace, key))
+                self._conn.commit()
+                return None
+        return expires_at, json.loads(data)
+
+    def set(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        data = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO state (namespace, key, value, expires_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, data, _expires_at(ttl_seconds), time.time()),
+            )
+            self._writes += 1
+            if self._writes % self.purge_every == 0:
+                self._conn.execute("DELETE FROM state WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+            self._conn.commit()
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM state WHERE namespace = ? AND key = ?", (namespace, key))
+            self._conn.commit()
+
+    def keys(self, namespace: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM state WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?) ORDER BY key",
+                (namespace, time.time()),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def recent_keys(self, namespace: str, limit: int) -> List[str]:
+        if limit <= 0:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM state WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?) "
+                "ORDER BY updated_at DESC LIMIT ?",
+                (namespace, time.time(), limit),
+            ).fetchall()
+        return [row[0] for row in reversed(rows)]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM state").fetchone()[0]
+        return {**super().stats(), "path": self.path, "entries": entries}
+
+
+class RedisBackend(StateBackend):
+    """
+    Redis 호환 서버 백엔드 (Redis/Valkey/KeyDB 등)
+
+    키: {prefix}:{namespace}:{key}, 값: JSON 문자열, TTL은 서버 만료(PX)에 위임
+    최근 저장 순서: namespace별 sorted set {prefix}:~recent:{namespace} (score = 저장 시각, recent_limit개 유지)
+    이벤트 루프에서는 redis.asyncio 클라이언트 사용 (첫 비동기 호출 시 생성 → 실행 중인 루프에 연결)
+    """
+
+    kind = "redis"
+
+    def __init__(
+        self,
+        url: str,
+        prefix: str = "ai-service",
+        socket_timeout: float = 1.0,
+        recent_limit: int = 10000,
+        client: Any = None,
+        async_client: Any = None,
+    ):
+        """
+        Args:
+            url: redis:// URL
+            prefix: 키 접두사
+            socket_timeout: 소켓 타임아웃 (초)
+            recent_limit: namespace별로 기억할 최근 저장 키 수
+            client / async_client: 이미 만든 클라이언트 재사용 (미지정 시 url로 생성)
+        """
+        self.url = url
+        self.prefix = prefix
+        self.socket_timeout = socket_timeout
+        self.recent_limit = recent_limit
+        if client is None:
+            client = self._redis_module("redis").Redis.from_url(
+                url, socket_timeout=socket_timeout, decode_responses=True
+            )
+        self._client = client
+        self._async_client = async_client
+
+    @staticmethod
+    def _redis_module(name: str):
+        try:
+            return import_module(name)
+        except ImportError:  # 선택 의존성
+            raise RuntimeError("state_backend=redis 사용 시 redis 패키지가 필요합니다 (pip install redis)")
+
+    def _get_async_client(self):
+        if self._async_client is None:
+            self._async_client = self._redis_module("redis.asyncio").Redis.from_url(
+                self.url, socket_timeout=self.socket_timeout, decode_responses=True
+            )
+        return self._async_client
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:{namespace}:{key}"
+
+    def _recent_key(self, namespace: str) -> str:
+        return f"{self.prefix}:~recent:{namespace}"
+
+    @staticmethod
+    def _entry(data: Optional[str], pttl: Optional[int]) -> Optional[Entry]:
+        if data is None:
+            return None
+        expires_at = time.time() + pttl / 1000 if pttl and pttl > 0 else None
+        return expires_at, json.loads(data)
+
+    def _queue_get(self, pipe, namespace: str, key: str) -> None:
+        pipe.get(self._key(namespace, key))
+        pipe.pttl(self._key(namespace, key))
+
+    def _queue_set(self, pipe, namespace: str, key: str, value: Any, ttl_seconds: Optional[float]) -> None:
+        px = max(1, int(ttl_seconds * 1000)) if ttl_seconds else None
+        recent = self._recent_key(namespace)
+        pipe.set(self._key(namespace, key), json.dumps(value, ensure_ascii=False), px=px)
+        pipe.zadd(recent, {key: time.time()})
+        pipe.zremrangebyrank(recent, 0, -self.recent_limit - 1)
+
+    def _queue_delete(self, pipe, namespace: str, key: str) -> None:
+        pipe.delete(self._key(namespace, key))
+        pipe.zrem(self._recent_key(namespace), key)
+
+    def get_entry(self, namespace: str, key: str) -> Optional[Entry]:
+        pipe = self._client.pipeline(transaction=False)
+        self._queue_get(pipe, namespace, key)
+        return self._entry(*pipe.execute())
+
+    def set(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        pipe = self._client.pipeline(transaction=False)
+        self._queue_set(pipe, namespace, key, value, ttl_seconds)
+        pipe.execute()
+
+    def delete(self, namespace: str, key: str) -> None:
+        pipe = self._client.pipeline(transaction=False)
+        self._queue_delete(pipe, namespace, key)
+        pipe.execute()
+
+    async def get_entry_async(self, namespace: str, key: str) -> Optional[Entry]:
+        pipe = self._get_async_client().pipeline(transaction=False)
+        self._queue_get(pipe, namespace, key)
+        return self._entry(*await pipe.execute())
+
+    async def set_async(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        pipe = self._get_async_client().pipeline(transaction=False)
+        self._queue_set(pipe, namespace, key, value, ttl_seconds)
+        await pipe.execute()
+
+    async def delete_async(self, namespace: str, key: str) -> None:
+        pipe = self._get_async_client().pipeline(transaction=False)
+        self._queue_delete(pipe, namespace, key)
+        await pipe.execute()
+
+    def keys(self, namespace: str) -> List[str]:
+        head = len(self._key(namespace, ""))
+        return sorted(name[head:] for name in self._client.scan_iter(match=self._key(namespace, "*"), count=500))
+
+    def recent_keys(self, namespace: str, limit: int) -> List[str]:
+        if limit <= 0:
+            return []
+        keys = self._client.zrange(self._recent_key(namespace), -limit, -1)
+        # 최근 목록이 없으면(이전 버전이 저장한 항목) 키 스캔으로 대체
+        return list(keys) if keys else super().recent_keys(namespace, limit)
+
+    def close(self) -> None:
+        self._client.close()
+
+    async def close_async(self) -> None:
+        self.close()
+        if self._async_client is not None:
+            close = getattr(self._async_client, "aclose", None) or self._async_client.close  # redis<5.0.1
+            await close()
+            self._async_client = None
+
+    def stats(self) -> dict:
+        return {**super().stats(), "prefix": self.prefix}
+
+
+def create_state_backend(kind: str) -> StateBackend:
+    """
+    설정값으로 백엔드 생성
+
+    Args:
+        kind: memory / file / sqlite / redis
+
+    Returns:
+        StateBackend: 백엔드 인스턴스
+    """
+    if kind == "memory":
+        return MemoryBackend()
+    if kind == "file":
+        return FileBackend(
+            settings.cache_dir,
+            max_entries=settings.state_file_max_entries or None,
+            sweep_every=settings.state_file_sweep_every,
+        )
+    if kind == "sqlite":
+        return SQLiteBackend(settings.state_sqlite_file)
+    if kind == "redis":
+        return RedisBackend(settings.state_redis_url, prefix=settings.state_key_prefix)
+    raise ValueError(f"알 수 없는 state_backend: {kind} (지원: {', '.join(STATE_BACKENDS)})")
+
+
+# 싱글톤 인스턴스
+_state_backend: Optional[StateBackend] = None
+
+
+def get_state_backend() -> StateBackend:
+    """설정된 StateBackend 싱글톤 반환"""
+    global _state_backend
+    if _state_backend is None:
+        _state_backend = create_state_backend(settings.state_backend)
+        print(f"[State] Backend: {_state_backend.kind}")
+    return _state_backend
+
+
+async def close_state_backend() -> None:
+    """백엔드 연결 종료 (앱 종료 시)"""
+    global _state_backend
+    if _state_backend is not None:
+        await _state_backend.close_async()
+        _state_backend = None
@@ -0,0 +1,127 @@
+"""
+시작 웜업
+배포 직후 첫 요청들이 떠안던 준비 비용(SDK 로드, 모델 객체 생성, TLS 핸드셰이크, 캐시 디스크 적재)을
+lifespan 단계에서 미리 처리하고, 끝날 때까지 readiness를 보류
+
+- 단계는 순서대로 실행 (에이전트 → 커넥션 → 캐시 → 프로브), 단계 실패는 기록만 하고 다음 단계 진행
+- 전체 제한 시간 초과 시 남은 단계는 건너뛰고 완료 처리 (웜업이 배포를 막지 않도록)
+- 완료 전에는 GET /api/ready가 503 → 로드밸런서/쿠버네티스가 준비된 인스턴스에만 트래픽 전달
+- /api/health(liveness)는 웜업과 무관하게 200
+"""
+import asyncio
+import time
+from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from app.config import settings
+
+
+@dataclass
+class WarmupStep:
+    """웜업 단계 상태"""
+    name: str
+    status: str = "pending"  # pending | running | done | failed | skipped
+    duration_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+class Warmup:
+    """
+    웜업 단계 실행기 + readiness 상태
+
+    Usage:
+        warmup = get_warmup()
+        warmup.add_step("agents", init_agents)
+        task = asyncio.create_task(warmup.run())
+        ...
+        warmup.ready  # 모든 단계가 끝나면 True
+    """
+
+    def __init__(self, timeout_seconds: Optional[float] = None):
+        self.timeout_seconds = timeout_seconds
+        self._steps: List[Tuple[WarmupStep, Callable[[], Awaitable]]] = []
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._ready = False
+
+    def add_step(self, name: str, func: Callable[[], Awaitable]) -> None:
+        """웜업 단계 등록 (run 이전에만)"""
+        self._steps.append((WarmupStep(name), func))
+
+    @property
+    def ready(self) -> bool:
+        """웜업 완료 여부 (단계가 없으면 run 직후 True)"""
+        return self._ready
+
+    async def run(self) -> bool:
+        """
+        등록된 단계를 순서대로 실행
+
+        Returns:
+            bool: 모든 단계가 성공했는지 여부 (실패/건너뜀이 있어도 ready는 True가 됨)
+        """
+        self._started_at = time.perf_counter()
+        try:
+            if self.timeout_seconds:
+                await asyncio.wait_for(self._run_steps(), timeout=self.timeout_seconds)
+            else:
+                await self._run_steps()
+        except asyncio.TimeoutError:
+            for step, _ in self._steps:
+                if step.status in ("pending", "running"):
+                    step.status = "skipped"
+                    step.error = f"warm-up timeout ({self.timeout_seconds:g}s)"
+            print(f"[Warmup] Timed out after {self.timeout_seconds:g}s, remaining steps skipped")
+
+        # 실패/건너뜀이 있어도 트래픽 수용 (취소 = 서버 종료 시에는 여기까지 오지 않음)
+        self._finished_at = time.perf_counter()
+        self._ready = True
+
+        ok = all(step.status == "done" for step, _ in self._steps)
+        print(f"[Warmup] Ready in {self.elapsed_ms():,.0f}ms ({'all steps done' if ok else 'with failures'})")
+        return ok
+
+    async def _run_steps(self) -> None:
+        for step, func in self._steps:
+            step.status = "running"
+            started = time.perf_counter()
+            try:
+                await func()
+                step.status = "done"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                step.status = "failed"
+                step.error = str(e)
+                print(f"[Warmup] Step '{step.name}' failed: {e}")
+            finally:
+                step.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+            if step.status == "done":
+                print(f"[Warmup] Step '{step.name}' done in {step.duration_ms:,.0f}ms")
+
+    def elapsed_ms(self) -> Optional[float]:
+        """웜업 경과 시간 (ms, 시작 전이면 None)"""
+        if self._started_at is None:
+            return None
+        end = self._finished_at if self._finished_at is not None else time.perf_counter()
+        return round((end - self._started_at) * 1000, 1)
+
+    def status(self) -> dict:
+        """readiness 응답용 상태"""
+        return {
+            "ready": self._ready,
+            "elapsed_ms": self.elapsed_ms(),
+            "steps": [asdict(step) for step, _ in self._steps],
+        }
+
+
+# 싱글톤 인스턴스
+_warmup: Optional[Warmup] = None
+
+
+def get_warmup() -> Warmup:
+    """Warmup 싱글톤 반환"""
+    global _warmup
+    if _warmup is None:
+        _warmup = Warmup(timeout_seconds=settings.warmup_timeout_seconds or None)
+    return _warmup
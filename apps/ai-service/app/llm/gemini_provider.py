@@ -1,9 +1,10 @@
 """
 Google Gemini LLM Provider
-Google GenAI SDK를 사용한 Gemini 모델 구현
+Google GenAI SDK를 사용한 Gemini 모델 구현 (SDK는 initialize 시점에 로드)
 """
 from typing import Optional, AsyncIterator
-import google.generativeai as genai
+
+from app.core.lazy import import_module_async
 
 from .base import LLMProvider, LLMConfig, LLMResponse, LLMProviderType
 
@@ -29,6 +30,7 @@ class GeminiProvider(LLMProvider):
 
     async def initialize(self) -> None:
         """Gemini 클라이언트 초기화"""
+        genai = await import_module_async("google.generativeai")
         genai.configure(api_key=self.config.api_key)
 
         generation_config = genai.GenerationConfig(
@@ -41,6 +43,12 @@ class GeminiProvider(LLMProvider):
             generation_config=generation_config,
         )
 
+    async def warm_connection(self) -> None:
+        """커넥션 웜업: count_tokens 호출로 채널 연결/TLS 핸드셰이크를 미리 수행 (생성 비용 없음)"""
+        if not self._client:
+            await self.initialize()
+        await self._client.count_tokens_async("ping")
+
     async def generate(
         self,
         prompt: str,
@@ -2,8 +2,9 @@
 Pydantic 스키마 모델
 AI 서비스에서 사용하는 데이터 모델 정의
 """
+from datetime import date
 from pydantic import BaseModel, Field
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Dict
 from enum import Enum
 
 
@@ -91,6 +92,56 @@ class ProjectSchedule(BaseModel):
     warnings: List[str] = Field(default_factory=list, description="주의 사항")
 
 
+class PhaseInput(BaseModel):
+    """사용자 정의 공정"""
+    name: str = Field(..., description="공정명 (예: 철거, 타일)")
+    task: str = Field(default="", description="작업 내용")
+    duration: int = Field(..., ge=1, le=60, description="작업일수")
+    workers: int = Field(default=2, ge=1, le=20, description="투입 인력")
+    is_noise_work: bool = Field(default=False, description="소음 작업 여부 (Friday Rule 적용)")
+    predecessors: List[str] = Field(default_factory=list, description="선행 공정명")
+
+
+class ProjectScheduleInput(BaseModel):
+    """다중 현장 스케줄링 대상 현장"""
+    project_id: str = Field(..., description="현장 ID")
+    start_date: date = Field(..., description="착공 가능일 (YYYY-MM-DD)")
+    due_date: Optional[date] = Field(None, description="납기/입주일 (YYYY-MM-DD)")
+    priority: float = Field(default=1.0, gt=0, le=10, description="우선순위 가중치 (클수록 먼저)")
+    area_size: int = Field(default=32, ge=1, le=200, description="평수 (phases 미지정 시 공정 생성용)")
+    work_scope: str = Field(default="전체", description="시공 범위 (phases 미지정 시 공정 생성용)")
+    bathrooms: Optional[int] = Field(None, ge=0, le=5, description="욕실 수")
+    phases: Optional[List[PhaseInput]] = Field(None, description="공정 목록 (미지정 시 평수/범위로 생성)")
+
+
+class MultiProjectScheduleRequest(BaseModel):
+    """공유 크루 제약 다중 현장 일정 요청"""
+    projects: List[ProjectScheduleInput] = Field(..., description="현장 목록")
+    crews: Dict[str, int] = Field(
+        default_factory=dict,
+        description="공종별 크루 수 (예: {\"타일\": 2, \"목공\": 3}) - 지정하지 않은 공종은 제한 없음",
+    )
+    max_workers_per_day: int = Field(default=8, ge=1, le=50, description="현장별 하루 투입 인원 상한")
+    time_limit_ms: int = Field(default=500, ge=0, le=5000, description="지역 탐색 시간 상한 (ms)")
+
+
+class ProjectScheduleResult(BaseModel):
+    """현장별 배치 결과"""
+    project_id: str = Field(..., description="현장 ID")
+    schedule: ProjectSchedule = Field(..., description="현장 일정 (note에 배정 크루 표시)")
+    completion_date: str = Field(..., description="완료 예정일")
+    tardiness_days: int = Field(default=0, description="납기 초과 일수")
+
+
+class MultiProjectScheduleResponse(BaseModel):
+    """다중 현장 일정 응답"""
+    projects: List[ProjectScheduleResult] = Field(default_factory=list, description="현장별 일정")
+    crew_utilization: Dict[str, float] = Field(default_factory=dict, description="공종별 크루 가동률 (0-1)")
+    objective: float = Field(..., description="목표값 (가중 공기 + 납기 초과 벌점, 낮을수록 좋음)")
+    iterations: int = Field(default=0, description="지역 탐색 반복 횟수")
+    elapsed_ms: int = Field(default=0, description="계산 시간 (ms)")
+
+
 # === 견적서 관련 모델 ===
 
 class QuoteData(BaseModel):
@@ -107,6 +158,65 @@ class QuoteData(BaseModel):
     target_areas: List[str] = Field(default_factory=list, description="서비스 가능 지역")
 
 
+# === 견적 매트릭스 (What-if) 모델 ===
+
+class CostGridRequest(BaseModel):
+    """평수 × 스타일 × 등급 견적 매트릭스 요청"""
+    areas: Optional[List[int]] = Field(None, description="평수 목록 (미지정 시 area_min~area_max)")
+    area_min: int = Field(default=20, ge=1, le=200, description="최소 평수")
+    area_max: int = Field(default=60, ge=1, le=200, description="최대 평수")
+    area_step: int = Field(default=1, ge=1, description="평수 간격")
+    styles: Optional[List[str]] = Field(None, description="스타일 목록 (미지정 시 전체 8종)")
+    grades: Optional[List[str]] = Field(None, description="자재 등급 목록 (basic/standard/premium, 미지정 시 전체)")
+    work_scope: str = Field(default="전체", description="시공 범위 (전체/욕실/주방/도배/바닥)")
+    location: Optional[str] = Field(None, description="위치 (노임단가 권역 보정)")
+    bathrooms: Optional[int] = Field(None, ge=0, le=5, description="욕실 수 (미지정 시 평수로 추정)")
+    include_breakdown: bool = Field(default=False, description="공종별 소계 매트릭스 포함 여부")
+
+
+class CostGridResponse(BaseModel):
+    """견적 매트릭스 응답 - 모든 매트릭스는 [평수][스타일][등급] 순서 (만원)"""
+    areas: List[int] = Field(..., description="평수 축")
+    styles: List[str] = Field(..., description="스타일 축")
+    grades: List[str] = Field(..., description="등급 축")
+    work_scope: str = Field(..., description="시공 범위")
+    categories: List[str] = Field(default_factory=list, description="포함된 공종")
+    total_dm: List[List[List[int]]] = Field(..., description="총 재료비")
+    total_dl: List[List[List[int]]] = Field(..., description="총 노무비")
+    total_oh: List[List[List[int]]] = Field(..., description="총 경비")
+    grand_total: List[List[List[int]]] = Field(..., description="총 합계")
+    contingency: List[List[List[int]]] = Field(..., description="예비비")
+    final_total: List[List[List[int]]] = Field(..., description="최종 합계")
+    category_totals: Optional[List[List[List[List[int]]]]] = Field(
+        None, description="공종별 소계 [공종][평수][스타일][등급] (include_breakdown=true일 때)"
+    )
+
+
+class ContractorOfferRequest(BaseModel):
+    """업체 제안가 기록 요청"""
+    work_scope: str = Field(default="전체", description="시공 범위 (전체/욕실/주방/도배/바닥)")
+    area_size: int = Field(..., ge=1, le=200, description="평수")
+    total_cost: int = Field(..., gt=0, description="제안 총액 (만원)")
+    location: Optional[str] = Field(None, description="위치")
+    breakdown: List[CostBreakdown] = Field(default_factory=list, description="공종별 내역 (선택)")
+    contractor_id: Optional[str] = Field(None, description="업체 ID")
+    quote_id: Optional[str] = Field(None, description="견적 요청 ID")
+
+
+class EstimateBenchmarkResponse(BaseModel):
+    """평당 단가 분포 조회 결과"""
+    source: str = Field(..., description="출처 (estimate/quote/offer/*)")
+    category: str = Field(..., description="공사 범위 또는 범위/공종")
+    region: str = Field(..., description="사용된 권역 (*: 전국)")
+    area_band: str = Field(..., description="사용된 평형대 (*: 전체)")
+    count: int = Field(..., description="표본 수")
+    sufficient: bool = Field(..., description="표본 수 충분 여부")
+    unit_percentiles: Dict[str, float] = Field(default_factory=dict, description="평당 단가 분위수 (만원/평)")
+    total_percentiles: Dict[str, int] = Field(default_factory=dict, description="총액 분위수 (만원, area_size 지정 시)")
+    price_percentile: Optional[float] = Field(None, description="price의 백분위 (0-1)")
+    verdict: Optional[str] = Field(None, description="가격 판정")
+
+
 # === 구조물 분석 관련 모델 (AI 건축사) ===
 
 class StructuralElementType(str, Enum):
@@ -135,6 +245,7 @@ class StructuralElement(BaseModel):
 
 class FloorPlanAnalysis(BaseModel):
     """도면 분석 결과"""
+    analysis_id: Optional[str] = Field(None, description="서버 저장 분석 ID (후속 요청에서 전체 분석 대신 전달)")
     floor_plan_id: Optional[str] = Field(None, description="도면 ID")
     image_dimensions: dict = Field(default_factory=dict, description="이미지 크기 {width, height}")
     estimated_area: Optional[float] = Field(None, description="추정 면적 (평)")
@@ -179,13 +290,15 @@ class FloorPlanAnalysisRequest(BaseModel):
 
 class DemolitionValidationRequest(BaseModel):
     """철거 검증 요청"""
-    floor_plan_analysis: FloorPlanAnalysis = Field(..., description="도면 분석 결과")
+    analysis_id: Optional[str] = Field(None, description="서버 저장 분석 ID (floor_plan_analysis와 둘 중 하나 필수)")
+    floor_plan_analysis: Optional[FloorPlanAnalysis] = Field(None, description="도면 분석 결과")
     selected_element_ids: List[str] = Field(..., description="철거 선택된 요소 라벨 목록")
 
 
 class DesignFeasibilityRequest(BaseModel):
     """디자인 시공 가능성 검증 요청"""
-    floor_plan_analysis: FloorPlanAnalysis = Field(..., description="도면 분석 결과")
+    analysis_id: Optional[str] = Field(None, description="서버 저장 분석 ID (floor_plan_analysis와 둘 중 하나 필수)")
+    floor_plan_analysis: Optional[FloorPlanAnalysis] = Field(None, description="도면 분석 결과")
     demolition_plan: DemolitionValidation = Field(..., description="철거 계획")
     design_image_url: Optional[str] = Field(None, description="디자인 이미지 URL")
     design_image_base64: Optional[str] = Field(None, description="디자인 이미지 Base64")
@@ -248,6 +361,8 @@ class GenerateDesignRequest(BaseModel):
     room_type: Optional[str] = Field("living_room", description="공간 유형")
     user_request: Optional[str] = Field(None, description="사용자 요청 (자연어)")
     reference_image_urls: Optional[List[str]] = Field(None, description="레퍼런스 이미지 URL 목록")
+    deep_style_analysis: bool = Field(default=False, description="레퍼런스 이미지 AI 심층 스타일 분석 여부 (기본: 로컬 팔레트 분석만)")
+    analysis_id: Optional[str] = Field(None, description="서버 저장 분석 ID (floor_plan_analysis 대신 전달)")
     floor_plan_analysis: Optional[FloorPlanAnalysis] = Field(None, description="건축사 도면 분석 결과")
 
 
@@ -255,12 +370,15 @@ class GenerateDesignResponse(BaseModel):
     """인테리어 디자인 이미지 생성 응답"""
     success: bool = Field(..., description="생성 성공 여부")
     image_url: Optional[str] = Field(None, description="생성된 이미지 URL")
+    image_variants: Optional[Dict[str, str]] = Field(None, description="해상도별 이미지 URL {thumbnail, medium, full} (WebP)")
+    source_image_url: Optional[str] = Field(None, description="원본(업스트림) 이미지 URL")
     prompt_used: str = Field(..., description="사용된 프롬프트")
     style: Optional[str] = Field(None, description="적용된 스타일")
     room_type: Optional[str] = Field(None, description="공간 유형")
     model: Optional[str] = Field(None, description="사용된 모델")
     error: Optional[str] = Field(None, description="에러 메시지")
     note: Optional[str] = Field(None, description="추가 메모")
+    cached: bool = Field(default=False, description="캐시된 생성 결과 재사용 여부")
 
 
 # === API 요청/응답 모델 ===
@@ -269,6 +387,7 @@ class ChatRequest(BaseModel):
     """채팅 API 요청"""
     query: str = Field(..., description="사용자 질문")
     context: Optional[dict] = Field(default_factory=dict, description="컨텍스트 (평수, 위치, 공종 등)")
+    session_id: Optional[str] = Field(None, description="세션 ID (있으면 서버에 저장된 슬롯/대화 이력 사용)")
 
 
 class AgentResponse(BaseModel):
@@ -286,3 +405,4 @@ class AgentResponse(BaseModel):
         default_factory=list,
         description="추천 후속 질문"
     )
+    session_id: Optional[str] = Field(None, description="세션 ID (다음 요청에 그대로 전달)")
@@ -0,0 +1,4 @@
+"""
+Services 모듈
+LLM 호출 없이 로컬에서 동작하는 분석/계산 엔진
+"""
@@ -0,0 +1,105 @@
+"""
+도면 분석 저장소
+생성된 FloorPlanAnalysis를 서버에 보관하고 콘텐츠 해시 ID로 조회
+
+- 분석이 만들어질 때 등록 → 응답의 analysis_id만으로 철거 검증/시공 검증/Clean Slate/디자인 생성 요청 가능
+  (클라이언트가 수백 KB 분석 결과를 매번 다시 보내고, 서버가 매번 다시 검증하던 비용 제거)
+- 메모리: 파싱된 모델 객체 그대로 LRU 보관 (조회 시 재검증 없음)
+- 공유: 상태 백엔드(file/sqlite/redis)에 저장 → 다른 워커/노드/재시작 후에도 조회 가능 (이때만 한 번 검증)
+- 같은 내용의 분석은 같은 ID (analysis_id 필드 제외하고 해시)
+
+조회된 객체는 여러 요청이 공유하므로 읽기 전용으로 취급
+"""
+from typing import Optional
+
+from app.config import settings
+from app.core.cache import ResultCache
+from app.core.hashing import stable_hash
+from app.core.state import StateBackend, get_state_backend
+from app.models.schemas import FloorPlanAnalysis
+
+# analysis_id 길이 (SHA-256 hex 앞부분, 128비트)
+ANALYSIS_ID_LENGTH = 32
+
+
+def compute_analysis_id(analysis: FloorPlanAnalysis) -> str:
+    """분석 내용 기반 ID (analysis_id 필드 자체는 제외)"""
+    return stable_hash(analysis.model_dump(mode="json", exclude={"analysis_id"}))[:ANALYSIS_ID_LENGTH]
+
+
+class AnalysisStore:
+    """
+    FloorPlanAnalysis 핸들 저장소
+
+    Usage:
+        store = get_analysis_store()
+        analysis = await store.put_async(analysis)          # analysis.analysis_id 설정
+        same = await store.get_async(analysis.analysis_id)  # 파싱된 객체 그대로
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        backend: Optional[StateBackend] = None,
+    ):
+        self._cache = ResultCache(
+            name="floor_plan_analyses",
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+            backend=backend,
+            encode=lambda analysis: analysis.model_dump(mode="json"),
+            decode=FloorPlanAnalysis.model_validate,
+        )
+
+    def put(self, analysis: FloorPlanAnalysis) -> FloorPlanAnalysis:
+        """
+        분석 결과 등록
+
+        Args:
+            analysis: 도면 분석 결과
+
+        Returns:
+            FloorPlanAnalysis: analysis_id가 설정된 같은 객체
+        """
+        analysis.analysis_id = compute_analysis_id(analysis)
+        self._cache.set(analysis.analysis_id, analysis)
+        return analysis
+
+    async def put_async(self, analysis: FloorPlanAnalysis) -> FloorPlanAnalysis:
+        """put의 비동기 버전"""
+        analysis.analysis_id = compute_analysis_id(analysis)
+        await self._cache.set_async(analysis.analysis_id, analysis)
+        return analysis
+
+    @staticmethod
+    def _valid_id(analysis_id: str) -> bool:
+        return bool(analysis_id) and analysis_id.isalnum()  # 파일명으로 쓰이므로 hex 이외 입력은 바로 거절
+
+    def get(self, analysis_id: str) -> Optional[FloorPlanAnalysis]:
+        """ID로 분석 결과 조회 (만료/미존재 시 None)"""
+        return self._cache.get(analysis_id) if self._valid_id(analysis_id) else None
+
+    async def get_async(self, analysis_id: str) -> Optional[FloorPlanAnalysis]:
+        """get의 비동기 버전"""
+        return await self._cache.get_async(analysis_id) if self._valid_id(analysis_id) else None
+
+    def stats(self) -> dict:
+        """저장소 통계"""
+        return self._cache.stats()
+
+
+# 싱글톤 인스턴스
+_analysis_store: Optional[AnalysisStore] = None
+
+
+def get_analysis_store() -> AnalysisStore:
+    """AnalysisStore 싱글톤 반환"""
+    global _analysis_store
+    if _analysis_store is None:
+        _analysis_store = AnalysisStore(
+            max_entries=settings.analysis_store_max_entries,
+            ttl_seconds=settings.analysis_store_ttl_seconds or None,
+            backend=get_state_backend(),
+        )
+    return _analysis_store
@@ -0,0 +1,584 @@
+"""
+견적 엔진
+LLM 호출 없이 공종별 단가표 + 물량 산출로 CostEstimate를 결정적으로 계산
+
+- 공종: 철거, 목공, 바닥, 타일, 도배, 전기, 설비
+- 단가: 자재 등급(basic/standard/premium) × 권역(서울/수도권/광역시/지방) 보정
+- 물량: 평수 + 공사 범위(전체/욕실/주방/도배/바닥)로 산출
+- 스타일 지정 시 STYLE_DATA의 마감재 단가 범위를 등급 위치로 보간해 사용
+
+같은 입력이면 항상 같은 견적 (LLM은 답변 문장만 작성)
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.models.schemas import CostBreakdown, CostEstimate
+from app.services.regions import parse_location, region_group
+from app.services.style_catalog import STYLE_DATA
+
+
+SQM_PER_PYEONG = 3.3058
+
+# 욕실 수 상한 (주거 리모델링 범위 밖 입력으로 물량이 튀지 않도록)
+MAX_BATHROOMS = 6
+
+# 자재 등급
+GRADES = ("basic", "standard", "premium")
+GRADE_LABELS = {"basic": "보급형", "standard": "중급", "premium": "고급"}
+GRADE_KEYWORDS = {
+    "basic": ("보급", "저가", "저렴", "가성비", "기본"),
+    "premium": ("고급", "프리미엄", "하이엔드", "최고급", "명품"),
+    "standard": ("중급", "일반", "보통"),
+}
+# STYLE_DATA price_range 내 등급 위치 (0=최저가, 1=최고가)
+GRADE_RANGE_POSITION = {"basic": 0.0, "standard": 0.5, "premium": 1.0}
+
+# 권역별 보정 계수 (자재비, 노무비) - 서울 기준
+REGION_FACTORS = {
+    "seoul": (1.0, 1.0),
+    "capital": (1.0, 0.95),
+    "metro": (0.98, 0.9),
+    "provincial": (0.97, 0.85),
+}
+REGION_LABELS = {"seoul": "서울", "capital": "수도권", "metro": "광역시", "provincial": "지방"}
+
+# 공사 범위 → 포함 공종
+SCOPE_TRADES = {
+    "전체": ("철거", "목공", "바닥", "타일", "도배", "전기", "설비"),
+    "욕실": ("철거", "타일", "설비"),
+    "주방": ("철거", "타일", "전기", "설비"),
+    "도배": ("도배",),
+    "바닥": ("철거", "바닥"),
+}
+SCOPE_KEYWORDS = {
+    "욕실": ("욕실", "화장실", "욕조"),
+    "주방": ("주방", "부엌", "싱크대"),
+    "도배": ("도배", "벽지"),
+    "바닥": ("바닥", "마루", "장판"),
+}
+FULL_SCOPE_KEYWORDS = ("전체", "올수리", "풀리모델링", "전부")
+
+
+@dataclass(frozen=True)
+class TradeRate:
+    """공종 단가 (서울 기준, 만원/단위)"""
+    category: str
+    quantity_key: str
+    unit: str
+    dm: Dict[str, float]
+    dl: Dict[str, float]
+    oh_rate: float
+    note: str
+    style_material: Optional[str] = None  # STYLE_DATA materials 키 (스타일 단가 사용 시)
+    style_material_share: float = 0.6     # 스타일 단가 중 자재비 비율 (나머지는 시공비)
+
+
+TRADE_RATES: Tuple[TradeRate, ...] = (
+    TradeRate(
+        category="철거", quantity_key="demolition_pyeong", unit="평",
+        dm={"basic": 2.2, "standard": 2.5, "premium": 2.8},
+        dl={"basic": 4.0, "standard": 4.5, "premium": 5.0},
+        oh_rate=0.12, note="보양 및 폐기물 처리 포함",
+    ),
+    TradeRate(
+        category="목공", quantity_key="area_pyeong", unit="평",
+        dm={"basic": 4.5, "standard": 6.0, "premium": 9.0},
+        dl={"basic": 5.0, "standard": 5.5, "premium": 7.0},
+        oh_rate=0.08, note="문틀, 몰딩, 걸레받이, 천장 보수",
+    ),
+    TradeRate(
+        category="바닥", quantity_key="floor_sqm", unit="㎡",
+        dm={"basic": 2.0, "standard": 4.0, "premium": 9.0},
+        dl={"basic": 1.2, "standard": 1.5, "premium": 2.5},
+        oh_rate=0.08, note="장판/강화마루/원목마루 (등급별)",
+        style_material="flooring", style_material_share=0.7,
+    ),
+    TradeRate(
+        category="타일", quantity_key="tile_sqm", unit="㎡",
+        dm={"basic": 3.0, "standard": 4.5, "premium": 7.0},
+        dl={"basic": 4.5, "standard": 5.0, "premium": 6.0},
+        oh_rate=0.08, note="욕실 벽/바닥, 주방 벽 타일 (방수 포함)",
+    ),
+    TradeRate(
+        category="도배", quantity_key="finish_sqm", unit="㎡",
+        dm={"basic": 0.35, "standard": 0.6, "premium": 1.0},
+        dl={"basic": 0.45, "standard": 0.5, "premium": 0.6},
+        oh_rate=0.08, note="벽/천장 (합지/실크/수입벽지)",
+        style_material="wall", style_material_share=0.55,
+    ),
+    TradeRate(
+        category="전기", quantity_key="electrical_pyeong", unit="평",
+        dm={"basic": 2.0, "standard": 3.0, "premium": 5.0},
+        dl={"basic": 1.5, "standard": 2.0, "premium": 2.5},
+        oh_rate=0.08, note="조명, 스위치, 콘센트 교체",
+        style_material="lighting", style_material_share=1.0,
+    ),
+    TradeRate(
+        category="설비", quantity_key="wet_areas", unit="개소",
+        dm={"basic": 180.0, "standard": 250.0, "premium": 400.0},
+        dl={"basic": 100.0, "standard": 130.0, "premium": 160.0},
+        oh_rate=0.10, note="욕실 도기/수전/배관, 주방 급배수",
+    ),
+)
+TRADE_RATE_MAP = {rate.category: rate for rate in TRADE_RATES}
+
+
+@dataclass
+class EstimateInput:
+    """견적 입력"""
+    area_size: int                       # 평
+    work_scope: str = "전체"             # 전체 / 욕실 / 주방 / 도배 / 바닥
+    grade: str = "standard"
+    city: Optional[str] = None
+    district: Optional[str] = None
+    style: Optional[str] = None          # STYLE_DATA 키
+    bathrooms: Optional[int] = None
+
+
+@dataclass
+class TakeOff:
+    """물량 산출 결과"""
+    area_pyeong: float
+    floor_sqm: float
+    finish_sqm: float
+    tile_sqm: float
+    demolition_pyeong: float
+    electrical_pyeong: float
+    wet_areas: float
+    bathrooms: int
+    kitchens: int
+    trades: Tuple[str, ...] = field(default_factory=tuple)
+
+    def quantity(self, key: str) -> float:
+        return getattr(self, key)
+
+
+def default_bathrooms(area_size: int) -> int:
+    """평수 기준 욕실 수 추정 (25평 미만 1개, 이상 2개)"""
+    return 1 if area_size < 25 else 2
+
+
+def coerce_bathrooms(value: Any) -> Optional[int]:
+    """
+    욕실 수 정규화 (클라이언트/세션 슬롯 값은 "2" 같은 문자열일 수 있음)
+
+    Args:
+        value: 욕실 수 원본 값
+
+    Returns:
+        Optional[int]: 0~MAX_BATHROOMS로 제한한 정수 (비어 있거나 해석할 수 없으면 None)
+    """
+    if value is None or value == "":
+        return None
+    try:
+        count = int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return max(0, min(MAX_BATHROOMS, count))
+
+
+def take_off(inp: EstimateInput) -> TakeOff:
+    """
+    평수 + 공사 범위로 공종별 물량 산출
+
+    Args:
+        inp: 견적 입력
+
+    Returns:
+        TakeOff: 물량
+    """
+    scope = inp.work_scope if inp.work_scope in SCOPE_TRADES else "전체"
+    area = float(inp.area_size)
+    floor_sqm = area * SQM_PER_PYEONG
+    bathrooms = coerce_bathrooms(inp.bathrooms)
+    if bathrooms is None:
+        bathrooms = default_bathrooms(inp.area_size)
+
+    if scope == "욕실":
+        bathrooms = max(1, bathrooms)  # 욕실 공사인데 0개소면 물량이 비므로 최소 1개소
+        return TakeOff(
+            area_pyeong=area, floor_sqm=0.0, finish_sqm=0.0,
+            tile_sqm=bathrooms * 22.0,
+            demolition_pyeong=bathrooms * 4.0,  # 타일/방수층 철거는 일반 철거보다 품이 많이 듦
+            electrical_pyeong=0.0,
+            wet_areas=float(bathrooms),
+            bathrooms=bathrooms, kitchens=0, trades=SCOPE_TRADES[scope],
+        )
+    if scope == "주방":
+        return TakeOff(
+            area_pyeong=area, floor_sqm=0.0, finish_sqm=0.0,
+            tile_sqm=6.0,
+            demolition_pyeong=3.0,
+            electrical_pyeong=3.0,
+            wet_areas=0.3,
+            bathrooms=0, kitchens=1, trades=SCOPE_TRADES[scope],
+        )
+    if scope == "도배":
+        return TakeOff(
+            area_pyeong=area, floor_sqm=0.0,
+            finish_sqm=floor_sqm * 2.6,  # 벽(바닥면적 × 1.6) + 천장
+            tile_sqm=0.0, demolition_pyeong=0.0, electrical_pyeong=0.0, wet_areas=0.0,
+            bathrooms=0, kitchens=0, trades=SCOPE_TRADES[scope],
+        )
+    if scope == "바닥":
+        return TakeOff(
+            area_pyeong=area, floor_sqm=floor_sqm, finish_sqm=0.0, tile_sqm=0.0,
+            demolition_pyeong=area * 0.4,  # 기존 바닥재만 철거
+            electrical_pyeong=0.0, wet_areas=0.0,
+            bathrooms=0, kitchens=0, trades=SCOPE_TRADES[scope],
+        )
+
+    return TakeOff(
+        area_pyeong=area,
+        floor_sqm=floor_sqm,
+        finish_sqm=floor_sqm * 2.6,
+        tile_sqm=bathrooms * 22.0 + 6.0,
+        demolition_pyeong=area,
+        electrical_pyeong=area,
+        wet_areas=bathrooms + 0.3,  # 주방 급배수는 욕실 1개소의 약 30%
+        bathrooms=bathrooms, kitchens=1, trades=SCOPE_TRADES["전체"],
+    )
+
+
+def _style_unit_price(style: str, material: str, grade: str) -> Optional[Tuple[float, str, str]]:
+    """
+    STYLE_DATA 마감재 단가를 등급 위치로 보간 (원 → 만원)
+
+    Returns:
+        tuple: (만원/단위, 단위, 자재명) 또는 None
+    """
+    info = STYLE_DATA.get(style, {}).get("materials", {}).get(material)
+    if not isinstance(info, dict) or "price_range" not in info:
+        return None
+    low, high = info["price_range"]
+    price = low + (high - low) * GRADE_RANGE_POSITION[grade]
+    return price / 10000, info.get("unit", "sqm"), info.get("type", "")
+
+
+def _unit_prices(rate: TradeRate, style: Optional[str], grade: str) -> Tuple[float, float, float, str]:
+    """
+    공종 단가 결정 (등급 기본 단가 또는 스타일 마감재 단가)
+
+    Returns:
+        tuple: (자재비 단가, 노무비 단가, 자재비 가산액, 비고) - 만원
+    """
+    dm_unit = rate.dm[grade]
+    dl_unit = rate.dl[grade]
+    note = rate.note
+    dm_extra = 0.0
+
+    style = style if style in STYLE_DATA else None
+    if style and rate.style_material:
+        styled = _style_unit_price(style, rate.style_material, grade)
+        if styled:
+            price, unit, material_type = styled
+            if unit == "set":
+                # 조명 등 세트 단가는 공종 자재비에 가산
+                dm_extra = price
+            else:
+                dm_unit = price * rate.style_material_share
+                dl_unit = price * (1 - rate.style_material_share)
+            note = material_type or note
+
+    if style and rate.category == "목공":
+        # 몰딩/우물천장 등 디테일 난이도 반영
+        multiplier = STYLE_DATA[style].get("cost_multiplier", 1.0)
+        dm_unit *= multiplier
+        dl_unit *= multiplier
+
+    return dm_unit, dl_unit, dm_extra, note
+
+
+def _trade_line(rate: TradeRate, qty: float, inp: EstimateInput, takeoff: TakeOff) -> CostBreakdown:
+    """공종 한 줄 계산"""
+    dm_factor, dl_factor = REGION_FACTORS[region_group(inp.city)]
+    dm_unit, dl_unit, dm_extra, note = _unit_prices(rate, inp.style, inp.grade)
+
+    if rate.category == "설비":
+        parts = []
+        if takeoff.bathrooms:
+            parts.append(f"욕실 {takeoff.bathrooms}개소")
+        if takeoff.kitchens:
+            parts.append("주방 급배수")
+        note = ", ".join(parts) or note
+
+    dm = round((dm_unit * qty + dm_extra) * dm_factor)
+    dl = round(dl_unit * qty * dl_factor)
+    oh = round((dm + dl) * rate.oh_rate)
+    return CostBreakdown.calculate(rate.category, dm, dl, oh, note=note)
+
+
+def estimate_cost(inp: EstimateInput) -> CostEstimate:
+    """
+    공종별 견적 계산
+
+    Args:
+        inp: 견적 입력
+
+    Returns:
+        CostEstimate: 총계/예비비가 계산된 견적
+    """
+    if inp.grade not in GRADES:
+        inp.grade = "standard"
+    takeoff = take_off(inp)
+
+    breakdown = []
+    for category in takeoff.trades:
+        rate = TRADE_RATE_MAP[category]
+        qty = takeoff.quantity(rate.quantity_key)
+        if qty <= 0:
+            continue
+        breakdown.append(_trade_line(rate, qty, inp, takeoff))
+
+    group = region_group(inp.city)
+    assumptions = [
+        f"{GRADE_LABELS[inp.grade]} 자재 기준",
+        f"{inp.city or REGION_LABELS[group]} 기준 노임단가",
+    ]
+    if takeoff.bathrooms:
+        assumptions.append(f"욕실 {takeoff.bathrooms}개소 기준")
+    if inp.style in STYLE_DATA:
+        assumptions.append(f"{inp.style} 스타일 마감재 단가 적용")
+    assumptions.append("주방 가구, 샷시, 가전 제외")
+
+    estimate = CostEstimate(
+        area_size=inp.area_size,
+        work_scope=inp.work_scope if inp.work_scope in SCOPE_TRADES else "전체",
+        breakdown=breakdown,
+        assumptions=assumptions,
+    )
+    return estimate.calculate_totals()
+
+
+def estimate_grid(
+    areas: Sequence[int],
+    styles: Sequence[str],
+    grades: Sequence[str] = GRADES,
+    work_scope: str = "전체",
+    city: Optional[str] = None,
+    bathrooms: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    평수 × 스타일 × 등급 견적 매트릭스를 NumPy 한 번의 브로드캐스트로 계산
+
+    estimate_cost()와 같은 단가/물량/반올림 규칙을 사용하므로 각 칸의 값은
+    같은 입력으로 estimate_cost()를 호출한 결과와 동일
+
+    Args:
+        areas: 평수 목록
+        styles: STYLE_DATA 스타일 키 목록
+        grades: 자재 등급 목록
+        work_scope: 공사 범위
+        city: 시/도 (권역 보정)
+        bathrooms: 욕실 수 (미지정 시 평수로 추정)
+
+    Returns:
+        dict: categories와 [공종][평수][스타일][등급] / [평수][스타일][등급] 모양의 int 배열
+    """
+    unknown_styles = [style for style in styles if style not in STYLE_DATA]
+    if unknown_styles:
+        raise ValueError(f"알 수 없는 스타일: {', '.join(unknown_styles)}")
+    unknown_grades = [grade for grade in grades if grade not in GRADES]
+    if unknown_grades:
+        raise ValueError(f"알 수 없는 자재 등급: {', '.join(unknown_grades)}")
+
+    takeoffs = [
+        take_off(EstimateInput(area_size=int(area), work_scope=work_scope, bathrooms=bathrooms))
+        for area in areas
+    ]
+    categories = list(takeoffs[0].trades) if takeoffs else []
+    dm_factor, dl_factor = REGION_FACTORS[region_group(city)]
+    shape = (len(areas), len(styles), len(grades))
+
+    dm = np.zeros((len(categories),) + shape)
+    dl = np.zeros_like(dm)
+    oh = np.zeros_like(dm)
+    for index, category in enumerate(categories):
+        rate = TRADE_RATE_MAP[category]
+        qty = np.array([t.quantity(rate.quantity_key) for t in takeoffs], dtype=np.float64)[:, None, None]
+        units = np.array([
+            [_unit_prices(rate, style, grade)[:3] for grade in grades]
+            for style in styles
+        ], dtype=np.float64)[None]  # (1, S, G, 3)
+        active = qty > 0  # estimate_cost()는 물량 0인 공종을 제외
+        dm[index] = np.where(active, np.round((units[..., 0] * qty + units[..., 2]) * dm_factor), 0)
+        dl[index] = np.where(active, np.round(units[..., 1] * qty * dl_factor), 0)
+        oh[index] = np.round((dm[index] + dl[index]) * rate.oh_rate)
+
+    category_totals = dm + dl + oh
+    total_dm = dm.sum(axis=0)
+    total_dl = dl.sum(axis=0)
+    total_oh = oh.sum(axis=0)
+    grand_total = total_dm + total_dl + total_oh
+    contingency = np.floor(grand_total * 0.1)
+
+    def as_list(values: np.ndarray) -> list:
+        return values.astype(np.int64).tolist()
+
+    return {
+        "categories": categories,
+        "total_dm": as_list(total_dm),
+        "total_dl": as_list(total_dl),
+        "total_oh": as_list(total_oh),
+        "grand_total": as_list(grand_total),
+        "contingency": as_list(contingency),
+        "final_total": as_list(grand_total + contingency),
+        "category_totals": as_list(category_totals),
+    }
+
+
+_AREA_PATTERN = re.compile(r"(\d{1,3}(?:\.\d+)?)\s*평")
+_SQM_PATTERN = re.compile(r"(\d{2,4}(?:\.\d+)?)\s*(?:㎡|m2|제곱미터|헤베)")
+_BATHROOM_PATTERN = re.compile(r"(?:욕실|화장실)\s*(\d)\s*개")
+_EOK_PATTERN = re.compile(r"(?P<eok>\d+(?:\.\d+)?)\s*억(?:\s*(?P<cheon>\d)\s*천)?(?:\s*(?P<man>\d{1,4})\s*만)?")
+_MAN_PATTERN = re.compile(r"(?:(?P<cheon>\d)\s*천\s*)?(?P<man>\d{1,5})?\s*만\s*원")
+_PRICE_CHECK_PATTERN = re.compile(r"적정|적당|비싼|비싸|저렴|바가지|합리적|시세|괜찮은 가격|싼 (?:편|건가)")
+
+
+def parse_area(text: str) -> Optional[int]:
+    """텍스트에서 평수 추출 ("32평", "84㎡" → 25)"""
+    match = _AREA_PATTERN.search(text)
+    if match:
+        return round(float(match.group(1)))
+    match = _SQM_PATTERN.search(text)
+    if match:
+        return round(float(match.group(1)) / SQM_PER_PYEONG)
+    return None
+
+
+def stated_work_scope(text: str) -> Optional[str]:
+    """텍스트에 명시된 공사 범위 (없으면 None)"""
+    if any(keyword in text for keyword in FULL_SCOPE_KEYWORDS):
+        return "전체"
+    for scope, keywords in SCOPE_KEYWORDS.items():
+        if any(keyword in text for keyword in keywords):
+            return scope
+    return None
+
+
+def parse_work_scope(text: str) -> str:
+    """텍스트에서 공사 범위 추출 (명시 없으면 전체)"""
+    return stated_work_scope(text) or "전체"
+
+
+def resolve_work_scope(query: str, context: Optional[dict] = None) -> str:
+    """공사 범위: 질문에 명시된 범위 → 컨텍스트(work_type/work_scope) → 전체"""
+    context = context or {}
+    scope_text = " ".join(str(v) for v in (context.get("work_type"), context.get("work_scope")) if v)
+    return stated_work_scope(query) or stated_work_scope(scope_text) or "전체"
+
+
+def parse_bathrooms(text: str) -> Optional[int]:
+    """텍스트에서 욕실 수 추출 ("화장실 2개" → 2, 없으면 None)"""
+    match = _BATHROOM_PATTERN.search(text)
+    return coerce_bathrooms(match.group(1)) if match else None
+
+
+def query_slots(query: str) -> Dict[str, Any]:
+    """
+    질문에 명시된 슬롯 값 (평수/공사 범위/욕실 수)
+
+    저장된 세션 슬롯보다 우선하고, 세션 슬롯에 다시 기록됨
+    ("32평" 견적 후 "40평 올수리 얼마?"는 40평으로 계산하고 이후 턴도 40평 기준)
+
+    Args:
+        query: 사용자 질문
+
+    Returns:
+        dict: 명시된 값만 담은 슬롯 (SLOT_KEYS 이름)
+    """
+    slots: Dict[str, Any] = {}
+    area = parse_area(query)
+    if area:
+        slots["area_size"] = area
+    scope = stated_work_scope(query)
+    if scope:
+        slots["work_type"] = scope
+    bathrooms = parse_bathrooms(query)
+    if bathrooms is not None:
+        slots["bathrooms"] = bathrooms
+    return slots
+
+
+def parse_price(text: str) -> Optional[int]:
+    """텍스트에서 금액 추출 (만원) - "3,500만원", "2천만원", "1억 2천만원", "1.2억" """
+    text = text.replace(",", "")
+    match = _EOK_PATTERN.search(text)
+    eok = float(match.group("eok")) if match else 0.0
+    if match is None:
+        match = next((m for m in _MAN_PATTERN.finditer(text) if m.group("cheon") or m.group("man")), None)
+    if match is None:
+        return None
+    total = eok * 10000
+    if match.group("cheon"):
+        total += int(match.group("cheon")) * 1000
+    if match.group("man"):
+        total += int(match.group("man"))
+    return int(round(total)) or None
+
+
+def is_price_check(text: str) -> bool:
+    """가격 적정성 질문인지 ("이 가격 적정한가요?", "3800만원 비싼 건가요?")"""
+    return bool(_PRICE_CHECK_PATTERN.search(text))
+
+
+def parse_grade(text: str) -> str:
+    """텍스트에서 자재 등급 추출 (명시 없으면 중급)"""
+    for grade, keywords in GRADE_KEYWORDS.items():
+        if any(keyword in text for keyword in keywords):
+            return grade
+    return "standard"
+
+
+def build_estimate_input(query: str, context: Optional[dict] = None) -> Optional[EstimateInput]:
+    """
+    질문 + 컨텍스트에서 견적 입력 구성
+
+    질문에 명시된 평수/공사 범위/욕실 수는 컨텍스트(세션 슬롯)보다 우선, 나머지는 컨텍스트 우선.
+    평수를 알 수 없으면 None (LLM이 되물어야 함)
+
+    Args:
+        query: 사용자 질문
+        context: 채팅 컨텍스트 (area_size, location, work_type, style, grade 등)
+
+    Returns:
+        EstimateInput 또는 None
+    """
+    context = context or {}
+    area = parse_area(query)
+    if not area:
+        try:
+            area = int(float(context.get("area_size") or 0))
+        except (TypeError, ValueError, OverflowError):
+            area = None
+    if not area or area <= 0:
+        return None
+
+    work_scope = resolve_work_scope(query, context)
+
+    grade = context.get("grade")
+    if grade not in GRADES:
+        grade = parse_grade(query)
+
+    city, district = parse_location(context.get("location") or query)
+
+    style = context.get("style")
+    if style not in STYLE_DATA:
+        style = None
+
+    bathrooms = parse_bathrooms(query)
+    if bathrooms is None:
+        bathrooms = coerce_bathrooms(context.get("bathrooms"))
+
+    return EstimateInput(
+        area_size=area,
+        work_scope=work_scope,
+        grade=grade,
+        city=city,
+        district=district,
+        style=style,
+        bathrooms=bathrooms,
+    )
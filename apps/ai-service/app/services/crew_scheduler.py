@@ -0,0 +1,384 @@
+"""
+다중 현장 크루 스케줄러
+업체가 동시에 진행하는 여러 현장의 공정을 공유 크루(타일/목공/전기 등) 수 안에서 충돌 없이 배치
+
+- 현장별 제약: 선후행, 달력(일요일/공휴일), Friday Rule, 현장 하루 투입 인원 상한 (ConstraintScheduler와 동일)
+- 공유 제약: 공종별 크루 수 (하루에 한 크루는 한 현장에만 투입)
+- 휴리스틱: 우선순위 규칙 리스트 스케줄링(serial SGS)으로 초기해 → 작업 순서 이동 지역 탐색
+  목표 = Σ 현장 가중치 × (공기 + 납기 초과일 × 벌점)
+- 달력/사용량은 착공일 기준 정수 일자 배열로 계산 → 공정 수백 개도 1초 이내
+"""
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.models.schemas import ProjectSchedule
+from app.services.scheduler import (
+    DEFAULT_MAX_WORKERS,
+    MAX_CALENDAR_DAYS,
+    ConstraintScheduler,
+    Phase,
+    PhasePlan,
+    SchedulePlan,
+    is_noise_allowed,
+    is_work_day,
+)
+
+
+# 공정 → 투입 크루 공종 (없으면 공정명 그대로)
+PHASE_CREWS: Dict[str, str] = {
+    "전기 마감": "전기",
+    "설비 마감": "설비",
+    "가구": "목공",
+    "보양": "청소",
+}
+
+# 납기 초과 1일당 벌점 (공기 1일 대비)
+TARDINESS_PENALTY = 10.0
+
+
+def crew_of(phase: Phase) -> str:
+    """공정에 투입되는 크루 공종"""
+    return PHASE_CREWS.get(phase.name, phase.name)
+
+
+@dataclass
+class ProjectSpec:
+    """스케줄링 대상 현장"""
+    project_id: str
+    phases: List[Phase]
+    start_date: date                 # 착공 가능일
+    due_date: Optional[date] = None  # 입주/납기일
+    priority: float = 1.0            # 가중치 (클수록 먼저 끝내야 하는 현장)
+
+
+@dataclass
+class _Task:
+    project: int
+    phase: Phase
+    crew: str
+    preds: List[int] = field(default_factory=list)
+    succs: List[int] = field(default_factory=list)
+    tail: int = 0  # 자신 포함 남은 최장 경로 작업일수
+
+
+@dataclass
+class _Decoded:
+    """작업 순서 → 배치 결과 (정수 일자)"""
+    days: List[List[int]]
+    slots: List[List[int]]      # 작업일별 크루 번호 (0부터)
+    binding: List[Optional[int]]
+    crew_wait: List[int]        # 크루 부족으로 밀린 일수
+    completion: List[int]       # 현장별 마지막 작업일
+    objective: float
+
+
+@dataclass
+class MultiProjectPlan:
+    """다중 현장 배치 결과"""
+    schedules: Dict[str, ProjectSchedule]
+    completion_dates: Dict[str, date]
+    tardiness_days: Dict[str, int]
+    crew_utilization: Dict[str, float]
+    objective: float
+    iterations: int
+    elapsed_ms: int
+
+
+class CrewScheduler:
+    """
+    공유 크루 제약 다중 현장 스케줄러
+
+    Usage:
+        scheduler = CrewScheduler({"타일": 2, "목공": 3, "전기": 1})
+        result = scheduler.plan([
+            ProjectSpec("A", build_phases(32), date(2025, 3, 3)),
+            ProjectSpec("B", build_phases(24, "욕실"), date(2025, 3, 5), due_date=date(2025, 3, 20)),
+        ])
+        result.schedules["A"]  # ProjectSchedule
+    """
+
+    def __init__(
+        self,
+        crew_capacity: Dict[str, int],
+        max_workers_per_day: int = DEFAULT_MAX_WORKERS,
+        time_limit: float = 0.5,
+        max_iterations: int = 5000,
+        seed: int = 0,
+    ):
+        self.crew_capacity = {crew: count for crew, count in crew_capacity.items() if count is not None}
+        self.max_workers_per_day = max_workers_per_day
+        self.time_limit = time_limit
+        self.max_iterations = max_iterations
+        self.seed = seed
+
+    # ---- 준비 ----
+
+    @staticmethod
+    def _build_tasks(projects: List[ProjectSpec]) -> List[_Task]:
+        tasks: List[_Task] = []
+        for p, project in enumerate(projects):
+            index: Dict[str, int] = {}
+            for phase in project.phases:
+                if phase.name in index:
+                    raise ValueError(f"{project.project_id}: 중복된 공정명 {phase.name}")
+                index[phase.name] = len(tasks)
+                tasks.append(_Task(project=p, phase=phase, crew=crew_of(phase)))
+            for phase in project.phases:
+                task_id = index[phase.name]
+                for pred in phase.predecessors:
+                    if pred not in index:
+                        raise ValueError(f"{project.project_id}: 알 수 없는 선행 공정 {pred} ({phase.name})")
+                    tasks[task_id].preds.append(index[pred])
+                    tasks[index[pred]].succs.append(task_id)
+
+        # 위상 정렬 겸 순환 검사 → 역순으로 tail 계산
+        indegree = [len(task.preds) for task in tasks]
+        order = [i for i, degree in enumerate(indegree) if degree == 0]
+        for i in order:
+            for succ in tasks[i].succs:
+                indegree[succ] -= 1
+                if indegree[succ] == 0:
+                    order.append(succ)
+        if len(order) != len(tasks):
+            raise ValueError("공정 선후행에 순환이 있습니다")
+        for i in reversed(order):
+            tasks[i].tail = tasks[i].phase.duration + max((tasks[s].tail for s in tasks[i].succs), default=0)
+        return tasks
+
+    # ---- 디코딩 (serial schedule generation) ----
+
+    def _decode(
+        self,
+        sequence: List[int],
+        tasks: List[_Task],
+        projects: List[ProjectSpec],
+        releases: List[int],
+        dues: List[Optional[int]],
+        work_ok: List[bool],
+        noise_ok: List[bool],
+    ) -> _Decoded:
+        horizon = len(work_ok)
+        site_usage = [[0] * horizon for _ in projects]
+        crew_usage = {crew: [0] * horizon for crew in self.crew_capacity}
+        finish = [0] * len(tasks)
+        days: List[List[int]] = [[] for _ in tasks]
+        slots: List[List[int]] = [[] for _ in tasks]
+        binding: List[Optional[int]] = [None] * len(tasks)
+        crew_wait = [0] * len(tasks)
+
+        for t in sequence:
+            task = tasks[t]
+            phase = task.phase
+            earliest, bound = releases[task.project], None
+            for pred in task.preds:
+                if finish[pred] + 1 > earliest:
+                    earliest, bound = finish[pred] + 1, pred
+            binding[t] = bound
+
+            site = site_usage[task.project]
+            site_cap = max(self.max_workers_per_day, phase.workers)
+            crew = crew_usage.get(task.crew)
+            capacity = self.crew_capacity.get(task.crew, 0)
+            calendar = noise_ok if phase.is_noise_work else work_ok
+
+            placed: List[int] = []
+            day = earliest
+            while len(placed) < phase.duration:
+                if day >= horizon:
+                    raise ValueError(f"{projects[task.project].project_id}: {phase.name} 공정을 배치할 수 없습니다")
+                if calendar[day] and site[day] + phase.workers <= site_cap:
+                    if crew is None or crew[day] < capacity:
+                        placed.append(day)
+                    elif not placed:
+                        crew_wait[t] += 1
+                day += 1
+
+            for d in placed:
+                site[d] += phase.workers
+                if crew is not None:
+                    slots[t].append(crew[d])
+                    crew[d] += 1
+            days[t] = placed
+            finish[t] = placed[-1]
+
+        completion = [releases[p] for p in range(len(projects))]
+        for t, task in enumerate(tasks):
+            completion[task.project] = max(completion[task.project], finish[t])
+        objective = 0.0
+        for p, project in enumerate(projects):
+            cost = completion[p] - releases[p] + 1
+            if dues[p] is not None and completion[p] > dues[p]:
+                cost += TARDINESS_PENALTY * (completion[p] - dues[p])
+            objective += project.priority * cost
+        return _Decoded(days, slots, binding, crew_wait, completion, objective)
+
+    @staticmethod
+    def _priority_sequence(tasks: List[_Task], key: Callable[[int], tuple]) -> List[int]:
+        """선후행을 지키면서 매 단계 우선순위가 가장 높은 작업 선택"""
+        remaining = [len(task.preds) for task in tasks]
+        eligible = [i for i, count in enumerate(remaining) if count == 0]
+        sequence = []
+        while eligible:
+            best = min(eligible, key=key)
+            eligible.remove(best)
+            sequence.append(best)
+            for succ in tasks[best].succs:
+                remaining[succ] -= 1
+                if remaining[succ] == 0:
+                    eligible.append(succ)
+        return sequence
+
+    @staticmethod
+    def _move(sequence: List[int], tasks: List[_Task], rng: random.Random) -> Optional[List[int]]:
+        """작업 하나를 선후행이 허용하는 범위 안의 다른 위치로 이동"""
+        position = {t: i for i, t in enumerate(sequence)}
+        i = rng.randrange(len(sequence))
+        t = sequence[i]
+        low = max((position[p] for p in tasks[t].preds), default=-1) + 1
+        high = min((position[s] for s in tasks[t].succs), default=len(sequence)) - 1
+        if high <= low:
+            return None
+        j = rng.randint(low, high)
+        if j == i:
+            return None
+        moved = sequence[:i] + sequence[i + 1:]
+        moved.insert(j, t)
+        return moved
+
+    # ---- 공개 API ----
+
+    def plan(self, projects: List[ProjectSpec]) -> MultiProjectPlan:
+        """
+        여러 현장 동시 배치
+
+        Args:
+            projects: 현장 목록
+
+        Returns:
+            MultiProjectPlan: 현장별 ProjectSchedule 및 지표
+        """
+        started = time.perf_counter()
+        if not projects:
+            return MultiProjectPlan({}, {}, {}, {}, 0.0, 0, 0)
+        if len({project.project_id for project in projects}) != len(projects):
+            raise ValueError("현장 ID가 중복되었습니다")
+
+        tasks = self._build_tasks(projects)
+        origin = min(project.start_date for project in projects)
+        releases = [(project.start_date - origin).days for project in projects]
+        dues = [(project.due_date - origin).days if project.due_date else None for project in projects]
+        horizon = max(releases) + MAX_CALENDAR_DAYS
+        calendar = [origin + timedelta(days=d) for d in range(horizon)]
+        work_ok = [is_work_day(day) for day in calendar]
+        noise_ok = [is_noise_allowed(day) for day in calendar]
+
+        def decode(sequence: List[int]) -> _Decoded:
+            return self._decode(sequence, tasks, projects, releases, dues, work_ok, noise_ok)
+
+        # 초기해: 여러 우선순위 규칙 중 최선
+        rules: List[Callable[[int], tuple]] = [
+            lambda t: (-tasks[t].tail, releases[tasks[t].project]),
+            lambda t: (releases[tasks[t].project], -tasks[t].tail),
+            lambda t: (dues[tasks[t].project] if dues[tasks[t].project] is not None else horizon,
+                       -tasks[t].tail),
+            lambda t: (-projects[tasks[t].project].priority * tasks[t].tail, releases[tasks[t].project]),
+        ]
+        best_sequence, best = None, None
+        for rule in rules:
+            sequence = self._priority_sequence(tasks, rule)
+            decoded = decode(sequence)
+            if best is None or decoded.objective < best.objective:
+                best_sequence, best = sequence, decoded
+
+        # 지역 탐색: 작업 순서 이동, 나빠지지 않으면 채택 (같은 값 이동 허용 → 평탄 구간 탈출)
+        rng = random.Random(self.seed)
+        deadline = started + self.time_limit
+        iterations = 0
+        current_sequence, current = best_sequence, best
+        while iterations < self.max_iterations and time.perf_counter() < deadline:
+            iterations += 1
+            candidate_sequence = self._move(current_sequence, tasks, rng)
+            if candidate_sequence is None:
+                continue
+            candidate = decode(candidate_sequence)
+            if candidate.objective <= current.objective:
+                current_sequence, current = candidate_sequence, candidate
+                if candidate.objective < best.objective:
+                    best_sequence, best = candidate_sequence, candidate
+
+        return self._to_result(projects, tasks, best, calendar, releases, dues, iterations, started)
+
+    def _to_result(
+        self,
+        projects: List[ProjectSpec],
+        tasks: List[_Task],
+        decoded: _Decoded,
+        calendar: List[date],
+        releases: List[int],
+        dues: List[Optional[int]],
+        iterations: int,
+        started: float,
+    ) -> MultiProjectPlan:
+        schedules: Dict[str, ProjectSchedule] = {}
+        completion_dates: Dict[str, date] = {}
+        tardiness: Dict[str, int] = {}
+
+        for p, project in enumerate(projects):
+            task_ids = [t for t, task in enumerate(tasks) if task.project == p]
+            plans: Dict[str, PhasePlan] = {}
+            crew_notes: Dict[Tuple[str, str], str] = {}
+            extra_warnings: List[str] = []
+            for t in task_ids:
+                task = tasks[t]
+                bound = decoded.binding[t]
+                plans[task.phase.name] = PhasePlan(
+                    phase=task.phase,
+                    days=[calendar[d] for d in decoded.days[t]],
+                    binding=tasks[bound].phase.name if bound is not None else None,
+                )
+                for d, slot in zip(decoded.days[t], decoded.slots[t]):
+                    crew_notes[(task.phase.name, calendar[d].isoformat())] = f"{task.crew} {slot + 1}팀"
+                if decoded.crew_wait[t]:
+                    extra_warnings.append(
+                        f"{task.phase.name}: {task.crew} 크루 배정 대기로 {decoded.crew_wait[t]}일 늦게 시작"
+                    )
+
+            plan = SchedulePlan(
+                start_date=project.start_date,
+                phases=plans,
+                critical_path=ConstraintScheduler._critical_path(plans),
+                warnings=ConstraintScheduler._warnings(plans),
+            )
+            late = max(0, decoded.completion[p] - dues[p]) if dues[p] is not None else 0
+            if late:
+                extra_warnings.insert(0, f"납기({project.due_date.isoformat()})보다 {late}일 늦게 완료 예정")
+            schedule = ConstraintScheduler.to_project_schedule(plan, extra_warnings=extra_warnings)
+            for item in schedule.items:
+                crew_note = crew_notes.get((item.phase, item.date))
+                if crew_note:
+                    item.note = f"{item.note}, {crew_note}" if item.note else crew_note
+
+            schedules[project.project_id] = schedule
+            completion_dates[project.project_id] = calendar[decoded.completion[p]]
+            tardiness[project.project_id] = late
+
+        # 크루 가동률: 배정된 크루-일 / (크루 수 × 전체 기간 작업일)
+        last_day = max(decoded.completion)
+        work_days = sum(1 for d in range(min(releases), last_day + 1) if is_work_day(calendar[d]))
+        utilization = {}
+        for crew, capacity in self.crew_capacity.items():
+            used = sum(len(decoded.days[t]) for t, task in enumerate(tasks) if task.crew == crew)
+            utilization[crew] = round(used / (capacity * work_days), 4) if capacity and work_days else 0.0
+
+        return MultiProjectPlan(
+            schedules=schedules,
+            completion_dates=completion_dates,
+            tardiness_days=tardiness,
+            crew_utilization=utilization,
+            objective=round(decoded.objective, 2),
+            iterations=iterations,
+            elapsed_ms=int((time.perf_counter() - started) * 1000),
+        )
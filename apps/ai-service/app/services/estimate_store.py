@@ -0,0 +1,414 @@
+"""
+견적 이력 저장소
+우리가 만든 견적(CostEstimate), 업체 전송 견적서(QuoteData), 업체가 보낸 실제 제안가(offer)를 기록하고
+(출처, 공사 범위/공종, 권역, 평형대)별 평당 단가 분위수 스케치를 유지
+
+- 원본 기록: SQLite 한 테이블 (요약 컬럼 + 압축 JSON)
+- 통계: 메모리 QuantileSketch, flush_every건마다 SQLite에 스냅샷 저장
+  재시작 시 스냅샷 로드 후 마지막 스냅샷 이후 기록만 재생
+- 여러 워커가 같은 파일을 쓰면 records 테이블이 기준: 각 워커는 자기 기록뿐 아니라
+  다른 워커 기록도 id 순서대로 따라 읽어 반영 (기록 시 + 조회 시 sync_interval마다)
+  → 같은 id까지 반영한 스케치는 워커와 무관하게 같으므로, 스냅샷은 저장된 것보다 앞선 경우에만 덮어씀
+- 조회: 가장 구체적인 키부터 표본 수가 충분한 스케치 선택 → "이 가격 적정한가요" 즉시 답변
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+from app.core.sketch import QuantileSketch
+from app.models.schemas import CostEstimate, QuoteData
+from app.services.quote_builder import SCOPE_CATEGORIES
+from app.services.regions import parse_location, region_group
+
+
+# 기록 출처
+SOURCES = ("estimate", "quote", "offer")
+# 모든 출처/권역/평형대를 합친 롤업 키
+ANY = "*"
+# 조회 시 보여주는 분위수
+PERCENTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+# 견적서 공사 종류 → 공사 범위
+CATEGORY_SCOPES = {label: scope for scope, label in SCOPE_CATEGORIES.items()}
+
+
+def area_band(area_size: Optional[float]) -> Optional[str]:
+    """평수 → 평형대 (예: 32 → "30평대")"""
+    if not area_size or area_size <= 0:
+        return None
+    return f"{int(area_size) // 10 * 10}평대"
+
+
+def price_verdict(percentile: float) -> str:
+    """가격 백분위 → 한 줄 판정"""
+    if percentile < 0.25:
+        return "저렴한 편"
+    if percentile <= 0.75:
+        return "적정 범위"
+    if percentile <= 0.9:
+        return "다소 높은 편"
+    return "높은 편"
+
+
+@dataclass
+class Benchmark:
+    """평당 단가 분포 조회 결과"""
+    source: str
+    category: str
+    region: str
+    area_band: str
+    count: int
+    sufficient: bool  # 표본 수가 min_samples 이상인지
+    unit_percentiles: Dict[str, float] = field(default_factory=dict)   # 만원/평
+    total_percentiles: Dict[str, int] = field(default_factory=dict)    # 만원 (area_size 지정 시)
+    price_percentile: Optional[float] = None
+    verdict: Optional[str] = None
+
+    def to_prompt_dict(self) -> dict:
+        """프롬프트용 압축 dict"""
+        data = {"n": self.count, "region": self.region, "band": self.area_band}
+        data.update(self.total_percentiles or self.unit_percentiles)
+        if self.price_percentile is not None:
+            data["price_pct"] = round(self.price_percentile * 100)
+            data["verdict"] = self.verdict
+        return data
+
+
+class EstimateStore:
+    """
+    견적 이력 + 분위수 통계
+
+    Usage:
+        store = get_estimate_store()
+        store.record_estimate(estimate, location="서울 강남구")
+        result = store.benchmark("전체", area_size=32, location="서울", price=3800)
+        result.price_percentile  # 0.64
+    """
+
+    def __init__(
+        self,
+        path: str,
+        relative_accuracy: float = 0.01,
+        min_samples: int = 5,
+        flush_every: int = 20,
+        sync_interval: float = 1.0,
+    ):
+        self.path = path
+        self.relative_accuracy = relative_accuracy
+        self.min_samples = min_samples
+        self.flush_every = flush_every
+        self.sync_interval = sync_interval
+        self._sketches: Dict[str, QuantileSketch] = {}
+        self._dirty: set = set()
+        self._pending = 0
+        self._last_flushed_id = 0
+        self._last_record_id = 0
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS records (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                category TEXT NOT NULL,
+                city TEXT,
+                district TEXT,
+                area_size INTEGER NOT NULL,
+                total INTEGER NOT NULL,
+                payload TEXT
+            );
+            CREATE TABLE IF NOT EXISTS sketches (key TEXT PRIMARY KEY, data TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        """)
+        self._conn.commit()
+        self._load()
+
+    # ---- 키 / 스케치 ----
+
+    @staticmethod
+    def _key(source: str, category: str, region: str, band: str) -> str:
+        return f"{source}|{category}|{region}|{band}"
+
+    def _keys_for(self, source: str, category: str, region: Optional[str], band: Optional[str]) -> Iterable[str]:
+        """기록 1건이 반영될 키 (출처/권역/평형대 롤업 포함)"""
+        for src in (source, ANY):
+            for reg in {region or ANY, ANY}:
+                for bnd in {band or ANY, ANY}:
+                    yield self._key(src, category, reg, bnd)
+
+    def _add(self, key: str, value: float) -> None:
+        sketch = self._sketches.get(key)
+        if sketch is None:
+            sketch = self._sketches[key] = QuantileSketch(self.relative_accuracy)
+        sketch.add(value)
+        self._dirty.add(key)
+
+    def _apply(self, source: str, category: str, city: Optional[str], area_size: int,
+               total: float, breakdown: List[Tuple[str, float]]) -> None:
+        """기록 1건을 스케치에 반영 (lock 보유 상태에서 호출)"""
+        region = region_group(city) if city else None
+        band = area_band(area_size)
+        for key in self._keys_for(source, category, region, band):
+            self._add(key, total / area_size)
+        for trade, trade_total in breakdown:
+            for key in self._keys_for(source, f"{category}/{trade}", region, band):
+                self._add(key, trade_total / area_size)
+
+    # ---- 영속화 ----
+
+    def _load(self) -> None:
+        """스냅샷 로드 + 스냅샷 이후 기록 재생"""
+        for key, data in self._conn.execute("SELECT key, data FROM sketches"):
+            self._sketches[key] = QuantileSketch.from_dict(json.loads(data))
+        self._last_flushed_id = self._stored_record_id()
+        self._last_record_id = self._last_flushed_id
+
+        replayed = self._sync()
+        if replayed:
+            self._flush()
+        print(f"[EstimateStore] Loaded {len(self._sketches)} sketches ({replayed} records replayed)")
+
+    def _stored_record_id(self) -> int:
+        """스냅샷에 반영된 마지막 기록 id"""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'last_record_id'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _sync(self) -> int:
+        """
+        마지막으로 반영한 기록 이후의 기록을 id 순서대로 스케치에 반영 (lock 보유 상태에서 호출)
+
+        Returns:
+            int: 반영한 기록 수 (다른 워커 기록 포함)
+        """
+        rows = self._conn.execute(
+            "SELECT id, source, category, city, area_size, total, payload FROM records WHERE id > ? ORDER BY id",
+            (self._last_record_id,),
+        ).fetchall()
+        for record_id, source, category, city, area, total, payload in rows:
+            breakdown = json.loads(payload).get("breakdown", []) if payload else []
+            self._apply(source, category, city, area, total, [tuple(item) for item in breakdown])
+            self._last_record_id = record_id
+        self._synced_at = time.monotonic()
+        self._pending += len(rows)
+        return len(rows)
+
+    def _flush(self) -> None:
+        """
+        변경된 스케치 스냅샷 저장 (lock 보유 상태에서 호출)
+
+        다른 워커가 더 뒤의 기록까지 반영한 스냅샷을 이미 저장했다면 덮어쓰지 않음
+        (그 스냅샷이 이 워커의 변경분을 모두 포함)
+        """
+        if not self._dirty:
+            return
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self._last_record_id > self._stored_record_id():
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO sketches (key, data) VALUES (?, ?)",
+                    [(key, json.dumps(self._sketches[key].to_dict(), separators=(",", ":"))) for key in self._dirty],
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_record_id', ?)",
+                    (str(self._last_record_id),),
+                )
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+        self._dirty.clear()
+        self._pending = 0
+        self._last_flushed_id = self._last_record_id
+
+    def flush(self) -> None:
+        """스냅샷 즉시 저장"""
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """스냅샷 저장 후 연결 종료"""
+        with self._lock:
+            self._flush()
+            self._conn.close()
+
+    # ---- 기록 ----
+
+    def record(
+        self,
+        source: str,
+        category: str,
+        area_size: int,
+        total: int,
+        location: Optional[str] = None,
+        breakdown: Optional[List[Tuple[str, float]]] = None,
+        extra: Optional[dict] = None,
+    ) -> None:
+        """
+        견적/제안가 1건 기록
+
+        Args:
+            source: estimate / quote / offer
+            category: 공사 범위 (전체/욕실/주방/도배/바닥)
+            area_size: 평수
+            total: 총액 (만원)
+            location: 위치 텍스트
+            breakdown: [(공종, 금액)] - 공종별 통계용
+            extra: 원본 기록에 함께 저장할 값
+        """
+        if source not in SOURCES:
+            raise ValueError(f"알 수 없는 출처: {source}")
+        if not area_size or area_size <= 0 or total is None or total <= 0:
+            return
+        city, district = parse_location(location)
+        breakdown = [(trade, amount) for trade, amount in (breakdown or []) if amount and amount > 0]
+        payload = json.dumps(
+            {"breakdown": breakdown, **(extra or {})},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO records (source, created_at, category, city, district, area_size, total, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (source, time.time(), category, city, district, int(area_size), int(total), payload),
+            )
+            self._conn.commit()
+            # 방금 넣은 기록과 그 사이 다른 워커가 넣은 기록을 함께 반영
+            self._sync()
+            if self._pending >= self.flush_every:
+                self._flush()
+
+    def record_estimate(self, estimate: CostEstimate, location: Optional[str] = None) -> None:
+        """김 반장 견적 기록 (예비비 포함 최종 금액 기준)"""
+        if not estimate.area_size:
+            return
+        self.record(
+            source="estimate",
+            category=estimate.work_scope or "전체",
+            area_size=estimate.area_size,
+            total=estimate.final_total or estimate.grand_total,
+            location=location,
+            breakdown=[(item.category, item.total) for item in estimate.breakdown],
+        )
+
+    def record_quote(self, quote: QuoteData) -> None:
+        """업체 전송 견적서 기록"""
+        if not quote.area_size:
+            return
+        location = " ".join(area for area in (quote.location_city, quote.location_district) if area)
+        self.record(
+            source="quote",
+            category=CATEGORY_SCOPES.get(quote.category, quote.category),
+            area_size=quote.area_size,
+            total=quote.total_cost,
+            location=location,
+            breakdown=[(item.category, item.total) for item in quote.breakdown],
+        )
+
+    # ---- 조회 ----
+
+    def benchmark(
+        self,
+        category: str,
+        area_size: Optional[int] = None,
+        location: Optional[str] = None,
+        source: str = ANY,
+        price: Optional[float] = None,
+    ) -> Optional[Benchmark]:
+        """
+        평당 단가 분포 조회
+
+        (권역, 평형대) → (권역, 전체) → (전국, 평형대) → (전국, 전체) 순으로
+        표본 수가 min_samples 이상인 첫 스케치 사용 (없으면 표본이 가장 많은 스케치)
+
+        Args:
+            category: 공사 범위 또는 "범위/공종" (예: "전체", "욕실/타일")
+            area_size: 평수 (지정 시 총액 분위수와 평형대 사용)
+            location: 위치 텍스트
+            source: estimate / quote / offer / * (전체)
+            price: 비교할 총액 (만원) - area_size 필요
+
+        Returns:
+            Optional[Benchmark]: 기록이 없으면 None
+        """
+        city, _ = parse_location(location)
+        region = region_group(city) if city else ANY
+        band = area_band(area_size) or ANY
+        candidates = [(region, band), (region, ANY), (ANY, band), (ANY, ANY)]
+
+        with self._lock:
+            if time.monotonic() - self._synced_at >= self.sync_interval:
+                self._sync()  # 다른 워커 기록 반영
+            chosen, fallback = None, None
+            for reg, bnd in dict.fromkeys(candidates):
+                sketch = self._sketches.get(self._key(source, category, reg, bnd))
+                if sketch is None or sketch.count == 0:
+                    continue
+                if sketch.count >= self.min_samples:
+                    chosen = (reg, bnd, sketch)
+                    break
+                if fallback is None or sketch.count > fallback[2].count:
+                    fallback = (reg, bnd, sketch)
+            chosen = chosen or fallback
+            if chosen is None:
+                return None
+
+            reg, bnd, sketch = chosen
+            unit = {f"p{round(q * 100)}": round(sketch.quantile(q), 1) for q in PERCENTILES}
+            result = Benchmark(
+                source=source,
+                category=category,
+                region=reg,
+                area_band=bnd,
+                count=sketch.count,
+                sufficient=sketch.count >= self.min_samples,
+                unit_percentiles=unit,
+            )
+            if area_size:
+                result.total_percentiles = {name: int(round(value * area_size)) for name, value in unit.items()}
+                if price:
+                    result.price_percentile = round(sketch.rank(price / area_size), 4)
+                    result.verdict = price_verdict(result.price_percentile)
+            return result
+
+    def stats(self) -> dict:
+        """저장소 통계"""
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT source, COUNT(*) FROM records GROUP BY source").fetchall())
+            return {"records": counts, "sketches": len(self._sketches), "pending_flush": self._pending}
+
+
+# 싱글톤 인스턴스
+_estimate_store: Optional[EstimateStore] = None
+
+
+def get_estimate_store() -> EstimateStore:
+    """EstimateStore 싱글톤 반환"""
+    global _estimate_store
+    if _estimate_store is None:
+        _estimate_store = EstimateStore(
+            path=settings.estimate_store_file,
+            relative_accuracy=settings.estimate_sketch_relative_accuracy,
+            min_samples=settings.estimate_benchmark_min_samples,
+            sync_interval=settings.estimate_store_sync_seconds,
+        )
+    return _estimate_store
+
+
+def close_estimate_store() -> None:
+    """스냅샷 저장 후 싱글톤 종료 (앱 종료 시)"""
+    global _estimate_store
+    if _estimate_store is not None:
+        _estimate_store.close()
+        _estimate_store = None
@@ -0,0 +1,301 @@
+"""
+의도 분류기 (Intent Router)
+LLM 호출 전에 한국어 질문의 의도를 로컬에서 분류
+
+- 문자 n-gram(2~3) 벡터 → 의도별 예문 centroid와 코사인 유사도
+- 의도별 핵심 키워드 가점
+- 최고 점수가 임계값 미만이거나 2위와의 차이가 작으면 확신 없음 → 전체 프롬프트로 폴백
+"""
+import math
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.models.schemas import AgentIntent
+
+
+# 의도별 예문 (centroid 학습용)
+INTENT_EXAMPLES: Dict[AgentIntent, Tuple[str, ...]] = {
+    AgentIntent.COST: (
+        "32평 아파트 전체 리모델링 비용 얼마나 들어요",
+        "견적 좀 내주세요",
+        "욕실 공사 가격이 얼마인가요",
+        "도배 비용 알려줘",
+        "주방 리모델링 예산 얼마 잡아야 해요",
+        "인테리어 공사비 대략 얼마",
+        "철거 비용이랑 목공 비용 알려주세요",
+        "고급 자재로 하면 금액 얼마나 올라가요",
+        "24평 올수리 견적",
+        "바닥 마루 시공비 얼마에요",
+        "32평 올수리 얼마",
+        "32평 전체 리모델링 비용",
+        "화장실 공사 얼마나 나와요",
+    ),
+    AgentIntent.SCHEDULE: (
+        "공사 기간 며칠 걸려요",
+        "일정 짜주세요",
+        "공정표 만들어줘",
+        "다음달 1일 착공하면 언제 끝나요",
+        "욕실 공사 몇일 걸리나요",
+        "공사 순서가 어떻게 되나요",
+        "스케줄 알려줘",
+        "입주 전까지 공사 끝낼 수 있을까요",
+        "철거 다음에 뭐 해요 공정 순서",
+        "3월 3일 시작 일정",
+        "공사 기간 얼마나 걸려요",
+        "올수리 하면 얼마나 걸리나요",
+        "화장실 공사 기간",
+    ),
+    AgentIntent.TECHNICAL: (
+        "강화마루랑 강마루 차이가 뭐예요",
+        "욕실 방수는 어떻게 하나요",
+        "결로 방지하려면 어떻게 해야 해요",
+        "실크벽지랑 합지벽지 차이",
+        "타일 줄눈 색상 추천해줘",
+        "베란다 확장하면 단열 문제 없나요",
+        "곰팡이 생긴 벽 어떻게 시공해요",
+        "포세린 타일 장단점",
+        "몰딩 없이 마감하는 방법",
+        "층간소음 줄이는 바닥재 추천",
+    ),
+    AgentIntent.CHAT: (
+        "안녕하세요",
+        "고마워요",
+        "감사합니다",
+        "반가워요 반장님",
+        "누구세요",
+        "뭐 할 수 있어요",
+        "좋은 하루 보내세요",
+        "수고하셨습니다",
+        "ㅎㅎ 알겠어요",
+        "오늘 날씨 좋네요",
+    ),
+    AgentIntent.QUOTE_SEND: (
+        "이 견적서 업체에 보내줘",
+        "시공업체에 견적 의뢰해줘",
+        "업체 찾아줘",
+        "이 내용으로 업체들한테 전송해주세요",
+        "견적 요청 보내주세요",
+        "근처 시공업체 연결해줘",
+        "이 견적으로 업체 알아봐줘",
+        "인테리어 업체에 견적서 전달해줘",
+    ),
+}
+
+# 의도별 핵심 키워드 (매칭 1개당 KEYWORD_WEIGHT 가점, 최대 1.0)
+INTENT_KEYWORDS: Dict[AgentIntent, Tuple[str, ...]] = {
+    AgentIntent.COST: ("견적", "비용", "얼마", "가격", "예산", "금액", "공사비", "시공비", "만원"),
+    AgentIntent.SCHEDULE: (
+        "일정", "공정", "기간", "며칠", "몇일", "스케줄", "언제 끝", "착공", "순서", "걸려", "걸리",
+    ),
+    AgentIntent.TECHNICAL: (
+        "차이", "방법", "방수", "단열", "결로", "곰팡이", "장단점", "자재", "시공법", "추천", "하자",
+        "좋을까", "괜찮", "해도 되", "가능한가",
+    ),
+    AgentIntent.CHAT: ("안녕", "고마", "감사", "반가", "누구", "수고"),
+    AgentIntent.QUOTE_SEND: ("보내", "전송", "의뢰", "업체", "전달", "연결"),
+}
+KEYWORD_WEIGHT = 0.5
+# 최종 점수 = COSINE_WEIGHT × 코사인 유사도 + (1 - COSINE_WEIGHT) × 키워드 점수
+COSINE_WEIGHT = 0.6
+# 1위와 2위 점수 차이가 이보다 작으면 확신 없음
+MIN_MARGIN = 0.05
+
+# 같은 뜻의 표현 → 대표 표현 (질문 비교용, 긴 표현부터 치환)
+# 어절 단위로만 치환: 어절 전체이거나 뒤에 조사/어미(QUERY_PARTICLES)만 붙은 경우
+# ("얼마나"는 기간에도 쓰이므로 단독으로는 치환하지 않고 비용 표현 구문만 등록)
+QUERY_SYNONYMS: Dict[str, str] = {
+    "얼마나 들어요": "비용",
+    "얼마나 드나요": "비용",
+    "얼마나 들까요": "비용",
+    "얼마나 나와요": "비용",
+    "올리모델링": "전체 리모델링",
+    "올수리": "전체 리모델링",
+    "전체수리": "전체 리모델링",
+    "전체 공사": "전체 리모델링",
+    "인테리어 공사": "리모델링",
+    "화장실": "욕실",
+    "부엌": "주방",
+    "싱크대": "주방",
+    "베란다": "발코니",
+    "공사비": "비용",
+    "시공비": "비용",
+    "가격": "비용",
+    "금액": "비용",
+    "견적": "비용",
+    "얼마": "비용",
+    "기간": "일정",
+    "며칠": "일정",
+    "몇일": "일정",
+}
+
+# 치환 대상 뒤에 붙어도 되는 조사/어미 (긴 것부터 매칭)
+QUERY_PARTICLES = (
+    "이랑", "이에요", "인가요", "인데요", "에서", "으로", "까지", "부터", "하고", "예요", "에요", "이요",
+    "은요", "는요", "일까", "이야", "이", "가", "은", "는", "을", "를", "도", "만", "에", "로", "랑",
+    "과", "와", "의", "요", "야",
+)
+
+# 의미 없는 어미/군더더기 (질문 비교 시 제거, 어절 끝에서만)
+FILLER_WORDS = (
+    "어떻게", "어떤가요", "어때요", "하나요", "해요", "인가요", "나요", "예요", "에요", "이에요",
+    "알려주세요", "알려줘", "주세요", "해주세요", "해줘", "정도", "대략", "혹시", "좀",
+    "들어요", "드나요", "들까요", "할까요", "되나요", "되요", "돼요",
+)
+
+_NON_WORD = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+
+def _alternation(words) -> str:
+    return "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+
+
+# 어절 시작에서 시작하고, 어절 끝이거나 조사/어미 뒤 어절 끝에서 끝나는 경우만 매칭
+_SYNONYM_PATTERN = re.compile(
+    rf"(?<!\w)({_alternation(QUERY_SYNONYMS)})(?=(?:{_alternation(QUERY_PARTICLES)})?(?!\w))"
+)
+_FILLER_PATTERN = re.compile(rf"(?:{_alternation(FILLER_WORDS)})(?!\w)")
+
+
+@dataclass
+class IntentPrediction:
+    """의도 분류 결과"""
+    intent: AgentIntent
+    confidence: float
+    confident: bool
+    scores: Dict[str, float] = field(default_factory=dict)
+
+
+def normalize_text(text: str) -> str:
+    """NFKC 정규화 + 소문자 + 구두점 제거 + 공백 정리"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = _NON_WORD.sub(" ", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def canonicalize_query(text: str) -> str:
+    """
+    질문 비교용 정규형 - 동의어를 대표 표현으로 바꾸고 어미/군더더기 제거
+
+    "32평 올수리 얼마?" → "32평 전체 리모델링 비용"
+    "공사 기간 얼마나 걸려요?" → "공사 일정 얼마나 걸려요" (어절 안의 "얼마"는 치환하지 않음)
+    """
+    text = normalize_text(text)
+    text = _SYNONYM_PATTERN.sub(lambda m: QUERY_SYNONYMS[m.group(1)], text)
+    text = _FILLER_PATTERN.sub(" ", text)
+    # 치환 후 연달아 같은 표현이 남으면 하나로 ("비용 얼마" → "비용 비용" → "비용")
+    words: List[str] = []
+    for word in text.split():
+        if not words or words[-1] != word:
+            words.append(word)
+    return " ".join(words)
+
+
+def char_ngrams(text: str, sizes: Tuple[int, ...] = (2, 3)) -> Counter:
+    """문자 n-gram 빈도 (단어 경계는 공백 1개로 유지)"""
+    padded = f" {normalize_text(text)} "
+    grams: Counter = Counter()
+    for n in sizes:
+        for i in range(len(padded) - n + 1):
+            gram = padded[i:i + n]
+            if gram.strip():
+                grams[gram] += 1
+    return grams
+
+
+def _l2_normalize(vector: Dict[str, float]) -> Dict[str, float]:
+    norm = math.sqrt(sum(v * v for v in vector.values()))
+    if norm == 0:
+        return {}
+    return {k: v / norm for k, v in vector.items()}
+
+
+def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    """정규화된 희소 벡터 내적"""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+
+class IntentRouter:
+    """
+    n-gram centroid + 키워드 의도 분류기
+
+    Usage:
+        router = IntentRouter()
+        prediction = router.classify("32평 전체 공사 비용 얼마에요?")
+        if prediction.confident:
+            ...  # 의도별 슬림 프롬프트 사용
+    """
+
+    def __init__(
+        self,
+        examples: Optional[Dict[AgentIntent, Tuple[str, ...]]] = None,
+        keywords: Optional[Dict[AgentIntent, Tuple[str, ...]]] = None,
+        threshold: Optional[float] = None,
+    ):
+        self.examples = examples or INTENT_EXAMPLES
+        self.keywords = keywords or INTENT_KEYWORDS
+        self.threshold = threshold if threshold is not None else settings.intent_router_threshold
+        self._centroids: Dict[AgentIntent, Dict[str, float]] = {
+            intent: self._centroid(texts) for intent, texts in self.examples.items()
+        }
+
+    @staticmethod
+    def _centroid(texts: Tuple[str, ...]) -> Dict[str, float]:
+        """예문별 정규화 벡터의 평균 → 다시 정규화"""
+        total: Dict[str, float] = {}
+        for text in texts:
+            for gram, value in _l2_normalize(char_ngrams(text)).items():
+                total[gram] = total.get(gram, 0.0) + value
+        return _l2_normalize(total)
+
+    def _keyword_score(self, intent: AgentIntent, text: str) -> float:
+        hits = sum(1 for keyword in self.keywords.get(intent, ()) if keyword in text)
+        return min(1.0, hits * KEYWORD_WEIGHT)
+
+    def classify(self, query: str) -> IntentPrediction:
+        """
+        질문 의도 분류
+
+        Args:
+            query: 사용자 질문
+
+        Returns:
+            IntentPrediction: 의도, 점수, 확신 여부
+        """
+        text = normalize_text(query)
+        vector = _l2_normalize(char_ngrams(query))
+
+        scores: List[Tuple[float, AgentIntent]] = []
+        for intent, centroid in self._centroids.items():
+            score = COSINE_WEIGHT * _cosine(vector, centroid) + (1 - COSINE_WEIGHT) * self._keyword_score(intent, text)
+            scores.append((score, intent))
+        scores.sort(key=lambda item: item[0], reverse=True)
+
+        if not scores:
+            return IntentPrediction(intent=AgentIntent.CHAT, confidence=0.0, confident=False)
+
+        best_score, best_intent = scores[0]
+        runner_up = scores[1][0] if len(scores) > 1 else 0.0
+        return IntentPrediction(
+            intent=best_intent,
+            confidence=round(best_score, 4),
+            confident=best_score >= self.threshold and best_score - runner_up >= MIN_MARGIN,
+            scores={intent.value: round(score, 4) for score, intent in scores},
+        )
+
+
+# 싱글톤 인스턴스
+_intent_router: Optional[IntentRouter] = None
+
+
+def get_intent_router() -> IntentRouter:
+    """IntentRouter 싱글톤 반환"""
+    global _intent_router
+    if _intent_router is None:
+        _intent_router = IntentRouter()
+    return _intent_router
@@ -0,0 +1,189 @@
+"""
+시공 지식 검색 인덱스 (Knowledge Index)
+TECHNICAL 질문에 대해 로컬 지식 베이스에서 관련 문단을 검색
+
+- 문자 n-gram(2~3) BM25 → 제목/대표 질문/본문 전체에서 후보 문단 순위
+- 대표 질문과의 코사인 유사도 → 거의 같은 질문이면 LLM 없이 바로 답변
+- 메모리 인덱스, 문서 추가 시 df/평균 길이만 갱신 (전체 재구축 없음)
+"""
+import json
+import math
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.services.intent_router import char_ngrams
+
+# BM25 파라미터
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+@dataclass
+class KnowledgeEntry:
+    """지식 베이스 항목"""
+    id: str
+    title: str
+    content: str
+    questions: List[str] = field(default_factory=list)
+    follow_up_questions: List[str] = field(default_factory=list)
+
+
+@dataclass
+class KnowledgeHit:
+    """검색 결과"""
+    entry: KnowledgeEntry
+    score: float  # BM25 점수
+    similarity: float  # 제목/대표 질문과의 최대 코사인 유사도
+
+
+def _unit_vector(grams: Counter) -> Dict[str, float]:
+    norm = math.sqrt(sum(v * v for v in grams.values()))
+    if norm == 0:
+        return {}
+    return {k: v / norm for k, v in grams.items()}
+
+
+def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+
+class KnowledgeIndex:
+    """
+    BM25 + n-gram 유사도 지식 검색
+
+    Usage:
+        index = get_knowledge_index()
+        hits = index.search("욕실 방수 어떻게 해요?", k=3)
+        if hits and hits[0].similarity >= settings.knowledge_direct_answer_threshold:
+            ...  # 바로 답변
+    """
+
+    def __init__(self, entries: Optional[List[KnowledgeEntry]] = None):
+        self._entries: List[KnowledgeEntry] = []
+        self._ids: Dict[str, int] = {}
+        self._term_freqs: List[Counter] = []
+        self._lengths: List[int] = []
+        self._question_vectors: List[List[Dict[str, float]]] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._df: Counter = Counter()
+        self._total_length = 0
+        for entry in entries or []:
+            self.add(entry)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, entry: KnowledgeEntry) -> None:
+        """
+        항목 추가 (같은 id가 있으면 무시)
+
+        Args:
+            entry: 지식 베이스 항목
+        """
+        if entry.id in self._ids:
+            return
+        text = " ".join([entry.title, *entry.questions, entry.content])
+        term_freq = char_ngrams(text)
+        doc_id = len(self._entries)
+
+        self._ids[entry.id] = doc_id
+        self._entries.append(entry)
+        self._term_freqs.append(term_freq)
+        length = sum(term_freq.values())
+        self._lengths.append(length)
+        self._total_length += length
+        self._question_vectors.append(
+            [_unit_vector(char_ngrams(q)) for q in (entry.title, *entry.questions)]
+        )
+        for gram in term_freq:
+            self._df[gram] += 1
+            self._postings.setdefault(gram, []).append(doc_id)
+
+    def load_file(self, path: str) -> int:
+        """
+        JSON 파일에서 항목 추가
+
+        Args:
+            path: [{id, title, questions, content, follow_up_questions}, ...] 형식 파일
+
+        Returns:
+            int: 추가된 항목 수
+        """
+        if not os.path.exists(path):
+            print(f"[KnowledgeIndex] Knowledge base not found: {path}")
+            return 0
+        with open(path, "r", encoding="utf-8") as f:
+            items = json.load(f)
+        before = len(self)
+        for item in items:
+            try:
+                self.add(KnowledgeEntry(**item))
+            except TypeError as e:
+                print(f"[KnowledgeIndex] Skipping invalid entry {item.get('id')}: {e}")
+        return len(self) - before
+
+    def _idf(self, gram: str) -> float:
+        df = self._df.get(gram, 0)
+        return math.log(1 + (len(self._entries) - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, k: int = 3, min_score: float = 0.0) -> List[KnowledgeHit]:
+        """
+        질문과 관련된 항목 검색
+
+        Args:
+            query: 사용자 질문
+            k: 최대 결과 수
+            min_score: 최소 BM25 점수
+
+        Returns:
+            List[KnowledgeHit]: BM25 점수 내림차순
+        """
+        if not self._entries:
+            return []
+        query_grams = char_ngrams(query)
+        avg_length = self._total_length / len(self._entries)
+
+        scores: Dict[int, float] = {}
+        for gram in query_grams:
+            postings = self._postings.get(gram)
+            if not postings:
+                continue
+            idf = self._idf(gram)
+            for doc_id in postings:
+                tf = self._term_freqs[doc_id][gram]
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        query_vector = _unit_vector(query_grams)
+        hits = []
+        for doc_id, score in ranked:
+            if score < min_score:
+                continue
+            similarity = max((_cosine(query_vector, v) for v in self._question_vectors[doc_id]), default=0.0)
+            hits.append(KnowledgeHit(
+                entry=self._entries[doc_id],
+                score=round(score, 4),
+                similarity=round(similarity, 4),
+            ))
+        return hits
+
+
+# 싱글톤 인스턴스
+_knowledge_index: Optional[KnowledgeIndex] = None
+
+
+def get_knowledge_index() -> KnowledgeIndex:
+    """KnowledgeIndex 싱글톤 반환 (최초 호출 시 지식 베이스 파일 로드)"""
+    global _knowledge_index
+    if _knowledge_index is None:
+        index = KnowledgeIndex()
+        count = index.load_file(settings.knowledge_base_file)
+        print(f"[KnowledgeIndex] Loaded {count} entries")
+        _knowledge_index = index
+    return _knowledge_index
@@ -0,0 +1,301 @@
+"""
+레퍼런스 이미지 팔레트 / 자재 톤 분석기
+Gemini Vision 호출 없이 NumPy만으로 수십 ms 안에 색상 팔레트와 주요 자재 톤을 추출
+
+- Lab 색공간 k-means → 대표 색상 팔레트
+- 명도/채도 히스토그램 → 밝기, 색온도
+- 그래디언트 통계 → 표면 질감 (매끈함 / 거침)
+"""
+from dataclasses import dataclass, field
+from typing import List
+
+import numpy as np
+from PIL import Image
+
+
+# 분석용 축소 크기 (긴 변 픽셀) - 팔레트 추출에는 이 정도면 충분
+ANALYSIS_SIZE = 96
+# k-means에 사용할 최대 픽셀 수 (여러 장일 때 균등 샘플링)
+MAX_SAMPLES = 4096
+# 이 거리(ΔE) 이내의 팔레트 색상은 같은 색으로 병합
+MERGE_DELTA_E = 10.0
+
+# sRGB(D65) → XYZ 변환 행렬
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_D65_WHITE = np.array([0.95047, 1.0, 1.08883])
+
+# 자재 톤별 프롬프트 표현
+MATERIAL_TONE_PROMPTS = {
+    "wood": "natural wood tones, warm timber surfaces",
+    "white": "bright white surfaces, clean painted finishes",
+    "concrete": "raw concrete gray, cement and stone textures",
+    "dark": "dark moody tones, deep charcoal and black finishes",
+    "neutral": "soft neutral tones",
+}
+
+
+@dataclass
+class PaletteColor:
+    """팔레트 색상"""
+    hex: str
+    name: str
+    ratio: float
+
+
+@dataclass
+class PaletteDescriptor:
+    """팔레트 / 자재 톤 분석 결과"""
+    palette: List[PaletteColor] = field(default_factory=list)
+    material_tone: str = "neutral"  # wood / white / concrete / dark / neutral
+    brightness: str = "medium"      # bright / medium / dark
+    warmth: str = "neutral"         # warm / neutral / cool
+    texture: str = "smooth"         # smooth / textured
+
+    def to_prompt(self) -> str:
+        """이미지 생성 프롬프트용 문구"""
+        colors = ", ".join(f"{c.name} ({c.hex})" for c in self.palette[:4])
+        parts = []
+        if colors:
+            parts.append(f"color palette of {colors}")
+        parts.append(MATERIAL_TONE_PROMPTS.get(self.material_tone, MATERIAL_TONE_PROMPTS["neutral"]))
+        parts.append(f"{self.brightness} {self.warmth} lighting")
+        if self.texture == "textured":
+            parts.append("tactile textured materials")
+        return ", ".join(parts)
+
+    def to_dict(self) -> dict:
+        """JSON 직렬화용 dict"""
+        return {
+            "palette": [{"hex": c.hex, "name": c.name, "ratio": c.ratio} for c in self.palette],
+            "material_tone": self.material_tone,
+            "brightness": self.brightness,
+            "warmth": self.warmth,
+            "texture": self.texture,
+        }
+
+
+def _rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """sRGB (0-1, Nx3) → CIE Lab (Nx3)"""
+    linear = np.where(rgb > 0.04045, ((rgb + 0.055) / 1.055) ** 2.4, rgb / 12.92)
+    xyz = linear @ _RGB_TO_XYZ.T / _D65_WHITE
+    f = np.where(xyz > 0.008856, np.cbrt(xyz), 7.787 * xyz + 16 / 116)
+    lightness = 116 * f[:, 1] - 16
+    a = 500 * (f[:, 0] - f[:, 1])
+    b = 200 * (f[:, 1] - f[:, 2])
+    return np.stack([lightness, a, b], axis=1)
+
+
+def _squared_distances(points: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """점-중심 제곱거리 행렬 (N x k), |x|^2 - 2x·c + |c|^2 전개로 중간 배열 최소화"""
+    return (
+        (points ** 2).sum(axis=1)[:, None]
+        - 2 * points @ centers.T
+        + (centers ** 2).sum(axis=1)[None, :]
+    )
+
+
+def _kmeans(points: np.ndarray, k: int, iterations: int = 12) -> tuple:
+    """
+    k-means (k-means++ 초기화, 고정 seed → 같은 이미지면 같은 결과)
+
+    Returns:
+        tuple: (중심점 kx3, 각 점의 클러스터 인덱스)
+    """
+    rng = np.random.default_rng(0)
+    k = min(k, len(points))
+    centers = points[rng.integers(len(points))][None, :]
+    for _ in range(1, k):
+        dist = np.maximum(_squared_distances(points, centers).min(axis=1), 0)
+        total = dist.sum()
+        if total == 0:
+            break
+        centers = np.vstack([centers, points[rng.choice(len(points), p=dist / total)]])
+
+    labels = None
+    for _ in range(iterations):
+        new_labels = _squared_distances(points, centers).argmin(axis=1)
+        if labels is not None and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for i in range(len(centers)):
+            members = points[labels == i]
+            if len(members):
+                centers[i] = members.mean(axis=0)
+    return centers, labels
+
+
+def _merge_similar(centers: np.ndarray, ratios: np.ndarray) -> tuple:
+    """ΔE가 MERGE_DELTA_E 이내인 클러스터를 비율 가중 평균으로 병합"""
+    merged_centers, merged_ratios = [], []
+    for i in np.argsort(-ratios):
+        for j, center in enumerate(merged_centers):
+            if np.linalg.norm(center - centers[i]) < MERGE_DELTA_E:
+                total = merged_ratios[j] + ratios[i]
+                merged_centers[j] = (center * merged_ratios[j] + centers[i] * ratios[i]) / total
+                merged_ratios[j] = total
+                break
+        else:
+            merged_centers.append(centers[i].copy())
+            merged_ratios.append(ratios[i])
+    return np.array(merged_centers), np.array(merged_ratios)
+
+
+def _lab_to_hex(lab: np.ndarray) -> str:
+    """Lab 한 점 → #rrggbb"""
+    lightness, a, b = lab
+    fy = (lightness + 16) / 116
+    f = np.array([fy + a / 500, fy, fy - b / 200])
+    xyz = np.where(f ** 3 > 0.008856, f ** 3, (f - 16 / 116) / 7.787) * _D65_WHITE
+    linear = np.linalg.solve(_RGB_TO_XYZ, xyz)
+    linear = np.clip(linear, 0, 1)
+    rgb = np.where(linear > 0.0031308, 1.055 * linear ** (1 / 2.4) - 0.055, 12.92 * linear)
+    r, g, b_ = (np.clip(rgb, 0, 1) * 255).round().astype(int)
+    return f"#{r:02x}{g:02x}{b_:02x}"
+
+
+def _color_name(lab: np.ndarray) -> str:
+    """Lab 색상의 대략적인 영문 이름 (프롬프트용)"""
+    lightness, a, b = lab
+    chroma = float(np.hypot(a, b))
+    hue = float(np.degrees(np.arctan2(b, a)) % 360)
+
+    if chroma < 10:
+        if lightness > 88:
+            return "white"
+        if lightness > 70:
+            return "light gray"
+        if lightness > 45:
+            return "gray"
+        if lightness > 22:
+            return "charcoal"
+        return "black"
+
+    if 35 <= hue < 95:  # 주황~노랑 계열: 나무/베이지/브라운
+        if lightness > 75:
+            return "cream" if chroma < 25 else "light beige"
+        if lightness > 55:
+            return "beige" if chroma < 30 else "honey oak"
+        if lightness > 35:
+            return "walnut brown"
+        return "dark brown"
+    if hue < 35 or hue >= 330:
+        base = "terracotta" if lightness < 60 else "blush pink"
+    elif hue < 130:
+        base = "mustard" if lightness > 55 else "olive"
+    elif hue < 200:
+        base = "sage green" if chroma < 30 else "green"
+    elif hue < 260:
+        base = "dusty blue" if chroma < 30 else "blue"
+    else:
+        base = "lavender" if lightness > 60 else "plum"
+    if lightness > 80:
+        return f"pale {base}"
+    if lightness < 30:
+        return f"deep {base}"
+    return base
+
+
+def _material_tone(centers: np.ndarray, ratios: np.ndarray, edge_strength: float) -> str:
+    """클러스터 가중 점수로 주요 자재 톤 분류"""
+    lightness, a, b = centers[:, 0], centers[:, 1], centers[:, 2]
+    chroma = np.hypot(a, b)
+    hue = np.degrees(np.arctan2(b, a)) % 360
+
+    scores = {
+        "wood": ratios[(hue >= 35) & (hue < 95) & (chroma >= 12) & (lightness > 20) & (lightness < 80)].sum(),
+        "white": ratios[(lightness > 80) & (chroma < 12)].sum(),
+        "concrete": ratios[(chroma < 10) & (lightness > 30) & (lightness <= 80)].sum(),
+        "dark": ratios[lightness < 25].sum(),
+    }
+    # 거친 회색 표면은 콘크리트일 가능성이 높음
+    if edge_strength > 0.06:
+        scores["concrete"] *= 1.3
+
+    tone, score = max(scores.items(), key=lambda item: item[1])
+    return tone if score >= 0.25 else "neutral"
+
+
+def analyze_palette(images: List[Image.Image], n_colors: int = 5) -> PaletteDescriptor:
+    """
+    레퍼런스 이미지(들)의 팔레트 / 자재 톤 분석
+
+    여러 장이면 픽셀을 합쳐 하나의 팔레트로 요약
+
+    Args:
+        images: PIL 이미지 목록
+        n_colors: 팔레트 색상 수
+
+    Returns:
+        PaletteDescriptor: 분석 결과
+    """
+    pixel_sets = []
+    edge_values = []
+    for image in images:
+        small = image.convert("RGB")
+        small.thumbnail((ANALYSIS_SIZE, ANALYSIS_SIZE))
+        rgb = np.asarray(small, dtype=np.float64) / 255.0
+        pixel_sets.append(rgb.reshape(-1, 3))
+
+        # 질감: 흑백 그래디언트 크기의 평균
+        gray = rgb @ np.array([0.299, 0.587, 0.114])
+        gx = np.abs(np.diff(gray, axis=1)).mean() if gray.shape[1] > 1 else 0.0
+        gy = np.abs(np.diff(gray, axis=0)).mean() if gray.shape[0] > 1 else 0.0
+        edge_values.append((gx + gy) / 2)
+
+    if not pixel_sets:
+        return PaletteDescriptor()
+
+    pixels = np.concatenate(pixel_sets)
+    if len(pixels) > MAX_SAMPLES:
+        pixels = pixels[np.random.default_rng(0).choice(len(pixels), MAX_SAMPLES, replace=False)]
+    lab = _rgb_to_lab(pixels)
+    edge_strength = float(np.mean(edge_values))
+
+    centers, labels = _kmeans(lab, n_colors)
+    ratios = np.bincount(labels, minlength=len(centers)) / len(labels)
+    centers, ratios = _merge_similar(centers, ratios)
+    order = np.argsort(-ratios)
+
+    palette = [
+        PaletteColor(
+            hex=_lab_to_hex(centers[i]),
+            name=_color_name(centers[i]),
+            ratio=round(float(ratios[i]), 3),
+        )
+        for i in order
+        if ratios[i] > 0
+    ]
+
+    # 히스토그램 기반 밝기 / 색온도
+    lightness_hist, _ = np.histogram(lab[:, 0], bins=[0, 35, 70, 101])
+    lightness_hist = lightness_hist / lightness_hist.sum()
+    if lightness_hist[2] > 0.5:
+        brightness = "bright"
+    elif lightness_hist[0] > 0.4:
+        brightness = "dark"
+    else:
+        brightness = "medium"
+
+    chroma = np.hypot(lab[:, 1], lab[:, 2])
+    colored = chroma > 8
+    warm_ratio = float((lab[colored, 2] > np.abs(lab[colored, 1]) * 0.5).mean()) if colored.any() else 0.5
+    if colored.mean() < 0.15:
+        warmth = "neutral"
+    elif warm_ratio > 0.6:
+        warmth = "warm"
+    elif warm_ratio < 0.4:
+        warmth = "cool"
+    else:
+        warmth = "neutral"
+
+    return PaletteDescriptor(
+        palette=palette,
+        material_tone=_material_tone(centers, ratios, edge_strength),
+        brightness=brightness,
+        warmth=warmth,
+        texture="textured" if edge_strength > 0.06 else "smooth",
+    )
@@ -0,0 +1,128 @@
+"""
+견적서 빌더
+기존 견적(세션/컨텍스트)에서 업체 전송용 QuoteData를 LLM 없이 그대로 구성
+
+- breakdown은 입력 값을 그대로 복사 (누락/변형 없음)
+- 필요 전문 분야 / 서비스 지역은 공종·위치 룩업으로 결정
+"""
+from typing import Any, Dict, List, Optional
+
+from app.models.schemas import CostBreakdown, QuoteData
+from app.services.regions import parse_location
+
+
+# 공사 범위 → 견적서 공사 종류
+SCOPE_CATEGORIES = {
+    "전체": "전체 인테리어",
+    "욕실": "욕실 리모델링",
+    "주방": "주방 리모델링",
+    "도배": "도배",
+    "바닥": "바닥 시공",
+}
+
+# 공사 범위별 기본 전문 분야
+SCOPE_SPECIALTIES = {
+    "전체": ("전체 인테리어", "리모델링"),
+    "욕실": ("욕실 리모델링",),
+    "주방": ("주방 리모델링",),
+    "도배": ("도배",),
+    "바닥": ("바닥재",),
+}
+
+# 공종 → 전문 분야
+TRADE_SPECIALTIES = {
+    "철거": "철거",
+    "목공": "목공",
+    "바닥": "바닥재",
+    "타일": "타일",
+    "도배": "도배",
+    "전기": "전기",
+    "설비": "설비",
+}
+
+
+def _first(data: Dict[str, Any], *keys: str) -> Any:
+    """snake_case / camelCase 키 중 먼저 있는 값"""
+    for key in keys:
+        value = data.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _breakdown(items: List[Dict[str, Any]]) -> List[CostBreakdown]:
+    """견적 내역을 그대로 CostBreakdown 목록으로 변환"""
+    breakdown = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        dm, dl, oh = item.get("dm", 0), item.get("dl", 0), item.get("oh", 0)
+        breakdown.append(CostBreakdown(
+            category=item.get("category", ""),
+            dm=dm,
+            dl=dl,
+            oh=oh,
+            total=item.get("total", dm + dl + oh),
+            note=item.get("note"),
+        ))
+    return breakdown
+
+
+def has_quotable_estimate(estimate: Optional[Dict[str, Any]]) -> bool:
+    """견적서로 보낼 수 있는 견적인지 (breakdown 존재)"""
+    return bool(estimate) and bool(estimate.get("breakdown"))
+
+
+def build_quote(estimate: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> QuoteData:
+    """
+    기존 견적 → 업체 전송용 QuoteData
+
+    Args:
+        estimate: CostEstimate dict (snake_case 또는 앱의 camelCase)
+        context: 세션/요청 컨텍스트 (location, work_type 등)
+
+    Returns:
+        QuoteData: 견적서
+    """
+    context = context or {}
+    breakdown = _breakdown(estimate.get("breakdown", []))
+
+    area_size = _first(estimate, "area_size", "areaSize") or context.get("area_size")
+    try:
+        area_size = int(area_size) if area_size is not None else None
+    except (TypeError, ValueError):
+        area_size = None
+
+    scope = _first(estimate, "work_scope", "workScope") or "전체"
+    category = SCOPE_CATEGORIES.get(scope, f"{scope} 공사")
+    title = f"{area_size}평 {category}" if area_size else category
+
+    city, district = parse_location(context.get("location"))
+
+    specialties = list(SCOPE_SPECIALTIES.get(scope, (category,)))
+    for item in breakdown:
+        specialty = TRADE_SPECIALTIES.get(item.category)
+        if specialty and specialty not in specialties:
+            specialties.append(specialty)
+
+    total_cost = sum(item.total for item in breakdown)
+    trades = ", ".join(item.category for item in breakdown)
+    description = f"{trades} 공사"
+    final_total = _first(estimate, "final_total", "finalTotal")
+    if final_total:
+        description += f" (예비비 포함 {final_total}만원)"
+    if context.get("work_type"):
+        description = f"{context['work_type']} - {description}"
+
+    return QuoteData(
+        title=title,
+        category=category,
+        location_city=city,
+        location_district=district,
+        area_size=area_size,
+        description=description,
+        total_cost=total_cost,
+        breakdown=breakdown,
+        target_specialties=specialties,
+        target_areas=[area for area in (city, district) if area],
+    )
@@ -0,0 +1,95 @@
+"""
+지역 파싱
+자유 텍스트 위치("서울 강남구", "분당", "부산 해운대")를 시/도 + 구/군으로 정규화
+"""
+from typing import Optional, Tuple
+
+
+# 서울 자치구
+SEOUL_DISTRICTS = (
+    "강남구", "강동구", "강북구", "강서구", "관악구", "광진구", "구로구", "금천구",
+    "노원구", "도봉구", "동대문구", "동작구", "마포구", "서대문구", "서초구", "성동구",
+    "성북구", "송파구", "양천구", "영등포구", "용산구", "은평구", "종로구", "중구", "중랑구",
+)
+
+# 시/도 (표기 변형 → 표준명)
+CITY_ALIASES = {
+    "서울": "서울", "서울시": "서울", "서울특별시": "서울",
+    "경기": "경기", "경기도": "경기",
+    "인천": "인천", "인천시": "인천", "인천광역시": "인천",
+    "부산": "부산", "부산시": "부산", "부산광역시": "부산",
+    "대구": "대구", "대구시": "대구", "대구광역시": "대구",
+    "광주": "광주", "광주시": "광주", "광주광역시": "광주",
+    "대전": "대전", "대전시": "대전", "대전광역시": "대전",
+    "울산": "울산", "울산시": "울산", "울산광역시": "울산",
+    "세종": "세종", "세종시": "세종",
+    "강원": "강원", "충북": "충북", "충남": "충남", "전북": "전북",
+    "전남": "전남", "경북": "경북", "경남": "경남", "제주": "제주",
+}
+
+# 경기도 주요 시 (시 이름만 나와도 경기로 판단)
+GYEONGGI_CITIES = (
+    "수원", "성남", "분당", "판교", "용인", "고양", "일산", "부천", "안양", "평촌",
+    "안산", "화성", "동탄", "남양주", "의정부", "파주", "김포", "광명", "하남", "시흥", "군포", "과천",
+)
+
+# 노임/자재 단가 권역
+REGION_GROUPS = {
+    "서울": "seoul",
+    "경기": "capital",
+    "인천": "capital",
+    "부산": "metro",
+    "대구": "metro",
+    "광주": "metro",
+    "대전": "metro",
+    "울산": "metro",
+    "세종": "metro",
+}
+
+
+def parse_location(text: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    위치 텍스트에서 시/도, 구/군 추출
+
+    Args:
+        text: 위치 텍스트 (예: "서울 강남구", "강남", "분당 정자동")
+
+    Returns:
+        tuple: (시/도 표준명 또는 None, 구/군 또는 None)
+    """
+    if not text:
+        return None, None
+
+    tokens = text.replace(",", " ").split()
+    city = None
+    district = None
+    for token in tokens:
+        if city is None and token in CITY_ALIASES:
+            city = CITY_ALIASES[token]
+            continue
+        if district is None and token.endswith(("구", "군", "시")) and len(token) >= 2 and token not in CITY_ALIASES:
+            district = token
+
+    # "강남" 처럼 '구' 없이 쓴 서울 자치구
+    if district is None:
+        for name in SEOUL_DISTRICTS:
+            if name[:-1] in text and len(name) > 2:
+                district = name
+                break
+    if district in SEOUL_DISTRICTS and city is None:
+        city = "서울"
+
+    if city is None:
+        for name in GYEONGGI_CITIES:
+            if name in text:
+                city = "경기"
+                break
+
+    return city, district
+
+
+def region_group(city: Optional[str]) -> str:
+    """시/도 → 단가 권역 (seoul / capital / metro / provincial, 미상이면 seoul)"""
+    if city is None:
+        return "seoul"
+    return REGION_GROUPS.get(city, "provincial")
@@ -0,0 +1,574 @@
+"""
+공정 스케줄러
+LLM 호출 없이 공정(선후행, 작업일수, 투입 인원)을 실제 달력에 배치해 ProjectSchedule 생성
+
+- 일요일 / 공휴일: 작업 없음
+- 금요일 / 토요일 / 공휴일 전날: 소음 작업(철거, 타공, 해머링) 금지 (Friday Rule)
+- 하루 투입 인원 상한 내에서 병행 가능한 공정은 병행
+- 각 공정의 시작을 결정한 선행 공정(binding predecessor)을 따라 크리티컬 패스 계산
+- 공정 지연 시 후속 공정만 재배치 (reschedule)
+
+공휴일: KOREAN_HOLIDAYS 표(2025~2027) → 표 밖의 연도는 holidays 패키지(선택 의존성)로 계산,
+패키지가 없으면 양력 고정 공휴일만 적용하고 일정 경고에 음력 공휴일 미반영을 표시
+"""
+import math
+import re
+from dataclasses import dataclass, field, replace
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.core.lazy import import_module
+from app.models.schemas import ProjectSchedule, ScheduleItem
+from app.services.cost_engine import coerce_bathrooms, default_bathrooms
+
+
+# 한국 공휴일 (대체공휴일, 선거일 포함)
+KOREAN_HOLIDAYS: Dict[date, str] = {
+    # 2025
+    date(2025, 1, 1): "신정",
+    date(2025, 1, 27): "임시공휴일",
+    date(2025, 1, 28): "설날 연휴",
+    date(2025, 1, 29): "설날",
+    date(2025, 1, 30): "설날 연휴",
+    date(2025, 3, 1): "삼일절",
+    date(2025, 3, 3): "대체공휴일(삼일절)",
+    date(2025, 5, 5): "어린이날/부처님오신날",
+    date(2025, 5, 6): "대체공휴일",
+    date(2025, 6, 3): "대통령선거일",
+    date(2025, 6, 6): "현충일",
+    date(2025, 8, 15): "광복절",
+    date(2025, 10, 3): "개천절",
+    date(2025, 10, 5): "추석 연휴",
+    date(2025, 10, 6): "추석",
+    date(2025, 10, 7): "추석 연휴",
+    date(2025, 10, 8): "대체공휴일(추석)",
+    date(2025, 10, 9): "한글날",
+    date(2025, 12, 25): "성탄절",
+    # 2026
+    date(2026, 1, 1): "신정",
+    date(2026, 2, 16): "설날 연휴",
+    date(2026, 2, 17): "설날",
+    date(2026, 2, 18): "설날 연휴",
+    date(2026, 3, 1): "삼일절",
+    date(2026, 3, 2): "대체공휴일(삼일절)",
+    date(2026, 5, 5): "어린이날",
+    date(2026, 5, 24): "부처님오신날",
+    date(2026, 5, 25): "대체공휴일(부처님오신날)",
+    date(2026, 6, 3): "지방선거일",
+    date(2026, 6, 6): "현충일",
+    date(2026, 8, 15): "광복절",
+    date(2026, 8, 17): "대체공휴일(광복절)",
+    date(2026, 9, 24): "추석 연휴",
+    date(2026, 9, 25): "추석",
+    date(2026, 9, 26): "추석 연휴",
+    date(2026, 10, 3): "개천절",
+    date(2026, 10, 5): "대체공휴일(개천절)",
+    date(2026, 10, 9): "한글날",
+    date(2026, 12, 25): "성탄절",
+    # 2027
+    date(2027, 1, 1): "신정",
+    date(2027, 2, 5): "설날 연휴",
+    date(2027, 2, 6): "설날",
+    date(2027, 2, 7): "설날 연휴",
+    date(2027, 2, 8): "대체공휴일(설날)",
+    date(2027, 3, 1): "삼일절",
+    date(2027, 5, 5): "어린이날",
+    date(2027, 5, 13): "부처님오신날",
+    date(2027, 6, 6): "현충일",
+    date(2027, 8, 15): "광복절",
+    date(2027, 8, 16): "대체공휴일(광복절)",
+    date(2027, 9, 14): "추석 연휴",
+    date(2027, 9, 15): "추석",
+    date(2027, 9, 16): "추석 연휴",
+    date(2027, 10, 3): "개천절",
+    date(2027, 10, 4): "대체공휴일(개천절)",
+    date(2027, 10, 9): "한글날",
+    date(2027, 10, 11): "대체공휴일(한글날)",
+    date(2027, 12, 25): "성탄절",
+    date(2027, 12, 27): "대체공휴일(성탄절)",
+}
+
+# KOREAN_HOLIDAYS가 다루는 연도
+HOLIDAY_TABLE_YEARS = frozenset(day.year for day in KOREAN_HOLIDAYS)
+
+# 표 밖 연도의 폴백: 양력 고정 공휴일 (설날/추석/부처님오신날/대체공휴일/선거일 미포함)
+FIXED_SOLAR_HOLIDAYS: Dict[Tuple[int, int], str] = {
+    (1, 1): "신정",
+    (3, 1): "삼일절",
+    (5, 5): "어린이날",
+    (6, 6): "현충일",
+    (8, 15): "광복절",
+    (10, 3): "개천절",
+    (10, 9): "한글날",
+    (12, 25): "성탄절",
+}
+
+WEEKDAY_LABELS = ("월", "화", "수", "목", "금", "토", "일")
+
+# 하루 투입 인원 상한 (현장 주차/엘리베이터 사용 기준)
+DEFAULT_MAX_WORKERS = 8
+# 배치 탐색 상한 (달력일) - 잘못된 입력으로 무한 루프 방지
+MAX_CALENDAR_DAYS = 365
+
+
+@dataclass(frozen=True)
+class Phase:
+    """공정 정의"""
+    name: str
+    task: str
+    duration: int              # 작업일수
+    workers: int
+    is_noise_work: bool = False
+    predecessors: Tuple[str, ...] = ()
+
+
+@dataclass
+class PhasePlan:
+    """공정 배치 결과"""
+    phase: Phase
+    days: List[date] = field(default_factory=list)
+    binding: Optional[str] = None  # 시작일을 결정한 선행 공정
+
+    @property
+    def start(self) -> date:
+        return self.days[0]
+
+    @property
+    def end(self) -> date:
+        return self.days[-1]
+
+
+@dataclass
+class SchedulePlan:
+    """전체 배치 결과 (재배치에 재사용)"""
+    start_date: date
+    phases: Dict[str, PhasePlan]
+    critical_path: List[str]
+    warnings: List[str] = field(default_factory=list)
+
+
+@lru_cache(maxsize=32)
+def _holidays_for_year(year: int) -> Tuple[Dict[date, str], bool]:
+    """
+    연도별 공휴일
+
+    Returns:
+        (공휴일 표, 음력 공휴일까지 포함한 완전한 표인지 여부)
+    """
+    if year in HOLIDAY_TABLE_YEARS:
+        return {day: name for day, name in KOREAN_HOLIDAYS.items() if day.year == year}, True
+    try:
+        holidays = import_module("holidays")  # 선택 의존성
+    except ImportError:
+        return {date(year, month, day): name for (month, day), name in FIXED_SOLAR_HOLIDAYS.items()}, False
+    return dict(holidays.KR(years=year)), True
+
+
+def holiday_name(day: date) -> Optional[str]:
+    """공휴일 이름 (공휴일이 아니면 None)"""
+    return _holidays_for_year(day.year)[0].get(day)
+
+
+def holidays_complete(year: int) -> bool:
+    """해당 연도에 설날/추석 등 음력 공휴일까지 반영되는지 여부"""
+    return _holidays_for_year(year)[1]
+
+
+def is_holiday(day: date) -> bool:
+    """공휴일 여부"""
+    return holiday_name(day) is not None
+
+
+def is_work_day(day: date) -> bool:
+    """작업 가능일 (일요일/공휴일 제외)"""
+    return day.weekday() != 6 and not is_holiday(day)
+
+
+def is_noise_allowed(day: date) -> bool:
+    """소음 작업 가능일 (금/토, 공휴일 전날 제외)"""
+    if not is_work_day(day) or day.weekday() in (4, 5):
+        return False
+    return not is_holiday(day + timedelta(days=1))
+
+
+def _noise_block_reason(day: date) -> str:
+    if day.weekday() == 4:
+        return "금요일"
+    if day.weekday() == 5:
+        return "토요일"
+    return f"{holiday_name(day + timedelta(days=1)) or '공휴일'} 전날"
+
+
+def build_phases(area_size: int = 32, work_scope: str = "전체", bathrooms: Optional[int] = None) -> List[Phase]:
+    """
+    평수 / 공사 범위로 공정 목록 생성
+
+    Args:
+        area_size: 평수
+        work_scope: 전체 / 욕실 / 주방 / 도배 / 바닥
+        bathrooms: 욕실 수 (미지정/해석 불가 시 평수로 추정, 0~MAX_BATHROOMS로 제한)
+
+    Returns:
+        List[Phase]: 선후행이 정의된 공정 목록
+    """
+    bathrooms = coerce_bathrooms(bathrooms)
+    if bathrooms is None:
+        bathrooms = default_bathrooms(area_size)
+
+    if work_scope == "욕실":
+        bathrooms = max(1, bathrooms)  # 욕실 공사인데 0개소면 철거/타일 기간이 비므로 최소 1개소
+        return [
+            Phase("철거", "욕실 타일/도기 철거 및 폐기물 반출", bathrooms, 3, True),
+            Phase("설비", "욕실 배관 교체 및 코어 타공", 1, 2, True, ("철거",)),
+            Phase("방수", "방수 시공 및 담수 테스트 (양생)", 2, 1, False, ("설비",)),
+            Phase("타일", "욕실 벽/바닥 타일 시공", 2 * bathrooms, 2, False, ("방수",)),
+            Phase("설비 마감", "도기, 수전, 욕실장 설치", 1, 2, False, ("타일",)),
+            Phase("청소", "실리콘 마감 및 청소", 1, 2, False, ("설비 마감",)),
+        ]
+    if work_scope == "주방":
+        return [
+            Phase("철거", "기존 주방 가구/벽 타일 철거", 1, 3, True),
+            Phase("설비", "급배수 배관 이설", 1, 2, True, ("철거",)),
+            Phase("전기", "주방 배선 및 콘센트 증설", 1, 1, False, ("철거",)),
+            Phase("타일", "주방 벽 타일 시공", 1, 2, False, ("설비", "전기")),
+            Phase("가구", "주방 가구 및 상판 설치", 2, 3, True, ("타일",)),
+            Phase("청소", "마감 청소", 1, 2, False, ("가구",)),
+        ]
+    if work_scope == "도배":
+        return [
+            Phase("보양", "가구 이동 및 바닥 보양", 1, 2, False),
+            Phase("도배", "기존 벽지 제거 및 도배", max(2, math.ceil(area_size / 16)), 3, False, ("보양",)),
+            Phase("청소", "마감 청소", 1, 2, False, ("도배",)),
+        ]
+    if work_scope == "바닥":
+        return [
+            Phase("철거", "기존 바닥재 철거 및 폐기물 반출", max(1, math.ceil(area_size / 20)), 3, True),
+            Phase("바닥", "바닥 레벨링 및 마루 시공", max(2, math.ceil(area_size / 12)), 3, False, ("철거",)),
+            Phase("청소", "걸레받이 마감 및 청소", 1, 2, False, ("바닥",)),
+        ]
+
+    return [
+        Phase("철거", "기존 마감재 철거 및 폐기물 반출", max(2, math.ceil(area_size / 16)), 4, True),
+        Phase("설비", "배관 이설 및 코어 타공", 2, 2, True, ("철거",)),
+        Phase("전기", "전기 배선 및 분전반 정리", 2, 2, False, ("철거",)),
+        Phase("방수", "욕실 방수 시공 및 양생", 2, 1, False, ("설비",)),
+        Phase("목공", "천장, 문틀, 몰딩, 가벽 작업", max(3, math.ceil(area_size / 8)), 3, True, ("설비", "전기")),
+        Phase("타일", "욕실/주방 타일 시공", 2 + bathrooms, 2, False, ("방수",)),
+        Phase("도배", "벽/천장 도배", max(2, math.ceil(area_size / 16)), 3, False, ("목공",)),
+        Phase("바닥", "마루 시공", max(2, math.ceil(area_size / 12)), 3, False, ("도배", "타일")),
+        Phase("전기 마감", "조명, 스위치, 콘센트 설치", 1, 2, False, ("도배",)),
+        Phase("설비 마감", "도기, 수전, 욕실장 설치", 1, 2, False, ("타일",)),
+        Phase("청소", "입주 청소 및 하자 점검", 1, 3, False, ("바닥", "전기 마감", "설비 마감")),
+    ]
+
+
+class ConstraintScheduler:
+    """
+    공정 제약 스케줄러
+
+    Usage:
+        scheduler = ConstraintScheduler()
+        plan = scheduler.plan(build_phases(32), date(2025, 3, 3))
+        schedule = scheduler.to_project_schedule(plan)
+
+        # 목공이 2일 지연 → 후속 공정만 재배치
+        plan = scheduler.reschedule(plan, "목공", extra_days=2)
+    """
+
+    def __init__(self, max_workers_per_day: int = DEFAULT_MAX_WORKERS):
+        self.max_workers_per_day = max_workers_per_day
+
+    @staticmethod
+    def _topological_order(phases: Dict[str, Phase]) -> List[str]:
+        """선후행 순서 정렬 (입력 순서를 최대한 유지)"""
+        order: List[str] = []
+        visited: Set[str] = set()
+        visiting: Set[str] = set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"공정 선후행에 순환이 있습니다: {name}")
+            visiting.add(name)
+            for pred in phases[name].predecessors:
+                if pred not in phases:
+                    raise ValueError(f"알 수 없는 선행 공정: {pred} ({name})")
+                visit(pred)
+            visiting.discard(name)
+            visited.add(name)
+            order.append(name)
+
+        for name in phases:
+            visit(name)
+        return order
+
+    def _place(
+        self,
+        phase: Phase,
+        earliest: date,
+        usage: Dict[date, int],
+    ) -> List[date]:
+        """earliest 이후 조건(달력/소음/인원)을 만족하는 날에 작업일수만큼 배치"""
+        days: List[date] = []
+        day = earliest
+        limit = earliest + timedelta(days=MAX_CALENDAR_DAYS)
+        while len(days) < phase.duration:
+            if day > limit:
+                raise ValueError(f"{phase.name} 공정을 배치할 수 없습니다")
+            allowed = is_noise_allowed(day) if phase.is_noise_work else is_work_day(day)
+            if allowed and usage.get(day, 0) + phase.workers <= max(self.max_workers_per_day, phase.workers):
+                days.append(day)
+            day += timedelta(days=1)
+        for placed in days:
+            usage[placed] = usage.get(placed, 0) + phase.workers
+        return days
+
+    def _schedule(
+        self,
+        phases: Dict[str, Phase],
+        start_date: date,
+        fixed: Dict[str, PhasePlan],
+    ) -> Dict[str, PhasePlan]:
+        """fixed에 없는 공정만 선후행 순서로 배치"""
+        usage: Dict[date, int] = {}
+        for plan in fixed.values():
+            for day in plan.days:
+                usage[day] = usage.get(day, 0) + plan.phase.workers
+
+        plans = dict(fixed)
+        for name in self._topological_order(phases):
+            if name in plans:
+                continue
+            phase = phases[name]
+            earliest, binding = start_date, None
+            for pred in phase.predecessors:
+                candidate = plans[pred].end + timedelta(days=1)
+                if candidate > earliest:
+                    earliest, binding = candidate, pred
+            plans[name] = PhasePlan(phase=phase, days=self._place(phase, earliest, usage), binding=binding)
+        return plans
+
+    @staticmethod
+    def _critical_path(plans: Dict[str, PhasePlan]) -> List[str]:
+        """가장 늦게 끝나는 공정에서 binding predecessor를 역추적"""
+        if not plans:
+            return []
+        name = max(plans.values(), key=lambda plan: plan.end).phase.name
+        path = []
+        while name is not None:
+            path.append(name)
+            name = plans[name].binding
+        return list(reversed(path))
+
+    @staticmethod
+    def _warnings(plans: Dict[str, PhasePlan]) -> List[str]:
+        """소음 공정이 Friday Rule / 공휴일로 밀린 경우 안내"""
+        warnings = []
+        for plan in sorted(plans.values(), key=lambda p: p.start):
+            if not plan.phase.is_noise_work:
+                continue
+            day = plan.start
+            while day <= plan.end:
+                if is_work_day(day) and not is_noise_allowed(day):
+                    warnings.append(
+                        f"{day.isoformat()}({WEEKDAY_LABELS[day.weekday()]})은 {_noise_block_reason(day)}이므로 "
+                        f"{plan.phase.name} 작업 불가 - 일정 조정됨"
+                    )
+                day += timedelta(days=1)
+        for plan in plans.values():
+            day = plan.start
+            while day <= plan.end:
+                if is_holiday(day):
+                    warnings.append(f"{day.isoformat()} {holiday_name(day)} 휴무")
+                day += timedelta(days=1)
+        # 공휴일 정보가 불완전한 연도에 걸친 일정은 소음 규정 준수를 보장할 수 없으므로 명시
+        start = min((plan.start for plan in plans.values()), default=None)
+        end = max((plan.end for plan in plans.values()), default=None)
+        if start is not None:
+            for year in range(start.year, end.year + 1):
+                if not holidays_complete(year):
+                    warnings.append(
+                        f"{year}년 설날/추석/부처님오신날/대체공휴일 정보가 없어 해당 휴무와 전날 소음 제한이 "
+                        f"반영되지 않았습니다 - 착공 전 일정 재확인 필요"
+                    )
+        return list(dict.fromkeys(warnings))
+
+    def plan(self, phases: List[Phase], start_date: date) -> SchedulePlan:
+        """
+        공정 배치
+
+        Args:
+            phases: 공정 목록
+            start_date: 착공일
+
+        Returns:
+            SchedulePlan: 배치 결과
+        """
+        phase_map = {phase.name: phase for phase in phases}
+        plans = self._schedule(phase_map, start_date, fixed={})
+        return SchedulePlan(
+            start_date=start_date,
+            phases=plans,
+            critical_path=self._critical_path(plans),
+            warnings=self._warnings(plans),
+        )
+
+    def reschedule(self, plan: SchedulePlan, phase_name: str, extra_days: int) -> SchedulePlan:
+        """
+        공정 지연 시 증분 재배치
+
+        지연된 공정은 이미 배치된 날 뒤로 작업일을 이어 붙이고,
+        그 후속 공정(descendants)만 다시 배치. 나머지 공정은 그대로 유지
+
+        Args:
+            plan: 기존 배치 결과
+            phase_name: 지연된 공정
+            extra_days: 추가로 필요한 작업일수
+
+        Returns:
+            SchedulePlan: 재배치 결과
+        """
+        if phase_name not in plan.phases:
+            raise ValueError(f"알 수 없는 공정: {phase_name}")
+
+        phases = {name: p.phase for name, p in plan.phases.items()}
+        descendants: Set[str] = set()
+        frontier = [phase_name]
+        while frontier:
+            current = frontier.pop()
+            for name, phase in phases.items():
+                if current in phase.predecessors and name not in descendants:
+                    descendants.add(name)
+                    frontier.append(name)
+
+        fixed = {
+            name: p for name, p in plan.phases.items()
+            if name not in descendants and name != phase_name
+        }
+
+        # 지연 공정: 기존 작업일 유지 + 마지막 날 다음부터 추가 작업일 배치
+        slipped = plan.phases[phase_name]
+        usage: Dict[date, int] = {}
+        for p in fixed.values():
+            for day in p.days:
+                usage[day] = usage.get(day, 0) + p.phase.workers
+        for day in slipped.days:
+            usage[day] = usage.get(day, 0) + slipped.phase.workers
+        extended_phase = replace(slipped.phase, duration=slipped.phase.duration + extra_days)
+        extra = self._place(
+            replace(slipped.phase, duration=extra_days),
+            slipped.end + timedelta(days=1),
+            usage,
+        ) if extra_days > 0 else []
+        fixed[phase_name] = PhasePlan(phase=extended_phase, days=slipped.days + extra, binding=slipped.binding)
+
+        phases[phase_name] = extended_phase
+        plans = self._schedule(phases, plan.start_date, fixed)
+        # 입력 순서 유지
+        plans = {name: plans[name] for name in plan.phases}
+        return SchedulePlan(
+            start_date=plan.start_date,
+            phases=plans,
+            critical_path=self._critical_path(plans),
+            warnings=self._warnings(plans),
+        )
+
+    @staticmethod
+    def to_project_schedule(plan: SchedulePlan, extra_warnings: Optional[List[str]] = None) -> ProjectSchedule:
+        """
+        배치 결과 → ProjectSchedule (공정별 작업일마다 ScheduleItem 한 개)
+
+        Args:
+            plan: 배치 결과
+            extra_warnings: 추가 안내 문구
+
+        Returns:
+            ProjectSchedule: 앱 렌더링용 일정
+        """
+        critical = set(plan.critical_path)
+        items = []
+        for phase_plan in plan.phases.values():
+            phase = phase_plan.phase
+            for index, day in enumerate(phase_plan.days, start=1):
+                note_parts = []
+                if phase.name in critical:
+                    note_parts.append("크리티컬 패스")
+                if phase.duration > 1:
+                    note_parts.append(f"{index}/{phase.duration}일차")
+                items.append(ScheduleItem(
+                    day=(day - plan.start_date).days + 1,
+                    date=day.isoformat(),
+                    phase=phase.name,
+                    task=phase.task,
+                    duration_hours=8,
+                    workers=phase.workers,
+                    note=", ".join(note_parts) or None,
+                    is_noise_work=phase.is_noise_work,
+                ))
+        items.sort(key=lambda item: (item.day, item.phase))
+
+        end = max((p.end for p in plan.phases.values()), default=plan.start_date)
+        milestones = [
+            f"{p.phase.name} 완료: {p.end.isoformat()} (D+{(p.end - plan.start_date).days + 1})"
+            for p in sorted(plan.phases.values(), key=lambda p: p.end)
+            if p.phase.name in critical
+        ]
+        return ProjectSchedule(
+            start_date=plan.start_date.isoformat(),
+            total_days=(end - plan.start_date).days + 1,
+            items=items,
+            milestones=milestones,
+            friday_rule_applied=True,
+            warnings=(extra_warnings or []) + plan.warnings,
+        )
+
+
+_DATE_PATTERNS = (
+    re.compile(r"(?P<y>\d{4})[-./](?P<m>\d{1,2})[-./](?P<d>\d{1,2})"),
+    re.compile(r"(?:(?P<y>\d{4})\s*년\s*)?(?P<m>\d{1,2})\s*월\s*(?P<d>\d{1,2})\s*일"),
+)
+
+
+def parse_start_date(text: Optional[str], today: Optional[date] = None) -> Optional[date]:
+    """
+    텍스트에서 착공일 추출 ("2025-03-03", "3월 3일", "2025년 3월 3일")
+
+    연도가 없으면 오늘 이후 가장 가까운 날짜로 해석
+
+    Args:
+        text: 입력 텍스트
+        today: 기준일 (기본: 오늘)
+
+    Returns:
+        date 또는 None
+    """
+    if not text:
+        return None
+    today = today or date.today()
+    for pattern in _DATE_PATTERNS:
+        match = pattern.search(text)
+        if not match:
+            continue
+        month, day = int(match.group("m")), int(match.group("d"))
+        if match.group("y"):
+            try:
+                return date(int(match.group("y")), month, day)
+            except ValueError:
+                continue
+        # 연도가 없으면 오늘 이후 가장 가까운 유효한 날짜 (2월 29일은 다음 윤년)
+        for year in range(today.year, today.year + 9):
+            try:
+                parsed = date(year, month, day)
+            except ValueError:
+                continue
+            if parsed >= today:
+                return parsed
+    return None
+
+
+def next_monday(today: Optional[date] = None) -> date:
+    """다음 주 월요일"""
+    today = today or date.today()
+    return today + timedelta(days=7 - today.weekday())
@@ -0,0 +1,120 @@
+"""
+스타일 카탈로그
+인테리어 스타일별 프롬프트 / 자재 / 가격 데이터
+
+DesignerAgent(이미지 생성)와 CostEngine(견적)이 함께 사용
+"""
+from typing import Any, Dict
+
+
+# 스타일별 상세 데이터 (프롬프트 + 자재 정보 for 견적 연동)
+STYLE_DATA: Dict[str, Dict[str, Any]] = {
+    "modern": {
+        "prompt": "modern interior design, clean lines, neutral colors, contemporary furniture, minimalist decor, high-end finishes, white walls, sleek surfaces",
+        "materials": {
+            "flooring": {"type": "강화마루", "unit": "sqm", "price_range": (80000, 150000)},
+            "wall": {"type": "친환경 페인트", "unit": "sqm", "price_range": (15000, 30000)},
+            "ceiling": {"type": "평천장 도장", "unit": "sqm", "price_range": (20000, 40000)},
+            "furniture_style": "contemporary",
+            "lighting": {"type": "LED 매입등 + 레일조명", "unit": "set", "price_range": (500000, 1500000)},
+        },
+        "cost_multiplier": 1.0,  # 기준 가격
+    },
+    "minimalist": {
+        "prompt": "minimalist interior, ultra clean, white space, simple furniture, no clutter, zen atmosphere, natural light, monochromatic palette",
+        "materials": {
+            "flooring": {"type": "폴리싱 콘크리트 or 마이크로 시멘트", "unit": "sqm", "price_range": (100000, 200000)},
+            "wall": {"type": "백색 무광 페인트", "unit": "sqm", "price_range": (15000, 25000)},
+            "ceiling": {"type": "평천장 무광 도장", "unit": "sqm", "price_range": (20000, 35000)},
+            "furniture_style": "minimal",
+            "lighting": {"type": "간접조명 + 다운라이트", "unit": "set", "price_range": (600000, 1200000)},
+        },
+        "cost_multiplier": 1.1,
+    },
+    "scandinavian": {
+        "prompt": "scandinavian interior, light wood floors, white walls, cozy textiles, hygge atmosphere, functional furniture, natural materials, soft lighting",
+        "materials": {
+            "flooring": {"type": "화이트오크 원목마루", "unit": "sqm", "price_range": (150000, 300000)},
+            "wall": {"type": "화이트/라이트그레이 페인트", "unit": "sqm", "price_range": (15000, 28000)},
+            "ceiling": {"type": "화이트 도장", "unit": "sqm", "price_range": (18000, 32000)},
+            "furniture_style": "scandinavian_wood",
+            "lighting": {"type": "펜던트 조명 + 테이블 램프", "unit": "set", "price_range": (400000, 1000000)},
+            "textiles": {"type": "린넨/울 텍스타일", "unit": "set", "price_range": (300000, 800000)},
+        },
+        "cost_multiplier": 1.2,
+    },
+    "industrial": {
+        "prompt": "industrial interior design, exposed brick, metal accents, concrete floors, vintage furniture, Edison bulbs, loft style, raw materials",
+        "materials": {
+            "flooring": {"type": "에폭시 코팅 콘크리트", "unit": "sqm", "price_range": (80000, 150000)},
+            "wall": {"type": "노출콘크리트 or 브릭타일", "unit": "sqm", "price_range": (50000, 120000)},
+            "ceiling": {"type": "노출천장 (덕트 노출)", "unit": "sqm", "price_range": (30000, 60000)},
+            "furniture_style": "industrial_vintage",
+            "lighting": {"type": "에디슨벌브 + 파이프조명", "unit": "set", "price_range": (300000, 800000)},
+            "metal_fixtures": {"type": "철재 인테리어 요소", "unit": "set", "price_range": (200000, 600000)},
+        },
+        "cost_multiplier": 0.95,
+    },
+    "natural": {
+        "prompt": "natural interior design, warm wood tones, plants, earthy colors, organic materials, rattan furniture, botanical elements, biophilic design",
+        "materials": {
+            "flooring": {"type": "월넛/티크 원목마루", "unit": "sqm", "price_range": (180000, 350000)},
+            "wall": {"type": "자연 톤 페인트 or 목재 패널", "unit": "sqm", "price_range": (25000, 80000)},
+            "ceiling": {"type": "목재 빔 노출 or 우드 패널", "unit": "sqm", "price_range": (50000, 120000)},
+            "furniture_style": "natural_organic",
+            "lighting": {"type": "라탄/우드 펜던트", "unit": "set", "price_range": (400000, 900000)},
+            "plants": {"type": "플랜테리어 (대형 화분 포함)", "unit": "set", "price_range": (500000, 1500000)},
+        },
+        "cost_multiplier": 1.3,
+    },
+    "classic": {
+        "prompt": "classic elegant interior, crown molding, traditional furniture, rich fabrics, chandelier, symmetrical layout, timeless design, warm lighting",
+        "materials": {
+            "flooring": {"type": "헤링본 원목마루 or 대리석", "unit": "sqm", "price_range": (200000, 500000)},
+            "wall": {"type": "몰딩 + 고급 벽지 or 페인트", "unit": "sqm", "price_range": (40000, 100000)},
+            "ceiling": {"type": "크라운 몰딩 + 우물천장", "unit": "sqm", "price_range": (80000, 180000)},
+            "furniture_style": "traditional_elegant",
+            "lighting": {"type": "샹들리에 + 브라켓 조명", "unit": "set", "price_range": (800000, 3000000)},
+            "molding": {"type": "석고 몰딩", "unit": "m", "price_range": (15000, 40000)},
+        },
+        "cost_multiplier": 1.5,
+    },
+    "luxurious": {
+        "prompt": "luxury interior design, marble floors, gold accents, designer furniture, crystal chandelier, premium materials, sophisticated palette, high ceiling",
+        "materials": {
+            "flooring": {"type": "이탈리아 대리석 or 포세린 타일", "unit": "sqm", "price_range": (300000, 800000)},
+            "wall": {"type": "베네치안 플라스터 or 고급 벽지", "unit": "sqm", "price_range": (80000, 200000)},
+            "ceiling": {"type": "우물천장 + 간접조명", "unit": "sqm", "price_range": (120000, 250000)},
+            "furniture_style": "designer_luxury",
+            "lighting": {"type": "크리스탈 샹들리에 + 디자이너 조명", "unit": "set", "price_range": (2000000, 10000000)},
+            "gold_accents": {"type": "골드 하드웨어/악센트", "unit": "set", "price_range": (500000, 2000000)},
+        },
+        "cost_multiplier": 2.0,
+    },
+    "korean_modern": {
+        "prompt": "modern Korean interior, ondol floor, minimalist hanok elements, natural wood, paper screen inspired, warm neutral tones, clean aesthetic",
+        "materials": {
+            "flooring": {"type": "온돌 원목마루 (오크/물푸레)", "unit": "sqm", "price_range": (150000, 280000)},
+            "wall": {"type": "한지벽지 or 황토 도장", "unit": "sqm", "price_range": (30000, 70000)},
+            "ceiling": {"type": "한지 천장 or 평천장", "unit": "sqm", "price_range": (40000, 90000)},
+            "furniture_style": "korean_contemporary",
+            "lighting": {"type": "한지 조명 + 간접조명", "unit": "set", "price_range": (400000, 1000000)},
+            "traditional_elements": {"type": "한옥 요소 (창호, 문살)", "unit": "set", "price_range": (300000, 1200000)},
+        },
+        "cost_multiplier": 1.25,
+    },
+}
+
+# 기존 호환성을 위한 STYLE_PROMPTS 매핑
+STYLE_PROMPTS: Dict[str, str] = {
+    style_id: data["prompt"] for style_id, data in STYLE_DATA.items()
+}
+
+# 공간별 추가 프롬프트
+ROOM_PROMPTS: Dict[str, str] = {
+    "living_room": "spacious living room, comfortable sofa, coffee table, entertainment center, area rug, accent lighting",
+    "bedroom": "cozy bedroom, comfortable bed, nightstands, soft bedding, ambient lighting, wardrobe",
+    "kitchen": "modern kitchen, kitchen island, built-in appliances, pendant lights, countertop, cabinets",
+    "bathroom": "modern bathroom, vanity, mirror, tiles, shower, clean lines",
+    "office": "home office, desk, ergonomic chair, bookshelf, task lighting, organized workspace",
+}
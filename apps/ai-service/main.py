@@ -4,12 +4,61 @@ AI Site Manager - FastAPI Entry Point
 
 김 반장 (Chief Kim) - 20년 경력의 베테랑 현장 소장
 """
+import asyncio
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.config import settings
 from app.api import router as api_router
+from app import agents  # 에이전트 모듈은 웜업/첫 요청에서 임포트
+from app.core.admission import AdmissionMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.disconnect import DisconnectMiddleware
+from app.core.executor import close_executor, get_executor
+from app.core.loop_monitor import LoopMonitorMiddleware, get_loop_monitor
+from app.core.semantic_cache import get_answer_cache
+from app.services.estimate_store import close_estimate_store, get_estimate_store
+from app.services.knowledge_index import get_knowledge_index
+from app.core.object_store import ImmutableStaticFiles
+from app.core.responses import FastJSONResponse
+from app.core.state import close_state_backend, get_state_backend
+from app.core.warmup import Warmup, get_warmup
+
+
+def register_warmup_steps(warmup: Warmup) -> None:
+    """설정에 따라 웜업 단계 등록 (에이전트 → 커넥션 → 캐시 → 프로브 순)"""
+
+    async def initialize_agents():
+        manager, architect, designer = await asyncio.gather(
+            agents.get_manager_agent(), agents.get_architect_agent(), agents.get_designer_agent()
+        )
+        await asyncio.gather(manager.initialize(), architect.initialize(), designer.initialize())
+
+    async def connections():
+        instances = await asyncio.gather(agents.get_manager_agent(), agents.get_architect_agent(), agents.get_designer_agent())
+        await asyncio.gather(*(agent.warm_connections() for agent in instances))
+
+    async def caches():
+        designer = await agents.get_designer_agent()
+        await designer.warm_caches()
+        # 시맨틱 캐시 인덱스를 공유 저장소에서 적재 (백엔드 스캔 → 스레드 풀)
+        await get_answer_cache().load_shared_async()
+
+    async def probe():
+        manager = await agents.get_manager_agent()
+        await manager.probe()
+
+    if settings.warmup_agents:
+        warmup.add_step("agents", initialize_agents)
+    if settings.warmup_connections:
+        warmup.add_step("connections", connections)
+    if settings.warmup_caches:
+        warmup.add_step("caches", caches)
+    if settings.warmup_probe_generation:
+        warmup.add_step("probe", probe)
 
 
 @asynccontextmanager
@@ -19,8 +68,39 @@ async def lifespan(app: FastAPI):
     print(f"🚀 Starting {settings.app_name} v{settings.app_version}")
     print(f"👷 김 반장(Chief Kim) 현장 투입 준비 완료!")
     print(f"📡 LLM Provider: {settings.default_llm_provider} ({settings.default_llm_model})")
+
+    # 이벤트 루프 블로킹 모니터 (이후 웜업 단계의 블로킹도 기록되도록 가장 먼저 시작)
+    if settings.loop_monitor_enabled:
+        await get_loop_monitor().start()
+
+    # 캐시/세션 공유 상태 백엔드 연결 (설정 오류는 시작 시점에 드러나도록)
+    get_state_backend()
+
+    # 기술 상담용 지식 베이스 인덱스 구축 (메모리)
+    get_knowledge_index()
+
+    # 견적 이력 통계 스냅샷 로드
+    get_estimate_store()
+
+    # 이미지 렌더링 워커 프로세스 기동
+    await get_executor().start()
+
+    # 에이전트/커넥션/캐시 웜업 (완료 전까지 /api/ready 503)
+    warmup = get_warmup()
+    if settings.warmup_enabled:
+        register_warmup_steps(warmup)
+    warmup_task = asyncio.create_task(warmup.run())
+    if settings.warmup_blocking:
+        await warmup_task
     yield
     # Shutdown
+    warmup_task.cancel()
+    if agents.is_loaded("get_designer_agent"):  # 한 번도 쓰지 않은 에이전트는 임포트하지 않음
+        await (await agents.get_designer_agent()).close()
+    close_estimate_store()
+    await close_state_backend()
+    close_executor()
+    await get_loop_monitor().stop()
     print("👋 김 반장 퇴근합니다. 수고하셨습니다!")
 
 
@@ -44,8 +124,21 @@ app = FastAPI(
 3. **Cost Transparency** - 비용 투명성
     """,
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
+# 비싼 엔드포인트 승인 제어 (CORS보다 먼저 등록 → 안쪽에서 실행되어 429/503에도 CORS 헤더 부착)
+if settings.admission_enabled:
+    app.add_middleware(
+        AdmissionMiddleware,
+        user_header=settings.admission_user_header,
+        trusted_proxies=settings.admission_trusted_proxies,
+    )
+
+# 클라이언트 연결 종료 → 요청 task 취소 (에이전트 await 전체로 전파, 승인 제어 슬롯 반납)
+if settings.cancel_on_disconnect:
+    app.add_middleware(DisconnectMiddleware)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -55,9 +148,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 (gzip/brotli, 작은 응답과 이미지 제외)
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+    )
+
+# 요청 task → 라우트 매핑 (루프 블로킹 발생 라우트 추적)
+if settings.loop_monitor_enabled:
+    app.add_middleware(LoopMonitorMiddleware)
+
 # API 라우터 등록
 app.include_router(api_router, prefix="/api", tags=["AI Chat"])
 
+# 재호스팅된 생성 이미지 정적 서빙 (콘텐츠 주소 → 장기 캐시)
+os.makedirs(settings.media_dir, exist_ok=True)
+app.mount(settings.media_url_path, ImmutableStaticFiles(directory=settings.media_dir), name="media")
+
 
 @app.get("/")
 async def root():
@@ -70,6 +180,7 @@ async def root():
         "endpoints": {
             "chat": "POST /api/chat",
             "health": "GET /api/health",
+            "ready": "GET /api/ready",
             "docs": "GET /docs",
         }
     }
@@ -0,0 +1,19 @@
+"""
+테스트 공통 설정
+
+- 캐시/상태 파일은 테스트 세션용 임시 디렉토리에 기록
+- 이미지 렌더링은 프로세스 풀 대신 스레드 풀 사용
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_TMP_DIR = tempfile.mkdtemp(prefix="ai-service-tests-")
+os.environ.setdefault("CACHE_DIR", os.path.join(_TMP_DIR, "cache"))
+os.environ.setdefault("STATE_SQLITE_FILE", os.path.join(_TMP_DIR, "state.sqlite3"))
+os.environ.setdefault("ESTIMATE_STORE_FILE", os.path.join(_TMP_DIR, "estimates.sqlite3"))
+os.environ.setdefault("SEMANTIC_CACHE_AUDIT_RATE", "0")
+os.environ.setdefault("EXECUTOR_PROCESS_WORKERS", "0")
+os.environ.setdefault("WARMUP_ENABLED", "false")
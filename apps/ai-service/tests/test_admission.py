@@ -0,0 +1,156 @@
+import asyncio
+
+import pytest
+
+from app.core import admission
+from app.core.admission import (
+    ROUTE_GROUPS,
+    AdmissionController,
+    AdmissionMiddleware,
+    AdmissionRegistry,
+    _user_key,
+    parse_trusted_proxies,
+)
+
+TRUSTED = parse_trusted_proxies("10.0.0.0/8, 127.0.0.1")
+
+
+def _scope(peer, **headers):
+    return {
+        "type": "http",
+        "client": (peer, 50000) if peer else None,
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    }
+
+
+def test_headers_ignored_without_trusted_proxy():
+    scope = _scope("203.0.113.7", x_user_id="alice", x_forwarded_for="198.51.100.1")
+    assert _user_key(scope, "x-user-id") == "ip:203.0.113.7"
+    assert _user_key(scope, "x-user-id", TRUSTED) == "ip:203.0.113.7"
+
+
+def test_user_header_from_trusted_proxy():
+    scope = _scope("10.1.2.3", x_user_id="alice", x_forwarded_for="198.51.100.1")
+    assert _user_key(scope, "x-user-id", TRUSTED) == "user:alice"
+
+
+def test_forwarded_for_skips_trusted_hops_from_the_right():
+    # 클라이언트가 위조한 맨 왼쪽 항목 대신 프록시가 기록한 실제 주소 사용
+    scope = _scope("10.1.2.3", x_forwarded_for="1.2.3.4, 198.51.100.1, 10.9.9.9")
+    assert _user_key(scope, "x-user-id", TRUSTED) == "ip:198.51.100.1"
+
+
+def test_forwarded_for_all_trusted_uses_first_hop():
+    scope = _scope("127.0.0.1", x_forwarded_for="10.0.0.5, 10.0.0.6")
+    assert _user_key(scope, "x-user-id", TRUSTED) == "ip:10.0.0.5"
+
+
+def test_trusted_proxy_without_headers_uses_peer():
+    assert _user_key(_scope("127.0.0.1"), "x-user-id", TRUSTED) == "ip:127.0.0.1"
+    assert _user_key(_scope(None), "x-user-id", TRUSTED) == "ip:unknown"
+
+
+def test_parse_trusted_proxies_skips_invalid_entries():
+    networks = parse_trusted_proxies(["10.0.0.0/8", "not-an-ip", "", "::1"])
+    assert [str(network) for network in networks] == ["10.0.0.0/8", "::1/128"]
+    assert parse_trusted_proxies("") == ()
+
+
+# ---- 대기 중 연결 종료 ----
+
+@pytest.fixture
+def controller(monkeypatch):
+    controller = AdmissionController("generate", target_latency_ms=1000, max_concurrency=1, queue_timeout_seconds=5)
+    monkeypatch.setattr(admission, "_admission", AdmissionRegistry({"generate": controller}, ROUTE_GROUPS))
+    return controller
+
+
+def _request_scope():
+    return {"type": "http", "method": "POST", "path": "/api/designer/generate", "headers": [], "client": ("203.0.113.7", 1)}
+
+
+class _Client:
+    """본문 메시지 뒤에 연결 종료를 기다리는 ASGI receive"""
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.left = asyncio.Event()
+
+    async def receive(self):
+        if self.messages:
+            return self.messages.pop(0)
+        await self.left.wait()
+        return {"type": "http.disconnect"}
+
+
+async def _noop_send(message):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_disconnect_while_queued_removes_waiter(controller):
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(await receive())
+
+    started_at = await controller.acquire("other")  # 슬롯 점유 → 다음 요청은 대기
+    client = _Client([{"type": "http.request", "body": b"{}", "more_body": False}])
+    task = asyncio.create_task(AdmissionMiddleware(app)(_request_scope(), client.receive, _noop_send))
+    await asyncio.sleep(0.01)
+    assert controller.stats()["queued"] == 1
+
+    client.left.set()
+    await asyncio.wait_for(task, timeout=1)
+    assert controller.stats()["queued"] == 0
+    assert controller.cancelled == 1
+    assert calls == []
+
+    controller.release(started_at)
+    assert controller.stats()["inflight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_queued_request_replays_body_after_admission(controller):
+    received = []
+
+    async def app(scope, receive, send):
+        received.append(await receive())
+
+    started_at = await controller.acquire("other")
+    body = {"type": "http.request", "body": b'{"style": "modern"}', "more_body": False}
+    client = _Client([body])
+    task = asyncio.create_task(AdmissionMiddleware(app)(_request_scope(), client.receive, _noop_send))
+    await asyncio.sleep(0.01)
+
+    controller.release(started_at)
+    await asyncio.wait_for(task, timeout=1)
+    assert received == [body]
+    assert controller.stats()["inflight"] == 0
+    assert controller.completed == 2
+
+
+@pytest.mark.asyncio
+async def test_chunked_body_is_not_read_ahead(controller):
+    received = []
+
+    async def app(scope, receive, send):
+        while True:
+            message = await receive()
+            received.append(message)
+            if not message.get("more_body", False):
+                break
+
+    started_at = await controller.acquire("other")
+    chunks = [
+        {"type": "http.request", "body": b"a", "more_body": True},
+        {"type": "http.request", "body": b"b", "more_body": False},
+    ]
+    client = _Client(chunks)
+    task = asyncio.create_task(AdmissionMiddleware(app)(_request_scope(), client.receive, _noop_send))
+    await asyncio.sleep(0.01)
+    assert client.messages == chunks[1:]  # 첫 청크만 읽고 감시 중단
+
+    controller.release(started_at)
+    await asyncio.wait_for(task, timeout=1)
+    assert received == chunks
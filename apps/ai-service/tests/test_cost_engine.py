@@ -0,0 +1,31 @@
+"""견적 엔진: 입력 정규화"""
+import pytest
+
+from app.services.cost_engine import MAX_BATHROOMS, build_estimate_input, coerce_bathrooms, estimate_cost
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2", 2),
+    (2.0, 2),
+    ("3.0", 3),
+    (99, MAX_BATHROOMS),
+    (-1, 0),
+    ("두 개", None),
+    ("", None),
+    (None, None),
+    (float("nan"), None),
+    (float("inf"), None),
+])
+def test_coerce_bathrooms(value, expected):
+    assert coerce_bathrooms(value) == expected
+
+
+def test_string_bathrooms_from_context_is_estimated():
+    inp = build_estimate_input("32평 욕실 얼마", {"bathrooms": "2"})
+    assert inp.bathrooms == 2
+    assert estimate_cost(inp).grand_total > 0
+
+
+def test_invalid_bathrooms_falls_back_to_query():
+    inp = build_estimate_input("32평 화장실 3개 공사 얼마", {"bathrooms": "many"})
+    assert inp.bathrooms == 3
@@ -0,0 +1,37 @@
+from app.services.estimate_store import EstimateStore
+
+
+def _store(path, **kwargs):
+    return EstimateStore(str(path), min_samples=1, sync_interval=0, **kwargs)
+
+
+def test_workers_see_each_others_records(tmp_path):
+    path = tmp_path / "estimates.sqlite3"
+    worker_a, worker_b = _store(path), _store(path)
+
+    worker_a.record("estimate", "전체", 32, 3200, location="서울")
+    worker_b.record("estimate", "전체", 32, 4800, location="서울")
+
+    for worker in (worker_a, worker_b):
+        assert worker.benchmark("전체", area_size=32, location="서울").count == 2
+
+
+def test_snapshots_from_several_workers_match_a_rebuild(tmp_path):
+    path = tmp_path / "estimates.sqlite3"
+    worker_a, worker_b = _store(path, flush_every=2), _store(path, flush_every=3)
+    for i in range(7):
+        worker = worker_a if i % 2 else worker_b
+        worker.record("offer", "욕실", 24, 900 + i * 50, location="부산", breakdown=[("타일", 300 + i)])
+    worker_b.flush()
+    worker_a.flush()  # 더 오래된 상태로 덮어쓰지 않아야 함
+
+    restarted = _store(path)
+    rebuilt = _store(tmp_path / "rebuilt.sqlite3")
+    for i in range(7):
+        rebuilt.record("offer", "욕실", 24, 900 + i * 50, location="부산", breakdown=[("타일", 300 + i)])
+
+    for category in ("욕실", "욕실/타일"):
+        restored = restarted.benchmark(category, area_size=24, location="부산", price=1000)
+        expected = rebuilt.benchmark(category, area_size=24, location="부산", price=1000)
+        assert restored == expected
+        assert restored.count == 7
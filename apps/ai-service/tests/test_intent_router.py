@@ -0,0 +1,37 @@
+import pytest
+
+from app.models.schemas import AgentIntent
+from app.services.intent_router import IntentRouter, canonicalize_query
+
+
+@pytest.fixture(scope="module")
+def router():
+    return IntentRouter(threshold=0.3)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("공사 기간 얼마나 걸려요?", "공사 일정 얼마나 걸려요"),
+    ("견적서 보내줘", "견적서 보내줘"),
+    ("32평 올수리 얼마?", "32평 전체 리모델링 비용"),
+    ("32평 전체 공사 비용 얼마나 들어요", "32평 전체 리모델링 비용"),
+    ("화장실이랑 부엌 견적", "욕실이랑 주방 비용"),
+])
+def test_synonyms_replace_whole_words_only(text, expected):
+    assert canonicalize_query(text) == expected
+
+
+def test_paraphrases_share_canonical_form():
+    assert canonicalize_query("32평 올수리 얼마?") == canonicalize_query("32평 전체 리모델링 비용")
+
+
+@pytest.mark.parametrize("query, intent", [
+    ("공사 기간 얼마나 걸려요?", AgentIntent.SCHEDULE),
+    ("욕실 공사 얼마나 걸려요", AgentIntent.SCHEDULE),
+    ("32평 올수리 얼마?", AgentIntent.COST),
+    ("32평 전체 리모델링 비용", AgentIntent.COST),
+    ("견적서 보내줘", AgentIntent.QUOTE_SEND),
+])
+def test_classify_paraphrases(router, query, intent):
+    prediction = router.classify(query)
+    assert prediction.intent == intent
+    assert prediction.confident
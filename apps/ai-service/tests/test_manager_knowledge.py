@@ -0,0 +1,26 @@
+import pytest
+
+from app.agents.manager_agent import ManagerAgent
+from app.models.schemas import AgentIntent
+
+
+class _NoLLM:
+    """LLM이 호출되면 실패하는 프로바이더"""
+
+    async def generate(self, *args, **kwargs):
+        raise AssertionError("LLM should not be called for a knowledge base hit")
+
+
+@pytest.fixture
+def agent():
+    agent = ManagerAgent(api_key="test")
+    agent.provider = _NoLLM()
+    return agent
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query", ["강화마루 vs 원목마루", "욕실 방수 공법"])
+async def test_faq_answered_from_knowledge_base(agent, query):
+    response = await agent._respond(query, {})
+    assert response.intent == AgentIntent.TECHNICAL
+    assert response.answer
@@ -0,0 +1,49 @@
+import pytest
+
+from app.agents.manager_agent import ManagerAgent
+from app.models.schemas import AgentIntent
+from app.services.estimate_store import get_estimate_store
+
+
+class _NoLLM:
+    async def initialize(self):
+        pass
+
+    async def generate(self, *args, **kwargs):
+        raise AssertionError("LLM should not be called for a price check")
+
+    async def generate_json(self, *args, **kwargs):
+        raise RuntimeError("offline")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def seeded_store():
+    store = get_estimate_store()
+    for total in (3000, 3400, 3800, 4200, 4600, 5000):
+        store.record("offer", "전체", 32, total, location="서울 마포구")
+    return store
+
+
+@pytest.fixture
+def agent():
+    agent = ManagerAgent(api_key="test")
+    agent.provider = _NoLLM()
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_price_check_uses_latest_estimate(agent):
+    estimate = {"area_size": 32, "work_scope": "전체", "final_total": 3900, "breakdown": []}
+    response = await agent.process_request(
+        "이 가격 적정한가요?", {"location": "서울", "previous_cost_estimate": estimate}
+    )
+    assert response.intent == AgentIntent.COST
+    assert "3,900만원" in response.answer
+    assert "적정 범위" in response.answer
+
+
+@pytest.mark.asyncio
+async def test_price_check_with_price_in_question(agent):
+    response = await agent.process_request("서울 32평 올수리 6000만원 비싼 건가요?", {})
+    assert response.intent == AgentIntent.COST
+    assert "높은 편" in response.answer
@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.agents.manager_agent import ManagerAgent
+from app.core.session import get_session_store
+from app.models.schemas import AgentIntent
+
+
+class _RecordingLLM:
+    """프롬프트를 기록하는 프로바이더 (문장 생성은 실패 → 템플릿 답변)"""
+
+    def __init__(self):
+        self.prompts = []
+
+    async def initialize(self):
+        pass
+
+    async def generate(self, prompt, *args, **kwargs):
+        self.prompts.append(prompt)
+        return SimpleNamespace(content='{"intent": "technical", "answer": "원목 합판을 권해요.", "data": null}')
+
+    async def generate_json(self, prompt, *args, **kwargs):
+        self.prompts.append(prompt)
+        raise RuntimeError("offline")
+
+
+@pytest.fixture
+def agent():
+    agent = ManagerAgent(api_key="test")
+    agent.provider = _RecordingLLM()
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_paraphrase_hits_across_sessions(agent):
+    first = await agent.process_request("서울 32평 올수리 얼마?", {"location": "서울"})
+    calls = len(agent.provider.prompts)
+
+    # 같은 세션의 두 번째 질문: 첫 답변 후 세션 슬롯(area_size)이 바뀌어도 캐시 scope는 그대로
+    second = await agent.process_request("서울 32평 전체 리모델링 비용", {"location": "서울"}, session_id=first.session_id)
+    assert second.intent == AgentIntent.COST
+    assert second.data == first.data
+    assert len(agent.provider.prompts) == calls
+
+
+@pytest.mark.asyncio
+async def test_cached_answer_is_generated_without_session_state(agent):
+    store = get_session_store()
+    session = store.get_or_create(None)
+    session.slots["budget"] = 3000
+    session.add_turn("user", "우리집은 복층이에요 비밀번호는 1234", 6, 6)
+    store.save(session)
+
+    await agent.process_request("24평 올수리 비용 얼마?", {}, session_id=session.session_id)
+    await agent.process_request("붙박이장 자재 추천해줘", {}, session_id=session.session_id)
+    assert len(agent.provider.prompts) == 2
+    assert all("1234" not in prompt and "3000" not in prompt for prompt in agent.provider.prompts)
@@ -0,0 +1,53 @@
+import pytest
+
+from app.agents.manager_agent import ManagerAgent
+from app.core.session import get_session_store
+from app.models.schemas import CostEstimate, ProjectSchedule
+from app.services.cost_engine import build_estimate_input, query_slots
+
+
+class _NoLLM:
+    async def initialize(self):
+        pass
+
+    async def generate(self, *args, **kwargs):
+        raise RuntimeError("offline")
+
+    async def generate_json(self, *args, **kwargs):
+        raise RuntimeError("offline")
+
+
+@pytest.fixture
+def agent():
+    agent = ManagerAgent(api_key="test")
+    agent.provider = _NoLLM()
+    return agent
+
+
+def test_query_values_override_context():
+    inp = build_estimate_input("40평 올수리 얼마?", {"area_size": 32, "work_type": "욕실", "bathrooms": 1})
+    assert (inp.area_size, inp.work_scope) == (40, "전체")
+    inp = build_estimate_input("화장실 2개 공사 얼마?", {"area_size": 32, "work_type": "전체", "bathrooms": 1})
+    assert (inp.area_size, inp.work_scope, inp.bathrooms) == (32, "욕실", 2)
+
+
+def test_query_slots_only_include_stated_values():
+    assert query_slots("40평 올수리 얼마?") == {"area_size": 40, "work_type": "전체"}
+    assert query_slots("견적 다시 알려주세요") == {}
+
+
+@pytest.mark.asyncio
+async def test_stated_area_overrides_session_slot(agent):
+    first = await agent.process_request("32평 올수리 얼마?", {"location": "서울"})
+    assert isinstance(first.data, CostEstimate) and first.data.area_size == 32
+
+    second = await agent.process_request("40평 올수리 얼마?", {}, session_id=first.session_id)
+    assert isinstance(second.data, CostEstimate) and second.data.area_size == 40
+
+    session = get_session_store().get(first.session_id)
+    assert session.slots["area_size"] == 40
+
+    # 이후 턴은 다시 기록된 40평 슬롯 기준
+    schedule = await agent.process_request("공사 기간 얼마나 걸려요?", {}, session_id=first.session_id)
+    assert isinstance(schedule.data, ProjectSchedule)
+    assert schedule.answer.startswith("40평")
@@ -0,0 +1,95 @@
+import httpx
+import pytest
+
+from app.core.remote_fetch import RemoteFetchError, check_public_url, fetch_image_bytes
+
+PUBLIC = "http://93.184.216.34"  # 숫자 주소 → DNS 조회 없음
+
+
+def _client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _image(request, body=b"\x89PNG....", content_type="image/png"):
+    return httpx.Response(200, headers={"content-type": content_type}, content=body)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1/a.png",
+    "http://localhost/a.png",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://10.0.0.5/a.png",
+    "http://[::1]/a.png",
+    "http://[::ffff:127.0.0.1]/a.png",
+    "file:///etc/passwd",
+    "ftp://93.184.216.34/a.png",
+    "http:///a.png",
+])
+async def test_rejects_non_public_urls(url):
+    with pytest.raises(RemoteFetchError):
+        await check_public_url(url)
+
+
+@pytest.mark.asyncio
+async def test_fetches_public_image():
+    async with _client(_image) as client:
+        assert await fetch_image_bytes(client, f"{PUBLIC}/a.png", max_bytes=1024) == b"\x89PNG...."
+
+
+@pytest.mark.asyncio
+async def test_redirect_to_internal_host_is_rejected():
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        if request.url.host == "93.184.216.34":
+            return httpx.Response(302, headers={"location": "http://169.254.169.254/latest/meta-data/"})
+        return _image(request)
+
+    async with _client(handler) as client:
+        with pytest.raises(RemoteFetchError):
+            await fetch_image_bytes(client, f"{PUBLIC}/a.png", max_bytes=1024)
+    assert requested == [f"{PUBLIC}/a.png"]
+
+
+@pytest.mark.asyncio
+async def test_public_redirect_is_followed():
+    def handler(request):
+        if request.url.path == "/old.png":
+            return httpx.Response(301, headers={"location": "/new.png"})
+        return _image(request, body=b"new")
+
+    async with _client(handler) as client:
+        assert await fetch_image_bytes(client, f"{PUBLIC}/old.png", max_bytes=1024) == b"new"
+
+
+@pytest.mark.asyncio
+async def test_redirect_loop_is_bounded():
+    def handler(request):
+        return httpx.Response(302, headers={"location": "/again"})
+
+    async with _client(handler) as client:
+        with pytest.raises(RemoteFetchError):
+            await fetch_image_bytes(client, f"{PUBLIC}/start", max_bytes=1024)
+
+
+@pytest.mark.asyncio
+async def test_non_image_response_is_rejected():
+    async with _client(lambda request: _image(request, b"<html>", "text/html")) as client:
+        with pytest.raises(RemoteFetchError):
+            await fetch_image_bytes(client, f"{PUBLIC}/page", max_bytes=1024)
+
+
+@pytest.mark.asyncio
+async def test_body_over_limit_is_rejected_while_streaming():
+    async def chunks():
+        for _ in range(10):
+            yield b"x" * 512
+
+    def handler(request):
+        return httpx.Response(200, headers={"content-type": "image/jpeg"}, content=chunks())  # Content-Length 없음
+
+    async with _client(handler) as client:
+        with pytest.raises(RemoteFetchError):
+            await fetch_image_bytes(client, f"{PUBLIC}/big.jpg", max_bytes=2048)
@@ -0,0 +1,57 @@
+"""공정 스케줄러: 공휴일 범위 / 착공일 파싱"""
+from datetime import date
+
+import pytest
+
+from app.services import scheduler
+from app.services.scheduler import ConstraintScheduler, build_phases, is_work_day, parse_start_date
+
+
+@pytest.fixture
+def without_holidays_package(monkeypatch):
+    def missing(name):
+        raise ImportError(name)
+
+    monkeypatch.setattr(scheduler, "import_module", missing)
+    scheduler._holidays_for_year.cache_clear()
+    yield
+    scheduler._holidays_for_year.cache_clear()
+
+
+def test_new_year_outside_table_is_holiday(without_holidays_package):
+    assert not is_work_day(date(2028, 1, 1))
+
+
+def test_schedule_warns_when_lunar_holidays_unknown(without_holidays_package):
+    plan = ConstraintScheduler().plan(build_phases(32), date(2027, 12, 20))
+    assert any("2028년" in warning and "반영되지 않았습니다" in warning for warning in plan.warnings)
+
+
+def test_schedule_within_table_has_no_coverage_warning():
+    plan = ConstraintScheduler().plan(build_phases(32), date(2026, 3, 2))
+    assert not any("반영되지 않았습니다" in warning for warning in plan.warnings)
+
+
+@pytest.mark.parametrize("today, expected", [
+    (date(2028, 3, 1), date(2032, 2, 29)),  # 윤년 2월 29일이 지난 뒤
+    (date(2027, 3, 1), date(2028, 2, 29)),  # 평년 (올해 2월 29일 없음)
+    (date(2028, 2, 1), date(2028, 2, 29)),
+])
+def test_parse_feb_29_picks_next_leap_year(today, expected):
+    assert parse_start_date("2월 29일 착공 예정", today=today) == expected
+
+
+def test_parse_invalid_dates():
+    assert parse_start_date("2025-02-29") is None
+    assert parse_start_date("13월 3일") is None
+
+
+def test_string_bathrooms_are_coerced():
+    phases = {phase.name: phase for phase in build_phases(32, "욕실", "3")}
+    assert phases["철거"].duration == 3
+    assert phases["타일"].duration == 6
+
+
+def test_invalid_bathrooms_fall_back_to_area_estimate():
+    assert build_phases(32, "전체", "abc") == build_phases(32, "전체", None)
+    assert {phase.name: phase for phase in build_phases(32, "욕실", 0)}["철거"].duration == 1
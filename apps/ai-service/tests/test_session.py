@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from app.core.session import ChatSession, SessionStore
+from app.core.state import MemoryBackend
+
+
+def _add_exchange(question, answer, **slots):
+    def apply(session):
+        session.update_slots(slots)
+        session.add_turn("user", question, 10, 10)
+        session.add_turn("assistant", answer, 10, 10)
+    return apply
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_keep_both_turns():
+    store = SessionStore(backend=MemoryBackend())
+    session_id = "session-concurrent"
+
+    # 같은 세션으로 동시에 들어온 두 요청이 각자 같은 버전을 읽음
+    first = await store.get_or_create_async(session_id)
+    second = await store.get_or_create_async(session_id)
+
+    await store.update_async(first, _add_exchange("32평 견적", "약 4천만원", area_size=32))
+    await store.update_async(second, _add_exchange("서울이에요", "서울 기준으로 볼게요", location="서울"))
+
+    saved = await store.get_async(session_id)
+    assert [turn.text for turn in saved.turns] == ["32평 견적", "약 4천만원", "서울이에요", "서울 기준으로 볼게요"]
+    assert saved.slots == {"area_size": 32, "location": "서울"}
+    assert saved.turn_count == 2
+    assert saved.version == 2
+
+
+@pytest.mark.asyncio
+async def test_parallel_updates_are_serialized():
+    store = SessionStore(backend=MemoryBackend())
+    session_id = "session-parallel"
+    sessions = [await store.get_or_create_async(session_id) for _ in range(5)]
+
+    await asyncio.gather(*(
+        store.update_async(session, _add_exchange(f"질문 {i}", f"답변 {i}"))
+        for i, session in enumerate(sessions)
+    ))
+
+    saved = await store.get_async(session_id)
+    assert saved.turn_count == 5
+    assert saved.version == 5
+
+
+@pytest.mark.asyncio
+async def test_sequential_update_uses_loaded_session():
+    store = SessionStore(backend=MemoryBackend())
+    session = await store.get_or_create_async("session-sequential")
+    saved = await store.update_async(session, _add_exchange("안녕하세요", "네 반갑습니다"))
+    assert saved is session
+    assert (await store.get_async("session-sequential")).version == 1
+
+
+def test_sessions_saved_before_versioning_load():
+    data = ChatSession(session_id="session-legacy").to_dict()
+    del data["version"]
+    assert ChatSession.from_dict(data).version == 0
@@ -0,0 +1,170 @@
+import os
+import time
+
+import pytest
+
+from app.core.cache import PerceptualHashCache, ResultCache
+from app.core.semantic_cache import SemanticCache
+from app.core.state import FileBackend, MemoryBackend, RedisBackend, SQLiteBackend
+
+
+def _redis_backend():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    return RedisBackend(
+        "redis://fake",
+        prefix="test",
+        client=fakeredis.FakeRedis(server=server, decode_responses=True),
+        async_client=fakeredis.FakeAsyncRedis(server=server, decode_responses=True),
+    )
+
+
+@pytest.fixture(params=["memory", "file", "sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        backend = MemoryBackend(shared=True)
+    elif request.param == "file":
+        backend = FileBackend(str(tmp_path / "state"))
+    elif request.param == "sqlite":
+        backend = SQLiteBackend(str(tmp_path / "state.sqlite3"))
+    else:
+        backend = _redis_backend()
+    yield backend
+    backend.close()
+
+
+def test_set_get_delete(backend):
+    backend.set("ns", "a", {"value": [1, 2]})
+    assert backend.get("ns", "a") == {"value": [1, 2]}
+    assert backend.keys("ns") == ["a"]
+    backend.delete("ns", "a")
+    assert backend.get("ns", "a") is None
+
+
+def test_ttl_expiry(backend):
+    backend.set("ns", "short", 1, ttl_seconds=0.05)
+    backend.set("ns", "long", 2, ttl_seconds=60)
+    expires_at, _ = backend.get_entry("ns", "long")
+    assert expires_at == pytest.approx(time.time() + 60, abs=2)
+    time.sleep(0.1)
+    assert backend.get("ns", "short") is None
+    assert backend.get("ns", "long") == 2
+
+
+@pytest.mark.asyncio
+async def test_async_round_trip(backend):
+    await backend.set_async("ns", "a", {"x": 1}, ttl_seconds=60)
+    assert backend.get("ns", "a") == {"x": 1}  # 동기/비동기 경로가 같은 저장소
+    assert (await backend.get_entry_async("ns", "a"))[1] == {"x": 1}
+    await backend.delete_async("ns", "a")
+    assert await backend.get_entry_async("ns", "a") is None
+
+
+def test_recent_keys_follow_write_order(backend):
+    for key in ("c", "a", "b"):
+        backend.set("ns", key, key)
+        time.sleep(0.01)  # 파일 수정 시각 구분
+    assert backend.recent_keys("ns", 2) == ["a", "b"]
+    assert backend.recent_keys("ns", 10) == ["c", "a", "b"]
+
+
+def test_load_shared_prefers_recent_entries(backend):
+    writer = ResultCache("images", backend=backend)
+    for key in ("z-old", "m-old", "a-new", "b-new"):
+        writer.set(key, key)
+        time.sleep(0.01)
+
+    reader = ResultCache("images", max_entries=2, backend=backend)
+    assert reader.load_shared() == 2
+    assert reader.keys() == ["a-new", "b-new"]
+
+
+@pytest.mark.asyncio
+async def test_result_cache_async_shares_between_workers(backend):
+    worker_a = ResultCache("results", backend=backend)
+    worker_b = ResultCache("results", backend=backend)
+    await worker_a.set_async("k", {"url": "x"})
+    assert await worker_b.get_async("k") == {"url": "x"}
+    assert await worker_b.get_async("missing") is None
+    assert worker_b.stats()["hits"] == 1 and worker_b.stats()["misses"] == 1
+
+
+class _CountingBackend(MemoryBackend):
+    """recent_keys 호출 수를 세는 공유 메모리 백엔드"""
+
+    def __init__(self):
+        super().__init__(shared=True)
+        self.scans = 0
+
+    def recent_keys(self, namespace, limit):
+        self.scans += 1
+        return super().recent_keys(namespace, limit)
+
+
+@pytest.mark.asyncio
+async def test_perceptual_cache_loads_shared_on_first_async_get():
+    backend = _CountingBackend()
+    PerceptualHashCache("refs", backend=backend).set(0x0F0F0F0F0F0F0F0F, "warm oak")
+
+    reader = PerceptualHashCache("refs", backend=backend)
+    assert backend.scans == 0  # 생성자에서는 백엔드를 읽지 않음
+    assert await reader.get_async(0x0F0F0F0F0F0F0F0E) == "warm oak"  # 근접 해시 → 적재된 항목
+    await reader.get_async(0x1234)
+    assert backend.scans == 1
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_loads_shared_on_first_async_get():
+    backend = _CountingBackend()
+    SemanticCache("answers", backend=backend).set("32평 올수리 비용 얼마", "cost", "약 4천만원")
+
+    reader = SemanticCache("answers", backend=backend)
+    assert backend.scans == 0
+    hit = await reader.get_async("32평 올수리 비용은 얼마", "cost")
+    assert hit is not None and hit.value == "약 4천만원"
+    assert await reader.load_shared_async() == 1  # 명시적 웜업은 다시 적재
+    assert backend.scans == 2
+
+
+def test_file_sweep_removes_expired_and_oldest(tmp_path):
+    backend = FileBackend(str(tmp_path), max_entries=3, sweep_every=0)
+    backend.set("ns", "expired", 0, ttl_seconds=0.01)
+    for i in range(5):
+        backend.set("ns", f"k{i}", i)
+        time.sleep(0.01)
+    stale_tmp = tmp_path / "ns" / "k9.json.1.2.tmp"
+    stale_tmp.write_text("{")
+    old = time.time() - FileBackend.STALE_TMP_SECONDS - 10
+    os.utime(stale_tmp, (old, old))
+
+    assert backend.sweep("ns") == 4  # 만료 1 + 초과 2 + 임시 파일 1
+    assert sorted(os.listdir(tmp_path / "ns")) == ["k2.json", "k3.json", "k4.json"]
+
+
+def test_file_sweep_runs_on_writes(tmp_path):
+    backend = FileBackend(str(tmp_path), max_entries=2, sweep_every=3)
+    for i in range(7):
+        backend.set("ns", f"k{i}", i)
+        time.sleep(0.01)
+    # 1번째, 4번째, 7번째 쓰기 후 정리
+    assert len(os.listdir(tmp_path / "ns")) == 2
+
+
+def test_sqlite_adds_updated_at_to_old_files(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "old.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE state (namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+        "expires_at REAL, PRIMARY KEY (namespace, key)) WITHOUT ROWID"
+    )
+    conn.execute("INSERT INTO state VALUES ('ns', 'legacy', '1', NULL)")
+    conn.commit()
+    conn.close()
+
+    backend = SQLiteBackend(path)
+    backend.set("ns", "fresh", 2)
+    assert backend.get("ns", "legacy") == 1
+    assert backend.recent_keys("ns", 10) == ["legacy", "fresh"]
+    backend.close()